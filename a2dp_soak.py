@@ -0,0 +1,250 @@
+import time
+from collections import deque
+
+from PyQt6.QtCore import QObject
+from PyQt6.QtCore import QThreadPool
+from PyQt6.QtCore import QTimer
+from PyQt6.QtCore import pyqtSignal
+
+from a2dp_streamer import A2dpStreamer
+from action_metrics import percentile
+from device_action_executor import DeviceActionSignals
+from device_action_executor import DeviceActionTask
+from libraries.bluetooth import constants
+
+
+def format_duration(seconds):
+    """Return a duration as H:MM:SS.
+
+    Args:
+        seconds: Duration in seconds.
+    """
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+
+class A2dpSoakSession(QObject):
+    """Keeps a playlist streaming to one A2DP device until stopped, surviving link drops.
+
+    A drop is noticed either from org.bluez.Device1.Connected turning False or from the stream
+    failing. The stream is then stopped (so PulseAudio does not move it to another sink), the
+    device is reconnected periodically and, once it is connected again, the stream restarts with
+    the file that was playing. The time from the drop until audio flows again is recorded as the
+    reconnect latency; the time audio was flowing is the stream uptime.
+    """
+
+    finished = pyqtSignal()
+
+    def __init__(self, log, device_address, file_paths, loop, bluetooth_device_manager, device_state_cache,
+                 latency_recorder=None):
+        """Initialize the session.
+
+        Args:
+            log: Logger instance used for logging.
+            device_address: Bluetooth address of the A2DP sink device.
+            file_paths: Paths of the audio files to stream, in order.
+            loop: If True, the playlist repeats until the session is stopped.
+            bluetooth_device_manager: BluetoothDeviceManager used to reconnect the device.
+            device_state_cache: DeviceStateCache of the adapter the device is connected to.
+            latency_recorder: Optional LatencyRecorder receiving the reconnect latencies.
+        """
+        super().__init__()
+        self.log = log
+        self.device_address = device_address
+        self.file_paths = list(file_paths)
+        self.loop = loop
+        self.bluetooth_device_manager = bluetooth_device_manager
+        self.device_state_cache = device_state_cache
+        self.latency_recorder = latency_recorder
+        self.streamer = None
+        self.resume_index = 0
+        self.started_at = None
+        self.stream_up_since = None
+        self.uptime = 0.0
+        self.outage_started_at = None
+        self.drops = 0
+        self.reconnect_latencies = deque(maxlen=constants.latency_max_samples)
+        self.next_restart_at = 0.0
+        self.next_reconnect_at = 0.0
+        self.reconnect_in_progress = False
+        self.reconnect_signals = DeviceActionSignals()
+        self.reconnect_signals.finished.connect(self.handle_reconnect_finished)
+        self.reconnect_signals.failed.connect(self.handle_reconnect_failed)
+        self.poll_timer = QTimer(self)
+        self.poll_timer.timeout.connect(self.poll)
+
+    def start(self):
+        """Start streaming the first file and begin supervising the link.
+
+        Raises:
+            ValueError, RuntimeError or OSError: If the first file or pacat cannot be started.
+        """
+        self.start_streamer(0)
+        self.started_at = time.monotonic()
+        self.device_state_cache.device_changed.connect(self.handle_device_changed)
+        self.poll_timer.start(constants.a2dp_soak_poll_interval_ms)
+
+    def stop(self):
+        """Stop streaming and supervising; the statistics stay available."""
+        if not self.poll_timer.isActive():
+            return
+        self.poll_timer.stop()
+        self.device_state_cache.device_changed.disconnect(self.handle_device_changed)
+        self.stop_streamer()
+        self.log_stats()
+
+    def is_running(self):
+        return self.poll_timer.isActive()
+
+    def start_streamer(self, file_index):
+        """Start a streamer on the playlist, beginning with one file.
+
+        Args:
+            file_index: Index of the first file to play.
+        """
+        self.streamer = A2dpStreamer(self.log, self.device_address, self.file_paths, loop=self.loop,
+                                     start_index=file_index)
+        try:
+            self.streamer.start()
+        except (OSError, RuntimeError, ValueError):
+            self.streamer = None
+            raise
+
+    def stop_streamer(self):
+        """Stop the current streamer and add its running time to the uptime."""
+        if self.streamer is None:
+            return
+        if self.streamer.is_running() or self.streamer.last_write_at is None:
+            stream_ended_at = time.monotonic()
+        else:
+            stream_ended_at = self.streamer.last_write_at
+        self.streamer.stop()
+        self.resume_index = self.streamer.playing_index
+        self.streamer = None
+        if self.stream_up_since is not None:
+            self.uptime += max(0.0, stream_ended_at - self.stream_up_since)
+            self.stream_up_since = None
+
+    def begin_outage(self, reason):
+        """Stop the stream after a link drop and schedule its restart.
+
+        Args:
+            reason: Description of how the drop was detected, for the log.
+        """
+        now = time.monotonic()
+        self.stop_streamer()
+        if self.outage_started_at is None:
+            self.outage_started_at = now
+            self.drops += 1
+            self.log.warning("A2DP stream to %s interrupted: %s", self.device_address, reason)
+        self.next_restart_at = now + constants.a2dp_soak_restart_delay_ms / 1000
+
+    def handle_device_changed(self, device_address, changed_properties):
+        """Reacts to Device1.Connected changes of the streaming device.
+
+        Args:
+            device_address: Bluetooth address of the device.
+            changed_properties: Names of the Device1 properties that changed.
+        """
+        if device_address != self.device_address or "Connected" not in changed_properties:
+            return
+        if not self.device_state_cache.is_device_connected(device_address):
+            self.begin_outage("device disconnected")
+        elif self.streamer is None:
+            # Give PulseAudio time to create the sink of the reconnected device.
+            self.next_restart_at = time.monotonic() + constants.a2dp_soak_restart_delay_ms / 1000
+            self.log.info("%s reconnected, restarting the A2DP stream", device_address)
+
+    def poll(self):
+        """Tracks the stream state and drives the restart and reconnect attempts."""
+        now = time.monotonic()
+        streamer = self.streamer
+        if streamer is not None:
+            if self.stream_up_since is None and streamer.first_write_at is not None:
+                self.stream_up_since = streamer.first_write_at
+                if self.outage_started_at is not None:
+                    self.record_reconnect(self.stream_up_since - self.outage_started_at)
+            if streamer.is_running():
+                return
+            if streamer.error is None:
+                self.log.info("A2DP playlist to %s finished", self.device_address)
+                self.stop()
+                self.finished.emit()
+                return
+            self.begin_outage(streamer.error)
+        if self.device_state_cache.is_device_connected(self.device_address):
+            if now < self.next_restart_at:
+                return
+            try:
+                self.start_streamer(self.resume_index)
+            except (OSError, RuntimeError, ValueError) as error:
+                self.log.error("Failed to restart A2DP stream to %s: %s", self.device_address, error)
+                self.next_restart_at = now + constants.a2dp_soak_restart_delay_ms / 1000
+        elif now >= self.next_reconnect_at and not self.reconnect_in_progress:
+            self.next_reconnect_at = now + constants.a2dp_soak_reconnect_interval_ms / 1000
+            self.reconnect_in_progress = True
+            self.log.info("Reconnecting %s to resume A2DP streaming", self.device_address)
+            QThreadPool.globalInstance().start(DeviceActionTask(self.bluetooth_device_manager.connect, "connect",
+                                                                self.device_address, self.reconnect_signals))
+
+    def handle_reconnect_finished(self, action, device_address, result, started_at, ended_at):
+        self.reconnect_in_progress = False
+        self.device_state_cache.refresh_device(device_address)
+        if not result:
+            self.log.warning("Reconnecting %s failed, retrying", device_address)
+
+    def handle_reconnect_failed(self, action, device_address, error, started_at, ended_at):
+        self.reconnect_in_progress = False
+        self.log.warning("Reconnecting %s failed: %s", device_address, error)
+
+    def record_reconnect(self, seconds):
+        """Store the latency of a recovered link drop.
+
+        Args:
+            seconds: Time from the drop until audio was written to the sink again.
+        """
+        self.outage_started_at = None
+        self.reconnect_latencies.append(seconds)
+        if self.latency_recorder:
+            self.latency_recorder.record("a2dp_reconnect", "total", seconds, True)
+        self.log.info("A2DP stream to %s resumed after %.1f s", self.device_address, seconds)
+
+    def get_stats(self):
+        """Return a dict with session duration, stream uptime and its ratio, drops and reconnect latency statistics."""
+        now = time.monotonic()
+        session_seconds = now - self.started_at if self.started_at is not None else 0.0
+        uptime_seconds = self.uptime + (now - self.stream_up_since if self.stream_up_since is not None else 0.0)
+        latencies = sorted(self.reconnect_latencies)
+        return {
+            "session_seconds": session_seconds,
+            "uptime_seconds": uptime_seconds,
+            "uptime_ratio": uptime_seconds / session_seconds if session_seconds else 0.0,
+            "drops": self.drops,
+            "reconnects": len(latencies),
+            "reconnect_mean_seconds": sum(latencies) / len(latencies) if latencies else None,
+            "reconnect_p95_seconds": percentile(latencies, 0.95),
+            "reconnect_max_seconds": latencies[-1] if latencies else None,
+            "current_file": self.streamer.get_playing_file() if self.streamer else None,
+        }
+
+    def get_summary(self):
+        """Return the statistics of the session as one line of text."""
+        stats = self.get_stats()
+        summary = (f"Uptime {format_duration(stats['uptime_seconds'])} of {format_duration(stats['session_seconds'])} "
+                   f"({stats['uptime_ratio']:.2%}) | Drops: {stats['drops']}")
+        if stats["reconnects"]:
+            summary += (f" | Reconnect: mean {stats['reconnect_mean_seconds']:.1f} s, "
+                        f"max {stats['reconnect_max_seconds']:.1f} s")
+        return summary
+
+    def log_stats(self):
+        """Log the statistics of the session."""
+        stats = self.get_stats()
+        self.log.info("A2DP soak to %s: %.0f s, uptime %.0f s (%.2f%%), %d drops, %d reconnects",
+                      self.device_address, stats["session_seconds"], stats["uptime_seconds"],
+                      stats["uptime_ratio"] * 100, stats["drops"], stats["reconnects"])
+        if stats["reconnects"]:
+            self.log.info("A2DP reconnect latency to %s: mean %.1f s, p95 %.1f s, max %.1f s", self.device_address,
+                          stats["reconnect_mean_seconds"], stats["reconnect_p95_seconds"],
+                          stats["reconnect_max_seconds"])
@@ -0,0 +1,360 @@
+import mmap
+import os
+import queue
+import shutil
+import struct
+import subprocess
+import threading
+import time
+from collections import namedtuple
+
+from libraries.bluetooth import constants
+
+AudioFormat = namedtuple("AudioFormat", ["sample_rate", "channels", "sample_width"])
+
+# Output format of the ffmpeg decoder for non-WAV files that start a stream.
+decoded_audio_format = AudioFormat(44100, 2, 2)
+
+# Raw sample format names by sample width in bytes; pacat and ffmpeg use the same names.
+pacat_sample_formats = {1: "u8", 2: "s16le", 3: "s24le", 4: "s32le"}
+
+
+def read_wav_layout(file_path):
+    """Locate the PCM data of a WAV file.
+
+    Args:
+        file_path: Path of the WAV file.
+
+    Returns:
+        Tuple of (AudioFormat, byte offset of the sample data, size of the sample data in bytes).
+
+    Raises:
+        ValueError: If the file is not a RIFF/WAVE file with uncompressed PCM samples.
+    """
+    with open(file_path, "rb") as wav_file:
+        header = wav_file.read(12)
+        if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+            raise ValueError(f"{file_path} is not a RIFF/WAVE file")
+        audio_format = None
+        while True:
+            chunk_header = wav_file.read(8)
+            if len(chunk_header) < 8:
+                raise ValueError(f"{file_path} has no data chunk")
+            chunk_id, chunk_size = struct.unpack("<4sI", chunk_header)
+            if chunk_id == b"fmt ":
+                fmt = wav_file.read(chunk_size)
+                format_tag, channels, sample_rate, _, _, bits_per_sample = struct.unpack("<HHIIHH", fmt[:16])
+                if format_tag not in (1, 0xFFFE) or bits_per_sample // 8 not in pacat_sample_formats:
+                    raise ValueError(f"{file_path} does not contain uncompressed PCM samples")
+                audio_format = AudioFormat(sample_rate, channels, bits_per_sample // 8)
+                wav_file.seek(chunk_size % 2, os.SEEK_CUR)
+            elif chunk_id == b"data":
+                if audio_format is None:
+                    raise ValueError(f"{file_path} has no fmt chunk before its data")
+                data_offset = wav_file.tell()
+                file_size = os.fstat(wav_file.fileno()).st_size
+                return audio_format, data_offset, min(chunk_size, file_size - data_offset)
+            else:
+                wav_file.seek(chunk_size + chunk_size % 2, os.SEEK_CUR)
+
+
+class WavFileSource:
+    """PCM samples of a WAV file, read in chunks; large files are memory-mapped."""
+
+    def __init__(self, file_path, mmap_threshold=constants.a2dp_stream_mmap_threshold_bytes):
+        """Open the file.
+
+        Args:
+            file_path: Path of the WAV file.
+            mmap_threshold: File size in bytes from which the file is memory-mapped instead of read.
+        """
+        self.audio_format, self.data_offset, self.data_size = read_wav_layout(file_path)
+        self.wav_file = open(file_path, "rb")
+        self.mapping = None
+        if self.data_offset + self.data_size >= mmap_threshold:
+            self.mapping = mmap.mmap(self.wav_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def iter_chunks(self, chunk_size):
+        """Yield the sample data in chunks of at most chunk_size bytes.
+
+        Args:
+            chunk_size: Maximum number of bytes per chunk.
+        """
+        end_position = self.data_offset + self.data_size
+        if self.mapping is not None:
+            for position in range(self.data_offset, end_position, chunk_size):
+                yield self.mapping[position:min(position + chunk_size, end_position)]
+            return
+        self.wav_file.seek(self.data_offset)
+        remaining = self.data_size
+        while remaining > 0:
+            chunk = self.wav_file.read(min(chunk_size, remaining))
+            if not chunk:
+                return
+            remaining -= len(chunk)
+            yield chunk
+
+    def close(self):
+        if self.mapping is not None:
+            self.mapping.close()
+        self.wav_file.close()
+
+
+class DecodedAudioSource:
+    """Samples of a compressed audio file, decoded incrementally by an ffmpeg process."""
+
+    def __init__(self, file_path, audio_format=decoded_audio_format):
+        """Start the decoder.
+
+        Args:
+            file_path: Path of the audio file (e.g. MP3, FLAC, OGG or AAC).
+            audio_format: AudioFormat the samples are converted to.
+
+        Raises:
+            RuntimeError: If ffmpeg is not installed.
+        """
+        ffmpeg = shutil.which(constants.ffmpeg_command)
+        if not ffmpeg:
+            raise RuntimeError(f"{constants.ffmpeg_command} is required to stream non-WAV files")
+        self.audio_format = audio_format
+        sample_format = pacat_sample_formats[audio_format.sample_width]
+        self.process = subprocess.Popen(
+            [ffmpeg, "-nostdin", "-loglevel", "error", "-i", file_path, "-f", sample_format,
+             "-acodec", f"pcm_{sample_format}",
+             "-ac", str(self.audio_format.channels), "-ar", str(self.audio_format.sample_rate), "-"],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+    def iter_chunks(self, chunk_size):
+        """Yield decoded samples in chunks of at most chunk_size bytes as the decoder produces them.
+
+        Args:
+            chunk_size: Maximum number of bytes per chunk.
+        """
+        while True:
+            chunk = self.process.stdout.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def close(self):
+        if self.process.poll() is None:
+            self.process.terminate()
+            self.process.wait()
+        self.process.stdout.close()
+
+
+def open_audio_source(file_path, audio_format=None):
+    """Return a chunked sample source for an audio file: WAV files are read directly, anything else is decoded.
+
+    Args:
+        file_path: Path of the audio file.
+        audio_format: AudioFormat the samples must have, e.g. to continue a running stream; WAV files
+            in another format are then decoded as well.
+    """
+    if file_path.lower().endswith(".wav"):
+        try:
+            wav_source = WavFileSource(file_path)
+        except ValueError:
+            pass
+        else:
+            if audio_format is None or wav_source.audio_format == audio_format:
+                return wav_source
+            wav_source.close()
+    return DecodedAudioSource(file_path, audio_format or decoded_audio_format)
+
+
+def get_a2dp_sink_name(device_address):
+    """Return the name of the PulseAudio sink BlueZ creates for an A2DP device.
+
+    Args:
+        device_address: Bluetooth address of the remote device.
+    """
+    return constants.a2dp_sink_name_format.format(address=device_address.replace(":", "_"))
+
+
+class A2dpStreamer:
+    """Streams a playlist of audio files to the PulseAudio sink of an A2DP device on background threads.
+
+    A reader thread fills a bounded queue of chunks from one audio source after the other and a
+    writer thread drains it into a single pacat process, so consecutive files play without a gap.
+    Files are converted to the format of the first one when needed. The writer counts an underrun
+    each time it finds the queue empty before the playlist is exhausted.
+
+    The reader runs up to buffer_chunks ahead of the writer, so current_index is the file being
+    read while playing_index is the file of the last chunk written to pacat.
+    """
+
+    def __init__(self, log, device_address, file_paths, loop=False, start_index=0,
+                 chunk_ms=constants.a2dp_stream_chunk_ms, buffer_chunks=constants.a2dp_stream_buffer_chunks):
+        """Initialize the streamer.
+
+        Args:
+            log: Logger instance used for logging.
+            device_address: Bluetooth address of the A2DP sink device.
+            file_paths: Paths of the audio files to stream, in order.
+            loop: If True, start over with the first file after the last one until stopped.
+            start_index: Index of the file in file_paths to start with.
+            chunk_ms: Duration of audio per chunk in milliseconds.
+            buffer_chunks: Number of chunks the buffer between reader and writer holds.
+        """
+        self.log = log
+        self.device_address = device_address
+        self.file_paths = list(file_paths)
+        self.loop = loop
+        self.current_index = start_index
+        self.playing_index = start_index
+        self.file_path = self.file_paths[start_index]
+        self.chunk_ms = chunk_ms
+        self.chunks = queue.Queue(maxsize=buffer_chunks)
+        self.stop_event = threading.Event()
+        self.source_done = threading.Event()
+        self.lock = threading.Lock()
+        self.source = None
+        self.player = None
+        self.reader_thread = None
+        self.writer_thread = None
+        self.running = False
+        self.error = None
+        self.bytes_written = 0
+        self.underruns = 0
+        self.first_write_at = None
+        self.last_write_at = None
+
+    def start(self):
+        """Open the audio source, start pacat and the reader and writer threads.
+
+        Raises:
+            ValueError, RuntimeError or OSError: If the file cannot be opened or decoded, or pacat cannot be started.
+        """
+        self.source = open_audio_source(self.file_path)
+        audio_format = self.audio_format = self.source.audio_format
+        frame_size = audio_format.channels * audio_format.sample_width
+        bytes_per_second = audio_format.sample_rate * frame_size
+        self.chunk_size = max(frame_size, bytes_per_second * self.chunk_ms // 1000 // frame_size * frame_size)
+        try:
+            self.player = subprocess.Popen(self.get_player_command(audio_format), stdin=subprocess.PIPE)
+        except OSError:
+            self.source.close()
+            raise
+        self.log.info("Streaming %s to %s (%d Hz, %d channels, %d-bit)", self.file_path,
+                      get_a2dp_sink_name(self.device_address), audio_format.sample_rate, audio_format.channels,
+                      audio_format.sample_width * 8)
+        self.running = True
+        self.reader_thread = threading.Thread(target=self.read_chunks, daemon=True)
+        self.writer_thread = threading.Thread(target=self.write_chunks, daemon=True)
+        self.reader_thread.start()
+        self.writer_thread.start()
+
+    def get_player_command(self, audio_format):
+        """Return the pacat command line playing raw samples of a format on the device's sink.
+
+        Args:
+            audio_format: AudioFormat of the samples written to pacat.
+        """
+        return [constants.pacat_command, "--playback", "--raw", f"--device={get_a2dp_sink_name(self.device_address)}",
+                f"--format={pacat_sample_formats[audio_format.sample_width]}", f"--rate={audio_format.sample_rate}",
+                f"--channels={audio_format.channels}"]
+
+    def iter_playlist_chunks(self):
+        """Yield (file index, chunk) for every playlist file in turn, opening each source when the previous one ends."""
+        while True:
+            for chunk in self.source.iter_chunks(self.chunk_size):
+                yield self.current_index, chunk
+            self.source.close()
+            next_index = self.current_index + 1
+            if next_index == len(self.file_paths):
+                if not self.loop:
+                    return
+                next_index = 0
+            self.current_index = next_index
+            self.file_path = self.file_paths[next_index]
+            self.log.info("A2DP stream to %s continues with %s", self.device_address, self.file_path)
+            self.source = open_audio_source(self.file_path, self.audio_format)
+
+    def read_chunks(self):
+        """Reader thread: move chunks from the audio sources into the buffer."""
+        try:
+            for file_index, chunk in self.iter_playlist_chunks():
+                while not self.stop_event.is_set():
+                    try:
+                        self.chunks.put((file_index, chunk), timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                if self.stop_event.is_set():
+                    return
+        except Exception as error:
+            self.error = f"Failed to read {self.file_path}: {error}"
+            self.log.error(self.error)
+        finally:
+            self.source_done.set()
+
+    def write_chunks(self):
+        """Writer thread: drain the buffer into pacat and let it play out once the source is exhausted."""
+        starving = True
+        try:
+            while not self.stop_event.is_set():
+                try:
+                    file_index, chunk = self.chunks.get(timeout=0.1)
+                except queue.Empty:
+                    if self.source_done.is_set():
+                        break
+                    if not starving:
+                        starving = True
+                        with self.lock:
+                            self.underruns += 1
+                    continue
+                starving = False
+                self.player.stdin.write(chunk)
+                with self.lock:
+                    self.playing_index = file_index
+                    self.bytes_written += len(chunk)
+                    self.last_write_at = time.monotonic()
+                    if self.first_write_at is None:
+                        self.first_write_at = self.last_write_at
+            self.player.stdin.close()
+            self.player.wait()
+            if self.player.returncode and not self.stop_event.is_set():
+                self.error = f"pacat exited with status {self.player.returncode}"
+                self.log.error(self.error)
+        except OSError as error:
+            if not self.stop_event.is_set():
+                self.error = f"Writing to {get_a2dp_sink_name(self.device_address)} failed: {error}"
+                self.log.error(self.error)
+        finally:
+            self.stop_event.set()
+            self.reader_thread.join()
+            self.source.close()
+            self.running = False
+            self.log.info("A2DP stream to %s ended at %s", self.device_address, self.get_playing_file())
+
+    def stop(self):
+        """Stop streaming and wait for both threads to finish."""
+        if not self.running:
+            return
+        self.stop_event.set()
+        if self.player.poll() is None:
+            self.player.terminate()
+        self.writer_thread.join()
+
+    def is_running(self):
+        return self.running
+
+    def get_playing_file(self):
+        """Return the path of the file whose samples were last written to pacat."""
+        with self.lock:
+            return self.file_paths[self.playing_index]
+
+    def get_metrics(self):
+        """Return a dict with the buffer fill level (0..1), buffered chunks, underruns, bytes written and bitrate in kbit/s."""
+        with self.lock:
+            elapsed = (self.last_write_at - self.first_write_at) if self.first_write_at is not None else 0.0
+            bitrate_kbps = self.bytes_written * 8 / elapsed / 1000 if elapsed > 0 else 0.0
+            buffered_chunks = self.chunks.qsize()
+            return {
+                "buffer_fill": buffered_chunks / self.chunks.maxsize,
+                "buffered_chunks": buffered_chunks,
+                "underruns": self.underruns,
+                "bytes_written": self.bytes_written,
+                "bitrate_kbps": bitrate_kbps,
+            }
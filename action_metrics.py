@@ -0,0 +1,158 @@
+import bisect
+import csv
+import math
+import threading
+from collections import deque
+
+from libraries.bluetooth import constants
+
+
+def percentile(sorted_values, fraction):
+    """Return a percentile of sorted values using linear interpolation.
+
+    Args:
+        sorted_values: Values sorted in ascending order.
+        fraction: Percentile as a fraction between 0 and 1.
+    """
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * fraction
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    if lower == upper:
+        return sorted_values[lower]
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def summarize(values):
+    """Return the mean, p50, p95, p99, min and max of values, or None for each if there are none."""
+    values = sorted(values)
+    return {
+        "mean": sum(values) / len(values) if values else None,
+        "p50": percentile(values, 0.5),
+        "p95": percentile(values, 0.95),
+        "p99": percentile(values, 0.99),
+        "min": values[0] if values else None,
+        "max": values[-1] if values else None,
+    }
+
+
+class LatencyHistogram:
+    """Latency distribution of one operation phase.
+
+    Cumulative bucket counts are kept for every sample (for Prometheus export); percentiles are
+    computed from a bounded window of the most recent samples.
+    """
+
+    def __init__(self, bucket_bounds=constants.latency_bucket_bounds_ms, max_samples=constants.latency_max_samples):
+        """Initialize an empty histogram.
+
+        Args:
+            bucket_bounds: Ascending upper bounds of the buckets in milliseconds.
+            max_samples: Number of recent samples kept for percentiles.
+        """
+        self.bucket_bounds = list(bucket_bounds)
+        self.bucket_counts = [0] * (len(self.bucket_bounds) + 1)
+        self.samples = deque(maxlen=max_samples)
+        self.count = 0
+        self.failures = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, duration_ms, success=True):
+        """Add one sample.
+
+        Args:
+            duration_ms: Duration in milliseconds.
+            success: False if the operation failed.
+        """
+        self.bucket_counts[bisect.bisect_left(self.bucket_bounds, duration_ms)] += 1
+        self.samples.append(duration_ms)
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        if not success:
+            self.failures += 1
+
+    def percentiles(self, fractions=(0.5, 0.95, 0.99)):
+        """Return the requested percentiles of the recent samples in milliseconds.
+
+        Args:
+            fractions: Percentiles as fractions between 0 and 1.
+        """
+        sorted_samples = sorted(self.samples)
+        return [percentile(sorted_samples, fraction) for fraction in fractions]
+
+
+class LatencyRecorder:
+    """Thread-safe collection of latency histograms keyed by (operation, phase)."""
+
+    def __init__(self):
+        """Initialize an empty recorder."""
+        self.lock = threading.Lock()
+        self.histograms = {}
+
+    def record(self, operation, phase, seconds, success=True):
+        """Record the duration of one phase of an operation.
+
+        Args:
+            operation: Name of the operation (e.g. 'pair' or 'agent_confirm').
+            phase: Name of the phase (e.g. 'total', 'queue', 'execute', 'user_response').
+            seconds: Duration in seconds, measured with time.monotonic().
+            success: False if the operation failed.
+        """
+        with self.lock:
+            histogram = self.histograms.get((operation, phase))
+            if histogram is None:
+                histogram = self.histograms[(operation, phase)] = LatencyHistogram()
+            histogram.add(seconds * 1000, success)
+
+    def snapshot(self):
+        """Return one summary row per (operation, phase), sorted by operation and phase.
+
+        Returns:
+            List of dicts with operation, phase, count, failures, mean_ms, p50_ms, p95_ms, p99_ms and max_ms.
+        """
+        with self.lock:
+            rows = []
+            for (operation, phase), histogram in sorted(self.histograms.items()):
+                p50, p95, p99 = histogram.percentiles()
+                rows.append({"operation": operation, "phase": phase, "count": histogram.count,
+                             "failures": histogram.failures, "mean_ms": histogram.total_ms / histogram.count,
+                             "p50_ms": p50, "p95_ms": p95, "p99_ms": p99, "max_ms": histogram.max_ms})
+            return rows
+
+    def export_csv(self, file_path):
+        """Write the summary rows to a CSV file.
+
+        Args:
+            file_path: Destination path.
+        """
+        rows = self.snapshot()
+        with open(file_path, "w", newline="") as csv_file:
+            writer = csv.DictWriter(csv_file, fieldnames=["operation", "phase", "count", "failures", "mean_ms",
+                                                          "p50_ms", "p95_ms", "p99_ms", "max_ms"])
+            writer.writeheader()
+            writer.writerows(rows)
+
+    def export_prometheus(self, metric_name="bluetooth_operation_duration_seconds"):
+        """Return the histograms in the Prometheus text exposition format.
+
+        Args:
+            metric_name: Name of the exported histogram metric.
+        """
+        lines = [f"# HELP {metric_name} Duration of Bluetooth operations by phase.", f"# TYPE {metric_name} histogram"]
+        failure_lines = [f"# HELP {metric_name}_failures_total Failed Bluetooth operations by phase.",
+                         f"# TYPE {metric_name}_failures_total counter"]
+        with self.lock:
+            for (operation, phase), histogram in sorted(self.histograms.items()):
+                labels = f'operation="{operation}",phase="{phase}"'
+                cumulative = 0
+                for bound, bucket_count in zip(histogram.bucket_bounds, histogram.bucket_counts):
+                    cumulative += bucket_count
+                    lines.append(f'{metric_name}_bucket{{{labels},le="{bound / 1000:g}"}} {cumulative}')
+                lines.append(f'{metric_name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                lines.append(f"{metric_name}_sum{{{labels}}} {histogram.total_ms / 1000:.6f}")
+                lines.append(f"{metric_name}_count{{{labels}}} {histogram.count}")
+                failure_lines.append(f"{metric_name}_failures_total{{{labels}}} {histogram.failures}")
+        return "\n".join(lines + failure_lines) + "\n"
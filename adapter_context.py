@@ -0,0 +1,60 @@
+import dbus
+
+from device_action_executor import DeviceActionExecutor
+from device_state_cache import DeviceStateCache
+from libraries.bluetooth import constants
+from libraries.bluetooth.bluez import BluetoothDeviceManager
+
+
+def list_adapter_interfaces(bus=None):
+    """Return the interface names of all adapters BlueZ currently exports, sorted.
+
+    Args:
+        bus: D-Bus connection to BlueZ; defaults to the system bus.
+    """
+    bus = bus or dbus.SystemBus()
+    object_manager = dbus.Interface(bus.get_object(constants.bluez_service, "/"), constants.object_manager_interface)
+    return sorted(str(path).rsplit("/", 1)[-1] for path, interfaces in object_manager.GetManagedObjects().items()
+                  if constants.adapter_interface in interfaces)
+
+
+def get_adapter_interface(device_path):
+    """Return the adapter interface of a BlueZ device object path, e.g. 'hci1'.
+
+    Args:
+        device_path: D-Bus object path of the device.
+    """
+    parts = device_path.split("/")
+    return parts[3] if len(parts) > 4 else None
+
+
+class AdapterContext:
+    """Everything driving one controller: its device manager, device state cache and action executor.
+
+    Each adapter has its own executor thread pool, so actions on different controllers never
+    wait for each other.
+    """
+
+    def __init__(self, interface, log, latency_recorder=None):
+        """Create the per-adapter objects.
+
+        Args:
+            interface: Bluetooth adapter interface (e.g., hci0).
+            log: Logger instance used for logging.
+            latency_recorder: Optional LatencyRecorder shared by all adapters.
+        """
+        self.interface = interface
+        self.log = log
+        self.bluetooth_device_manager = BluetoothDeviceManager(log=log, interface=interface)
+        self.device_state_cache = DeviceStateCache(log, interface)
+        self.device_action_executor = DeviceActionExecutor(self.bluetooth_device_manager, log,
+                                                           latency_recorder=latency_recorder)
+
+    def start(self):
+        """Start tracking the devices of the adapter."""
+        self.device_state_cache.start()
+
+    def shutdown(self):
+        """Stop tracking devices and wait for running actions."""
+        self.device_state_cache.stop()
+        self.device_action_executor.shutdown()
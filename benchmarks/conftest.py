@@ -0,0 +1,167 @@
+"""Fixtures of the host UI benchmark suite.
+
+Run from the repository root with pytest-benchmark installed::
+
+    QT_QPA_PLATFORM=offscreen python -m pytest benchmarks --benchmark-autosave
+    python -m pytest benchmarks --device-counts 100,5000 --log-rates 1,10 --scenario-report report.json
+
+Every scenario reports wall time through pytest-benchmark (so --benchmark-compare-fail catches
+regressions) plus the longest event loop stall, the summed stall time and the peak RSS, which
+are stored in the benchmark's extra_info and summarized at the end of the run.
+"""
+import json
+import logging
+import os
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from PyQt6.QtWidgets import QApplication
+
+from benchmarks.fake_bluez import FakeBluetoothDeviceManager
+from benchmarks.fake_bluez import FakeDeviceStateCache
+from benchmarks.fake_bluez import FakeSignalBus
+from benchmarks.fake_bluez import make_log_line
+from benchmarks.measure import EventLoopStallMonitor
+from benchmarks.measure import process_events_for
+from benchmarks.measure import read_peak_rss_kb
+from benchmarks.measure import reset_peak_rss
+
+log_sources = ["bluetoothd", "pulseaudio", "hcidump", "obexd", "ofonod"]
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("host_ui benchmarks")
+    group.addoption("--device-counts", default="10,100,1000,5000",
+                    help="Comma separated numbers of simulated devices")
+    group.addoption("--log-rates", default="0.5,2,8", help="Comma separated synthetic log rates in MB/s")
+    group.addoption("--log-duration", type=float, default=3.0, help="Seconds each log stream scenario writes")
+    group.addoption("--scenario-report", help="JSON file receiving wall time, stall and peak RSS per scenario")
+
+
+def pytest_configure(config):
+    config.scenario_results = []
+
+
+def pytest_generate_tests(metafunc):
+    if "device_count" in metafunc.fixturenames:
+        device_counts = [int(count) for count in metafunc.config.getoption("device_counts").split(",")]
+        metafunc.parametrize("device_count", device_counts)
+    if "log_rate_mb_s" in metafunc.fixturenames:
+        log_rates = [float(rate) for rate in metafunc.config.getoption("log_rates").split(",")]
+        metafunc.parametrize("log_rate_mb_s", log_rates)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    results = config.scenario_results
+    if not results:
+        return
+    terminalreporter.section("host_ui scenarios")
+    terminalreporter.write_line(f"{'scenario':<64} {'mean ms':>10} {'max ms':>10} {'max stall ms':>13} "
+                                f"{'stall ms':>10} {'peak RSS MB':>12}")
+    for result in results:
+        terminalreporter.write_line(f"{result['scenario']:<64} {result['mean_ms']:>10.2f} {result['max_ms']:>10.2f} "
+                                    f"{result['max_stall_ms']:>13.1f} {result['total_stall_ms']:>10.1f} "
+                                    f"{result['peak_rss_kb'] / 1024:>12.1f}")
+    report_path = config.getoption("scenario_report")
+    if report_path:
+        with open(report_path, "w") as report_file:
+            json.dump(results, report_file, indent=2)
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def log_dir(tmp_path):
+    """Directory holding one seeded log file per source."""
+    for source in log_sources:
+        with open(tmp_path / f"{source}.log", "w") as log_file:
+            log_file.write("".join(make_log_line(source, index) for index in range(2000)))
+    return tmp_path
+
+
+@pytest.fixture
+def make_host_app(qapp, log_dir, monkeypatch):
+    """Factory building a TestApplication on top of a FakeBluetoothDeviceManager."""
+    import adapter_context
+    import controller_details
+    import host_ui
+
+    created_apps = []
+
+    def factory(device_count, action_delay=0.0):
+        bluetooth_device_manager = FakeBluetoothDeviceManager(interface="hci0", device_count=device_count,
+                                                              action_delay=action_delay)
+        monkeypatch.setattr(adapter_context, "BluetoothDeviceManager", lambda log, interface: bluetooth_device_manager)
+        monkeypatch.setattr(adapter_context, "DeviceStateCache",
+                            lambda log, interface: FakeDeviceStateCache(log, interface, bluetooth_device_manager))
+        monkeypatch.setattr(controller_details, "get_controller_interface_details",
+                            lambda *args, **kwargs: {"Name": "bench", "BD_ADDR": "00:00:00:00:00:01"})
+        monkeypatch.setattr(host_ui, "ControllerDetailsCache",
+                            lambda log: controller_details.ControllerDetailsCache(log, bus=FakeSignalBus()))
+        log = logging.LoggerAdapter(logging.getLogger("benchmarks"), {})
+        log.log_path = str(log_dir)
+        app = host_ui.TestApplication(interface="hci0", back_callback=lambda: None, log=log,
+                                      **{f"{source}_log_file_path": str(log_dir / f"{source}.log")
+                                         for source in log_sources if source != "hcidump"},
+                                      hcidump_log_name=str(log_dir / "hcidump.log"))
+        app.resize(1600, 900)
+        app.show()
+        process_events_for(0.05)
+        created_apps.append(app)
+        return app
+
+    yield factory
+    for app in created_apps:
+        app.shutdown()
+        app.close()
+        app.deleteLater()
+    process_events_for(0.05)
+
+
+@pytest.fixture
+def run_scenario(request, qapp):
+    """Benchmark an operation while probing the event loop and the peak RSS.
+
+    The returned callable takes (benchmark, operation, setup=None, rounds=5, settle=0.05). Pending
+    events are processed after each call, so deferred work such as layout and repaint is timed too.
+    """
+
+    def run(benchmark, operation, setup=None, rounds=5, settle=0.05):
+        def prepare():
+            if setup:
+                setup()
+            process_events_for(settle)
+
+        def target():
+            result = operation()
+            QApplication.processEvents()
+            return result
+
+        monitor = EventLoopStallMonitor()
+        reset_peak_rss()
+        monitor.start()
+        try:
+            result = benchmark.pedantic(target, setup=prepare, rounds=rounds, iterations=1)
+            process_events_for(settle)
+        finally:
+            monitor.stop()
+        benchmark.extra_info.update({"max_stall_ms": round(monitor.max_gap_ms, 3),
+                                     "total_stall_ms": round(monitor.total_stall_ms, 3),
+                                     "stall_count": monitor.stall_count,
+                                     "peak_rss_kb": read_peak_rss_kb()})
+        stats = benchmark.stats.stats if benchmark.stats else None
+        request.config.scenario_results.append({
+            "scenario": request.node.name,
+            "mean_ms": stats.mean * 1000 if stats else 0.0,
+            "max_ms": stats.max * 1000 if stats else 0.0,
+            **benchmark.extra_info,
+        })
+        return result
+
+    return run
@@ -0,0 +1,225 @@
+"""In-process stand-ins for BlueZ used by the benchmark suite.
+
+FakeBluetoothDeviceManager answers every BluetoothDeviceManager call used by host_ui from a
+generated device table, and FakeDeviceStateCache loads that table without a D-Bus connection.
+"""
+import random
+import threading
+import time
+from datetime import datetime
+
+from libraries.bluetooth import constants
+from device_state_cache import DeviceStateCache
+
+
+def make_device_address(index):
+    """Return a unique, stable Bluetooth address for a device index.
+
+    Args:
+        index: Index of the generated device.
+    """
+    return "00:1A:7D:" + ":".join(f"{(index >> shift) & 0xFF:02X}" for shift in (16, 8, 0))
+
+
+def make_device_properties(index, paired_ratio=0.1, connected_ratio=0.02):
+    """Return Device1 properties for a generated device.
+
+    Args:
+        index: Index of the generated device.
+        paired_ratio: Fraction of devices reported as paired.
+        connected_ratio: Fraction of devices reported as connected.
+    """
+    paired_every = max(1, round(1 / paired_ratio)) if paired_ratio else 0
+    connected_every = max(1, round(1 / connected_ratio)) if connected_ratio else 0
+    return {
+        "Address": make_device_address(index),
+        "Name": f"Device-{index:05d}",
+        "Alias": f"Device-{index:05d}",
+        "RSSI": -40 - index % 50,
+        "Paired": bool(paired_every) and index % paired_every == 0,
+        "Connected": bool(connected_every) and index % connected_every == 0,
+        "Trusted": False,
+        "UUIDs": ["0000110a-0000-1000-8000-00805f9b34fb", "00001105-0000-1000-8000-00805f9b34fb"],
+    }
+
+
+class FakeBluetoothDeviceManager:
+    """BluetoothDeviceManager replacement backed by a generated device table."""
+
+    def __init__(self, log=None, interface="hci0", device_count=100, action_delay=0.0):
+        """Initialize the manager.
+
+        Args:
+            log: Logger instance used for logging.
+            interface: Adapter interface the devices belong to.
+            device_count: Number of generated devices.
+            action_delay: Seconds each device action sleeps, to emulate radio latency.
+        """
+        self.log = log
+        self.interface = interface or "hci0"
+        self.action_delay = action_delay
+        self.devices = {}
+        for index in range(device_count):
+            properties = make_device_properties(index)
+            self.devices[properties["Address"]] = properties
+
+    def device_path(self, device_address):
+        """Return the BlueZ object path of a device."""
+        return f"{constants.bluez_path}/{self.interface}/dev_{device_address.replace(':', '_')}"
+
+    def set_property(self, device_address, name, value):
+        """Set a device property after the configured action delay."""
+        if self.action_delay:
+            time.sleep(self.action_delay)
+        self.devices[device_address][name] = value
+        return True
+
+    def pair(self, device_address):
+        return self.set_property(device_address, "Paired", True)
+
+    def connect(self, device_address):
+        return self.set_property(device_address, "Connected", True)
+
+    def disconnect(self, device_address):
+        return self.set_property(device_address, "Connected", False)
+
+    def unpair_device(self, device_address):
+        return self.set_property(device_address, "Paired", False)
+
+    def is_device_paired(self, device_address):
+        return self.devices.get(device_address, {}).get("Paired", False)
+
+    def is_device_connected(self, device_address):
+        return self.devices.get(device_address, {}).get("Connected", False)
+
+    def get_paired_devices(self):
+        return {address: device["Alias"] for address, device in self.devices.items() if device["Paired"]}
+
+    def get_a2dp_role_for_device(self, device_address):
+        return "sink"
+
+    def start_discovery(self):
+        pass
+
+    def stop_discovery(self):
+        pass
+
+    def set_discoverable_mode(self, enable):
+        pass
+
+
+class FakeSignalMatch:
+    """Signal subscription handle returned by FakeSignalBus."""
+
+    def remove(self):
+        pass
+
+
+class FakeSignalBus:
+    """Bus stand-in for components that only subscribe to signals."""
+
+    def add_signal_receiver(self, handler, **match_rules):
+        return FakeSignalMatch()
+
+
+class FakeDeviceStateCache(DeviceStateCache):
+    """DeviceStateCache fed from a FakeBluetoothDeviceManager instead of D-Bus."""
+
+    def __init__(self, log, interface, bluetooth_device_manager):
+        """Initialize the cache.
+
+        Args:
+            log: Logger instance used for logging.
+            interface: Adapter interface whose devices are tracked.
+            bluetooth_device_manager: FakeBluetoothDeviceManager providing the devices.
+        """
+        super().__init__(log, interface, bus=FakeSignalBus())
+        self.bluetooth_device_manager = bluetooth_device_manager
+
+    def start(self):
+        self.reload()
+
+    def stop(self):
+        pass
+
+    def reload(self):
+        self.devices = {}
+        self.device_paths = {}
+        for device_address, properties in self.bluetooth_device_manager.devices.items():
+            self.store_device(self.bluetooth_device_manager.device_path(device_address), dict(properties))
+
+    def refresh_device(self, device_address):
+        properties = self.bluetooth_device_manager.devices.get(device_address)
+        if properties:
+            self.store_device(self.bluetooth_device_manager.device_path(device_address), dict(properties))
+
+    def emit_rssi_updates(self):
+        """Report a new RSSI for every device, as BlueZ does during discovery."""
+        for device_address, device_path in list(self.device_paths.items()):
+            self.handle_properties_changed(constants.device_interface, {"RSSI": -30 - random.randrange(60)}, [],
+                                           path=device_path)
+
+
+def make_log_line(source, index):
+    """Return one synthetic log line in the format of a log source.
+
+    Args:
+        source: Name of the log source (e.g. 'bluetoothd' or 'hcidump').
+        index: Sequence number of the line.
+    """
+    timestamp = datetime.now().isoformat()
+    device_address = make_device_address(index % 1000)
+    if source == "hcidump":
+        return (f"{timestamp} > HCI Event: Connect Complete (0x03) plen 11\n"
+                f"    status 0x00 handle {index % 3840} bdaddr {device_address} type ACL encrypt 0x00\n")
+    level = "ERROR" if index % 97 == 0 else "INFO"
+    return (f"{timestamp} {source}[1234]: {level} src/device.c:device_connect() "
+            f"{device_address} sequence {index}\n")
+
+
+class SyntheticLogWriter:
+    """Appends synthetic log lines to a file at a fixed byte rate on a background thread."""
+
+    def __init__(self, file_path, source, rate_mb_s, duration, tick=0.01):
+        """Initialize the writer.
+
+        Args:
+            file_path: Log file receiving the lines.
+            source: Name of the log source, selects the line format.
+            rate_mb_s: Write rate in megabytes per second.
+            duration: Seconds to keep writing.
+            tick: Seconds between two writes.
+        """
+        self.file_path = file_path
+        self.source = source
+        self.bytes_per_tick = int(rate_mb_s * 1024 * 1024 * tick)
+        self.duration = duration
+        self.tick = tick
+        self.bytes_written = 0
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def join(self):
+        self.thread.join()
+
+    def run(self):
+        """Write one tick worth of lines at a time until the duration has elapsed."""
+        line_index = 0
+        started = time.monotonic()
+        next_tick = started
+        with open(self.file_path, "a") as log_file:
+            while time.monotonic() - started < self.duration:
+                chunk = []
+                chunk_size = 0
+                while chunk_size < self.bytes_per_tick:
+                    line = make_log_line(self.source, line_index)
+                    chunk.append(line)
+                    chunk_size += len(line)
+                    line_index += 1
+                log_file.write("".join(chunk))
+                log_file.flush()
+                self.bytes_written += chunk_size
+                next_tick += self.tick
+                time.sleep(max(0.0, next_tick - time.monotonic()))
@@ -0,0 +1,115 @@
+"""Event loop stall and memory measurements used by the benchmark suite."""
+import resource
+import time
+
+from PyQt6.QtCore import QElapsedTimer
+from PyQt6.QtCore import QEventLoop
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QApplication
+
+
+class EventLoopStallMonitor:
+    """Measures how long the Qt event loop is kept from running a short periodic timer.
+
+    Any gap between two timer ticks longer than the tick interval plus the threshold counts as a
+    stall; the monitor reports the longest gap and the summed excess of all stalls.
+    """
+
+    def __init__(self, interval_ms=5, threshold_ms=10):
+        """Initialize the monitor.
+
+        Args:
+            interval_ms: Period of the probe timer.
+            threshold_ms: Extra delay tolerated before a gap counts as a stall.
+        """
+        self.interval_ms = interval_ms
+        self.threshold_ms = threshold_ms
+        self.timer = QTimer()
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.tick)
+        self.elapsed_timer = QElapsedTimer()
+        self.last_tick_ns = 0
+        self.max_gap_ms = 0.0
+        self.total_stall_ms = 0.0
+        self.stall_count = 0
+
+    def start(self):
+        self.max_gap_ms = 0.0
+        self.total_stall_ms = 0.0
+        self.stall_count = 0
+        self.elapsed_timer.start()
+        self.last_tick_ns = 0
+        self.timer.start()
+
+    def tick(self):
+        now_ns = self.elapsed_timer.nsecsElapsed()
+        self.record_gap((now_ns - self.last_tick_ns) / 1e6)
+        self.last_tick_ns = now_ns
+
+    def record_gap(self, gap_ms):
+        self.max_gap_ms = max(self.max_gap_ms, gap_ms)
+        if gap_ms > self.interval_ms + self.threshold_ms:
+            self.total_stall_ms += gap_ms - self.interval_ms
+            self.stall_count += 1
+
+    def stop(self):
+        """Stop probing, counting the time since the last tick as a final gap."""
+        self.timer.stop()
+        self.record_gap((self.elapsed_timer.nsecsElapsed() - self.last_tick_ns) / 1e6)
+
+
+def process_events_for(seconds):
+    """Run the Qt event loop for a fixed time.
+
+    Args:
+        seconds: Time to keep the loop running.
+    """
+    event_loop = QEventLoop()
+    QTimer.singleShot(int(seconds * 1000), event_loop.quit)
+    event_loop.exec()
+
+
+def process_events_until(condition, timeout, poll_interval=0.01):
+    """Run the Qt event loop until a condition holds or the timeout expires.
+
+    Args:
+        condition: Callable returning True when done.
+        timeout: Maximum time to wait in seconds.
+        poll_interval: Seconds between two checks of the condition.
+
+    Returns:
+        True if the condition was met before the timeout.
+    """
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        process_events_for(poll_interval)
+    QApplication.processEvents()
+    return True
+
+
+def reset_peak_rss():
+    """Reset the kernel's peak RSS counter of this process where Linux allows it.
+
+    Returns:
+        True if the counter was reset, False if peak RSS is only available process-wide.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def read_peak_rss_kb():
+    """Return the peak resident set size of this process in kilobytes."""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
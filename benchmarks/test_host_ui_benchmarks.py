@@ -0,0 +1,77 @@
+import os
+
+import pytest
+
+from benchmarks.fake_bluez import SyntheticLogWriter
+from benchmarks.fake_bluez import make_device_address
+from benchmarks.fake_bluez import make_log_line
+from benchmarks.measure import process_events_until
+
+
+def test_startup(benchmark, make_host_app, run_scenario, device_count):
+    app = run_scenario(benchmark, lambda: make_host_app(device_count), rounds=3)
+    benchmark.extra_info["startup_phases_ms"] = {name: round(duration_ms, 3)
+                                                 for name, duration_ms in app.startup_trace.phases}
+    assert app.startup_trace.total_ms is not None
+
+
+def test_display_discovered_devices(benchmark, make_host_app, run_scenario, device_count):
+    app = make_host_app(device_count)
+    run_scenario(benchmark, app.display_discovered_devices, setup=app.clear_device_discovery_results)
+    assert app.discovered_devices_model.rowCount() == device_count
+
+
+def test_discovery_rssi_updates(benchmark, make_host_app, run_scenario, device_count):
+    app = make_host_app(device_count)
+    app.display_discovered_devices()
+    run_scenario(benchmark, app.device_state_cache.emit_rssi_updates)
+    assert app.discovered_devices_model.rowCount() == device_count
+
+
+def test_load_paired_devices(benchmark, make_host_app, run_scenario, device_count):
+    app = make_host_app(device_count)
+    run_scenario(benchmark, app.load_paired_devices, setup=app.profiles_list_widget.clear)
+    assert app.profiles_list_widget.count() == len(app.device_state_cache.get_paired_devices())
+
+
+def test_load_device_profile_tabs(benchmark, make_host_app, run_scenario, device_count):
+    app = make_host_app(device_count)
+    device_address = make_device_address(0)
+    assert app.device_state_cache.is_device_connected(device_address)
+    run_scenario(benchmark, lambda: app.load_device_profile_tabs(device_address))
+    assert app.device_tab_widget.count() == 2
+
+
+@pytest.mark.parametrize("source", ["bluetoothd", "hcidump"])
+def test_update_log_viewer(benchmark, make_host_app, run_scenario, source):
+    app = make_host_app(10)
+    app.dump_logs_text_browser.setCurrentWidget(app.log_tabs[source])
+    chunk = "".join(make_log_line(source, index) for index in range(600))
+    offsets = iter(range(0, 1 << 40, len(chunk)))
+    run_scenario(benchmark, lambda: app.update_log_viewer(source, next(offsets), chunk), rounds=50)
+
+
+def test_log_stream(benchmark, make_host_app, run_scenario, log_rate_mb_s, request):
+    """Stream synthetic bluetoothd and hcidump logs and time until the UI received all of it."""
+    app = make_host_app(100)
+    duration = request.config.getoption("log_duration")
+    received_bytes = {}
+    app.log_tailer.data_read.connect(
+        lambda name, offset, text: received_bytes.__setitem__(name, received_bytes.get(name, 0) + len(text)))
+    writers = []
+
+    def stream():
+        received_bytes.clear()
+        writers[:] = [SyntheticLogWriter(os.path.join(app.log_path, f"{source}.log"), source, log_rate_mb_s / 2,
+                                         duration) for source in ("bluetoothd", "hcidump")]
+        for writer in writers:
+            writer.start()
+        drained = process_events_until(
+            lambda: all(not writer.thread.is_alive() and received_bytes.get(writer.source, 0) >= writer.bytes_written
+                        for writer in writers), timeout=duration * 3 + 10)
+        for writer in writers:
+            writer.join()
+        benchmark.extra_info["bytes_streamed"] = sum(writer.bytes_written for writer in writers)
+        return drained
+
+    assert run_scenario(benchmark, stream, rounds=1)
@@ -0,0 +1,178 @@
+"""Smoke test of mock_bluez.py: starts it on a private dbus-daemon and calls each exported interface once.
+
+Needs dbus-python, PyGObject and dbus-daemon; it is skipped without them.
+"""
+import json
+import os
+import shutil
+import signal
+import time
+
+import pytest
+
+pytest.importorskip("gi.repository.GLib")
+dbus = pytest.importorskip("dbus")
+
+import dbus.bus
+import dbus.service
+from dbus.mainloop.glib import DBusGMainLoop
+from gi.repository import GLib
+
+import mock_bluez
+from libraries.bluetooth import constants
+
+scenario = {
+    "adapters": ["hci0"],
+    "devices": 20,
+    "paired_ratio": 0.1,
+    "discovery": {"batch": 5, "interval_ms": 20, "rssi_interval_ms": 50},
+    "obex": {"throughput_kbps": 8000},
+}
+
+
+def wait_until(condition, timeout=5.0):
+    """Run the GLib main loop until condition() is true."""
+    deadline = time.monotonic() + timeout
+    context = GLib.MainContext.default()
+    while not condition():
+        assert time.monotonic() < deadline, "timed out waiting for the mock"
+        context.iteration(False)
+        time.sleep(0.001)
+
+
+def call(method, *args, **kwargs):
+    """Call a D-Bus method asynchronously, so the mock can call back our agents meanwhile, and return its reply."""
+    outcome = {}
+    method(*args, reply_handler=lambda *values: outcome.setdefault("reply", values),
+           error_handler=lambda error: outcome.setdefault("error", error), **kwargs)
+    wait_until(lambda: outcome)
+    if "error" in outcome:
+        raise outcome["error"]
+    reply = outcome["reply"]
+    return reply[0] if len(reply) == 1 else reply
+
+
+class ConfirmingAgent(dbus.service.Object):
+    """org.bluez.Agent1 confirming every passkey."""
+
+    confirmations = 0
+
+    @dbus.service.method(constants.agent, in_signature="ou", out_signature="")
+    def RequestConfirmation(self, device, passkey):
+        self.confirmations += 1
+
+
+class AcceptingObexAgent(dbus.service.Object):
+    """org.bluez.obex.Agent1 accepting every push into a directory."""
+
+    def __init__(self, bus, path, directory):
+        super().__init__(bus, path)
+        self.directory = directory
+        self.accepted = []
+
+    @dbus.service.method(constants.obex_agent, in_signature="o", out_signature="s")
+    def AuthorizePush(self, transfer):
+        file_path = os.path.join(self.directory, f"received{len(self.accepted)}")
+        self.accepted.append((str(transfer), file_path))
+        return file_path
+
+
+@pytest.fixture
+def mock_bus(tmp_path):
+    """Bus connection to a running mock_bluez.py."""
+    if not shutil.which("dbus-daemon"):
+        pytest.skip("dbus-daemon is not installed")
+    scenario_file = tmp_path / "scenario.json"
+    scenario_file.write_text(json.dumps(scenario))
+    process, address = mock_bluez.spawn_mock_bluez(str(scenario_file))
+    bus = dbus.bus.BusConnection(address, mainloop=DBusGMainLoop())
+    yield bus
+    bus.close()
+    # SIGINT lets the mock stop its private dbus-daemon.
+    process.send_signal(signal.SIGINT)
+    process.wait(timeout=5)
+
+
+def get_interface(bus, service, path, interface):
+    return dbus.Interface(bus.get_object(service, path, introspect=False), interface)
+
+
+def test_mock_bluez_interfaces(mock_bus, tmp_path):
+    bus = mock_bus
+    adapter_path = f"{constants.bluez_path}/hci0"
+    object_manager = get_interface(bus, constants.bluez_service, "/", constants.object_manager_interface)
+    managed_objects = call(object_manager.GetManagedObjects)
+    assert constants.adapter_interface in managed_objects[adapter_path]
+    initial_devices = [path for path, interfaces in managed_objects.items() if constants.device_interface in interfaces]
+    assert initial_devices
+
+    # org.freedesktop.DBus.Properties and org.bluez.Adapter1
+    adapter_properties = get_interface(bus, constants.bluez_service, adapter_path, constants.properties_interface)
+    call(adapter_properties.Set, constants.adapter_interface, "Discoverable", dbus.Boolean(True))
+    assert call(adapter_properties.Get, constants.adapter_interface, "Discoverable")
+    adapter = get_interface(bus, constants.bluez_service, adapter_path, constants.adapter_interface)
+    call(adapter.StartDiscovery)
+    wait_until(lambda: len(call(object_manager.GetManagedObjects)) > len(managed_objects) + 5)
+    call(adapter.StopDiscovery)
+    managed_objects = call(object_manager.GetManagedObjects)
+    unpaired_devices = [path for path, interfaces in managed_objects.items()
+                        if constants.device_interface in interfaces
+                        and not interfaces[constants.device_interface]["Paired"]]
+
+    # org.bluez.Device1, MediaControl1 and MediaPlayer1
+    device_path = unpaired_devices[0]
+    device = get_interface(bus, constants.bluez_service, device_path, constants.device_interface)
+    device_properties = get_interface(bus, constants.bluez_service, device_path, constants.properties_interface)
+    call(device.Pair)
+    assert call(device_properties.Get, constants.device_interface, "Paired")
+    call(device.Connect)
+    player_path = call(device_properties.Get, constants.media_control_interface, "Player")
+    call(get_interface(bus, constants.bluez_service, device_path, constants.media_control_interface).Play)
+    player_properties = get_interface(bus, constants.bluez_service, player_path, constants.properties_interface)
+    wait_until(lambda: call(player_properties.Get, constants.media_player_interface, "Status") == "playing")
+    call(device.Disconnect)
+
+    # org.bluez.AgentManager1 and the Agent1 step of Pair
+    agent = ConfirmingAgent(bus, constants.agent_path)
+    agent_manager = get_interface(bus, constants.bluez_service, constants.bluez_path, constants.agent_interface)
+    call(agent_manager.RegisterAgent, constants.agent_path, "DisplayYesNo")
+    call(agent_manager.RequestDefaultAgent, constants.agent_path)
+    call(get_interface(bus, constants.bluez_service, unpaired_devices[1], constants.device_interface).Pair)
+    assert agent.confirmations == 1
+    call(agent_manager.UnregisterAgent, constants.agent_path)
+
+    # org.bluez.obex.Client1, ObjectPush1 and Transfer1
+    payload_path = tmp_path / "payload.bin"
+    payload_path.write_bytes(os.urandom(4096))
+    obex_client = get_interface(bus, constants.obex_service, constants.obex_path, constants.obex_client)
+    session_path = call(obex_client.CreateSession, "10:00:00:00:00:01", {"Target": "opp"})
+    object_push = get_interface(bus, constants.obex_service, session_path, constants.obex_object_push)
+    transfer_path, _ = call(object_push.SendFile, str(payload_path))
+    transfer_properties = get_interface(bus, constants.obex_service, transfer_path, constants.properties_interface)
+    wait_until(lambda: call(transfer_properties.Get, constants.obex_object_transfer, "Status") == "complete")
+    call(obex_client.RemoveSession, session_path)
+
+    # org.bluez.obex.AgentManager1 and an incoming push to an obex Agent1
+    obex_agent = AcceptingObexAgent(bus, constants.obex_agent_path, str(tmp_path))
+    obex_agent_manager = get_interface(bus, constants.obex_service, constants.obex_path,
+                                       constants.obex_agent_manager)
+    call(obex_agent_manager.RegisterAgent, constants.obex_agent_path)
+    control = get_interface(bus, constants.bluez_service, constants.mock_control_path,
+                            constants.mock_control_interface)
+    call(control.TriggerIncomingPushes, 1, 2048, 10)
+    wait_until(lambda: obex_agent.accepted)
+    pushed_transfer_path, received_path = obex_agent.accepted[0]
+    pushed_properties = get_interface(bus, constants.obex_service, pushed_transfer_path,
+                                      constants.properties_interface)
+    wait_until(lambda: call(pushed_properties.Get, constants.obex_object_transfer, "Status") == "complete")
+    assert os.path.getsize(received_path) == 2048
+    call(obex_agent_manager.UnregisterAgent, constants.obex_agent_path)
+
+    # org.bluez.mock.Control1
+    call(control.SetLatency, "Connect", 0.0, 0.0)
+    call(control.SetFailureRate, "Connect", 0.0)
+    assert call(control.AddDevices, "hci0", 5) >= 5
+    stats = call(control.GetStats)
+    assert stats["calls.Pair"] == 2
+    assert stats["calls.SendFile"] == 1
+    assert stats["calls.PushAccepted"] == 1
@@ -10,13 +10,73 @@ bluez_path = '/org/bluez'
 device_interface = "org.bluez.Device1"
 properties_interface = "org.freedesktop.DBus.Properties"
 pulseaudio_command = '/usr/local/bluez/pulseaudio-13.0_for_bluez-5.65/bin/pulseaudio -vvv'
+pacat_command = '/usr/local/bluez/pulseaudio-13.0_for_bluez-5.65/bin/pacat'
 media_control_interface = "org.bluez.MediaControl1"
+media_player_interface = "org.bluez.MediaPlayer1"
 obex_client = "org.bluez.obex.Client1"
 obex_path = "/org/bluez/obex"
 obex_service = "org.bluez.obex"
 obex_object_push = "org.bluez.obex.ObjectPush1"
 obex_object_transfer = "org.bluez.obex.Transfer1"
+obex_agent = "org.bluez.obex.Agent1"
+obex_agent_manager = "org.bluez.obex.AgentManager1"
+obex_agent_path = "/test/obex_agent"
+obex_session_interface = "org.bluez.obex.Session1"
 object_manager_interface = "org.freedesktop.DBus.ObjectManager"
+device_action_max_workers = 4
+pairing_result_timeout_ms = 60000
+log_viewer_max_lines = 5000
+log_viewer_initial_lines = 1000
+log_viewer_refresh_interval_ms = 250
+log_tailer_chunk_size = 65536
+log_tailer_max_chunks_per_poll = 16
+log_tailer_poll_interval_ms = 1000
+log_index_file_name = "log_index.db"
+log_index_schema_version = 2
+log_search_result_limit = 500
+timeline_page_lines = 500
+timeline_max_action_events = 10000
+timeline_untimed_lookahead_lines = 1000
+latency_bucket_bounds_ms = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 20000, 30000, 60000]
+latency_max_samples = 10000
+latency_stats_refresh_interval_ms = 1000
+controller_details_ttl_seconds = 30
+controller_details_refresh_delay_ms = 500
+mock_control_interface = "org.bluez.mock.Control1"
+mock_control_path = "/org/bluez/mock"
+mock_obex_transfer_linger_ms = 1000
+profile_panel_cache_size = 32
+startup_budget_ms = 2000
+ffmpeg_command = "ffmpeg"
+a2dp_sink_name_format = "bluez_sink.{address}.a2dp_sink"
+a2dp_stream_chunk_ms = 50
+a2dp_stream_buffer_chunks = 40
+a2dp_stream_mmap_threshold_bytes = 16 * 1024 * 1024
+a2dp_stream_metrics_interval_ms = 500
+a2dp_soak_poll_interval_ms = 1000
+a2dp_soak_restart_delay_ms = 2000
+a2dp_soak_reconnect_interval_ms = 10000
+opp_target = "opp"
+opp_max_parallel_transfers = 4
+opp_max_transfers_per_device = 1
+opp_max_retries = 3
+opp_retry_delay_ms = 5000
+opp_transfer_poll_interval_ms = 2000
+opp_unclaimed_transfer_updates = 256
+obex_session_idle_timeout_ms = 30000
+opp_spool_directory_name = "opp_spool"
+opp_spool_partial_directory = ".partial"
+opp_receive_hash_chunk_size = 1024 * 1024
+opp_benchmark_default_sizes = "1KB,64KB,1MB,10MB"
+opp_benchmark_default_repetitions = 10
+opp_benchmark_max_size_bytes = 100 * 1024 * 1024
+opp_benchmark_payload_directory_name = "opp_benchmark_payloads"
+opp_benchmark_report_version = 1
+media_control_default_script = "play,pause,next"
+media_control_default_repetitions = 100
+media_control_default_rate_hz = 2.0
+media_control_timeout_ms = 3000
+media_control_report_version = 1
 device_action_map = {
     "pair" : {
         "method" : "pair",
@@ -53,5 +113,3 @@ pairing_request_handlers = {
     "display_passkey": "handle_display_passkey_request",
     "cancel": "handle_cancel_request",
 }
-
-
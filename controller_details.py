@@ -0,0 +1,150 @@
+import time
+
+import dbus
+from dbus.mainloop.glib import DBusGMainLoop
+from PyQt6.QtCore import QObject
+from PyQt6.QtCore import QRunnable
+from PyQt6.QtCore import QThreadPool
+from PyQt6.QtCore import QTimer
+from PyQt6.QtCore import pyqtSignal
+
+from libraries.bluetooth import constants
+from Utils.utils import get_controller_interface_details
+
+DBusGMainLoop(set_as_default=True)
+
+# Adapter1 properties that can change what the controller details panel shows; Discovering and
+# similar toggles are ignored so a running inquiry does not trigger refetches.
+detail_properties = {"Address", "Name", "Alias", "Class", "Powered", "Discoverable", "Pairable", "Modalias"}
+
+
+class ControllerDetailsSignals(QObject):
+    """Signals used by a ControllerDetailsTask to report back to the GUI thread."""
+
+    fetched = pyqtSignal(str, object)
+    failed = pyqtSignal(str, str)
+
+
+class ControllerDetailsTask(QRunnable):
+    """Fetches the extended details of one controller on a worker thread."""
+
+    def __init__(self, log, interface, signals):
+        """Initialize the task.
+
+        Args:
+            log: Logger instance used for logging.
+            interface: Bluetooth adapter interface (e.g., hci0).
+            signals: ControllerDetailsSignals instance owned by the GUI thread.
+        """
+        super().__init__()
+        self.log = log
+        self.interface = interface
+        self.signals = signals
+
+    def run(self):
+        try:
+            details = get_controller_interface_details(self.log, interface=self.interface, detail_level='extended_info')
+        except Exception as error:
+            self.signals.failed.emit(self.interface, str(error))
+            return
+        self.signals.fetched.emit(self.interface, details or {})
+
+
+class ControllerDetailsCache(QObject):
+    """Controller details fetched in the background, cached per interface with a TTL.
+
+    Cached entries are refetched once they are older than the TTL or when BlueZ reports a change
+    of a relevant org.bluez.Adapter1 property; bursts of changes are coalesced.
+    """
+
+    details_updated = pyqtSignal(str, object)
+
+    def __init__(self, log, ttl=constants.controller_details_ttl_seconds, bus=None):
+        """Initialize the cache.
+
+        Args:
+            log: Logger instance used for logging.
+            ttl: Seconds a fetched entry stays valid.
+            bus: D-Bus connection to BlueZ; defaults to the system bus.
+        """
+        super().__init__()
+        self.log = log
+        self.ttl = ttl
+        self.bus = bus or dbus.SystemBus()
+        self.entries = {}
+        self.pending_fetches = set()
+        self.refresh_timers = {}
+        self.thread_pool = QThreadPool()
+        self.thread_pool.setMaxThreadCount(2)
+        self.signals = ControllerDetailsSignals()
+        self.signals.fetched.connect(self.handle_fetched)
+        self.signals.failed.connect(self.handle_failed)
+        self.signal_match = None
+
+    def start(self):
+        """Subscribe to Adapter1 property changes."""
+        self.signal_match = self.bus.add_signal_receiver(
+            self.handle_properties_changed, dbus_interface=constants.properties_interface,
+            signal_name="PropertiesChanged", arg0=constants.adapter_interface, bus_name=constants.bluez_service,
+            path_keyword="path")
+
+    def stop(self):
+        """Remove the signal subscription and wait for running fetches."""
+        if self.signal_match:
+            self.signal_match.remove()
+            self.signal_match = None
+        self.thread_pool.waitForDone()
+
+    def get_details(self, interface):
+        """Return the cached details of a controller, or None if they were never fetched.
+
+        Args:
+            interface: Bluetooth adapter interface (e.g., hci0).
+        """
+        entry = self.entries.get(interface)
+        return entry[0] if entry else None
+
+    def request(self, interface, force=False):
+        """Emit cached details if still valid and schedule a background fetch otherwise.
+
+        Args:
+            interface: Bluetooth adapter interface (e.g., hci0).
+            force: Fetch even if the cached entry has not expired.
+        """
+        entry = self.entries.get(interface)
+        if entry:
+            self.details_updated.emit(interface, entry[0])
+            if not force and time.monotonic() - entry[1] < self.ttl:
+                return
+        if interface in self.pending_fetches:
+            return
+        self.pending_fetches.add(interface)
+        self.thread_pool.start(ControllerDetailsTask(self.log, interface, self.signals))
+
+    def handle_fetched(self, interface, details):
+        self.pending_fetches.discard(interface)
+        self.entries[interface] = (details, time.monotonic())
+        self.details_updated.emit(interface, details)
+
+    def handle_failed(self, interface, error):
+        self.pending_fetches.discard(interface)
+        self.log.error("Failed to read controller details of %s: %s", interface, error)
+
+    def handle_properties_changed(self, interface, changed, invalidated, path=None):
+        """Schedules a refetch when a relevant Adapter1 property of a controller changes.
+
+        Args:
+            interface: Name of the interface whose properties changed.
+            changed: Mapping of changed property names to new values.
+            invalidated: Names of properties whose values were invalidated.
+            path: D-Bus object path of the adapter.
+        """
+        if not detail_properties.intersection(str(name) for name in list(changed.keys()) + list(invalidated)):
+            return
+        adapter_interface = str(path).rsplit("/", 1)[-1]
+        refresh_timer = self.refresh_timers.get(adapter_interface)
+        if refresh_timer is None:
+            refresh_timer = self.refresh_timers[adapter_interface] = QTimer(self)
+            refresh_timer.setSingleShot(True)
+            refresh_timer.timeout.connect(lambda: self.request(adapter_interface, force=True))
+        refresh_timer.start(constants.controller_details_refresh_delay_ms)
@@ -0,0 +1,36 @@
+from PyQt6.QtWidgets import QVBoxLayout
+from PyQt6.QtWidgets import QWidget
+
+
+class DeferredWidget(QWidget):
+    """Placeholder that builds its real content the first time it is shown.
+
+    Used for tabs that are not visible at startup, so their construction cost is paid when the
+    user opens them instead of during application start.
+    """
+
+    def __init__(self, build, parent=None):
+        """Initialize the placeholder.
+
+        Args:
+            build: Callable returning the content widget.
+            parent: Optional parent widget.
+        """
+        super().__init__(parent)
+        self.build = build
+        self.content = None
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(layout)
+
+    def ensure_built(self):
+        """Build the content if that has not happened yet and return it."""
+        if self.content is None:
+            self.content = self.build()
+            self.build = None
+            self.layout().addWidget(self.content)
+        return self.content
+
+    def showEvent(self, event):
+        self.ensure_built()
+        super().showEvent(event)
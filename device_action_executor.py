@@ -0,0 +1,147 @@
+import time
+
+from PyQt6.QtCore import QObject
+from PyQt6.QtCore import QRunnable
+from PyQt6.QtCore import QThreadPool
+from PyQt6.QtCore import pyqtSignal
+
+from libraries.bluetooth import constants
+
+
+class DeviceActionSignals(QObject):
+    """Signals used by a DeviceActionTask to report back to the GUI thread."""
+
+    finished = pyqtSignal(str, str, bool, float, float)
+    failed = pyqtSignal(str, str, str, float, float)
+
+
+class DeviceActionTask(QRunnable):
+    """Runs a single BluetoothDeviceManager method on a worker thread."""
+
+    def __init__(self, method, action, device_address, signals):
+        """Initialize the task.
+
+        Args:
+            method: Bound BluetoothDeviceManager method to call with the device address.
+            action: Key of the action in device_action_map (e.g. 'pair').
+            device_address: Bluetooth address of the remote device.
+            signals: DeviceActionSignals instance owned by the GUI thread.
+        """
+        super().__init__()
+        self.method = method
+        self.action = action
+        self.device_address = device_address
+        self.signals = signals
+
+    def run(self):
+        """Call the device manager method and emit the outcome with its monotonic start and end times."""
+        started_at = time.monotonic()
+        try:
+            result = self.method(self.device_address)
+        except Exception as error:
+            self.signals.failed.emit(self.action, self.device_address, str(error), started_at, time.monotonic())
+            return
+        self.signals.finished.emit(self.action, self.device_address, bool(result), started_at, time.monotonic())
+
+
+class DeviceActionExecutor(QObject):
+    """Executes device_action_map operations on a bounded thread pool.
+
+    Only one action may be in flight per device; different devices run in parallel.
+    All signals are delivered on the thread that owns the executor (the GUI thread).
+    """
+
+    action_started = pyqtSignal(str, str)
+    action_finished = pyqtSignal(str, str, bool)
+
+    def __init__(self, bluetooth_device_manager, log, max_workers=constants.device_action_max_workers,
+                 latency_recorder=None):
+        """Initialize the executor.
+
+        Args:
+            bluetooth_device_manager: BluetoothDeviceManager used to perform the actions.
+            log: Logger instance used for logging.
+            max_workers: Maximum number of actions running at the same time.
+            latency_recorder: Optional LatencyRecorder receiving queue, execute and total times.
+        """
+        super().__init__()
+        self.bluetooth_device_manager = bluetooth_device_manager
+        self.log = log
+        self.thread_pool = QThreadPool()
+        self.thread_pool.setMaxThreadCount(max_workers)
+        self.in_flight_actions = {}
+        self.submitted_at = {}
+        self.latency_recorder = latency_recorder
+        self.signals = DeviceActionSignals()
+        self.signals.finished.connect(self.handle_action_finished)
+        self.signals.failed.connect(self.handle_action_failed)
+
+    def submit(self, action, device_address):
+        """Queue an action for a device.
+
+        Args:
+            action: Key of the action in device_action_map.
+            device_address: Bluetooth address of the remote device.
+
+        Returns:
+            True if the action was queued, False if it is unknown or the device is busy.
+        """
+        device_action = constants.device_action_map.get(action)
+        if not device_action:
+            self.log.error("Unknown action: %s", action)
+            return False
+        if device_address in self.in_flight_actions:
+            self.log.warning("%s already in progress on %s", self.in_flight_actions[device_address], device_address)
+            return False
+        method = getattr(self.bluetooth_device_manager, device_action["method"])
+        self.in_flight_actions[device_address] = action
+        self.submitted_at[device_address] = time.monotonic()
+        self.log.info("Performing %s on %s", device_action["method"], device_address)
+        self.action_started.emit(action, device_address)
+        self.thread_pool.start(DeviceActionTask(method, action, device_address, self.signals))
+        return True
+
+    def get_action_in_progress(self, device_address):
+        """Return the action currently running for a device, or None if idle.
+
+        Args:
+            device_address: Bluetooth address of the remote device.
+        """
+        return self.in_flight_actions.get(device_address)
+
+    def handle_action_finished(self, action, device_address, result, started_at, ended_at):
+        """Clear the in-flight state, record the latency and forward the result.
+
+        Args:
+            action: Key of the action in device_action_map.
+            device_address: Bluetooth address of the remote device.
+            result: True if the device manager reported success.
+            started_at: Monotonic time at which the worker started the call.
+            ended_at: Monotonic time at which the call returned.
+        """
+        self.in_flight_actions.pop(device_address, None)
+        submitted_at = self.submitted_at.pop(device_address, started_at)
+        self.log.info("%s completed for %s in %.1f ms (Status: %s)", action, device_address,
+                      (ended_at - submitted_at) * 1000, "Success" if result else "Failure")
+        if self.latency_recorder:
+            self.latency_recorder.record(action, "queue", started_at - submitted_at, result)
+            self.latency_recorder.record(action, "execute", ended_at - started_at, result)
+            self.latency_recorder.record(action, "total", ended_at - submitted_at, result)
+        self.action_finished.emit(action, device_address, result)
+
+    def handle_action_failed(self, action, device_address, error, started_at, ended_at):
+        """Log an exception raised by the device manager and report the action as failed.
+
+        Args:
+            action: Key of the action in device_action_map.
+            device_address: Bluetooth address of the remote device.
+            error: Text of the raised exception.
+            started_at: Monotonic time at which the worker started the call.
+            ended_at: Monotonic time at which the call raised.
+        """
+        self.log.error("%s raised an error for %s: %s", action, device_address, error)
+        self.handle_action_finished(action, device_address, False, started_at, ended_at)
+
+    def shutdown(self):
+        """Wait for all running actions to complete."""
+        self.thread_pool.waitForDone()
@@ -0,0 +1,222 @@
+import dbus
+from dbus.mainloop.glib import DBusGMainLoop
+from PyQt6.QtCore import QObject
+from PyQt6.QtCore import pyqtSignal
+
+from libraries.bluetooth import constants
+
+DBusGMainLoop(set_as_default=True)
+
+
+def to_python(value):
+    """Convert a dbus-python value into the equivalent plain Python value.
+
+    Args:
+        value: Value received over D-Bus.
+    """
+    if isinstance(value, dbus.Boolean):
+        return bool(value)
+    if isinstance(value, (dbus.String, dbus.ObjectPath, dbus.Signature)):
+        return str(value)
+    if isinstance(value, (dbus.Byte, dbus.Int16, dbus.Int32, dbus.Int64, dbus.UInt16, dbus.UInt32, dbus.UInt64)):
+        return int(value)
+    if isinstance(value, dbus.Double):
+        return float(value)
+    if isinstance(value, dbus.Dictionary):
+        return {to_python(key): to_python(item) for key, item in value.items()}
+    if isinstance(value, (dbus.Array, dbus.Struct)):
+        return [to_python(item) for item in value]
+    return value
+
+
+class DeviceStateCache(QObject):
+    """In-process cache of org.bluez.Device1 properties keyed by device address.
+
+    The cache is populated once from ObjectManager.GetManagedObjects and then kept current
+    from the InterfacesAdded, InterfacesRemoved and PropertiesChanged signals, so UI code can
+    query connection and pairing state without a D-Bus round trip.
+    """
+
+    device_added = pyqtSignal(str)
+    device_changed = pyqtSignal(str, list)
+    device_removed = pyqtSignal(str)
+
+    def __init__(self, log, interface, bus=None):
+        """Initialize the cache.
+
+        Args:
+            log: Logger instance used for logging.
+            interface: Bluetooth adapter interface (e.g., hci0) whose devices are tracked.
+            bus: D-Bus connection to BlueZ; defaults to the system bus.
+        """
+        super().__init__()
+        self.log = log
+        self.interface = interface
+        self.bus = bus or dbus.SystemBus()
+        self.adapter_path = f"{constants.bluez_path}/{interface}"
+        self.devices = {}
+        self.device_paths = {}
+        self.signal_matches = []
+
+    def start(self):
+        """Subscribe to BlueZ signals and load the current device objects."""
+        self.signal_matches = [
+            self.bus.add_signal_receiver(self.handle_interfaces_added, dbus_interface=constants.object_manager_interface,
+                                         signal_name="InterfacesAdded", bus_name=constants.bluez_service),
+            self.bus.add_signal_receiver(self.handle_interfaces_removed, dbus_interface=constants.object_manager_interface,
+                                         signal_name="InterfacesRemoved", bus_name=constants.bluez_service),
+            self.bus.add_signal_receiver(self.handle_properties_changed, dbus_interface=constants.properties_interface,
+                                         signal_name="PropertiesChanged", arg0=constants.device_interface,
+                                         bus_name=constants.bluez_service, path_keyword="path"),
+        ]
+        self.reload()
+
+    def stop(self):
+        """Remove all signal subscriptions."""
+        for match in self.signal_matches:
+            match.remove()
+        self.signal_matches = []
+
+    def reload(self):
+        """Rebuild the cache from ObjectManager.GetManagedObjects."""
+        object_manager = dbus.Interface(self.bus.get_object(constants.bluez_service, "/"),
+                                        constants.object_manager_interface)
+        try:
+            managed_objects = object_manager.GetManagedObjects()
+        except dbus.exceptions.DBusException as error:
+            self.log.error("Failed to load managed objects: %s", error)
+            return
+        self.devices = {}
+        self.device_paths = {}
+        for path, interfaces in managed_objects.items():
+            if constants.device_interface in interfaces:
+                self.store_device(str(path), interfaces[constants.device_interface])
+        self.log.info("Device state cache loaded %d devices for %s", len(self.devices), self.interface)
+
+    def refresh_device(self, device_address):
+        """Re-read all properties of one device, e.g. right after an action on it finished.
+
+        Args:
+            device_address: Bluetooth address of the remote device.
+        """
+        path = self.device_paths.get(device_address)
+        if not path:
+            return
+        properties = dbus.Interface(self.bus.get_object(constants.bluez_service, path), constants.properties_interface)
+        try:
+            device_properties = properties.GetAll(constants.device_interface)
+        except dbus.exceptions.DBusException as error:
+            self.log.warning("Failed to refresh %s: %s", device_address, error)
+            return
+        self.store_device(path, device_properties)
+
+    def is_tracked_path(self, path):
+        """Return True if the object path is a device of the tracked adapter.
+
+        Args:
+            path: D-Bus object path.
+        """
+        return path.startswith(self.adapter_path + "/dev_")
+
+    def store_device(self, path, device_properties):
+        """Insert or replace a device entry.
+
+        Args:
+            path: D-Bus object path of the device.
+            device_properties: Device1 properties as received over D-Bus.
+        """
+        if not self.is_tracked_path(path):
+            return
+        device = to_python(device_properties)
+        device["Path"] = path
+        device_address = device.get("Address") or path.split("dev_")[-1].replace("_", ":")
+        is_new = device_address not in self.devices
+        self.devices[device_address] = device
+        self.device_paths[device_address] = path
+        if is_new:
+            self.device_added.emit(device_address)
+        else:
+            self.device_changed.emit(device_address, list(device.keys()))
+
+    def handle_interfaces_added(self, path, interfaces):
+        """Handles ObjectManager.InterfacesAdded.
+
+        Args:
+            path: D-Bus object path of the new object.
+            interfaces: Mapping of interface name to properties.
+        """
+        if constants.device_interface in interfaces:
+            self.store_device(str(path), interfaces[constants.device_interface])
+
+    def handle_interfaces_removed(self, path, interfaces):
+        """Handles ObjectManager.InterfacesRemoved.
+
+        Args:
+            path: D-Bus object path of the removed object.
+            interfaces: Names of the removed interfaces.
+        """
+        path = str(path)
+        if constants.device_interface not in interfaces or not self.is_tracked_path(path):
+            return
+        for device_address, device_path in list(self.device_paths.items()):
+            if device_path == path:
+                del self.device_paths[device_address]
+                self.devices.pop(device_address, None)
+                self.device_removed.emit(device_address)
+                break
+
+    def handle_properties_changed(self, interface, changed, invalidated, path=None):
+        """Handles Properties.PropertiesChanged for Device1 objects.
+
+        Args:
+            interface: Name of the interface whose properties changed.
+            changed: Mapping of changed property names to new values.
+            invalidated: Names of properties whose values were invalidated.
+            path: D-Bus object path of the device.
+        """
+        path = str(path)
+        if not self.is_tracked_path(path):
+            return
+        device_address = path.split("dev_")[-1].replace("_", ":")
+        device = self.devices.get(device_address)
+        if device is None:
+            self.store_device(path, changed)
+            return
+        device.update(to_python(changed))
+        for name in invalidated:
+            device.pop(str(name), None)
+        self.device_changed.emit(device_address, [str(name) for name in changed.keys()] + [str(name) for name in invalidated])
+
+    def get_device(self, device_address):
+        """Return the cached Device1 properties of a device, or an empty dict.
+
+        Args:
+            device_address: Bluetooth address of the remote device.
+        """
+        return self.devices.get(device_address, {})
+
+    def is_device_connected(self, device_address):
+        """Return True if the device is connected.
+
+        Args:
+            device_address: Bluetooth address of the remote device.
+        """
+        return bool(self.get_device(device_address).get("Connected", False))
+
+    def is_device_paired(self, device_address):
+        """Return True if the device is paired.
+
+        Args:
+            device_address: Bluetooth address of the remote device.
+        """
+        return bool(self.get_device(device_address).get("Paired", False))
+
+    def get_paired_devices(self):
+        """Return a mapping of paired device addresses to their alias."""
+        return {device_address: device.get("Alias", device_address)
+                for device_address, device in self.devices.items() if device.get("Paired")}
+
+    def get_connected_devices(self):
+        """Return a mapping of connected device addresses to their alias."""
+        return {device_address: device.get("Alias", device_address)
+                for device_address, device in self.devices.items() if device.get("Connected")}
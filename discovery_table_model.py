@@ -0,0 +1,176 @@
+from PyQt6.QtCore import QAbstractTableModel
+from PyQt6.QtCore import QEvent
+from PyQt6.QtCore import QModelIndex
+from PyQt6.QtCore import QRect
+from PyQt6.QtCore import Qt
+from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtGui import QFont
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtWidgets import QStyle
+from PyQt6.QtWidgets import QStyledItemDelegate
+from PyQt6.QtWidgets import QStyleOptionButton
+
+
+class DiscoveredDevicesModel(QAbstractTableModel):
+    """Table model of discovered devices, updated in place as discovery results arrive.
+
+    There is one row per device and adapter that found it. Rows are only ever appended, so the
+    (adapter, address) to row index stays valid and lookups are O(1).
+    """
+
+    NAME_COLUMN = 0
+    ADDRESS_COLUMN = 1
+    ADAPTER_COLUMN = 2
+    RSSI_COLUMN = 3
+    PROCEDURES_COLUMN = 4
+    headers = ["DEVICE NAME", "BD_ADDR", "ADAPTER", "RSSI", "PROCEDURES"]
+    ADAPTER_ROLE = Qt.ItemDataRole.UserRole + 1
+
+    def __init__(self, parent=None):
+        """Initialize an empty model.
+
+        Args:
+            parent: Optional parent QObject.
+        """
+        super().__init__(parent)
+        self.devices = []
+        self.row_index = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        """Return the number of discovered devices."""
+        return 0 if parent.isValid() else len(self.devices)
+
+    def columnCount(self, parent=QModelIndex()):
+        """Return the number of columns."""
+        return 0 if parent.isValid() else len(self.headers)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        """Return the data stored under the given role for a cell.
+
+        Args:
+            index: Model index of the cell.
+            role: Qt item data role.
+        """
+        if not index.isValid():
+            return None
+        device = self.devices[index.row()]
+        if role == Qt.ItemDataRole.UserRole:
+            return device["address"]
+        if role == self.ADAPTER_ROLE:
+            return device["adapter"]
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        column = index.column()
+        if column == self.NAME_COLUMN:
+            return device["name"]
+        if column == self.ADDRESS_COLUMN:
+            return device["address"]
+        if column == self.ADAPTER_COLUMN:
+            return device["adapter"]
+        if column == self.RSSI_COLUMN:
+            return "" if device["rssi"] is None else str(device["rssi"])
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        """Return the column titles."""
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.headers[section]
+        return super().headerData(section, orientation, role)
+
+    def update_device(self, device_address, name, rssi, adapter_interface):
+        """Insert a device or update its row in place.
+
+        Args:
+            device_address: Bluetooth address of the discovered device.
+            name: Alias or name of the device.
+            rssi: Last received RSSI, or None if unknown.
+            adapter_interface: Adapter that discovered the device (e.g., hci1).
+        """
+        key = (adapter_interface, device_address)
+        row = self.row_index.get(key)
+        if row is None:
+            row = len(self.devices)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self.devices.append({"address": device_address, "name": name, "rssi": rssi, "adapter": adapter_interface})
+            self.row_index[key] = row
+            self.endInsertRows()
+            return
+        device = self.devices[row]
+        if device["name"] == name and device["rssi"] == rssi:
+            return
+        device["name"] = name
+        device["rssi"] = rssi
+        self.dataChanged.emit(self.index(row, self.NAME_COLUMN), self.index(row, self.RSSI_COLUMN))
+
+    def contains(self, device_address, adapter_interface):
+        """Return True if the device already has a row for an adapter.
+
+        Args:
+            device_address: Bluetooth address of the device.
+            adapter_interface: Adapter that discovered the device.
+        """
+        return (adapter_interface, device_address) in self.row_index
+
+    def clear(self):
+        """Remove all rows."""
+        self.beginResetModel()
+        self.devices = []
+        self.row_index = {}
+        self.endResetModel()
+
+
+class DeviceActionDelegate(QStyledItemDelegate):
+    """Paints PAIR/CONNECT buttons in the procedures column and reports clicks on them.
+
+    action_requested carries the action, the device address and the adapter of the row.
+    """
+
+    action_requested = pyqtSignal(str, str, str)
+    actions = (("PAIR", "pair"), ("CONNECT", "connect"))
+    spacing = 5
+
+    def __init__(self, parent=None):
+        """Initialize the delegate.
+
+        Args:
+            parent: Optional parent QObject.
+        """
+        super().__init__(parent)
+        self.button_font = QFont()
+        self.button_font.setBold(True)
+        self.button_font.setPointSize(8)
+
+    def button_rects(self, cell_rect):
+        """Split a cell into one rectangle per action button.
+
+        Args:
+            cell_rect: Rectangle of the procedures cell.
+        """
+        count = len(self.actions)
+        width = (cell_rect.width() - self.spacing * (count - 1)) // count
+        return [QRect(cell_rect.left() + i * (width + self.spacing), cell_rect.top(), width, cell_rect.height())
+                for i in range(count)]
+
+    def paint(self, painter, option, index):
+        """Draw the action buttons."""
+        style = option.widget.style() if option.widget else QApplication.style()
+        painter.save()
+        painter.setFont(self.button_font)
+        for (label, _), rect in zip(self.actions, self.button_rects(option.rect)):
+            button = QStyleOptionButton()
+            button.rect = rect
+            button.text = label
+            button.state = QStyle.StateFlag.State_Enabled | QStyle.StateFlag.State_Raised
+            style.drawControl(QStyle.ControlElement.CE_PushButton, button, painter, option.widget)
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        """Emit action_requested when one of the buttons is clicked."""
+        if event.type() == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.LeftButton:
+            position = event.position().toPoint()
+            for (_, action), rect in zip(self.actions, self.button_rects(option.rect)):
+                if rect.contains(position):
+                    self.action_requested.emit(action, index.data(Qt.ItemDataRole.UserRole),
+                                               index.data(DiscoveredDevicesModel.ADAPTER_ROLE))
+                    return True
+        return super().editorEvent(event, model, option, index)
@@ -0,0 +1,257 @@
+from array import array
+
+from PyQt6.QtCore import QAbstractTableModel
+from PyQt6.QtCore import QModelIndex
+from PyQt6.QtCore import QObject
+from PyQt6.QtCore import QRunnable
+from PyQt6.QtCore import QThreadPool
+from PyQt6.QtCore import Qt
+from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtWidgets import QFileDialog
+from PyQt6.QtWidgets import QHBoxLayout
+from PyQt6.QtWidgets import QHeaderView
+from PyQt6.QtWidgets import QLabel
+from PyQt6.QtWidgets import QLineEdit
+from PyQt6.QtWidgets import QPushButton
+from PyQt6.QtWidgets import QTableView
+from PyQt6.QtWidgets import QVBoxLayout
+from PyQt6.QtWidgets import QWidget
+
+import style_sheet as styles
+from hci_parser import HcidumpTextParser
+from hci_parser import parse_btsnoop_file
+from Utils.utils import validate_bluetooth_address
+
+
+class HciRecordModel(QAbstractTableModel):
+    """Table model showing a selection of packets from an HciRecordStore."""
+
+    columns = [("time", "TIME"), ("direction", "DIR"), ("type", "TYPE"), ("name", "PACKET"), ("handle", "HANDLE"),
+               ("status", "STATUS"), ("address", "BD_ADDR")]
+
+    def __init__(self, store, parent=None):
+        """Initialize the model.
+
+        Args:
+            store: HciRecordStore providing the packets.
+            parent: Optional parent QObject.
+        """
+        super().__init__(parent)
+        self.store = store
+        self.selection = array("I")
+        self.selected_count = 0
+        self.handle_filter = None
+        self.address_filter = None
+
+    def rowCount(self, parent=QModelIndex()):
+        """Return the number of packets in the current selection."""
+        return 0 if parent.isValid() else len(self.selection)
+
+    def columnCount(self, parent=QModelIndex()):
+        """Return the number of columns."""
+        return 0 if parent.isValid() else len(self.columns)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        """Return the decoded field of a packet; rows are decoded only when painted."""
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        return self.store.describe(self.selection[index.row()])[self.columns[index.column()][0]]
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        """Return the column titles."""
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.columns[section][1]
+        return super().headerData(section, orientation, role)
+
+    def set_store(self, store):
+        """Replace the packet store, e.g. after loading a btsnoop capture.
+
+        Args:
+            store: New HciRecordStore.
+        """
+        self.store = store
+        self.apply_filter(self.handle_filter, self.address_filter)
+
+    def apply_filter(self, handle=None, address=None):
+        """Select the packets of one connection handle and/or device.
+
+        Args:
+            handle: Connection handle, or None for all.
+            address: BD_ADDR, or None for all.
+        """
+        self.handle_filter = handle
+        self.address_filter = address
+        self.beginResetModel()
+        self.selection = self.store.select(handle=handle, address=address)
+        self.selected_count = len(self.store)
+        self.endResetModel()
+
+    def refresh(self):
+        """Append rows for the matching packets added to the store since the last refresh."""
+        if len(self.store) == self.selected_count:
+            return
+        new_rows = self.store.select(handle=self.handle_filter, address=self.address_filter, start=self.selected_count)
+        self.selected_count = len(self.store)
+        if not new_rows:
+            return
+        first = len(self.selection)
+        self.beginInsertRows(QModelIndex(), first, first + len(new_rows) - 1)
+        self.selection.extend(new_rows)
+        self.endInsertRows()
+
+
+class BtsnoopLoadSignals(QObject):
+    """Signals reporting the outcome of a background btsnoop parse."""
+
+    loaded = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+
+class BtsnoopLoadTask(QRunnable):
+    """Parses a btsnoop capture on a worker thread."""
+
+    def __init__(self, file_path, signals):
+        """Initialize the task.
+
+        Args:
+            file_path: Path of the btsnoop file.
+            signals: BtsnoopLoadSignals owned by the GUI thread.
+        """
+        super().__init__()
+        self.file_path = file_path
+        self.signals = signals
+
+    def run(self):
+        """Parse the capture and emit the resulting store."""
+        try:
+            store = parse_btsnoop_file(self.file_path)
+        except (OSError, ValueError) as error:
+            self.signals.failed.emit(str(error))
+            return
+        self.signals.loaded.emit(store)
+
+
+class HciDumpPanel(QWidget):
+    """Decoded HCI traffic view with per-handle and per-device filtering."""
+
+    def __init__(self, log, hcidump_file_path=None, parent=None):
+        """Initialize the panel.
+
+        Args:
+            log: Logger instance used for logging.
+            hcidump_file_path: Path of the live hcidump log, used to date packets without a timestamp.
+            parent: Optional parent widget.
+        """
+        super().__init__(parent)
+        self.log = log
+        self.hcidump_file_path = hcidump_file_path
+        self.text_parser = HcidumpTextParser(file_path=hcidump_file_path)
+        self.model = HciRecordModel(self.text_parser.store)
+        self.load_signals = BtsnoopLoadSignals()
+        self.load_signals.loaded.connect(self.handle_btsnoop_loaded)
+        self.load_signals.failed.connect(self.handle_btsnoop_failed)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(4, 4, 4, 4)
+        filter_layout = QHBoxLayout()
+        self.handle_input = QLineEdit()
+        self.handle_input.setPlaceholderText("Handle")
+        self.handle_input.returnPressed.connect(self.apply_filter)
+        filter_layout.addWidget(self.handle_input)
+        self.address_input = QLineEdit()
+        self.address_input.setPlaceholderText("BD_ADDR")
+        self.address_input.returnPressed.connect(self.apply_filter)
+        filter_layout.addWidget(self.address_input)
+        filter_button = QPushButton("Filter")
+        filter_button.setStyleSheet(styles.color_style_sheet)
+        filter_button.clicked.connect(self.apply_filter)
+        filter_layout.addWidget(filter_button)
+        layout.addLayout(filter_layout)
+        source_layout = QHBoxLayout()
+        open_button = QPushButton("Open btsnoop...")
+        open_button.setStyleSheet(styles.color_style_sheet)
+        open_button.clicked.connect(self.open_btsnoop_file)
+        source_layout.addWidget(open_button)
+        self.live_button = QPushButton("Live")
+        self.live_button.setStyleSheet(styles.color_style_sheet)
+        self.live_button.setEnabled(False)
+        self.live_button.clicked.connect(self.show_live)
+        source_layout.addWidget(self.live_button)
+        layout.addLayout(source_layout)
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+        self.table_view = QTableView()
+        self.table_view.setModel(self.model)
+        self.table_view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.table_view.verticalHeader().setVisible(False)
+        layout.addWidget(self.table_view)
+        self.live = True
+
+    def feed_text(self, offset, text):
+        """Parse new hcidump output and show the new packets.
+
+        The output is parsed while a btsnoop capture is shown too, so the live view is complete
+        when it is restored.
+
+        Args:
+            offset: Byte offset of the text in the hcidump log.
+            text: Decoded hcidump output.
+        """
+        self.text_parser.feed(offset, text)
+        if self.live:
+            self.model.refresh()
+
+    def reset(self):
+        """Start over after the hcidump log was rotated or truncated."""
+        self.text_parser = HcidumpTextParser(file_path=self.hcidump_file_path)
+        if self.live:
+            self.model.set_store(self.text_parser.store)
+
+    def apply_filter(self):
+        """Filter the table on the entered connection handle and/or device address."""
+        handle_text = self.handle_input.text().strip()
+        address_text = self.address_input.text().strip().upper()
+        try:
+            handle = int(handle_text, 0) if handle_text else None
+        except ValueError:
+            self.status_label.setText(f"Invalid handle: {handle_text}")
+            return
+        if address_text and not validate_bluetooth_address(address_text):
+            self.status_label.setText(f"Invalid address: {address_text}")
+            return
+        self.model.apply_filter(handle, address_text or None)
+        self.status_label.setText(f"{self.model.rowCount()} of {len(self.model.store)} packets")
+
+    def open_btsnoop_file(self):
+        """Load a btsnoop capture in the background instead of the live hcidump stream."""
+        file_path, _ = QFileDialog.getOpenFileName(self, "Open btsnoop capture", "", "btsnoop (*.log *.cfa *.snoop);;All Files (*)")
+        if not file_path:
+            return
+        self.status_label.setText(f"Loading {file_path}...")
+        QThreadPool.globalInstance().start(BtsnoopLoadTask(file_path, self.load_signals))
+
+    def handle_btsnoop_loaded(self, store):
+        """Show a parsed btsnoop capture.
+
+        Args:
+            store: HciRecordStore holding the capture.
+        """
+        self.live = False
+        self.live_button.setEnabled(True)
+        self.model.set_store(store)
+        self.status_label.setText(f"{len(store)} packets loaded")
+
+    def show_live(self):
+        """Return from a loaded btsnoop capture to the live hcidump stream."""
+        self.live = True
+        self.live_button.setEnabled(False)
+        self.model.set_store(self.text_parser.store)
+        self.status_label.setText(f"{len(self.model.store)} live packets")
+
+    def handle_btsnoop_failed(self, error):
+        """Report a btsnoop capture that could not be parsed.
+
+        Args:
+            error: Description of the error.
+        """
+        self.log.error("Failed to load btsnoop capture: %s", error)
+        self.status_label.setText(f"Failed to load capture: {error}")
@@ -0,0 +1,428 @@
+import os
+import re
+import struct
+import time
+from array import array
+from bisect import bisect_left
+from datetime import datetime
+
+from log_index import LogLineParser
+
+COMMAND = 1
+ACL_DATA = 2
+SCO_DATA = 3
+EVENT = 4
+packet_type_names = {COMMAND: "CMD", ACL_DATA: "ACL", SCO_DATA: "SCO", EVENT: "EVT"}
+
+SENT = 0
+RECEIVED = 1
+NO_HANDLE = 0xFFFF
+NO_STATUS = 0xFF
+NO_ADDRESS = 0xFFFFFFFF
+
+btsnoop_magic = b"btsnoop\0"
+btsnoop_file_header = struct.Struct(">8sII")
+btsnoop_record_header = struct.Struct(">IIIIq")
+btsnoop_epoch_offset_us = 0x00DCDDB30F2F8000
+btsnoop_datalink_h1 = 1001
+btsnoop_datalink_h4 = 1002
+btsnoop_datalink_monitor = 2001
+monitor_packet_types = {2: (COMMAND, SENT), 3: (EVENT, RECEIVED), 4: (ACL_DATA, SENT), 5: (ACL_DATA, RECEIVED),
+                        6: (SCO_DATA, SENT), 7: (SCO_DATA, RECEIVED)}
+
+command_names = {
+    0x0401: "Inquiry", 0x0402: "Inquiry Cancel", 0x0405: "Create Connection", 0x0406: "Disconnect",
+    0x0409: "Accept Connection Request", 0x040A: "Reject Connection Request", 0x040B: "Link Key Request Reply",
+    0x040C: "Link Key Request Negative Reply", 0x040D: "PIN Code Request Reply",
+    0x040E: "PIN Code Request Negative Reply", 0x0411: "Authentication Requested",
+    0x0413: "Set Connection Encryption", 0x0419: "Remote Name Request", 0x041B: "Read Remote Supported Features",
+    0x041D: "Read Remote Version Information", 0x042B: "IO Capability Request Reply",
+    0x042C: "User Confirmation Request Reply", 0x042D: "User Confirmation Request Negative Reply",
+    0x042E: "User Passkey Request Reply", 0x0C03: "Reset", 0x0C1A: "Write Scan Enable",
+    0x200D: "LE Create Connection",
+}
+event_names = {
+    0x01: "Inquiry Complete", 0x03: "Connection Complete", 0x04: "Connection Request",
+    0x05: "Disconnection Complete", 0x06: "Authentication Complete", 0x07: "Remote Name Request Complete",
+    0x08: "Encryption Change", 0x0E: "Command Complete", 0x0F: "Command Status", 0x13: "Number of Completed Packets",
+    0x16: "PIN Code Request", 0x17: "Link Key Request", 0x18: "Link Key Notification", 0x2F: "Extended Inquiry Result",
+    0x31: "IO Capability Request", 0x32: "IO Capability Response", 0x33: "User Confirmation Request",
+    0x34: "User Passkey Request", 0x36: "Simple Pairing Complete", 0x3E: "LE Meta Event",
+}
+commands_with_address = {0x0405, 0x0409, 0x040A, 0x040B, 0x040C, 0x040D, 0x040E, 0x0419, 0x042B, 0x042C, 0x042D,
+                         0x042E}
+commands_with_handle = {0x0406, 0x0411, 0x0413, 0x041B, 0x041D}
+events_with_address = {0x04, 0x16, 0x17, 0x18, 0x31, 0x32, 0x33, 0x34}
+events_with_status_and_address = {0x07, 0x36}
+events_with_status_and_handle = {0x05, 0x06, 0x08}
+le_connection_complete_subevents = {0x01, 0x0A}
+
+hcidump_header_pattern = re.compile(
+    r"^(?:\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d+ )?([<>]) (HCI Command|HCI Event|ACL data|SCO data):?\s*(.*)$")
+hcidump_command_pattern = re.compile(r"\(0x([0-9a-fA-F]+)\|0x([0-9a-fA-F]+)\)")
+hcidump_event_pattern = re.compile(r"\(0x([0-9a-fA-F]+)\)")
+hcidump_handle_pattern = re.compile(r"\bhandle (\d+)")
+hcidump_status_pattern = re.compile(r"\bstatus 0x([0-9a-fA-F]{2})")
+hcidump_address_pattern = re.compile(r"\bbdaddr ([0-9A-Fa-f]{2}(?::[0-9A-Fa-f]{2}){5})")
+hcidump_packet_types = {"HCI Command": COMMAND, "HCI Event": EVENT, "ACL data": ACL_DATA, "SCO data": SCO_DATA}
+
+
+def format_address(raw_address):
+    """Format a little-endian 6 byte BD_ADDR as XX:XX:XX:XX:XX:XX.
+
+    Args:
+        raw_address: Address bytes as transmitted over HCI.
+    """
+    return ":".join(f"{byte:02X}" for byte in reversed(raw_address))
+
+
+class HciRecordStore:
+    """Compact, array-backed table of HCI packets with per-handle and per-address indexes.
+
+    Each packet costs a few dozen bytes regardless of its size; the raw text or bytes are not
+    kept and can be re-read from the capture through the stored offset.
+    """
+
+    def __init__(self):
+        """Initialize an empty store."""
+        self.timestamps = array("d")
+        self.packet_types = array("B")
+        self.directions = array("B")
+        self.codes = array("H")
+        self.handles = array("H")
+        self.statuses = array("B")
+        self.address_ids = array("I")
+        self.offsets = array("Q")
+        self.addresses = []
+        self.address_ids_by_name = {}
+        self.handle_index = {}
+        self.address_index = {}
+        self.handle_addresses = {}
+
+    def __len__(self):
+        """Return the number of stored packets."""
+        return len(self.timestamps)
+
+    def get_address_id(self, address):
+        """Return the numeric id of an address, registering it if new.
+
+        Args:
+            address: BD_ADDR formatted as XX:XX:XX:XX:XX:XX.
+        """
+        address_id = self.address_ids_by_name.get(address)
+        if address_id is None:
+            address_id = self.address_ids_by_name[address] = len(self.addresses)
+            self.addresses.append(address)
+        return address_id
+
+    def add(self, timestamp, packet_type, direction, code, offset, handle=NO_HANDLE, status=NO_STATUS, address=None,
+            connection_event=False, disconnection_event=False):
+        """Append a packet and update the indexes.
+
+        Args:
+            timestamp: Time of the packet in seconds since the epoch.
+            packet_type: COMMAND, ACL_DATA, SCO_DATA or EVENT.
+            direction: SENT (host to controller) or RECEIVED.
+            code: Command opcode or event code; 0 for data packets.
+            offset: Byte offset of the packet in the capture file.
+            handle: Connection handle, or NO_HANDLE.
+            status: HCI status code, or NO_STATUS.
+            address: BD_ADDR mentioned by the packet, if any.
+            connection_event: True if the packet establishes handle -> address.
+            disconnection_event: True if the packet ends the connection on handle.
+        """
+        if address is None and handle != NO_HANDLE:
+            address = self.handle_addresses.get(handle)
+        if connection_event and address is not None and handle != NO_HANDLE and status in (0, NO_STATUS):
+            self.handle_addresses[handle] = address
+        record_index = len(self.timestamps)
+        self.timestamps.append(timestamp)
+        self.packet_types.append(packet_type)
+        self.directions.append(direction)
+        self.codes.append(code)
+        self.handles.append(handle)
+        self.statuses.append(status)
+        self.offsets.append(offset)
+        if address is None:
+            self.address_ids.append(NO_ADDRESS)
+        else:
+            address_id = self.get_address_id(address)
+            self.address_ids.append(address_id)
+            self.address_index.setdefault(address_id, array("I")).append(record_index)
+        if handle != NO_HANDLE:
+            self.handle_index.setdefault(handle, array("I")).append(record_index)
+        if disconnection_event and status in (0, NO_STATUS):
+            self.handle_addresses.pop(handle, None)
+
+    def select(self, handle=None, address=None, start=0):
+        """Return the indexes of the packets matching the filters.
+
+        Args:
+            handle: Connection handle to filter on, or None.
+            address: BD_ADDR to filter on, or None.
+            start: Index of the first packet to consider, e.g. the number of packets already shown.
+
+        Returns:
+            A new array of packet indexes in ascending order.
+        """
+        if address is not None:
+            address_id = self.address_ids_by_name.get(address.upper())
+            selection = self.address_index.get(address_id, array("I"))
+            selection = selection[bisect_left(selection, start):]
+            if handle is not None:
+                selection = array("I", (index for index in selection if self.handles[index] == handle))
+            return selection
+        if handle is not None:
+            selection = self.handle_index.get(handle, array("I"))
+            return selection[bisect_left(selection, start):]
+        return array("I", range(start, len(self.timestamps)))
+
+    def describe(self, index):
+        """Return a dict with the decoded fields of a stored packet.
+
+        Args:
+            index: Index of the packet.
+        """
+        packet_type = self.packet_types[index]
+        code = self.codes[index]
+        if packet_type == COMMAND:
+            name = command_names.get(code, f"Opcode 0x{code:04x}")
+        elif packet_type == EVENT:
+            name = event_names.get(code, f"Event 0x{code:02x}")
+        else:
+            name = packet_type_names[packet_type]
+        handle = self.handles[index]
+        status = self.statuses[index]
+        address_id = self.address_ids[index]
+        return {
+            "time": datetime.fromtimestamp(self.timestamps[index]).strftime("%H:%M:%S.%f"),
+            "direction": ">" if self.directions[index] == RECEIVED else "<",
+            "type": packet_type_names[packet_type],
+            "name": name,
+            "handle": "" if handle == NO_HANDLE else str(handle),
+            "status": "" if status == NO_STATUS else f"0x{status:02x}",
+            "address": "" if address_id == NO_ADDRESS else self.addresses[address_id],
+            "offset": self.offsets[index],
+        }
+
+
+def decode_h4_packet(store, timestamp, direction, packet_type, payload, offset):
+    """Decode one HCI packet (without the H4 type byte) and add it to the store.
+
+    Args:
+        store: HciRecordStore receiving the packet.
+        timestamp: Time of the packet in seconds since the epoch.
+        direction: SENT or RECEIVED.
+        packet_type: COMMAND, ACL_DATA, SCO_DATA or EVENT.
+        payload: Packet bytes following the type byte.
+        offset: Byte offset of the packet record in the capture file.
+    """
+    if packet_type == COMMAND and len(payload) >= 3:
+        opcode = payload[0] | payload[1] << 8
+        parameters = payload[3:]
+        if opcode in commands_with_address and len(parameters) >= 6:
+            store.add(timestamp, COMMAND, direction, opcode, offset, address=format_address(parameters[:6]))
+        elif opcode in commands_with_handle and len(parameters) >= 2:
+            store.add(timestamp, COMMAND, direction, opcode, offset, handle=(parameters[0] | parameters[1] << 8) & 0x0FFF)
+        elif opcode == 0x200D and len(parameters) >= 12:
+            store.add(timestamp, COMMAND, direction, opcode, offset, address=format_address(parameters[6:12]))
+        else:
+            store.add(timestamp, COMMAND, direction, opcode, offset)
+    elif packet_type == EVENT and len(payload) >= 2:
+        event_code = payload[0]
+        parameters = payload[2:]
+        if event_code == 0x03 and len(parameters) >= 9:
+            store.add(timestamp, EVENT, direction, event_code, offset, handle=(parameters[1] | parameters[2] << 8) & 0x0FFF,
+                      status=parameters[0], address=format_address(parameters[3:9]), connection_event=True)
+        elif event_code in events_with_status_and_handle and len(parameters) >= 3:
+            store.add(timestamp, EVENT, direction, event_code, offset, handle=(parameters[1] | parameters[2] << 8) & 0x0FFF,
+                      status=parameters[0], disconnection_event=event_code == 0x05)
+        elif event_code in events_with_address and len(parameters) >= 6:
+            store.add(timestamp, EVENT, direction, event_code, offset, address=format_address(parameters[:6]))
+        elif event_code in events_with_status_and_address and len(parameters) >= 7:
+            store.add(timestamp, EVENT, direction, event_code, offset, status=parameters[0],
+                      address=format_address(parameters[1:7]))
+        elif event_code == 0x0E and len(parameters) >= 4:
+            store.add(timestamp, EVENT, direction, event_code, offset, status=parameters[3])
+        elif event_code == 0x0F and len(parameters) >= 1:
+            store.add(timestamp, EVENT, direction, event_code, offset, status=parameters[0])
+        elif event_code == 0x2F and len(parameters) >= 7:
+            store.add(timestamp, EVENT, direction, event_code, offset, address=format_address(parameters[1:7]))
+        elif event_code == 0x3E and len(parameters) >= 14 and parameters[0] in le_connection_complete_subevents:
+            store.add(timestamp, EVENT, direction, event_code, offset, handle=(parameters[2] | parameters[3] << 8) & 0x0FFF,
+                      status=parameters[1], address=format_address(parameters[6:12]), connection_event=True)
+        else:
+            store.add(timestamp, EVENT, direction, event_code, offset)
+    elif packet_type in (ACL_DATA, SCO_DATA) and len(payload) >= 2:
+        store.add(timestamp, packet_type, direction, 0, offset, handle=(payload[0] | payload[1] << 8) & 0x0FFF)
+
+
+def parse_btsnoop_file(file_path, store=None, chunk_size=1 << 20):
+    """Parse a btsnoop capture (H1, H4 or btmon format) into an HciRecordStore.
+
+    The file is read sequentially in bounded chunks, so memory use does not depend on its size.
+
+    Args:
+        file_path: Path of the btsnoop file.
+        store: Existing store to append to; a new one is created if None.
+        chunk_size: Number of bytes read at once.
+
+    Returns:
+        The HciRecordStore holding the parsed packets.
+
+    Raises:
+        ValueError: If the file is not a supported btsnoop capture.
+    """
+    store = store if store is not None else HciRecordStore()
+    with open(file_path, "rb") as capture:
+        magic, _, datalink = btsnoop_file_header.unpack(capture.read(btsnoop_file_header.size))
+        if magic != btsnoop_magic:
+            raise ValueError(f"{file_path} is not a btsnoop file")
+        if datalink not in (btsnoop_datalink_h1, btsnoop_datalink_h4, btsnoop_datalink_monitor):
+            raise ValueError(f"Unsupported btsnoop datalink type {datalink}")
+        buffer = b""
+        buffer_offset = btsnoop_file_header.size
+        while True:
+            chunk = capture.read(chunk_size)
+            if not chunk:
+                break
+            buffer += chunk
+            position = 0
+            while len(buffer) - position >= btsnoop_record_header.size:
+                _, included_length, flags, _, timestamp_us = btsnoop_record_header.unpack_from(buffer, position)
+                record_end = position + btsnoop_record_header.size + included_length
+                if record_end > len(buffer):
+                    break
+                packet = buffer[position + btsnoop_record_header.size:record_end]
+                timestamp = (timestamp_us - btsnoop_epoch_offset_us) / 1e6
+                record_offset = buffer_offset + position
+                if datalink == btsnoop_datalink_h4 and packet:
+                    decode_h4_packet(store, timestamp, flags & 1, packet[0], packet[1:], record_offset)
+                elif datalink == btsnoop_datalink_h1:
+                    packet_type = (EVENT if flags & 1 else COMMAND) if flags & 2 else ACL_DATA
+                    decode_h4_packet(store, timestamp, flags & 1, packet_type, packet, record_offset)
+                elif datalink == btsnoop_datalink_monitor and (flags & 0xFFFF) in monitor_packet_types:
+                    packet_type, direction = monitor_packet_types[flags & 0xFFFF]
+                    decode_h4_packet(store, timestamp, direction, packet_type, packet, record_offset)
+                position = record_end
+            buffer = buffer[position:]
+            buffer_offset += position
+    return store
+
+
+class HcidumpTextParser:
+    """Incremental parser of `hcidump -t` text output.
+
+    Packets without a timestamp inherit the one of the previous packet. Packets before the first
+    timestamp take the first timestamp that follows in the same chunk, or else the modification
+    time of the capture file, so output without timestamps is placed at its last write instead of at 1970.
+    """
+
+    def __init__(self, store=None, file_path=None):
+        """Initialize the parser.
+
+        Args:
+            store: Existing store to append to; a new one is created if None.
+            file_path: Path of the capture file, used to date packets without a timestamp.
+        """
+        self.store = store if store is not None else HciRecordStore()
+        self.file_path = file_path
+        self.line_parser = LogLineParser()
+        self.pending = None
+        self.untimed_packets = []
+
+    def reset(self):
+        """Discard partial state, e.g. after the capture file was rotated."""
+        self.line_parser.reset()
+        self.pending = None
+        self.untimed_packets = []
+
+    def feed(self, offset, text):
+        """Parse a chunk of hcidump output.
+
+        A packet is added to the store once the next packet header is seen, since its details
+        (handle, status, bdaddr) are printed on the following indented lines.
+
+        Args:
+            offset: Byte offset of the chunk in the capture file.
+            text: Decoded chunk.
+        """
+        for line_offset, timestamp, _, line, _ in self.line_parser.feed(offset, text):
+            header = hcidump_header_pattern.match(line)
+            if header:
+                self.flush()
+                if timestamp is not None and self.untimed_packets:
+                    self.store_untimed_packets(timestamp)
+                direction = SENT if header.group(1) == "<" else RECEIVED
+                packet_type = hcidump_packet_types[header.group(2)]
+                self.pending = {"timestamp": timestamp, "packet_type": packet_type, "direction": direction,
+                                "code": self.parse_code(packet_type, header.group(3)), "offset": line_offset,
+                                "details": header.group(3)}
+            elif self.pending is not None and line[:1].isspace():
+                self.pending["details"] += " " + line.strip()
+        if self.untimed_packets:
+            self.store_untimed_packets(self.get_modified_time())
+
+    def get_modified_time(self):
+        """Return the modification time of the capture file, or the current time if it is unknown."""
+        try:
+            return os.stat(self.file_path).st_mtime if self.file_path else time.time()
+        except OSError:
+            return time.time()
+
+    def store_untimed_packets(self, timestamp):
+        """Store the packets seen before the first timestamp.
+
+        Args:
+            timestamp: Time to place them at.
+        """
+        untimed_packets, self.untimed_packets = self.untimed_packets, []
+        for packet in untimed_packets:
+            packet["timestamp"] = timestamp
+            self.store_packet(packet)
+
+    @staticmethod
+    def parse_code(packet_type, description):
+        """Extract the opcode or event code from a hcidump header description.
+
+        Args:
+            packet_type: COMMAND, ACL_DATA, SCO_DATA or EVENT.
+            description: Text following the packet type in the header line.
+        """
+        if packet_type == COMMAND:
+            match = hcidump_command_pattern.search(description)
+            return int(match.group(1), 16) << 10 | int(match.group(2), 16) if match else 0
+        if packet_type == EVENT:
+            match = hcidump_event_pattern.search(description)
+            return int(match.group(1), 16) if match else 0
+        return 0
+
+    def flush(self):
+        """Store the packet whose details are complete."""
+        pending = self.pending
+        if pending is None:
+            return
+        self.pending = None
+        if pending["timestamp"] is None:
+            self.untimed_packets.append(pending)
+            return
+        self.store_packet(pending)
+
+    def store_packet(self, pending):
+        """Add a parsed packet to the store.
+
+        Args:
+            pending: Packet fields collected from its header and detail lines.
+        """
+        details = pending["details"]
+        handle = hcidump_handle_pattern.search(details)
+        status = hcidump_status_pattern.search(details)
+        address = hcidump_address_pattern.search(details)
+        code = pending["code"]
+        is_event = pending["packet_type"] == EVENT
+        self.store.add(pending["timestamp"], pending["packet_type"], pending["direction"], code, pending["offset"],
+                       handle=int(handle.group(1)) & 0x0FFF if handle else NO_HANDLE,
+                       status=int(status.group(1), 16) if status else NO_STATUS,
+                       address=address.group(1).upper() if address else None,
+                       connection_event=is_event and (code == 0x03 or code == 0x3E),
+                       disconnection_event=is_event and code == 0x05)
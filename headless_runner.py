@@ -0,0 +1,253 @@
+"""Headless batch runner for device_action_map operations.
+
+Usage:
+    python headless_runner.py job.yaml [--output results.jsonl] [--concurrency 8] [--latency-csv latency.csv]
+
+The job file (JSON or YAML) looks like::
+
+    interface: hci0
+    concurrency: 4
+    capability: NoInputNoOutput
+    pairing_policy: policy.json
+    jobs:
+      - addresses: ["00:11:22:33:44:55", "66:77:88:99:AA:BB"]
+        actions: [pair, connect, disconnect, unpair]
+        repeat: 100
+        delay: 0.5
+      - interface: hci1
+        addresses: ["00:1A:7D:DA:71:13"]
+        actions: [pair, unpair]
+
+Every address of a job runs its action sequence `repeat` times; different addresses run in
+parallel, up to `concurrency` at once. A job may name its own `interface`; every adapter gets its
+own BluetoothDeviceManager, so several controllers are driven at the same time. One JSON line is
+written per operation.
+"""
+import argparse
+import json
+import logging
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from action_metrics import LatencyRecorder
+from libraries.bluetooth import constants
+from libraries.bluetooth.bluez import BluetoothDeviceManager
+
+
+def load_job_file(file_path):
+    """Load a job description from a JSON or YAML file.
+
+    Args:
+        file_path: Path of the job file; .yaml/.yml files need PyYAML.
+    """
+    with open(file_path) as job_file:
+        if file_path.endswith((".yaml", ".yml")):
+            import yaml
+            return yaml.safe_load(job_file)
+        return json.load(job_file)
+
+
+class ResultWriter:
+    """Thread-safe JSON lines writer that also keeps per-action totals and latency histograms."""
+
+    def __init__(self, stream):
+        """Initialize the writer.
+
+        Args:
+            stream: Text stream receiving one JSON object per line.
+        """
+        self.stream = stream
+        self.lock = threading.Lock()
+        self.totals = {}
+        self.latency_recorder = LatencyRecorder()
+
+    def write(self, result):
+        """Write one operation result.
+
+        Args:
+            result: Dict describing the operation.
+        """
+        with self.lock:
+            self.stream.write(json.dumps(result) + "\n")
+            self.stream.flush()
+            total = self.totals.setdefault(result["action"], {"success": 0, "failure": 0})
+            total["success" if result["result"] else "failure"] += 1
+        self.latency_recorder.record(result["action"], "total", result["duration_ms"] / 1000, result["result"])
+
+
+class HeadlessRunner:
+    """Drives BluetoothDeviceManager through device_action_map without any widgets."""
+
+    def __init__(self, job, log, writer, concurrency=None):
+        """Initialize the runner.
+
+        Args:
+            job: Job description loaded from the job file.
+            log: Logger instance used for logging.
+            writer: ResultWriter receiving the operation results.
+            concurrency: Overrides the concurrency of the job file.
+        """
+        self.job = job
+        self.log = log
+        self.writer = writer
+        self.concurrency = concurrency or job.get("concurrency", constants.device_action_max_workers)
+        self.bluetooth_device_managers = {}
+        self.managers_lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.pairing_agent = None
+
+    def get_device_manager(self, interface):
+        """Return the BluetoothDeviceManager of an adapter, creating it on first use.
+
+        Args:
+            interface: Bluetooth adapter interface (e.g., hci1).
+        """
+        with self.managers_lock:
+            if interface not in self.bluetooth_device_managers:
+                self.bluetooth_device_managers[interface] = BluetoothDeviceManager(log=self.log, interface=interface)
+            return self.bluetooth_device_managers[interface]
+
+    def start_pairing_agent(self):
+        """Register a pairing agent answering from the job's pairing policy, if one is configured."""
+        policy_file = self.job.get("pairing_policy")
+        if not policy_file:
+            return
+        import dbus
+        from gi.repository import GLib
+        from pairing_agent import register_pairing_agent
+        from pairing_policy import ACCEPT
+        from pairing_policy import PairingPolicy
+
+        pairing_policy = PairingPolicy.from_file(policy_file)
+        bus = dbus.SystemBus()
+
+        def get_device_name(pairing_request):
+            properties = dbus.Interface(bus.get_object(constants.bluez_service, pairing_request.device_path),
+                                        constants.properties_interface)
+            try:
+                return str(properties.Get(constants.device_interface, "Alias"))
+            except dbus.exceptions.DBusException as error:
+                self.log.warning("Failed to read the alias of %s: %s", pairing_request.device_address, error)
+                return None
+
+        def handle_request(pairing_request):
+            device_name = get_device_name(pairing_request) if pairing_request.device_path else None
+            decision = pairing_policy.decide(pairing_request, device_name)
+            if decision and decision[0] == ACCEPT:
+                pairing_request.accept(decision[1])
+            else:
+                self.log.warning("Rejecting unhandled %s request for %s", pairing_request.request_type,
+                                 pairing_request.device_address)
+                pairing_request.reject()
+
+        self.pairing_agent = register_pairing_agent(bus, self.job.get("capability", "NoInputNoOutput"),
+                                                    handle_request)
+        threading.Thread(target=GLib.MainLoop().run, daemon=True).start()
+
+    def run_action(self, interface, action, device_address, cycle):
+        """Run one device action and record its outcome.
+
+        Args:
+            interface: Adapter running the action.
+            action: Key of the action in device_action_map.
+            device_address: Bluetooth address of the device.
+            cycle: Index of the repetition.
+
+        Returns:
+            True if the action succeeded.
+        """
+        device_action = constants.device_action_map[action]
+        method = getattr(self.get_device_manager(interface), device_action["method"])
+        error = None
+        started_at = time.time()
+        start = time.monotonic()
+        try:
+            result = bool(method(device_address))
+        except Exception as exception:
+            result = False
+            error = str(exception)
+        duration_ms = (time.monotonic() - start) * 1000
+        self.writer.write({"interface": interface, "address": device_address, "action": action, "method": device_action["method"],
+                           "cycle": cycle, "start": started_at, "duration_ms": round(duration_ms, 3),
+                           "result": result, "error": error})
+        return result
+
+    def run_sequence(self, interface, device_address, actions, repeat, delay, stop_on_failure):
+        """Run an action sequence repeatedly against one device.
+
+        Args:
+            interface: Adapter running the actions.
+            device_address: Bluetooth address of the device.
+            actions: Ordered list of device_action_map keys.
+            repeat: Number of times the sequence is run.
+            delay: Pause in seconds between actions.
+            stop_on_failure: If True, a failed action stops the remaining cycles of this device.
+        """
+        for cycle in range(repeat):
+            for action in actions:
+                if self.stop_event.is_set():
+                    return
+                if not self.run_action(interface, action, device_address, cycle) and stop_on_failure:
+                    self.log.error("%s failed on %s in cycle %d, stopping this device", action, device_address, cycle)
+                    return
+                if delay:
+                    time.sleep(delay)
+
+    def run(self):
+        """Run all jobs and wait for them to finish."""
+        for job in self.job.get("jobs", []):
+            unknown_actions = [action for action in job["actions"] if action not in constants.device_action_map]
+            if unknown_actions:
+                raise ValueError(f"Unknown actions in job file: {', '.join(unknown_actions)}")
+        self.start_pairing_agent()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = [executor.submit(self.run_sequence, job.get("interface", self.job.get("interface")),
+                                       device_address, job["actions"],
+                                       job.get("repeat", self.job.get("repeat", 1)), job.get("delay", 0),
+                                       job.get("stop_on_failure", self.job.get("stop_on_failure", False)))
+                       for job in self.job.get("jobs", []) for device_address in job["addresses"]]
+            try:
+                for future in futures:
+                    future.result()
+            except KeyboardInterrupt:
+                self.stop_event.set()
+                raise
+
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Run Bluetooth device actions without the GUI.")
+    parser.add_argument("job_file", help="JSON or YAML job description")
+    parser.add_argument("--output", help="File receiving JSON lines results (default: stdout)")
+    parser.add_argument("--concurrency", type=int, help="Number of devices driven in parallel")
+    parser.add_argument("--bus-address", help="D-Bus address to use instead of the system bus, e.g. of mock_bluez.py")
+    parser.add_argument("--latency-csv", help="File receiving the per-action latency percentiles")
+    parser.add_argument("--verbose", action="store_true", help="Log debug output to stderr")
+    args = parser.parse_args(argv)
+    if args.bus_address:
+        from mock_bluez import point_clients_at
+        point_clients_at(args.bus_address)
+    logging.basicConfig(stream=sys.stderr, level=logging.DEBUG if args.verbose else logging.INFO,
+                        format="%(asctime)s %(levelname)s %(threadName)s %(message)s")
+    log = logging.getLogger("headless_runner")
+    output = open(args.output, "a") if args.output else sys.stdout
+    writer = ResultWriter(output)
+    try:
+        HeadlessRunner(load_job_file(args.job_file), log, writer, args.concurrency).run()
+    finally:
+        if args.output:
+            output.close()
+    for action, total in writer.totals.items():
+        log.info("%s: %d succeeded, %d failed", action, total["success"], total["failure"])
+    for row in writer.latency_recorder.snapshot():
+        log.info("%s latency: p50 %.1f ms, p95 %.1f ms, p99 %.1f ms, max %.1f ms", row["operation"], row["p50_ms"],
+                 row["p95_ms"], row["p99_ms"], row["max_ms"])
+    if args.latency_csv:
+        writer.latency_recorder.export_csv(args.latency_csv)
+    return 0 if all(total["failure"] == 0 for total in writer.totals.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,14 @@
 import os
+import time
 
+import dbus
 from PyQt6.QtCore import Qt
-from PyQt6.QtCore import QFileSystemWatcher
+from PyQt6.QtCore import QThreadPool
 from PyQt6.QtCore import QTimer
 from PyQt6.QtGui import QFont
+from PyQt6.QtWidgets import QCheckBox
 from PyQt6.QtWidgets import QComboBox
+from PyQt6.QtWidgets import QDoubleSpinBox
 from PyQt6.QtWidgets import QFileDialog
 from PyQt6.QtWidgets import QGridLayout
 from PyQt6.QtWidgets import QGroupBox
@@ -17,27 +21,67 @@ from PyQt6.QtWidgets import QLineEdit
 from PyQt6.QtWidgets import QListWidget
 from PyQt6.QtWidgets import QListWidgetItem
 from PyQt6.QtWidgets import QMessageBox
+from PyQt6.QtWidgets import QProgressBar
 from PyQt6.QtWidgets import QPushButton
+from PyQt6.QtWidgets import QScrollArea
+from PyQt6.QtWidgets import QSpinBox
 from PyQt6.QtWidgets import QTabWidget
-from PyQt6.QtWidgets import QTableWidget
-from PyQt6.QtWidgets import QTableWidgetItem
-from PyQt6.QtWidgets import QTabWidget
-from PyQt6.QtWidgets import QTextEdit
+from PyQt6.QtWidgets import QTableView
 from PyQt6.QtWidgets import QVBoxLayout
 from PyQt6.QtWidgets import QWidget
-from setuptools.package_index import user_agent
 
 import style_sheet as styles
-from libraries.bluetooth.bluez import BluetoothDeviceManager
+from action_metrics import LatencyRecorder
+from adapter_context import AdapterContext
+from adapter_context import get_adapter_interface
+from adapter_context import list_adapter_interfaces
+from controller_details import ControllerDetailsCache
+from deferred_widget import DeferredWidget
+from discovery_table_model import DeviceActionDelegate
+from discovery_table_model import DiscoveredDevicesModel
+from log_tailer import LogTailer
+from log_timeline import ActionEventLog
+from log_viewer import LogLineBuffer
+from log_viewer import LogViewer
+from log_viewer import read_last_lines
+from opp_accept_rules import OppAcceptRules
+from pairing_agent import PairingRequestQueue
+from pairing_agent import register_pairing_agent
+from pairing_agent import unregister_pairing_agent
+from pairing_policy import ACCEPT
+from pairing_policy import PairingPolicy
+from profile_panel_cache import ProfilePanelCache
+from startup_trace import StartupTrace
 from libraries.bluetooth import constants
-from Utils.utils import get_controller_interface_details
 from Utils.utils import validate_bluetooth_address
 
 
 class TestApplication(QWidget):
     """Main GUI class for the Bluetooth Test Host."""
 
-    def __init__(self, interface=None, back_callback=None, log=None, bluetoothd_log_file_path=None, pulseaudio_log_file_path=None, obexd_log_file_path=None, ofonod_log_file_path=None, hcidump_log_name=None):
+    controller_detail_fields = [
+        ("Controller Name", "Name"),
+        ("Controller Address", "BD_ADDR"),
+        ("Link Mode", "Link mode"),
+        ("Link Policy", "Link policy"),
+        ("HCI Version", "HCI Version"),
+        ("LMP Version", "LMP Version"),
+        ("Manufacturer", "Manufacturer"),
+    ]
+
+    # Attributes each profile panel sets while being built; they are rebound whenever a cached panel is shown.
+    profile_panel_attributes = {
+        "A2DP": ("device_address_source", "device_address_sink", "audio_location_input", "browse_audio_button",
+                 "loop_stream_checkbox", "start_streaming_button", "stop_streaming_button", "stream_buffer_bar",
+                 "stream_stats_label", "soak_stats_label", "play_button", "pause_button", "next_button",
+                 "previous_button", "rewind_button", "media_script_input", "media_script_repetitions_input",
+                 "media_script_rate_input", "media_script_button", "media_control_status_label"),
+        "OPP": ("opp_location_input", "browse_opp_button", "opp_all_devices_checkbox", "send_file_button",
+                "receive_file_button", "opp_benchmark_sizes_input", "opp_benchmark_repetitions_input",
+                "opp_benchmark_button", "opp_benchmark_status_label"),
+    }
+
+    def __init__(self, interface=None, back_callback=None, log=None, bluetoothd_log_file_path=None, pulseaudio_log_file_path=None, obexd_log_file_path=None, ofonod_log_file_path=None, hcidump_log_name=None, pairing_policy_file=None, interfaces=None, startup_trace=None, opp_accept_rules_file=None):
         """Initialize the Test Host widget.
 
         Args:
@@ -49,9 +93,19 @@ class TestApplication(QWidget):
             obexd_log_file_path: Path to obexd log.
             ofonod_log_file_path: Path to ofonod log.
             hcidump_log_name: Name of hcidump log file.
+            pairing_policy_file: Optional JSON/YAML file with auto-response rules for the pairing agent.
+            interfaces: Adapters driven together in multi-controller mode, or 'all' for every adapter
+                BlueZ reports; defaults to [interface].
+            startup_trace: Optional StartupTrace receiving the construction phases; a new one is
+                started if omitted.
+            opp_accept_rules_file: Optional JSON/YAML file with the rules answering incoming OPP pushes.
         """
         super().__init__()
-        self.interface = interface
+        self.startup_trace = startup_trace or StartupTrace()
+        if interfaces == "all":
+            interfaces = list_adapter_interfaces()
+        self.interfaces = list(interfaces) if interfaces else [interface]
+        self.interface = interface if interface in self.interfaces else self.interfaces[0]
         self.log_path = log.log_path
         self.log = log
         self.bluetoothd_log_file_path = bluetoothd_log_file_path
@@ -60,11 +114,44 @@ class TestApplication(QWidget):
         self.ofonod_log_file_path = ofonod_log_file_path
         self.hcidump_log_name = hcidump_log_name
         self.back_callback = back_callback
+        self.is_shut_down = False
         self.gap_discoverable_enabled = False
         self.gap_discovery_running = False
         self.gap_discoverable_timeout = 0
         self.gap_inquiry_timeout = 0
-        self.bluetooth_device_manager = BluetoothDeviceManager(log=self.log, interface=self.interface)
+        self.latency_recorder = LatencyRecorder()
+        with self.startup_trace.phase("controller details cache"):
+            self.controller_details_cache = ControllerDetailsCache(self.log)
+            self.controller_details_cache.details_updated.connect(self.update_controller_details)
+            self.controller_details_cache.start()
+        self.controller_detail_labels = {}
+        self.pending_load_profiles = {}
+        self.profile_panel_cache = ProfilePanelCache()
+        self.a2dp_roles = {}
+        self.action_event_log = ActionEventLog()
+        self.adapter_contexts = {}
+        with self.startup_trace.phase("adapter contexts"):
+            for adapter_interface in self.interfaces:
+                self.add_adapter_context(adapter_interface)
+        self.bluetooth_device_manager = None
+        self.device_state_cache = None
+        self.device_action_executor = None
+        self.discovered_devices_model = DiscoveredDevicesModel()
+        self.device_action_delegate = DeviceActionDelegate()
+        self.device_action_delegate.action_requested.connect(
+            lambda action, addr, adapter: self.perform_device_action(action, addr, load_profiles=False,
+                                                                     adapter_interface=adapter))
+        self.discovery_table_view = None
+        self.discovery_update_connections = []
+        self.discovery_adapters = []
+        self.gap_all_adapters = False
+        self.selected_capability = None
+        self.pairing_agent = None
+        self.pairing_request_queue = PairingRequestQueue(self.log, latency_recorder=self.latency_recorder)
+        self.pairing_request_queue.request_added.connect(self.handle_pairing_request)
+        self.pairing_policy = PairingPolicy.from_file(pairing_policy_file) if pairing_policy_file else PairingPolicy()
+        self.opp_accept_rules = (OppAcceptRules.from_file(opp_accept_rules_file) if opp_accept_rules_file
+                                 else OppAcceptRules())
         self.paired_devices = {}
         self.connected_devices = {}
         self.main_grid_layout = None
@@ -78,12 +165,134 @@ class TestApplication(QWidget):
         self.refresh_button = None
         self.start_streaming_button = False
         self.stop_streaming_button = False
+        self.stream_buffer_bar = None
+        self.stream_stats_label = None
+        self.soak_stats_label = None
+        self.a2dp_session = None
+        self.opp_transfer_queue = None
+        self.opp_transfers_tab = None
+        self.opp_receive_service = None
+        self.opp_incoming_tab = None
+        self.opp_benchmark = None
+        self.media_control_engine = None
+        self.stream_metrics_timer = QTimer(self)
+        self.stream_metrics_timer.timeout.connect(self.update_stream_metrics)
+        with self.startup_trace.phase("device list"):
+            self.select_adapter(self.interface)
         self.initialize_host_ui()
+        QTimer.singleShot(0, lambda: self.startup_trace.finish(self.log))
+
+    def shutdown(self):
+        """Stops every background service of the view: streams, transfers, agents, log threads and adapters.
+
+        Safe to call more than once; called when the view is left with Back or closed.
+        """
+        if self.is_shut_down:
+            return
+        self.is_shut_down = True
+        self.stream_metrics_timer.stop()
+        self.stop_discovery_updates()
+        if self.a2dp_session:
+            self.a2dp_session.stop()
+        if self.media_control_engine:
+            self.media_control_engine.stop()
+        if self.opp_benchmark:
+            self.opp_benchmark.stop()
+        if self.opp_transfer_queue:
+            self.opp_transfer_queue.stop()
+        if self.opp_receive_service:
+            self.opp_receive_service.stop()
+        if self.pairing_agent:
+            try:
+                unregister_pairing_agent(self.pairing_agent)
+            except Exception as error:
+                self.log.error("Failed to unregister agent: %s", error)
+            self.pairing_agent = None
+        self.log_tailer.stop()
+        self.log_indexer.stop()
+        QThreadPool.globalInstance().waitForDone()
+        if self.log_index is not None:
+            self.log_index.close()
+            self.log_index = None
+        for adapter_context in self.adapter_contexts.values():
+            adapter_context.shutdown()
+        self.controller_details_cache.stop()
+        self.log.info("Host view shut down")
+
+    def closeEvent(self, event):
+        """Shuts the view down before the window closes."""
+        self.shutdown()
+        super().closeEvent(event)
+
+    def go_back(self):
+        """Shuts the view down and returns to the previous screen."""
+        self.shutdown()
+        if self.back_callback:
+            self.back_callback()
+
+    def add_adapter_context(self, adapter_interface):
+        """Creates the manager, device cache and action executor of one adapter and starts tracking its devices.
+
+        Args:
+            adapter_interface: Bluetooth adapter interface (e.g., hci1).
+        """
+        adapter_context = AdapterContext(adapter_interface, self.log, latency_recorder=self.latency_recorder)
+        executor = adapter_context.device_action_executor
+        executor.action_started.connect(self.update_device_action_status)
+        executor.action_finished.connect(
+            lambda action, addr, result: self.handle_device_action_result(action, addr, result, adapter_interface))
+        executor.action_started.connect(
+            lambda action, addr: self.action_event_log.record(f"{action} started on {addr} ({adapter_interface})"))
+        executor.action_finished.connect(
+            lambda action, addr, result: self.action_event_log.record(
+                f"{action} finished on {addr} ({adapter_interface}, {'Success' if result else 'Failure'})"))
+        adapter_context.device_state_cache.device_changed.connect(
+            lambda addr, changed: self.update_profile_panels(adapter_interface, addr, changed))
+        adapter_context.start()
+        self.adapter_contexts[adapter_interface] = adapter_context
+
+    def select_adapter(self, adapter_interface):
+        """Makes an adapter the one the device list and the device actions work on.
+
+        The discovery table keeps following the adapters discovery was started on.
+
+        Args:
+            adapter_interface: Bluetooth adapter interface (e.g., hci1).
+        """
+        adapter_context = self.adapter_contexts[adapter_interface]
+        if adapter_context.device_state_cache is self.device_state_cache:
+            return
+        self.interface = adapter_interface
+        self.bluetooth_device_manager = adapter_context.bluetooth_device_manager
+        self.device_state_cache = adapter_context.device_state_cache
+        self.device_action_executor = adapter_context.device_action_executor
+        self.profile_panel_cache.invalidate_all()
+        self.a2dp_roles.clear()
+        if self.profiles_list_widget is not None:
+            self.profiles_list_widget.clear()
+            self.load_paired_devices()
+        self.controller_details_cache.request(adapter_interface)
+        self.log.info("Active controller: %s", adapter_interface)
+
+    def get_target_adapters(self):
+        """Returns the adapter contexts GAP operations apply to: all of them if selected, else the active one."""
+        if self.gap_all_adapters:
+            return list(self.adapter_contexts.values())
+        return [self.adapter_contexts[self.interface]]
+
+    def get_request_adapter(self, pairing_request):
+        """Returns the adapter context a pairing request belongs to, or the active one if unknown.
+
+        Args:
+            pairing_request: PairingRequest received by the pairing agent.
+        """
+        adapter_interface = get_adapter_interface(pairing_request.device_path)
+        return self.adapter_contexts.get(adapter_interface, self.adapter_contexts[self.interface])
 
     def load_paired_devices(self):
         """Loads and displays all paired Bluetooth devices into the profiles list widget."""
         list_index = self.profiles_list_widget.count() - 1
-        self.paired_devices = self.bluetooth_device_manager.get_paired_devices()
+        self.paired_devices = self.device_state_cache.get_paired_devices()
         unique_devices = set(self.paired_devices.keys())
         for device_address in unique_devices:
             device_item = QListWidgetItem(device_address)
@@ -99,6 +308,9 @@ class TestApplication(QWidget):
             row: The row index in the grid layout where this entry should be placed.
             label: The text label to describe the data.
             value: The corresponding value to display alongside the label.
+
+        Returns:
+            The QLabel showing the value.
         """
         label_widget = QLabel(label)
         label_widget.setFont(QFont("Arial", 10, QFont.Weight.Bold))
@@ -110,6 +322,34 @@ class TestApplication(QWidget):
         value_widget.setStyleSheet(styles.color_style_sheet)
         self.grid.addWidget(label_widget, row, 0)
         self.grid.addWidget(value_widget, row, 1)
+        return value_widget
+
+    def populate_controller_details(self):
+        """Lays out one block of controller details rows per adapter; values are filled in once fetched."""
+        row = 0
+        for adapter_interface in self.interfaces:
+            if len(self.interfaces) > 1:
+                self.add_controller_details_row(row, "Interface", adapter_interface)
+                row += 1
+            for label, key in self.controller_detail_fields:
+                self.controller_detail_labels[(adapter_interface, key)] = self.add_controller_details_row(
+                    row, label, "Loading...")
+                row += 1
+            cached_details = self.controller_details_cache.get_details(adapter_interface)
+            if cached_details is not None:
+                self.update_controller_details(adapter_interface, cached_details)
+
+    def update_controller_details(self, adapter_interface, details):
+        """Shows freshly fetched details of a controller in its rows of the details grid.
+
+        Args:
+            adapter_interface: Bluetooth adapter interface (e.g., hci0).
+            details: Dict returned by get_controller_interface_details.
+        """
+        for _, key in self.controller_detail_fields:
+            value_widget = self.controller_detail_labels.get((adapter_interface, key))
+            if value_widget is not None:
+                value_widget.setText(details.get(key, "N/A"))
 
     def set_discoverable_mode(self, enable):
         """Enable or disable discoverable mode on the Bluetooth adapter.
@@ -122,7 +362,8 @@ class TestApplication(QWidget):
         if enable:
             self.set_discoverable_on_button.setEnabled(False)
             self.set_discoverable_off_button.setEnabled(True)
-            self.bluetooth_device_manager.set_discoverable_mode(True)
+            for adapter_context in self.get_target_adapters():
+                adapter_context.bluetooth_device_manager.set_discoverable_mode(True)
             timeout = self.gap_discoverable_timeout
             if timeout > 0:
                 self.discoverable_timeout_timer = QTimer()
@@ -133,7 +374,8 @@ class TestApplication(QWidget):
         else:
             self.set_discoverable_on_button.setEnabled(True)
             self.set_discoverable_off_button.setEnabled(False)
-            self.bluetooth_device_manager.set_discoverable_mode(False)
+            for adapter_context in self.get_target_adapters():
+                adapter_context.bluetooth_device_manager.set_discoverable_mode(False)
             if hasattr(self, 'discoverable_timeout_timer'):
                 self.discoverable_timeout_timer.stop()
             self.log.info("Discoverable mode is set to OFF")
@@ -146,7 +388,6 @@ class TestApplication(QWidget):
         if self.inquiry_timeout == 0:
             self.set_discovery_on_button.setEnabled(False)
             self.set_discovery_off_button.setEnabled(True)
-            self.bluetooth_device_manager.start_discovery()
         else:
             self.timer = QTimer()
             self.timer.timeout.connect(self.handle_discovery_timeout)
@@ -154,93 +395,102 @@ class TestApplication(QWidget):
             self.timer.start(self.inquiry_timeout)
             self.set_discovery_on_button.setEnabled(False)
             self.set_discovery_off_button.setEnabled(True)
-            self.bluetooth_device_manager.start_discovery()
-        self.log.info("Device discovery has started")
+        self.discovery_adapters = self.get_target_adapters()
+        self.display_discovered_devices()
+        for adapter_context in self.discovery_adapters:
+            adapter_context.bluetooth_device_manager.start_discovery()
+        self.log.info("Device discovery has started on %s",
+                      ", ".join(adapter_context.interface for adapter_context in self.discovery_adapters))
 
     def handle_discovery_timeout(self):
         """Handles the Bluetooth discovery timeout event"""
         self.timer.stop()
-        self.bluetooth_device_manager.stop_discovery()
+        for adapter_context in self.discovery_adapters:
+            adapter_context.bluetooth_device_manager.stop_discovery()
+        self.stop_discovery_updates()
         self.log.info("Discovery stopped due to timeout.")
-        self.display_discovered_devices()
 
     def stop_device_discovery(self):
         """Stops device Discovery"""
         self.gap_discovery_running = False
         self.set_discovery_off_button.setEnabled(False)
-        self.timer = QTimer()
-        if self.inquiry_timeout == 0:
-            self.bluetooth_device_manager.stop_discovery()
-            self.display_discovered_devices()
-        else:
+        if self.inquiry_timeout != 0:
             self.timer.stop()
-            self.bluetooth_device_manager.stop_discovery()
-            self.display_discovered_devices()
-            self.set_discovery_off_button.setEnabled(False)
+        for adapter_context in self.discovery_adapters:
+            adapter_context.bluetooth_device_manager.stop_discovery()
+        self.stop_discovery_updates()
         self.log.info("Device discovery has stopped")
 
     def display_discovered_devices(self):
-        """Display discovered devices in a table with options to pair or connect."""
-        self.timer.stop()
-        bold_font = QFont()
-        bold_font.setBold(True)
-        small_font = QFont()
-        small_font.setBold(True)
-        small_font.setPointSize(8)
-        discovered_devices = self.bluetooth_device_manager.get_discovered_devices()
-        self.clear_device_discovery_results()
-        self.table_widget = QTableWidget(0, 3)
-        self.table_widget.setHorizontalHeaderLabels(["DEVICE NAME", "BD_ADDR", "PROCEDURES"])
-        self.table_widget.setFont(bold_font)
-        header = self.table_widget.horizontalHeader()
-        header.setStyleSheet(styles.horizontal_header_style_sheet)
-        header.setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        vertical_header = self.table_widget.verticalHeader()
-        vertical_header.setStyleSheet(styles.vertical_header_style_sheet)
-        row = 0
-        for device in discovered_devices:
-            device_address = device["address"]
-            device_name = device["alias"]
-            device_path = device["path"]
-            self.table_widget.insertRow(row)
-            self.table_widget.setItem(row, 0, QTableWidgetItem(device_name))
-            self.table_widget.setItem(row, 1, QTableWidgetItem(device_address))
-            button_widget = QWidget()
-            button_layout = QHBoxLayout()
-            button_layout.setContentsMargins(0, 0, 0, 0)
-            button_layout.setSpacing(5)
-            pair_button = QPushButton("PAIR")
-            pair_button.setObjectName("PairButton")
-            pair_button.setFont(small_font)
-            pair_button.setStyleSheet(styles.color_style_sheet)
-            pair_button.clicked.connect(lambda _, addr = device_address: self.perform_device_action('pair', addr, load_profiles=False))
-            button_layout.addWidget(pair_button)
-            connect_button = QPushButton("CONNECT")
-            connect_button.setObjectName("ConnectButton")
-            connect_button.setFont(small_font)
-            connect_button.setStyleSheet(styles.color_style_sheet)
-            connect_button.clicked.connect(lambda _, addr = device_address: self.perform_device_action('connect', addr, load_profiles=False))
-            button_layout.addWidget(connect_button)
-            button_widget.setLayout(button_layout)
-            self.table_widget.setCellWidget(row, 2, button_widget)
-            row += 1
-        self.profile_methods_layout.insertWidget(self.profile_methods_layout.count() - 1, self.table_widget)
-        self.table_widget.show()
-        self.set_discovery_off_button.setEnabled(False)
+        """Display the live discovery table and stream the devices found by every discovery adapter into it."""
+        if not self.discovery_table_view:
+            bold_font = QFont()
+            bold_font.setBold(True)
+            self.discovery_table_view = QTableView()
+            self.discovery_table_view.setModel(self.discovered_devices_model)
+            self.discovery_table_view.setItemDelegateForColumn(DiscoveredDevicesModel.PROCEDURES_COLUMN,
+                                                               self.device_action_delegate)
+            self.discovery_table_view.setFont(bold_font)
+            header = self.discovery_table_view.horizontalHeader()
+            header.setStyleSheet(styles.horizontal_header_style_sheet)
+            header.setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+            vertical_header = self.discovery_table_view.verticalHeader()
+            vertical_header.setStyleSheet(styles.vertical_header_style_sheet)
+            self.profile_methods_layout.insertWidget(self.profile_methods_layout.count() - 1, self.discovery_table_view)
+        self.stop_discovery_updates()
+        self.discovered_devices_model.clear()
+        for adapter_context in self.discovery_adapters or self.get_target_adapters():
+            adapter_interface = adapter_context.interface
+            device_state_cache = adapter_context.device_state_cache
+            for device_address, device in device_state_cache.devices.items():
+                if "RSSI" in device:
+                    self.update_discovered_device(device_address, adapter_interface=adapter_interface)
+            self.discovery_update_connections += [
+                (device_state_cache.device_added, device_state_cache.device_added.connect(
+                    lambda addr, adapter=adapter_interface: self.update_discovered_device(addr,
+                                                                                          adapter_interface=adapter))),
+                (device_state_cache.device_changed, device_state_cache.device_changed.connect(
+                    lambda addr, changed, adapter=adapter_interface: self.update_discovered_device(addr, changed,
+                                                                                                   adapter))),
+            ]
+        self.discovery_table_view.show()
+
+    def update_discovered_device(self, device_address, changed_properties=None, adapter_interface=None):
+        """Inserts or updates the discovery table row of a device reported by BlueZ.
+
+        Args:
+            device_address: Bluetooth address of the device.
+            changed_properties: Names of the Device1 properties that changed, if known.
+            adapter_interface: Adapter that reported the device; defaults to the active one.
+        """
+        if changed_properties is not None and not {"RSSI", "Name", "Alias"}.intersection(changed_properties):
+            return
+        adapter_interface = adapter_interface or self.interface
+        device = self.adapter_contexts[adapter_interface].device_state_cache.get_device(device_address)
+        if "RSSI" not in device and not self.discovered_devices_model.contains(device_address, adapter_interface):
+            return
+        device_name = device.get("Alias") or device.get("Name") or device_address
+        self.discovered_devices_model.update_device(device_address, device_name, device.get("RSSI"),
+                                                    adapter_interface)
+
+    def stop_discovery_updates(self):
+        """Stops streaming device updates into the discovery table, leaving the results in place."""
+        for signal, connection in self.discovery_update_connections:
+            signal.disconnect(connection)
+        self.discovery_update_connections = []
 
     def clear_device_discovery_results(self):
         """Removes the discovery table if it exists to avoid stacking."""
-        if hasattr(self, 'table_widget') and self.table_widget:
-            self.profile_methods_layout.removeWidget(self.table_widget)
-            self.table_widget.deleteLater()
-            self.table_widget = None
+        if self.discovery_table_view:
+            self.profile_methods_layout.removeWidget(self.discovery_table_view)
+            self.discovery_table_view.deleteLater()
+            self.discovery_table_view = None
 
     def refresh_discovery_ui(self):
         """Refresh and clear the device discovery table."""
-        if hasattr(self, 'table_widget') and self.table_widget:
-            self.profile_methods_layout.removeWidget(self.table_widget)
-            self.table_widget.deleteLater()
-            self.table_widget = None
+        if self.discovery_table_view:
+            self.clear_device_discovery_results()
+            self.discovered_devices_model.clear()
             self.inquiry_timeout_input.setText("0")
             self.refresh_button.setEnabled(False)
             self.set_discovery_on_button.setEnabled(True)
@@ -267,6 +517,15 @@ class TestApplication(QWidget):
         device_item.setForeground(Qt.GlobalColor.black)
         self.profiles_list_widget.addItem(device_item)
 
+    def add_request_device_to_list(self, pairing_request):
+        """Adds the device of a pairing request to the paired devices list if it belongs to the active adapter.
+
+        Args:
+            pairing_request: PairingRequest that completed pairing.
+        """
+        if self.get_request_adapter(pairing_request).interface == self.interface:
+            self.add_paired_device_to_list(pairing_request.device_address)
+
     def clear_layout(self, layout):
         """Delete all widgets and sub-layouts from a layout.
 
@@ -297,14 +556,8 @@ class TestApplication(QWidget):
         else:
             selected_item_text = profile_name.strip()
         self.clear_device_discovery_results()
+        self.detach_device_tab_widget()
         self.clear_layout(self.profile_methods_layout)
-        if hasattr(self, 'device_tab_widget') and self.device_tab_widget:
-            self.device_tab_widget.currentChanged.disconnect(self.handle_profile_tab_change)
-            self.profile_methods_layout.removeWidget(self.device_tab_widget)
-            self.device_tab_widget.hide()
-            self.device_tab_widget.setParent(None)
-            self.device_tab_widget.deleteLater()
-            self.device_tab_widget = None
         QTimer.singleShot(0, lambda: (self.load_device_profile_tabs(selected_item_text)
         if validate_bluetooth_address(selected_item_text)else
         self.create_gap_profile_ui() if selected_item_text == "GAP"
@@ -314,6 +567,24 @@ class TestApplication(QWidget):
         """Build and display the widgets for the GAP profile."""
         bold_font = QFont()
         bold_font.setBold(True)
+        if len(self.interfaces) > 1:
+            controller_layout = QHBoxLayout()
+            controller_label = QLabel("Controller: ")
+            controller_label.setFont(bold_font)
+            controller_label.setStyleSheet(styles.color_style_sheet)
+            controller_combobox = QComboBox()
+            controller_combobox.setFont(QFont("Arial", 10))
+            controller_combobox.addItems(self.interfaces)
+            controller_combobox.setCurrentText(self.interface)
+            controller_combobox.currentTextChanged.connect(self.select_adapter)
+            all_adapters_checkbox = QCheckBox("All controllers")
+            all_adapters_checkbox.setFont(bold_font)
+            all_adapters_checkbox.setChecked(self.gap_all_adapters)
+            all_adapters_checkbox.toggled.connect(lambda checked: setattr(self, "gap_all_adapters", checked))
+            controller_layout.addWidget(controller_label)
+            controller_layout.addWidget(controller_combobox)
+            controller_layout.addWidget(all_adapters_checkbox)
+            self.profile_methods_layout.addLayout(controller_layout)
         label = QLabel("SetDiscoverable: ")
         label.setObjectName("SetDiscoverable")
         label.setFont(bold_font)
@@ -420,7 +691,7 @@ class TestApplication(QWidget):
         a2dp_label.setFont(QFont("Segoe UI", 12, QFont.Weight.Bold))
         a2dp_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
         layout.addWidget(a2dp_label)
-        is_connected = self.bluetooth_device_manager.is_device_connected(device_address)
+        is_connected = self.device_state_cache.is_device_connected(device_address)
         if not is_connected:
             warning_label = QLabel("Device is not connected. Connect to enable A2DP profile.")
             warning_label.setObjectName("WarningLabel")
@@ -433,7 +704,9 @@ class TestApplication(QWidget):
             return widget
         self.device_address_source = device_address
         self.device_address_sink = device_address
-        role = self.bluetooth_device_manager.get_a2dp_role_for_device(device_address)
+        role = self.a2dp_roles.get(device_address)
+        if role is None:
+            role = self.a2dp_roles[device_address] = self.bluetooth_device_manager.get_a2dp_role_for_device(device_address)
         if role == "sink":
             streaming_group = QGroupBox("Streaming Audio (A2DP Source)")
             streaming_group.setStyleSheet(styles.bluetooth_profiles_groupbox_style)
@@ -453,6 +726,9 @@ class TestApplication(QWidget):
             self.browse_audio_button.clicked.connect(self.select_audio_file)
             audio_layout.addWidget(self.browse_audio_button)
             streaming_layout.addLayout(audio_layout)
+            self.loop_stream_checkbox = QCheckBox("Loop playlist (soak)")
+            self.loop_stream_checkbox.setFont(bold_font)
+            streaming_layout.addWidget(self.loop_stream_checkbox)
             streaming_buttons_layout = QHBoxLayout()
             streaming_buttons_layout.setSpacing(12)
             self.start_streaming_button = QPushButton("Start Streaming")
@@ -462,9 +738,24 @@ class TestApplication(QWidget):
             self.stop_streaming_button = QPushButton("Stop Streaming")
             self.stop_streaming_button.setStyleSheet(styles.bluetooth_profiles_button_style)
             self.stop_streaming_button.clicked.connect(self.stop_a2dp_streaming)
-            self.stop_streaming_button.setEnabled(not self.start_streaming_button)
+            is_streaming = self.is_streaming_to(device_address)
+            self.start_streaming_button.setEnabled(not is_streaming)
+            self.stop_streaming_button.setEnabled(is_streaming)
             streaming_buttons_layout.addWidget(self.stop_streaming_button)
             streaming_layout.addLayout(streaming_buttons_layout)
+            stream_metrics_layout = QHBoxLayout()
+            buffer_label = QLabel("Buffer:")
+            buffer_label.setFont(bold_font)
+            stream_metrics_layout.addWidget(buffer_label)
+            self.stream_buffer_bar = QProgressBar()
+            self.stream_buffer_bar.setRange(0, 100)
+            self.stream_buffer_bar.setFixedHeight(18)
+            stream_metrics_layout.addWidget(self.stream_buffer_bar)
+            streaming_layout.addLayout(stream_metrics_layout)
+            self.stream_stats_label = QLabel("Underruns: 0 | Bitrate: 0.0 kbit/s")
+            streaming_layout.addWidget(self.stream_stats_label)
+            self.soak_stats_label = QLabel("")
+            streaming_layout.addWidget(self.soak_stats_label)
             streaming_group.setLayout(streaming_layout)
             layout.addWidget(streaming_group)
         elif role == "source":
@@ -502,6 +793,43 @@ class TestApplication(QWidget):
             self.rewind_button.clicked.connect(lambda: self.send_media_control_command("rewind"))
             control_buttons.addWidget(self.rewind_button)
             media_control_layout.addLayout(control_buttons)
+            script_layout = QGridLayout()
+            script_layout.setSpacing(10)
+            script_label = QLabel("Command Script:")
+            script_label.setFont(bold_font)
+            script_layout.addWidget(script_label, 0, 0)
+            self.media_script_input = QLineEdit(constants.media_control_default_script)
+            self.media_script_input.setFixedHeight(28)
+            self.media_script_input.setToolTip("Comma separated commands, each optionally followed by *count, "
+                                               "e.g. play,next*3,pause")
+            script_layout.addWidget(self.media_script_input, 0, 1, 1, 3)
+            repetitions_label = QLabel("Repetitions:")
+            repetitions_label.setFont(bold_font)
+            script_layout.addWidget(repetitions_label, 1, 0)
+            self.media_script_repetitions_input = QSpinBox()
+            self.media_script_repetitions_input.setRange(1, 100000)
+            self.media_script_repetitions_input.setValue(constants.media_control_default_repetitions)
+            script_layout.addWidget(self.media_script_repetitions_input, 1, 1)
+            rate_label = QLabel("Commands/s:")
+            rate_label.setFont(bold_font)
+            script_layout.addWidget(rate_label, 1, 2)
+            self.media_script_rate_input = QDoubleSpinBox()
+            self.media_script_rate_input.setRange(0.0, 100.0)
+            self.media_script_rate_input.setSingleStep(0.5)
+            self.media_script_rate_input.setSpecialValueText("No limit")
+            self.media_script_rate_input.setValue(constants.media_control_default_rate_hz)
+            script_layout.addWidget(self.media_script_rate_input, 1, 3)
+            is_script_running = bool(self.media_control_engine and self.media_control_engine.is_running())
+            self.media_script_button = QPushButton("Stop Script" if is_script_running else "Run Script")
+            self.media_script_button.setFont(bold_font)
+            self.media_script_button.setStyleSheet(styles.bluetooth_profiles_button_style)
+            self.media_script_button.clicked.connect(self.toggle_media_control_script)
+            script_layout.addWidget(self.media_script_button, 2, 0, 1, 4)
+            media_control_layout.addLayout(script_layout)
+            self.media_control_status_label = QLabel(self.media_control_engine.get_summary()
+                                                     if self.media_control_engine else "")
+            self.media_control_status_label.setWordWrap(True)
+            media_control_layout.addWidget(self.media_control_status_label)
             media_control_group.setLayout(media_control_layout)
             layout.addWidget(media_control_group)
         layout.addStretch(1)
@@ -523,7 +851,7 @@ class TestApplication(QWidget):
         opp_label.setFont(QFont("Segoe UI", 12, QFont.Weight.Bold))
         opp_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
         layout.addWidget(opp_label)
-        is_connected = self.bluetooth_device_manager.is_device_connected(device_address)
+        is_connected = self.device_state_cache.is_device_connected(device_address)
         if not is_connected:
             warning_label = QLabel("Device is not connected. Connect to enable OPP profile.")
             warning_label.setObjectName("WarningLabel")
@@ -541,7 +869,7 @@ class TestApplication(QWidget):
         opp_layout.setSpacing(10)
         opp_layout.setContentsMargins(10, 10, 10, 10)
         file_selection_layout = QHBoxLayout()
-        file_label = QLabel("Select File:")
+        file_label = QLabel("Select Files:")
         file_label.setFont(bold_font)
         file_selection_layout.addWidget(file_label)
         self.opp_location_input = QLineEdit()
@@ -554,13 +882,18 @@ class TestApplication(QWidget):
         self.browse_opp_button.clicked.connect(self.select_opp_file)
         file_selection_layout.addWidget(self.browse_opp_button)
         opp_layout.addLayout(file_selection_layout)
+        self.opp_all_devices_checkbox = QCheckBox("Send to all connected devices")
+        self.opp_all_devices_checkbox.setFont(bold_font)
+        opp_layout.addWidget(self.opp_all_devices_checkbox)
         button_layout = QHBoxLayout()
         self.send_file_button = QPushButton("Send File")
         self.send_file_button.setFont(bold_font)
         self.send_file_button.setStyleSheet(styles.bluetooth_profiles_button_style)
         self.send_file_button.clicked.connect(self.send_file)
         button_layout.addWidget(self.send_file_button)
-        self.receive_file_button = QPushButton("Receive File")
+        self.receive_file_button = QPushButton(
+            "Stop Receiving" if self.opp_receive_service and self.opp_receive_service.is_running()
+            else "Start Receiving")
         self.receive_file_button.setFont(bold_font)
         self.receive_file_button.setStyleSheet(styles.bluetooth_profiles_button_style)
         self.receive_file_button.clicked.connect(self.receive_file)
@@ -568,111 +901,363 @@ class TestApplication(QWidget):
         opp_layout.addLayout(button_layout)
         opp_group.setLayout(opp_layout)
         layout.addWidget(opp_group)
+        benchmark_group = QGroupBox("Throughput Benchmark")
+        benchmark_group.setStyleSheet(styles.bluetooth_profiles_groupbox_style)
+        benchmark_layout = QGridLayout()
+        benchmark_layout.setSpacing(10)
+        benchmark_layout.setContentsMargins(10, 10, 10, 10)
+        sizes_label = QLabel("Payload Sizes:")
+        sizes_label.setFont(bold_font)
+        benchmark_layout.addWidget(sizes_label, 0, 0)
+        self.opp_benchmark_sizes_input = QLineEdit(constants.opp_benchmark_default_sizes)
+        self.opp_benchmark_sizes_input.setFixedHeight(28)
+        benchmark_layout.addWidget(self.opp_benchmark_sizes_input, 0, 1)
+        repetitions_label = QLabel("Repetitions:")
+        repetitions_label.setFont(bold_font)
+        benchmark_layout.addWidget(repetitions_label, 1, 0)
+        self.opp_benchmark_repetitions_input = QSpinBox()
+        self.opp_benchmark_repetitions_input.setRange(1, 10000)
+        self.opp_benchmark_repetitions_input.setValue(constants.opp_benchmark_default_repetitions)
+        benchmark_layout.addWidget(self.opp_benchmark_repetitions_input, 1, 1)
+        is_benchmark_running = bool(self.opp_benchmark and self.opp_benchmark.is_running())
+        self.opp_benchmark_button = QPushButton("Stop Benchmark" if is_benchmark_running else "Run Benchmark")
+        self.opp_benchmark_button.setFont(bold_font)
+        self.opp_benchmark_button.setStyleSheet(styles.bluetooth_profiles_button_style)
+        self.opp_benchmark_button.clicked.connect(self.toggle_opp_benchmark)
+        benchmark_layout.addWidget(self.opp_benchmark_button, 2, 0, 1, 2)
+        self.opp_benchmark_status_label = QLabel(self.opp_benchmark.get_summary() if self.opp_benchmark else "")
+        self.opp_benchmark_status_label.setWordWrap(True)
+        benchmark_layout.addWidget(self.opp_benchmark_status_label, 3, 0, 1, 2)
+        benchmark_group.setLayout(benchmark_layout)
+        layout.addWidget(benchmark_group)
         layout.addStretch(1)
         widget = QWidget()
         widget.setLayout(layout)
         return widget
 
     def send_media_control_command(self, command):
-        """Sends a media control command to the connected Bluetooth device.
+        """Sends a media control command to the connected Bluetooth device without blocking the GUI.
+
+        The reply time and the time until the player acted on the command are shown below the buttons.
 
         Args:
             command: The media control command to send (e.g., "play", "pause", "next", "previous").
         """
-        self.bluetooth_device_manager.media_control(command, address=self.device_address_sink)
+        if self.media_control_engine and self.media_control_engine.is_running():
+            QMessageBox.warning(None, "Media Control", "Wait for the running media control commands to finish.")
+            return
+        from media_control_engine import MediaControlEngine
+        self.media_control_engine = MediaControlEngine(self.log, self.device_address_sink, [command],
+                                                       interface=self.interface, bus=self.device_state_cache.bus,
+                                                       latency_recorder=self.latency_recorder)
+        self.media_control_engine.command_finished.connect(
+            lambda sample: self.media_control_status_label.setText(sample.describe()))
+        self.media_control_engine.failed.connect(
+            lambda error: self.media_control_status_label.setText(f"{command} failed: {error}"))
+        self.media_control_engine.start()
         self.log.info("Media command %s sent to device %s.", command, self.device_address_sink)
 
+    def toggle_media_control_script(self):
+        """Starts the media control command script against the sink device, or stops the running one.
+
+        The report with the latency percentiles of every command is written as JSON to the log directory.
+        """
+        if self.media_control_engine and self.media_control_engine.is_running():
+            self.media_control_engine.stop()
+            self.media_control_status_label.setText(f"Stopped.\n{self.media_control_engine.get_summary()}")
+            self.media_script_button.setText("Run Script")
+            return
+        from media_control_engine import MediaControlEngine
+        from media_control_engine import parse_script
+        try:
+            commands = parse_script(self.media_script_input.text())
+        except ValueError as error:
+            QMessageBox.warning(None, "Media Control", f"Invalid command script: {error}")
+            return
+        if not commands or not self.device_address_sink:
+            QMessageBox.warning(None, "Media Control", "Please select a device and enter a command script.")
+            return
+        self.media_control_engine = MediaControlEngine(
+            self.log, self.device_address_sink, commands, self.media_script_repetitions_input.value(),
+            self.media_script_rate_input.value(), interface=self.interface, bus=self.device_state_cache.bus,
+            latency_recorder=self.latency_recorder)
+        self.media_control_engine.progress.connect(
+            lambda done, total: self.media_control_status_label.setText(
+                f"Command {done}/{total}\n{self.media_control_engine.get_summary()}"))
+        self.media_control_engine.finished.connect(self.save_media_control_report)
+        self.media_control_engine.failed.connect(
+            lambda error: self.media_control_status_label.setText(f"Script failed: {error}"))
+        self.media_control_engine.failed.connect(lambda _: self.media_script_button.setText("Run Script"))
+        self.media_control_engine.start()
+        self.media_control_status_label.setText("Looking up the media player...")
+        self.media_script_button.setText("Stop Script")
+
+    def save_media_control_report(self, report):
+        """Writes a finished media control script report to the log directory and shows its summary.
+
+        Args:
+            report: Report returned by MediaControlEngine.get_report.
+        """
+        from media_control_engine import save_report
+        report_path = os.path.join(self.log_path, f"media_control_{time.strftime('%Y%m%d_%H%M%S')}.json")
+        try:
+            save_report(report, report_path)
+            status = f"Report saved to {report_path}"
+        except OSError as error:
+            self.log.error("Cannot write media control report: %s", error)
+            status = f"Cannot write report: {error}"
+        self.media_control_status_label.setText(f"{status}\n{self.media_control_engine.get_summary(report)}")
+        self.media_script_button.setText("Run Script")
+
+    def is_streaming_to(self, device_address):
+        """Returns True if an A2DP streaming session to the device is running.
+
+        Args:
+            device_address: Bluetooth address of the remote device.
+        """
+        return bool(self.a2dp_session and self.a2dp_session.is_running()
+                    and self.a2dp_session.device_address == device_address)
+
     def start_a2dp_streaming(self):
-        """Start A2DP streaming to a selected Bluetooth sink device."""
-        audio_path = self.audio_location_input.text().strip()
-        if not audio_path or not os.path.exists(audio_path):
+        """Start streaming the selected playlist to a Bluetooth sink device, restarting it after link drops."""
+        audio_paths = [path for path in self.audio_location_input.text().split("; ") if path.strip()]
+        if not audio_paths or not all(os.path.exists(path) for path in audio_paths):
             QMessageBox.warning(self, "Invalid Audio File", "Please select a valid audio file to stream.")
             return
         self.log.info("Selected device address for streaming:%s", self.device_address_source)
         if not self.device_address_source:
             QMessageBox.warning(self, "No Device", "Please select a Bluetooth sink device to stream.")
             return
+        if self.a2dp_session:
+            self.a2dp_session.stop()
+        from a2dp_soak import A2dpSoakSession
+        self.a2dp_session = A2dpSoakSession(self.log, self.device_address_source, audio_paths,
+                                            self.loop_stream_checkbox.isChecked(), self.bluetooth_device_manager,
+                                            self.device_state_cache, latency_recorder=self.latency_recorder)
+        try:
+            self.a2dp_session.start()
+        except (OSError, RuntimeError, ValueError) as error:
+            self.log.error("Failed to start A2DP streaming with file: %s. Error: %s", audio_paths[0], error)
+            QMessageBox.critical(self, "Streaming Failed", f"Failed to start streaming:\n{error}")
+            self.a2dp_session = None
+            return
+        self.log.info("A2DP streaming successfully started with %d file(s)", len(audio_paths))
         self.start_streaming_button.setEnabled(False)
         self.stop_streaming_button.setEnabled(True)
-        success = self.bluetooth_device_manager.start_a2dp_stream(self.device_address_source, audio_path)
-        if success:
-            self.log.info("A2DP streaming successfully started with file: %s", audio_path)
-        else:
-            self.log.error("Failed to start A2DP streaming with file: %s", audio_path)
-            QMessageBox.critical(self, "Streaming Failed", "Failed to start streaming.")
-            self.start_streaming_button.setEnabled(True)
-            self.stop_streaming_button.setEnabled(False)
+        self.stream_metrics_timer.start(constants.a2dp_stream_metrics_interval_ms)
 
     def stop_a2dp_streaming(self):
         """Stop active A2DP streaming session."""
-        try:
-            self.bluetooth_device_manager.stop_a2dp_stream()
-        except Exception as error:
-            self.log.error("Failed to stop A2DP streaming for device: %s. Error: %s", self.device_address_source, error)
-            QMessageBox.critical(self, "Stop Streaming Failed", "Failed to stop A2DP streaming.")
-            return
+        if self.a2dp_session:
+            self.a2dp_session.stop()
         self.log.info("A2DP streaming stopped for device: %s", self.device_address_source)
-        self.start_streaming_button.setEnabled(True)
-        self.stop_streaming_button.setEnabled(False)
+        self.update_stream_metrics()
+
+    def update_stream_metrics(self):
+        """Shows buffer fill level, underruns, bitrate and soak statistics of the A2DP stream, and resets the controls once it ends."""
+        if not self.a2dp_session:
+            self.stream_metrics_timer.stop()
+            return
+        is_running = self.a2dp_session.is_running()
+        if self.stream_buffer_bar is not None and self.device_address_source == self.a2dp_session.device_address:
+            streamer = self.a2dp_session.streamer
+            if streamer:
+                metrics = streamer.get_metrics()
+                self.stream_buffer_bar.setValue(round(metrics["buffer_fill"] * 100))
+                self.stream_stats_label.setText(
+                    f"Underruns: {metrics['underruns']} | Bitrate: {metrics['bitrate_kbps']:.1f} kbit/s")
+            elif is_running:
+                self.stream_buffer_bar.setValue(0)
+                self.stream_stats_label.setText("Waiting for the device to reconnect...")
+            self.soak_stats_label.setText(self.a2dp_session.get_summary())
+            self.start_streaming_button.setEnabled(not is_running)
+            self.stop_streaming_button.setEnabled(is_running)
+        if not is_running:
+            self.stream_metrics_timer.stop()
+            self.a2dp_session = None
 
     def select_audio_file(self):
-        """Open a file dialog for selecting an audio file."""
+        """Open a file dialog for selecting the audio files of the playlist; formats other than WAV are decoded while streaming."""
         file_dialog = QFileDialog()
-        file_path, _ = file_dialog.getOpenFileName(caption="Select Audio File", filter="WAV files (*.wav)")
-        if file_path:
-            if os.path.exists(file_path) and file_path.lower().endswith('.wav'):
-                self.audio_location_input.setText(file_path)
-                self.log.info("Audio file selected.")
+        file_paths, _ = file_dialog.getOpenFileNames(
+            caption="Select Audio Files",
+            filter="Audio files (*.wav *.mp3 *.flac *.ogg *.opus *.aac *.m4a);;All files (*)")
+        if file_paths:
+            missing_paths = [path for path in file_paths if not os.path.exists(path)]
+            if not missing_paths:
+                self.audio_location_input.setText("; ".join(file_paths))
+                self.log.info("%d audio file(s) selected.", len(file_paths))
             else:
-                self.log.warning(f"Selected file is invalid or not a WAV file: {file_path}")
-                QMessageBox.warning(self, "Invalid File", "The selected file does not exist or is not a valid WAV file.")
+                self.log.warning(f"Selected audio files do not exist: {missing_paths}")
+                QMessageBox.warning(self, "Invalid File", "The selected file does not exist.")
 
     def select_opp_file(self):
-        """Open a file dialog to select a file to send via OPP."""
+        """Open a file dialog to select the files to send via OPP."""
         file_dialog = QFileDialog()
-        file_path, _ = file_dialog.getOpenFileName(None, "Select File to Send via OPP", "", "All Files (*)")
-        if file_path:
-            if not os.path.exists(file_path):
+        file_paths, _ = file_dialog.getOpenFileNames(None, "Select Files to Send via OPP", "", "All Files (*)")
+        if file_paths:
+            missing_paths = [path for path in file_paths if not os.path.exists(path)]
+            if missing_paths:
                 QMessageBox.critical(None, "Invalid File", "The selected file does not exist.")
-                self.log.error("Selected OPP file does not exist: %s", file_path)
+                self.log.error("Selected OPP files do not exist: %s", missing_paths)
                 return
-            self.opp_location_input.setText(file_path)
-            self.log.info("File selected to send via OPP")
+            self.opp_location_input.setText("; ".join(file_paths))
+            self.log.info("%d file(s) selected to send via OPP", len(file_paths))
 
     def send_file(self):
-        """Send a selected file to a remote device using OPP."""
-        file_path = self.opp_location_input.text()
-        if not file_path or not self.device_address:
+        """Queue the selected files for the current device, or for every connected device, in the OPP transfer queue.
+
+        The transfers run in the background; their progress is shown in the Transfers tab.
+        """
+        file_paths = [path for path in self.opp_location_input.text().split("; ") if path]
+        if self.opp_all_devices_checkbox.isChecked():
+            device_addresses = list(self.device_state_cache.get_connected_devices())
+        else:
+            device_addresses = [self.device_address] if self.device_address else []
+        if not file_paths or not device_addresses:
             QMessageBox.warning(None, "OPP", "Please select a device and a file.")
             return
-        self.send_file_button.setEnabled(False)
-        self.send_file_button.setText("Sending...")
         try:
-            status = self.bluetooth_device_manager.send_file(self.device_address, file_path)
-        except Exception as error:
-            status = "error"
-            self.log.info("UI error:%s", error)
-        self.send_file_button.setEnabled(True)
-        self.send_file_button.setText("Send File")
-        if status == "complete":
-            QMessageBox.information(None, "OPP", "File sent successfully!")
-        elif status == "queued":
-            QMessageBox.information(None, "OPP", "File transfer is queued. Please wait...")
-        elif status == "unknown":
-            QMessageBox.warning(None, "OPP", "File transfer status is unknown.")
-        else:
-            QMessageBox.warning(None, "OPP", "File transfer failed or was rejected.")
+            transfer_queue = self.get_opp_transfer_queue()
+        except dbus.exceptions.DBusException as error:
+            self.log.error("Cannot reach obexd: %s", error)
+            QMessageBox.critical(None, "OPP", f"Cannot reach obexd:\n{error}")
+            return
+        controller_details = self.controller_details_cache.get_details(self.interface) or {}
+        transfer_queue.add_transfers(device_addresses, file_paths, adapter_address=controller_details.get("BD_ADDR"))
+        if self.opp_transfers_tab is not None:
+            self.dump_logs_text_browser.setCurrentWidget(self.opp_transfers_tab)
+
+    def toggle_opp_benchmark(self):
+        """Starts the OPP throughput benchmark against the current device, or stops the running one.
+
+        The report is written as JSON to the log directory when all runs are done.
+        """
+        if self.opp_benchmark and self.opp_benchmark.is_running():
+            self.opp_benchmark.stop()
+            self.opp_benchmark_status_label.setText(f"Stopped.\n{self.opp_benchmark.get_summary()}")
+            self.opp_benchmark_button.setText("Run Benchmark")
+            return
+        from opp_benchmark import OppBenchmark
+        from opp_benchmark import parse_sizes
+        try:
+            sizes = parse_sizes(self.opp_benchmark_sizes_input.text())
+        except ValueError as error:
+            QMessageBox.warning(None, "OPP Benchmark", f"Invalid payload sizes: {error}")
+            return
+        if not sizes or not self.device_address:
+            QMessageBox.warning(None, "OPP Benchmark", "Please select a device and payload sizes.")
+            return
+        controller_details = self.controller_details_cache.get_details(self.interface) or {}
+        try:
+            self.opp_benchmark = OppBenchmark(
+                self.log, self.device_address, sizes, self.opp_benchmark_repetitions_input.value(),
+                os.path.join(self.log_path, constants.opp_benchmark_payload_directory_name),
+                adapter_address=controller_details.get("BD_ADDR"))
+        except dbus.exceptions.DBusException as error:
+            self.log.error("Cannot reach obexd: %s", error)
+            QMessageBox.critical(None, "OPP Benchmark", f"Cannot reach obexd:\n{error}")
+            return
+        self.opp_benchmark.progress.connect(
+            lambda done, total: self.opp_benchmark_status_label.setText(
+                f"Run {done}/{total}\n{self.opp_benchmark.get_summary()}"))
+        self.opp_benchmark.finished.connect(self.save_opp_benchmark_report)
+        self.opp_benchmark.failed.connect(
+            lambda error: self.opp_benchmark_status_label.setText(f"Benchmark failed: {error}"))
+        self.opp_benchmark.failed.connect(lambda _: self.opp_benchmark_button.setText("Run Benchmark"))
+        self.opp_benchmark.start()
+        self.opp_benchmark_status_label.setText("Generating payloads...")
+        self.opp_benchmark_button.setText("Stop Benchmark")
+
+    def save_opp_benchmark_report(self, report):
+        """Writes a finished OPP benchmark report to the log directory and shows its summary.
+
+        Args:
+            report: Report returned by OppBenchmark.get_report.
+        """
+        from opp_benchmark import save_report
+        report_path = os.path.join(self.log_path, f"opp_benchmark_{time.strftime('%Y%m%d_%H%M%S')}.json")
+        try:
+            save_report(report, report_path)
+            status = f"Report saved to {report_path}"
+        except OSError as error:
+            self.log.error("Cannot write OPP benchmark report: %s", error)
+            status = f"Cannot write report: {error}"
+        self.opp_benchmark_status_label.setText(f"{status}\n{self.opp_benchmark.get_summary()}")
+        self.opp_benchmark_button.setText("Run Benchmark")
+
+    def get_opp_transfer_queue(self):
+        """Returns the OPP transfer queue, connecting to obexd on first use."""
+        if self.opp_transfer_queue is None:
+            from opp_transfer_queue import OppTransferQueue
+            self.opp_transfer_queue = OppTransferQueue(self.log, latency_recorder=self.latency_recorder)
+            self.opp_transfer_queue.start()
+        return self.opp_transfer_queue
 
     def receive_file(self):
-        """Start OPP receiver and handle file transfer."""
+        """Start or stop the background OPP receive service.
+
+        Incoming pushes are answered by the OPP accept rules or, when no rule applies, by a
+        non-modal prompt; received files are listed in the Incoming tab.
+        """
         try:
-            received_file_path = self.bluetooth_device_manager.receive_file(user_confirm_callback=self.prompt_file_transfer_confirmation)
-            if received_file_path:
-                QMessageBox.information(None, "File Received", f"File received successfully:\n{received_file_path}")
+            receive_service = self.get_opp_receive_service()
+            if receive_service.is_running():
+                receive_service.stop()
             else:
-                QMessageBox.warning(None, "File Transfer", "No file received or user declined the transfer.")
-        except Exception as error:
-            QMessageBox.critical(None, "Error", f"An error occurred during file reception:\n{str(error)}")
+                receive_service.start()
+        except dbus.exceptions.DBusException as error:
+            self.log.error("Cannot start the OPP receive service: %s", error)
+            QMessageBox.critical(None, "Error", f"Cannot start the OPP receive service:\n{error}")
+            return
+        if receive_service.is_running() and self.opp_incoming_tab is not None:
+            self.dump_logs_text_browser.setCurrentWidget(self.opp_incoming_tab)
+
+    def get_opp_receive_service(self):
+        """Returns the OPP receive service, connecting to obexd on first use; the service is not started."""
+        if self.opp_receive_service is None:
+            from opp_receive_service import OppReceiveService
+            self.opp_receive_service = OppReceiveService(
+                self.log, os.path.join(self.log_path, constants.opp_spool_directory_name),
+                accept_rules=self.opp_accept_rules, latency_recorder=self.latency_recorder)
+            self.opp_receive_service.authorization_requested.connect(self.handle_incoming_push)
+            self.opp_receive_service.running_changed.connect(self.update_receive_file_buttons)
+        return self.opp_receive_service
+
+    def update_receive_file_buttons(self, running):
+        """Relabels the receive buttons of the cached OPP panels after the receive service started or stopped.
+
+        Args:
+            running: True if the service is running.
+        """
+        for profile_panel in self.profile_panel_cache.panels.values():
+            receive_file_button = profile_panel.attributes.get("receive_file_button")
+            if receive_file_button is not None:
+                receive_file_button.setText("Stop Receiving" if running else "Start Receiving")
+
+    def handle_incoming_push(self, transfer):
+        """Asks the user about an incoming push no accept rule answered, without blocking other transfers.
+
+        Args:
+            transfer: Pending IncomingTransfer.
+        """
+        message_box = QMessageBox(QMessageBox.Icon.Question, "Incoming File",
+                                  f"{transfer.sender_address} wants to send {transfer.file_name} "
+                                  f"({transfer.size // 1024} KB).\nAccept?",
+                                  QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, self)
+        message_box.setModal(False)
+        message_box.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+
+        def on_finished(_):
+            transfer.prompt = None
+            if message_box.clickedButton() == message_box.button(QMessageBox.StandardButton.Yes):
+                self.opp_receive_service.accept(transfer.transfer_id)
+            else:
+                self.opp_receive_service.reject(transfer.transfer_id, "rejected by user")
+
+        message_box.finished.connect(on_finished)
+        transfer.prompt = message_box
+        message_box.show()
 
     def handle_profile_tab_change(self, index):
         """Handles actions to perform when the user switches between profile tabs in the UI.
@@ -680,35 +1265,72 @@ class TestApplication(QWidget):
         Args:
             index: The index of the newly selected tab in the profile tab widget.
         """
-        if not hasattr(self, 'device_tab_widget') or index < 0:
+        if not self.device_tab_widget or index < 0:
+            return
+        profile_panel = self.device_tab_widget.widget(index)
+        self.refresh_profile_panel(profile_panel)
+        for name, value in profile_panel.attributes.items():
+            setattr(self, name, value)
+
+    def refresh_profile_panel(self, profile_panel):
+        """Builds the content of a cached profile panel if it is missing or outdated.
+
+        Args:
+            profile_panel: ProfilePanel of the device profile being shown.
+        """
+        is_connected = self.device_state_cache.is_device_connected(profile_panel.device_address)
+        if not profile_panel.is_stale(is_connected):
+            return
+        attribute_names = self.profile_panel_attributes[profile_panel.profile]
+        for name in attribute_names:
+            setattr(self, name, None)
+        if profile_panel.profile == "A2DP":
+            content = self.create_a2dp_profile_ui(profile_panel.device_address)
+        else:
+            content = self.create_opp_profile_ui(profile_panel.device_address)
+        profile_panel.set_content(content, is_connected, {name: getattr(self, name) for name in attribute_names})
+
+    def update_profile_panels(self, adapter_interface, device_address, changed_properties):
+        """Marks the cached panels of a device as outdated when its connection state or services change.
+
+        The panel on screen is rebuilt in place right away; the others are rebuilt when shown again.
+
+        Args:
+            adapter_interface: Adapter interface reporting the change.
+            device_address: Bluetooth address of the device.
+            changed_properties: Names of the Device1 properties that changed.
+        """
+        if adapter_interface != self.interface or not {"Connected", "UUIDs"}.intersection(changed_properties):
+            return
+        if "UUIDs" in changed_properties:
+            self.a2dp_roles.pop(device_address, None)
+        for profile_panel in self.profile_panel_cache.get_device_panels(device_address):
+            profile_panel.invalidate()
+        if self.device_tab_widget and self.device_tab_widget.isVisible():
+            self.handle_profile_tab_change(self.device_tab_widget.currentIndex())
+
+    def detach_device_tab_widget(self):
+        """Takes the reusable profile tab widget out of the profile area so clearing the area keeps it alive."""
+        if self.device_tab_widget is None or self.profile_methods_layout.indexOf(self.device_tab_widget) < 0:
             return
-        selected_tab = self.device_tab_widget.tabText(index)
-        if selected_tab == "A2DP":
-            self.clear_layout(self.a2dp_tab_placeholder)
-            layout = QVBoxLayout()
-            a2dp_panel = self.create_a2dp_profile_ui(self.device_address)
-            self.log.info(self.device_address)
-            layout.addWidget(a2dp_panel)
-            self.a2dp_tab_placeholder.setLayout(layout)
-            self.a2dp_tab_placeholder.update()
-        elif selected_tab == "OPP":
-            self.clear_layout(self.opp_tab_placeholder)
-            layout = QVBoxLayout()
-            opp_tab = self.create_opp_profile_ui(self.device_address)
-            layout.addWidget(opp_tab)
-            self.opp_tab_placeholder.setLayout(layout)
-            self.opp_tab_placeholder.update()
+        self.profile_methods_layout.removeWidget(self.device_tab_widget)
+        self.device_tab_widget.hide()
+        self.device_tab_widget.setParent(self)
 
     def load_device_profile_tabs(self, device_address):
         """Loads and displays profile-related UI tabs for a specific Bluetooth device.
 
+        The tab pages come from the profile panel cache, so a device shown before is displayed
+        without rebuilding its panels.
+
         Args:
             device_address: Bluetooth address of the remote device.
         """
         bold_font = QFont()
         bold_font.setBold(True)
-        is_connected = self.bluetooth_device_manager.is_device_connected(device_address)
+        is_connected = self.device_state_cache.is_device_connected(device_address)
         self.device_address = device_address
+        self.detach_device_tab_widget()
         if not is_connected:
             warning_label = QLabel("Device is not connected. Connect to enable profile controls.")
             warning_label.setObjectName("WarningLabel")
@@ -718,19 +1340,22 @@ class TestApplication(QWidget):
             self.profile_methods_layout.addWidget(warning_label)
             self.add_device_connection_controls(self.profile_methods_layout, device_address)
             return
-        self.device_tab_widget = QTabWidget()
-        self.device_tab_widget.setMaximumWidth(600)
-        self.device_tab_widget.setFont(bold_font)
-        self.device_tab_widget.setStyleSheet(styles.device_tab_widget_style_sheet)
-        self.a2dp_tab_placeholder = QWidget()
-        self.a2dp_tab_placeholder.setMaximumWidth(600)
-        self.opp_tab_placeholder = QWidget()
-        self.opp_tab_placeholder.setMaximumWidth(600)
-        self.device_tab_widget.addTab(self.a2dp_tab_placeholder, "A2DP")
-        self.device_tab_widget.addTab(self.opp_tab_placeholder, "OPP")
-        self.device_tab_widget.currentChanged.connect(self.handle_profile_tab_change)
+        if self.device_tab_widget is None:
+            self.device_tab_widget = QTabWidget()
+            self.device_tab_widget.setMaximumWidth(600)
+            self.device_tab_widget.setFont(bold_font)
+            self.device_tab_widget.setStyleSheet(styles.device_tab_widget_style_sheet)
+            self.device_tab_widget.currentChanged.connect(self.handle_profile_tab_change)
+        current_index = max(self.device_tab_widget.currentIndex(), 0)
+        self.device_tab_widget.blockSignals(True)
+        self.device_tab_widget.clear()
+        for profile in ("A2DP", "OPP"):
+            self.device_tab_widget.addTab(self.profile_panel_cache.get(device_address, profile), profile)
+        self.device_tab_widget.setCurrentIndex(current_index)
+        self.device_tab_widget.blockSignals(False)
         self.clear_layout(self.profile_methods_layout)
         self.profile_methods_layout.addWidget(self.device_tab_widget)
+        self.device_tab_widget.show()
         self.handle_profile_tab_change(self.device_tab_widget.currentIndex())
         self.add_device_connection_controls(self.profile_methods_layout, device_address)
 
@@ -744,8 +1369,8 @@ class TestApplication(QWidget):
         bold_font = QFont()
         bold_font.setBold(True)
         button_layout = QHBoxLayout()
-        self.is_connected = self.bluetooth_device_manager.is_device_connected(device_address)
-        self.is_paired = device_address in self.bluetooth_device_manager.get_paired_devices()
+        self.is_connected = self.device_state_cache.is_device_connected(device_address)
+        self.is_paired = device_address in self.device_state_cache.get_paired_devices()
         self.connect_button = QPushButton("Connect")
         self.connect_button.setFont(bold_font)
         self.connect_button.setStyleSheet(styles.bluetooth_profiles_button_style)
@@ -780,24 +1405,63 @@ class TestApplication(QWidget):
         """Handle the timeout when pairing takes too long."""
         self.pairing_in_progress = False
 
-    def perform_device_action(self, action, device_address, load_profiles):
-        device_action =constants.device_action_map.get(action)
-        if not device_action:
-            self.log.error("Unknown action: %s", action)
+    def perform_device_action(self, action, device_address, load_profiles, adapter_interface=None):
+        """Queues a Bluetooth device action on the background executor of an adapter.
+
+        Args:
+            action: One of 'pair', 'connect', 'disconnect', or 'unpair'.
+            device_address: The Bluetooth address of the device.
+            load_profiles: If True, refreshes the profile tabs after a connect.
+            adapter_interface: Adapter to run the action on; defaults to the active one.
+        """
+        device_action_executor = self.adapter_contexts[adapter_interface or self.interface].device_action_executor
+        action_in_progress = device_action_executor.get_action_in_progress(device_address)
+        if action_in_progress:
+            QMessageBox.information(self, action.capitalize(), f"{device_address}: {action_in_progress} is already in progress.")
             return
-        method_name = device_action["method"]
-        method = getattr(self.bluetooth_device_manager, method_name)
-        result = method(device_address)
-        self.log.info("Performing %s on %s", method_name, device_address)
+        if device_action_executor.submit(action, device_address):
+            self.pending_load_profiles[device_address] = load_profiles
+
+    def handle_device_action_result(self, action, device_address, result, adapter_interface=None):
+        """Shows the outcome of a finished device action and runs its post action.
+
+        Args:
+            action: Key of the finished action in device_action_map.
+            device_address: The Bluetooth address of the device.
+            result: True if the action succeeded.
+            adapter_interface: Adapter that ran the action; defaults to the active one.
+        """
+        device_action = constants.device_action_map[action]
+        load_profiles = self.pending_load_profiles.pop(device_address, False)
+        self.adapter_contexts[adapter_interface or self.interface].device_state_cache.refresh_device(device_address)
+        self.update_device_action_status(None, device_address)
         message = device_action["success"] if result else device_action["failure"]
         message_popup = QMessageBox.information if result else QMessageBox.warning
         message_popup(self, action.capitalize(), f"{device_address}: {message}")
+        if adapter_interface and adapter_interface != self.interface:
+            return
         post_method = getattr(self, device_action["post_action"])
         if action == "connect" and load_profiles:
             post_method(device_address)
         elif action!="connect":
             post_method(device_address)
 
+    def update_device_action_status(self, action, device_address):
+        """Reflects the in-flight action of a device on its paired devices list entry.
+
+        Args:
+            action: Action currently running on the device, or None when idle.
+            device_address: The Bluetooth address of the device.
+        """
+        for i in range(self.profiles_list_widget.count()):
+            device_item = self.profiles_list_widget.item(i)
+            if device_item.text().strip() == device_address:
+                font = device_item.font()
+                font.setItalic(bool(action))
+                device_item.setFont(font)
+                device_item.setToolTip(f"{action} in progress..." if action else "")
+                break
+
     '''def perform_device_action(self, action, device_address, load_profiles):
         """Performs a Bluetooth device action and updates the UI.
 
@@ -860,6 +1524,8 @@ class TestApplication(QWidget):
             if item_text == unpaired_device_address:
                 self.profiles_list_widget.takeItem(i)
                 break
+        self.profile_panel_cache.remove_device(unpaired_device_address)
+        self.a2dp_roles.pop(unpaired_device_address, None)
         if self.profiles_list_widget.count() == 1:
             self.profiles_list_widget.itemSelectionChanged.connect(self.handle_profile_selection)
         else:
@@ -870,7 +1536,11 @@ class TestApplication(QWidget):
         self.selected_capability = self.capability_combobox.currentText()
         self.log.info("Attempting to register agent with capability:%s", self.selected_capability)
         try:
-            self.bluetooth_device_manager.register_agent(capability=self.selected_capability, ui_callback = self.handle_pairing_request)
+            if self.pairing_agent:
+                unregister_pairing_agent(self.pairing_agent)
+                self.pairing_agent = None
+            self.pairing_agent = register_pairing_agent(dbus.SystemBus(), self.selected_capability,
+                                                        self.pairing_request_queue.add_request)
             QMessageBox.information(self, "Agent Registered", f"Agent registered with capability: {self.selected_capability}")
         except Exception as error:
             self.log.info("Failed to register agent:%s", error)
@@ -918,20 +1588,21 @@ class TestApplication(QWidget):
         controller_label.setFont(QFont("Arial", 11, QFont.Weight.Bold))
         controller_label.setStyleSheet(styles.color_style_sheet)
         controller_layout.addWidget(controller_label)
-        details = get_controller_interface_details(self.log, interface=self.interface, detail_level='extended_info')
         self.grid = QGridLayout()
         self.grid.setHorizontalSpacing(10)
         self.grid.setVerticalSpacing(12)
         self.grid.setColumnStretch(0, 1)
         self.grid.setColumnStretch(1, 2)
-        self.add_controller_details_row(0, "Controller Name", details.get("Name", "N/A"))
-        self.add_controller_details_row(1, "Controller Address", details.get("BD_ADDR", "N/A"))
-        self.add_controller_details_row(2, "Link Mode", details.get("Link mode", "N/A"))
-        self.add_controller_details_row(3, "Link Policy", details.get("Link policy", "N/A"))
-        self.add_controller_details_row(4, "HCI Version", details.get("HCI Version", "N/A"))
-        self.add_controller_details_row(5, "LMP Version", details.get("LMP Version", "N/A"))
-        self.add_controller_details_row(6, "Manufacturer", details.get("Manufacturer", "N/A"))
-        controller_layout.addLayout(self.grid)
+        self.populate_controller_details()
+        if len(self.interfaces) > 1:
+            details_widget = QWidget()
+            details_widget.setLayout(self.grid)
+            details_scroll_area = QScrollArea()
+            details_scroll_area.setWidgetResizable(True)
+            details_scroll_area.setWidget(details_widget)
+            controller_layout.addWidget(details_scroll_area)
+        else:
+            controller_layout.addLayout(self.grid)
         self.main_grid_layout.addWidget(controller_details_widget, 5, 0, 8, 2)
         # Grid2: Profile description
         profile_description_label = QLabel("Profile Methods or Procedures:")
@@ -950,7 +1621,7 @@ class TestApplication(QWidget):
         back_button = QPushButton("Back")
         back_button.setFixedSize(100, 40)
         back_button.setStyleSheet(styles.back_button_style_sheet)
-        back_button.clicked.connect(lambda: self.back_callback())
+        back_button.clicked.connect(self.go_back)
         back_layout = QHBoxLayout()
         back_layout.addWidget(back_button)
         back_layout.setAlignment(Qt.AlignmentFlag.AlignLeft)
@@ -959,8 +1630,12 @@ class TestApplication(QWidget):
         self.main_grid_layout.setColumnStretch(1, 0)
         self.main_grid_layout.setColumnStretch(2, 1)
         self.setLayout(self.main_grid_layout)
-        self.load_paired_devices()
-        self.setup_dump_logs_section()
+        with self.startup_trace.phase("paired devices"):
+            self.load_paired_devices()
+        with self.startup_trace.phase("dump logs section"):
+            self.setup_dump_logs_section()
+        QTimer.singleShot(0, lambda: [self.controller_details_cache.request(adapter_interface)
+                                      for adapter_interface in self.interfaces])
 
     def setup_dump_logs_section(self):
         """Initializes the dump logs tab section with log viewers for Bluetoothd, Pulseaudio, HCI Dump, Obexd, and Ofonod."""
@@ -975,260 +1650,414 @@ class TestApplication(QWidget):
         self.dump_logs_text_browser.setStyleSheet(styles.tab_style_sheet)
         self.dump_logs_text_browser.setUsesScrollButtons(True)
         self.main_grid_layout.addWidget(self.dump_logs_text_browser, 1, 4, 12, 2)
-        self.setup_bluetoothd_log()
-        self.setup_pulseaudio_log()
-        self.setup_hcidump_log()
-        self.setup_obexd_log()
-        self.setup_ofonod_log()
-
-    def setup_bluetoothd_log(self):
-        """Sets up the Bluetoothd log viewer tab and connects it to the log file for live updates."""
-        normal_font = QFont()
-        normal_font.setBold(False)
-        self.bluetoothd_log_text_browser = QTextEdit()
-        self.bluetoothd_log_text_browser.setFont(normal_font)
-        self.bluetoothd_log_text_browser.setMinimumWidth(50)
-        self.bluetoothd_log_text_browser.setReadOnly(True)
-        self.bluetoothd_log_text_browser.setStyleSheet(styles.transparent_textedit_style)
-        self.dump_logs_text_browser.addTab(self.bluetoothd_log_text_browser, "Bluetoothd_Logs")
-        self.bluetoothd_log_file_fd = open(self.bluetoothd_log_file_path, "r")
-        if self.bluetoothd_log_file_fd:
-            content = self.bluetoothd_log_file_fd.read()
-            self.bluetoothd_log_text_browser.append(content)
-            self.bluetoothd_file_position = self.bluetoothd_log_file_fd.tell()
-        self.bluetoothd_file_watcher = QFileSystemWatcher()
-        self.bluetoothd_file_watcher.addPath(self.bluetoothd_log_file_path)
-        self.bluetoothd_file_watcher.fileChanged.connect(self.update_bluetoothd_log)
-
-    def setup_pulseaudio_log(self):
-        """Sets up the Pulseaudio log viewer tab and connects it to the log file for live updates."""
-        normal_font = QFont()
-        normal_font.setBold(False)
-        self.pulseaudio_log_text_browser = QTextEdit()
-        self.pulseaudio_log_text_browser.setFont(normal_font)
-        self.pulseaudio_log_text_browser.setMinimumWidth(50)
-        self.pulseaudio_log_text_browser.setReadOnly(True)
-        self.pulseaudio_log_text_browser.setStyleSheet(styles.transparent_textedit_style)
-        self.dump_logs_text_browser.addTab(self.pulseaudio_log_text_browser, "Pulseaudio_Logs")
-        self.pulseaudio_log_file_fd = open(self.pulseaudio_log_file_path, "r")
-        if self.pulseaudio_log_file_fd:
-            content = self.pulseaudio_log_file_fd.read()
-            self.pulseaudio_log_text_browser.append(content)
-            self.pulseaudio_file_position = self.pulseaudio_log_file_fd.tell()
-        self.pulseaudio_file_watcher = QFileSystemWatcher()
-        self.pulseaudio_file_watcher.addPath(self.pulseaudio_log_file_path)
-        self.pulseaudio_file_watcher.fileChanged.connect(self.update_pulseaudio_log)
-
-    def setup_hcidump_log(self):
-        """Sets up the Hcidump log viewer tab and connects it to the log file for live updates."""
-        normal_font = QFont()
-        normal_font.setBold(False)
-        self.hci_dump_log_text_browser = QTextEdit()
-        self.hci_dump_log_text_browser.setFont(normal_font)
-        self.hci_dump_log_text_browser.setMinimumWidth(50)
-        self.hci_dump_log_text_browser.setReadOnly(True)
-        self.hci_dump_log_text_browser.setStyleSheet(styles.transparent_textedit_style)
-        self.dump_logs_text_browser.addTab(self.hci_dump_log_text_browser, "HCI_Dump_Logs")
-        self.hci_log_file_fd = open(self.hcidump_log_name, "r")
-        if self.hci_log_file_fd:
-            content = self.hci_log_file_fd.read()
-            self.hci_dump_log_text_browser.append(content)
-            self.hci_file_position = self.hci_log_file_fd.tell()
-        self.hci_file_watcher = QFileSystemWatcher()
-        self.hci_file_watcher.addPath(self.hcidump_log_name)
-        self.hci_file_watcher.fileChanged.connect(self.update_hci_log)
-
-    def setup_obexd_log(self):
-        """Sets up the Obexd log viewer tab and connects it to the log file for live updates."""
-        normal_font = QFont()
-        normal_font.setBold(False)
-        self.obexd_log_text_browser = QTextEdit()
-        self.obexd_log_text_browser.setFont(normal_font)
-        self.obexd_log_text_browser.setMinimumWidth(50)
-        self.obexd_log_text_browser.setReadOnly(True)
-        self.obexd_log_text_browser.setStyleSheet(styles.transparent_textedit_style)
-        self.dump_logs_text_browser.addTab(self.obexd_log_text_browser, "Obexd_Logs")
-        self.obexd_log_file_fd = open(self.obexd_log_file_path, "r")
-        if self.obexd_log_file_fd:
-            content = self.obexd_log_file_fd.read()
-            self.obexd_log_text_browser.append(content)
-            self.obexd_file_position = self.obexd_log_file_fd.tell()
-        self.obexd_file_watcher = QFileSystemWatcher()
-        self.obexd_file_watcher.addPath(self.obexd_log_file_path)
-        self.obexd_file_watcher.fileChanged.connect(self.update_obexd_log)
-
-    def setup_ofonod_log(self):
-        """Sets up the Ofonod log viewer tab and connects it to the log file for live updates."""
+        self.log_viewers = {}
+        self.log_buffers = {}
+        self.log_tabs = {}
+        self.log_index = None
+        self.log_tailer = LogTailer(self.log)
+        self.log_tailer.data_read.connect(self.update_log_viewer)
+        self.log_tailer.source_reset.connect(self.reset_log_buffer)
+        from log_index import LogIndexer
+        self.log_indexer = LogIndexer(self.log, os.path.join(self.log_path, constants.log_index_file_name))
+        self.log_tailer.data_read.connect(self.log_indexer.index_chunk)
+        self.log_tailer.source_reset.connect(self.log_indexer.reset_source)
+        log_sources = [
+            ("bluetoothd", "Bluetoothd_Logs", self.bluetoothd_log_file_path),
+            ("pulseaudio", "Pulseaudio_Logs", self.pulseaudio_log_file_path),
+            ("hcidump", "HCI_Dump_Logs", self.hcidump_log_name),
+            ("obexd", "Obexd_Logs", self.obexd_log_file_path),
+            ("ofonod", "Ofonod_Logs", self.ofonod_log_file_path),
+        ]
+        self.hci_dump_panel = None
+        self.log_tailer.source_reset.connect(lambda name: self.reset_hci_dump(name))
+        for name, tab_title, file_path in log_sources:
+            self.setup_log_tab(name, tab_title, file_path)
+        # hcidump output read before the HCI_Parsed tab is opened is parsed from the file when it is built.
+        self.hci_dump_start_position = self.hci_dump_end_position = self.log_buffers["hcidump"].tail_position
+        self.dump_logs_text_browser.addTab(DeferredWidget(self.create_hci_dump_panel), "HCI_Parsed")
+        source_paths = {name: file_path for name, _, file_path in log_sources}
+        self.dump_logs_text_browser.addTab(DeferredWidget(lambda: self.create_log_search_panel(list(source_paths))),
+                                           "Search")
+        self.dump_logs_text_browser.addTab(DeferredWidget(lambda: self.create_log_timeline_panel(source_paths)),
+                                           "Timeline")
+        self.dump_logs_text_browser.addTab(DeferredWidget(self.create_latency_stats_panel), "Stats")
+        self.opp_transfers_tab = DeferredWidget(self.create_opp_transfers_panel)
+        self.dump_logs_text_browser.addTab(self.opp_transfers_tab, "Transfers")
+        self.opp_incoming_tab = DeferredWidget(self.create_opp_incoming_panel)
+        self.dump_logs_text_browser.addTab(self.opp_incoming_tab, "Incoming")
+
+    def setup_log_tab(self, name, tab_title, file_path):
+        """Adds a log viewer tab and starts tailing its log file for live updates.
+
+        The viewer itself is created when the tab is first shown; until then new log lines are
+        kept in a LogLineBuffer.
+
+        Args:
+            name: Name of the log source (e.g. 'bluetoothd').
+            tab_title: Title of the tab in the dump logs section.
+            file_path: Path of the log file.
+        """
+        tail_position = os.path.getsize(file_path) if os.path.exists(file_path) else 0
+        self.log_buffers[name] = LogLineBuffer(tail_position)
+        self.log_tabs[name] = DeferredWidget(lambda: self.create_log_viewer(name, file_path))
+        self.dump_logs_text_browser.addTab(self.log_tabs[name], tab_title)
+        self.log_indexer.track_source(name, file_path, tail_position)
+        self.log_tailer.add_source(name, file_path, tail_position)
+
+    def create_log_viewer(self, name, file_path):
+        """Creates the viewer of a log source from the end of its file and the lines buffered since startup.
+
+        Args:
+            name: Name of the log source.
+            file_path: Path of the log file.
+        """
         normal_font = QFont()
         normal_font.setBold(False)
-        self.ofonod_log_text_browser = QTextEdit()
-        self.ofonod_log_text_browser.setFont(normal_font)
-        self.ofonod_log_text_browser.setMinimumWidth(50)
-        self.ofonod_log_text_browser.setReadOnly(True)
-        self.ofonod_log_text_browser.setStyleSheet(styles.transparent_textedit_style)
-        self.dump_logs_text_browser.addTab(self.ofonod_log_text_browser, "Ofonod_Logs")
-        self.ofonod_log_file_fd = open(self.ofonod_log_file_path, "r")
-        if self.ofonod_log_file_fd:
-            content = self.ofonod_log_file_fd.read()
-            self.ofonod_log_text_browser.append(content)
-            self.ofonod_file_position = self.ofonod_log_file_fd.tell()
-        self.ofonod_file_watcher = QFileSystemWatcher()
-        self.ofonod_file_watcher.addPath(self.ofonod_log_file_path)
-        self.ofonod_file_watcher.fileChanged.connect(self.update_ofonod_log)
-
-    def update_bluetoothd_log(self):
-        """Updates the bluetoothd log display with new log entries.
-        Reads the bluetoothd log file from the last known position and appends the new content to bluetoothd
-        log text browser."""
-        if self.bluetoothd_log_file_fd:
-            self.bluetoothd_log_file_fd.seek(self.bluetoothd_file_position)
-            content = self.bluetoothd_log_file_fd.read()
-            self.bluetoothd_file_position = self.bluetoothd_log_file_fd.tell()
-            self.bluetoothd_log_text_browser.append(content)
-
-    def update_pulseaudio_log(self):
-        """Updates the pulseaudio log display with new log entries.
-        Reads the pulseaudio log file from the last known position and appends the new content to pulseaudio
-        log text browser."""
-        if self.pulseaudio_log_file_fd:
-            self.pulseaudio_log_file_fd.seek(self.pulseaudio_file_position)
-            content = self.pulseaudio_log_file_fd.read()
-            self.pulseaudio_file_position = self.pulseaudio_log_file_fd.tell()
-            self.pulseaudio_log_text_browser.append(content)
-
-    def update_hci_log(self):
-        """Updates the hcidump log display with new log entries.
-        Reads the hci log file from the last known position and appends the new content to hci dump
-        log text browser."""
-        if self.hci_log_file_fd:
-            self.hci_log_file_fd.seek(self.hci_file_position)
-            content = self.hci_log_file_fd.read()
-            self.hci_file_position = self.hci_log_file_fd.tell()
-            self.hci_dump_log_text_browser.append(content)
-
-    def update_obexd_log(self):
-        """Updates the obexd log display with new log entries.
-        Reads the obexd log file from the last known position and appends the new content to obexd
-        log text browser."""
-        if self.obexd_log_file_fd:
-            self.obexd_log_file_fd.seek(self.obexd_file_position)
-            content = self.obexd_log_file_fd.read()
-            self.obexd_file_position = self.obexd_log_file_fd.tell()
-            self.obexd_log_text_browser.append(content)
-
-    def update_ofonod_log(self):
-        """Updates the ofonod log display with new log entries.
-        Reads the ofonod log file from the last known position and appends the new content to ofonod
-        log text browser."""
-        if self.ofonod_log_file_fd:
-            self.ofonod_log_file_fd.seek(self.ofonod_file_position)
-            content = self.ofonod_log_file_fd.read()
-            self.ofonod_file_position = self.ofonod_log_file_fd.tell()
-            self.ofonod_log_text_browser.append(content)
-
-    def prompt_file_transfer_confirmation(self, file_path):
-        """Prompt user to confirm a file transfer and return their decision.
+        log_viewer = LogViewer()
+        log_viewer.setFont(normal_font)
+        log_viewer.setMinimumWidth(50)
+        log_viewer.setStyleSheet(styles.transparent_textedit_style)
+        log_buffer = self.log_buffers.pop(name)
+        if log_buffer.tail_position and os.path.exists(file_path):
+            lines, _ = read_last_lines(file_path, constants.log_viewer_initial_lines,
+                                       end_position=log_buffer.tail_position)
+            log_viewer.append_lines(lines)
+        log_viewer.append_lines(log_buffer.lines)
+        log_viewer.append_text(log_buffer.partial_line)
+        self.log_viewers[name] = log_viewer
+        return log_viewer
+
+    def reset_log_buffer(self, name):
+        """Drops the buffered lines of a log source that was rotated before its viewer was created.
+
+        Args:
+            name: Name of the log source.
+        """
+        if name in self.log_buffers:
+            self.log_buffers[name].reset()
+
+    def create_hci_dump_panel(self):
+        """Creates the HCI_Parsed tab and parses the hcidump output written since startup."""
+        from hci_dump_panel import HciDumpPanel
+        self.hci_dump_panel = HciDumpPanel(self.log, self.hcidump_log_name)
+        if self.hci_dump_end_position > self.hci_dump_start_position:
+            try:
+                with open(self.hcidump_log_name, "rb") as hcidump_file:
+                    hcidump_file.seek(self.hci_dump_start_position)
+                    content = hcidump_file.read(self.hci_dump_end_position - self.hci_dump_start_position)
+                self.hci_dump_panel.feed_text(self.hci_dump_start_position, content.decode("utf-8", errors="replace"))
+            except OSError as error:
+                self.log.warning("Could not read %s: %s", self.hcidump_log_name, error)
+        return self.hci_dump_panel
+
+    def reset_hci_dump(self, name):
+        """Starts the parsed HCI view over after the hcidump log was rotated or truncated.
+
+        Args:
+            name: Name of the log source that was reset.
+        """
+        if name != "hcidump":
+            return
+        if self.hci_dump_panel is not None:
+            self.hci_dump_panel.reset()
+        else:
+            self.hci_dump_start_position = self.hci_dump_end_position = 0
+
+    def get_log_index(self):
+        """Returns the read-only log index shared by the search and timeline tabs, opening it on first use."""
+        if self.log_index is None:
+            from log_index import open_log_index
+            self.log_index = open_log_index(self.log_path)
+        return self.log_index
+
+    def create_log_search_panel(self, source_names):
+        """Creates the Search tab.
+
+        Args:
+            source_names: Names of the indexed log sources.
+        """
+        from log_search_panel import LogSearchPanel
+        self.log_search_panel = LogSearchPanel(self.get_log_index(), source_names)
+        return self.log_search_panel
+
+    def create_log_timeline_panel(self, source_paths):
+        """Creates the Timeline tab.
 
         Args:
-            file_path: The full path of the incoming file.
+            source_paths: Mapping of log source names to file paths.
         """
-        file_name = os.path.basename(file_path)
-        msg_box = QMessageBox()
-        msg_box.setWindowTitle("Incoming File")
-        msg_box.setText(f"Accept incoming file?\n\n{file_name}")
-        msg_box.setStandardButtons(QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
-        msg_box.setIcon(QMessageBox.Icon.Question)
-        result = msg_box.exec()
-        return result == QMessageBox.StandardButton.Yes
+        from log_timeline import LogTimelinePanel
+        self.log_timeline_panel = LogTimelinePanel(source_paths, self.action_event_log, self.get_log_index())
+        return self.log_timeline_panel
+
+    def create_latency_stats_panel(self):
+        """Creates the Stats tab."""
+        from latency_stats_panel import LatencyStatsPanel
+        self.latency_stats_panel = LatencyStatsPanel(self.latency_recorder)
+        return self.latency_stats_panel
+
+    def create_opp_transfers_panel(self):
+        """Creates the Transfers tab."""
+        from opp_transfers_panel import OppTransfersPanel
+        self.opp_transfers_panel = OppTransfersPanel(self.get_opp_transfer_queue())
+        return self.opp_transfers_panel
+
+    def create_opp_incoming_panel(self):
+        """Creates the Incoming tab."""
+        from opp_receive_panel import IncomingTransfersPanel
+        self.opp_incoming_panel = IncomingTransfersPanel(self.get_opp_receive_service())
+        return self.opp_incoming_panel
+
+    def update_log_viewer(self, name, offset, content):
+        """Appends new content read by the log tailer to the matching log viewer.
+
+        Args:
+            name: Name of the log source.
+            offset: Byte offset of the content in the log file.
+            content: Text read from the log file.
+        """
+        log_viewer = self.log_viewers.get(name)
+        if log_viewer:
+            log_viewer.append_text(content)
+        elif name in self.log_buffers:
+            self.log_buffers[name].append_text(content)
+        if name == "hcidump":
+            if self.hci_dump_panel is not None:
+                self.hci_dump_panel.feed_text(offset, content)
+            else:
+                self.hci_dump_end_position = offset + len(content.encode("utf-8"))
 
     def unregister_bluetooth_agent(self):
         """Unregister bluetooth pairing agent."""
         self.log.info("Attempting to unregister the Bluetooth agent...")
         try:
-            self.bluetooth_device_manager.unregister_agent()
+            if self.pairing_agent:
+                unregister_pairing_agent(self.pairing_agent)
+                self.pairing_agent = None
             QMessageBox.information(self, "Agent Unregistered", "Bluetooth agent was successfully unregistered.")
         except Exception as error:
             self.log.error("Failed to unregister agent: %s", error)
             QMessageBox.critical(self, "Unregistration Failed", f"Could not unregister agent.")
 
-    def handle_pairing_request(self, request_type, device, uuid=None, passkey=None):
-        self.log.info(f"Handling pairing request: {request_type} for {device}")
-        device_address = device.split("dev_")[-1].replace("_", ":")
-        if self.selected_capability == "NoInputNoOutput":
-            return self.handle_no_input_no_output(device_address)
-        handler_name = constants.pairing_request_handlers.get(request_type)
+    def show_pairing_notification(self, title, message, icon=QMessageBox.Icon.Information):
+        """Shows a non-modal message box that does not block other pairing requests.
+
+        Args:
+            title: Window title.
+            message: Text of the message.
+            icon: Icon of the message box.
+        """
+        message_box = QMessageBox(icon, title, message, QMessageBox.StandardButton.Ok, self)
+        message_box.setModal(False)
+        message_box.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        message_box.show()
+
+    def show_pairing_prompt(self, pairing_request, dialog, on_finished):
+        """Shows a non-modal prompt for a pairing request and resolves the request when it closes.
+
+        Args:
+            pairing_request: PairingRequest the prompt belongs to.
+            dialog: QInputDialog or QMessageBox to show.
+            on_finished: Callable invoked with the dialog once the user answered.
+        """
+        dialog.setModal(False)
+        dialog.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        dialog.finished.connect(lambda _: None if pairing_request.completed else on_finished(dialog))
+        pairing_request.prompt = dialog
+        dialog.show()
+
+    def show_pairing_question(self, pairing_request, title, message, on_answer):
+        """Shows a non-modal Yes/No question for a pairing request.
+
+        Args:
+            pairing_request: PairingRequest the question belongs to.
+            title: Window title.
+            message: Question text.
+            on_answer: Callable invoked with True for Yes and False otherwise.
+        """
+        message_box = QMessageBox(QMessageBox.Icon.Question, title, message,
+                                  QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, self)
+        self.show_pairing_prompt(pairing_request, message_box, lambda box: on_answer(
+            box.clickedButton() == box.button(QMessageBox.StandardButton.Yes)))
+
+    def handle_pairing_request(self, pairing_request):
+        """Dispatches a queued pairing request to its handler without blocking the agent.
+
+        Args:
+            pairing_request: PairingRequest received by the pairing agent.
+        """
+        self.log.info("Handling pairing request: %s for %s", pairing_request.request_type, pairing_request.device_path)
+        if self.apply_pairing_policy(pairing_request):
+            return None
+        if (self.selected_capability == "NoInputNoOutput"
+                and pairing_request.request_type in ("confirm", "authorize", "display_pin", "display_passkey")):
+            return self.handle_no_input_no_output(pairing_request)
+        handler_name = constants.pairing_request_handlers.get(pairing_request.request_type)
         if not handler_name:
-            self.log.warning(f"Unknown pairing request type: {request_type}")
+            self.log.warning("Unknown pairing request type: %s", pairing_request.request_type)
+            pairing_request.reject()
             return None
         handler = getattr(self, handler_name)
-        return handler(device_address, uuid, passkey)
+        return handler(pairing_request)
 
-    def handle_no_input_no_output(self, device_address):
-        if self.bluetooth_device_manager.is_device_paired(device_address):
-            QMessageBox.information(self, "Pairing Successful", f"{device_address} was paired.")
-            self.add_paired_device_to_list(device_address)
-            self.log.info("Pairing successful with %s", device_address)
+    def apply_pairing_policy(self, pairing_request):
+        """Answers a pairing request from the pairing policy rules, without prompting.
+
+        Args:
+            pairing_request: PairingRequest received by the pairing agent.
+
+        Returns:
+            True if the policy answered the request.
+        """
+        if not self.pairing_policy.is_enabled():
+            return False
+        device_state_cache = self.get_request_adapter(pairing_request).device_state_cache
+        device_name = device_state_cache.get_device(pairing_request.device_address).get("Alias")
+        decision = self.pairing_policy.decide(pairing_request, device_name)
+        if decision is None:
+            return False
+        response, value = decision
+        self.log.info("Pairing policy %sed %s request for %s", response, pairing_request.request_type,
+                      pairing_request.device_address)
+        if response == ACCEPT:
+            pairing_request.accept(value)
+            if pairing_request.request_type in ("pin", "passkey", "confirm"):
+                self.add_request_device_to_list(pairing_request)
         else:
+            pairing_request.reject()
+        return True
+
+    def handle_no_input_no_output(self, pairing_request):
+        """Accepts a confirmation, authorization or display request that needs no user interaction.
+
+        For a device that is not paired yet, success is taken from the device state cache once its
+        Paired property turns True, so the GUI thread never waits for BlueZ to finish the pairing.
+        PIN and passkey requests need a value and go to their interactive handlers instead.
+
+        Args:
+            pairing_request: PairingRequest received by the pairing agent.
+        """
+        device_address = pairing_request.device_address
+        device_state_cache = self.get_request_adapter(pairing_request).device_state_cache
+        if device_state_cache.is_device_paired(device_address):
+            pairing_request.accept()
+            return
+        result_timer = QTimer(self)
+        result_timer.setSingleShot(True)
+
+        def stop_watching():
+            result_timer.stop()
+            result_timer.deleteLater()
+            device_state_cache.device_changed.disconnect(handle_device_changed)
+
+        def handle_device_changed(changed_address, changed):
+            if changed_address != device_address or "Paired" not in changed:
+                return
+            if not device_state_cache.is_device_paired(device_address):
+                return
+            stop_watching()
+            self.show_pairing_notification("Pairing Successful", f"{device_address} was paired.")
+            self.add_request_device_to_list(pairing_request)
+            self.log.info("Pairing successful with %s", device_address)
+
+        def handle_timeout():
+            stop_watching()
             self.log.info("Pairing failed with %s", device_address)
-        return None
-
-    def handle_pin_request(self, device_address, uuid=None, passkey=None):
-        pin, user_response = QInputDialog.getText(self, "Pairing Request", f"Enter PIN for device {device_address}:")
-        if user_response and pin:
-            return pin
-        self.log.info("User cancelled or provided no PIN for device %s", device_address)
-        return None
-
-    def handle_passkey_request(self, device_address, uuid=None, passkey=None):
-        passkey_value, user_response = QInputDialog.getInt(self, "Pairing Request",
-                                                           f"Enter passkey for device {device_address}:")
-        if not user_response:
-            self.log.info("User cancelled passkey input for device %s", device_address)
-            return False
-        QMessageBox.information(self, "Pairing Successful", f"{device_address} was paired.")
-        self.add_paired_device_to_list(device_address)
-        return passkey_value
-
-    def handle_confirm_request(self, device_address, uuid=None, passkey=None):
-        reply = QMessageBox.question(self, "Confirm Pairing",
-                                     f"Device {device_address} requests to pair with passkey: {uuid}\nAccept?",
-                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
-        if reply == QMessageBox.StandardButton.Yes:
-            QMessageBox.information(self, "Pairing Successful", f"{device_address} was paired.")
-            self.add_paired_device_to_list(device_address)
-            return True
-        QMessageBox.information(self, "Pairing Failed", f"Pairing with {device_address} failed.")
-        self.log.info("User rejected pairing confirmation request")
-        return False
-
-    def handle_authorize_request(self, device_address, uuid=None, passkey=None):
-        reply = QMessageBox.question(self, "Authorize Service",
-                                     f"Device {device_address} wants to use service {uuid}\nAllow?",
-                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
-        if reply == QMessageBox.StandardButton.Yes:
-            QMessageBox.information(self, "Connection Successful", f"{device_address} was connected.")
-            return True
-        self.log.warning("User denied service authorization for device %s", device_address)
-        self.bluetooth_device_manager.disconnect(device_address)
-        return False
-
-    def display_pin_or_passkey(self, device_address, value, label):
+
+        result_timer.timeout.connect(handle_timeout)
+        device_state_cache.device_changed.connect(handle_device_changed)
+        result_timer.start(constants.pairing_result_timeout_ms)
+        pairing_request.accept()
+
+    def handle_pin_request(self, pairing_request):
+        device_address = pairing_request.device_address
+        dialog = QInputDialog(self)
+        dialog.setWindowTitle("Pairing Request")
+        dialog.setLabelText(f"Enter PIN for device {device_address}:")
+
+        def on_finished(finished_dialog):
+            pin = finished_dialog.textValue()
+            if finished_dialog.result() and pin:
+                pairing_request.accept(pin)
+                return
+            self.log.info("User cancelled or provided no PIN for device %s", device_address)
+            pairing_request.reject()
+
+        self.show_pairing_prompt(pairing_request, dialog, on_finished)
+
+    def handle_passkey_request(self, pairing_request):
+        device_address = pairing_request.device_address
+        dialog = QInputDialog(self)
+        dialog.setWindowTitle("Pairing Request")
+        dialog.setLabelText(f"Enter passkey for device {device_address}:")
+        dialog.setInputMode(QInputDialog.InputMode.IntInput)
+        dialog.setIntRange(0, 999999)
+
+        def on_finished(finished_dialog):
+            if not finished_dialog.result():
+                self.log.info("User cancelled passkey input for device %s", device_address)
+                pairing_request.reject()
+                return
+            pairing_request.accept(finished_dialog.intValue())
+            self.show_pairing_notification("Pairing Successful", f"{device_address} was paired.")
+            self.add_request_device_to_list(pairing_request)
+
+        self.show_pairing_prompt(pairing_request, dialog, on_finished)
+
+    def handle_confirm_request(self, pairing_request):
+        device_address = pairing_request.device_address
+
+        def on_answer(accepted):
+            if accepted:
+                pairing_request.accept()
+                self.show_pairing_notification("Pairing Successful", f"{device_address} was paired.")
+                self.add_request_device_to_list(pairing_request)
+                return
+            pairing_request.reject()
+            self.show_pairing_notification("Pairing Failed", f"Pairing with {device_address} failed.")
+            self.log.info("User rejected pairing confirmation request")
+
+        self.show_pairing_question(pairing_request, "Confirm Pairing",
+                                   f"Device {device_address} requests to pair with passkey: "
+                                   f"{pairing_request.passkey:06d}\nAccept?" if pairing_request.passkey is not None
+                                   else f"Device {device_address} requests to pair.\nAccept?", on_answer)
+
+    def handle_authorize_request(self, pairing_request):
+        device_address = pairing_request.device_address
+
+        def on_answer(accepted):
+            if accepted:
+                pairing_request.accept()
+                self.show_pairing_notification("Connection Successful", f"{device_address} was connected.")
+                return
+            pairing_request.reject()
+            self.log.warning("User denied service authorization for device %s", device_address)
+            self.perform_device_action("disconnect", device_address, load_profiles=False)
+
+        self.show_pairing_question(pairing_request, "Authorize Service",
+                                   f"Device {device_address} wants to use service {pairing_request.uuid}\nAllow?",
+                                   on_answer)
+
+    def display_pin_or_passkey(self, pairing_request, value, label):
+        device_address = pairing_request.device_address
+        pairing_request.accept()
         if value is None:
             self.log.warning(f"{label} requested but no value provided for device {device_address}.")
             return
-        QMessageBox.information(self, f"Display {label}", f"Enter this {label.lower()} on {device_address}: {value}")
+        self.show_pairing_notification(f"Display {label}", f"Enter this {label.lower()} on {device_address}: {value}")
         QTimer.singleShot(5000, lambda: (
-            self.add_paired_device_to_list(device_address)
-            if self.bluetooth_device_manager.is_device_paired(device_address)
-            else QMessageBox.warning(self, "Pairing Failed", f"Pairing with {device_address} did not complete.")
+            self.add_request_device_to_list(pairing_request)
+            if self.get_request_adapter(pairing_request).device_state_cache.is_device_paired(device_address)
+            else self.show_pairing_notification("Pairing Failed", f"Pairing with {device_address} did not complete.",
+                                                QMessageBox.Icon.Warning)
         ))
 
-    def handle_display_pin_request(self, device_address, uuid=None, passkey=None):
-        self.display_pin_or_passkey(device_address, uuid, "PIN")
+    def handle_display_pin_request(self, pairing_request):
+        self.display_pin_or_passkey(pairing_request, pairing_request.uuid, "PIN")
 
-    def handle_display_passkey_request(self, device_address, uuid=None, passkey=None):
-        self.display_pin_or_passkey(device_address, passkey, "Passkey")
+    def handle_display_passkey_request(self, pairing_request):
+        self.display_pin_or_passkey(pairing_request, pairing_request.passkey, "Passkey")
 
-    def handle_cancel_request(self, device_address, uuid=None, passkey=None):
-        QMessageBox.warning(self, "Pairing Cancelled", f"Pairing with {device_address} was cancelled.")
-        return None
+    def handle_cancel_request(self, pairing_request):
+        self.show_pairing_notification("Pairing Cancelled", "Pending pairing requests were cancelled.",
+                                       QMessageBox.Icon.Warning)
@@ -0,0 +1,90 @@
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QFileDialog
+from PyQt6.QtWidgets import QHBoxLayout
+from PyQt6.QtWidgets import QHeaderView
+from PyQt6.QtWidgets import QMessageBox
+from PyQt6.QtWidgets import QPushButton
+from PyQt6.QtWidgets import QTableWidget
+from PyQt6.QtWidgets import QTableWidgetItem
+from PyQt6.QtWidgets import QVBoxLayout
+from PyQt6.QtWidgets import QWidget
+
+import style_sheet as styles
+from libraries.bluetooth import constants
+
+
+class LatencyStatsPanel(QWidget):
+    """Per-operation latency percentiles with CSV and Prometheus export."""
+
+    columns = [("Operation", "operation"), ("Phase", "phase"), ("Count", "count"), ("Failures", "failures"),
+               ("Mean (ms)", "mean_ms"), ("p50 (ms)", "p50_ms"), ("p95 (ms)", "p95_ms"), ("p99 (ms)", "p99_ms"),
+               ("Max (ms)", "max_ms")]
+
+    def __init__(self, latency_recorder, parent=None):
+        """Initialize the panel.
+
+        Args:
+            latency_recorder: LatencyRecorder whose histograms are shown.
+            parent: Optional parent widget.
+        """
+        super().__init__(parent)
+        self.latency_recorder = latency_recorder
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(4, 4, 4, 4)
+        self.stats_table = QTableWidget(0, len(self.columns))
+        self.stats_table.setHorizontalHeaderLabels([title for title, _ in self.columns])
+        self.stats_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.stats_table.verticalHeader().setVisible(False)
+        self.stats_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.stats_table)
+        buttons_layout = QHBoxLayout()
+        csv_button = QPushButton("Export CSV")
+        csv_button.setStyleSheet(styles.color_style_sheet)
+        csv_button.clicked.connect(self.export_csv)
+        buttons_layout.addWidget(csv_button)
+        prometheus_button = QPushButton("Export Prometheus")
+        prometheus_button.setStyleSheet(styles.color_style_sheet)
+        prometheus_button.clicked.connect(self.export_prometheus)
+        buttons_layout.addWidget(prometheus_button)
+        layout.addLayout(buttons_layout)
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh_timer.start(constants.latency_stats_refresh_interval_ms)
+
+    def refresh(self):
+        """Redraw the table from the recorder, skipped while the panel is hidden."""
+        if not self.isVisible():
+            return
+        rows = self.latency_recorder.snapshot()
+        self.stats_table.setRowCount(len(rows))
+        for row_index, row in enumerate(rows):
+            for column_index, (_, key) in enumerate(self.columns):
+                value = row[key]
+                text = f"{value:.1f}" if isinstance(value, float) else str(value)
+                item = self.stats_table.item(row_index, column_index)
+                if item is None:
+                    self.stats_table.setItem(row_index, column_index, QTableWidgetItem(text))
+                elif item.text() != text:
+                    item.setText(text)
+
+    def export_csv(self):
+        """Ask for a file name and write the summary rows as CSV."""
+        file_path, _ = QFileDialog.getSaveFileName(self, "Export Latency CSV", "latency.csv", "CSV files (*.csv)")
+        if not file_path:
+            return
+        try:
+            self.latency_recorder.export_csv(file_path)
+        except OSError as error:
+            QMessageBox.critical(self, "Export Failed", str(error))
+
+    def export_prometheus(self):
+        """Ask for a file name and write the histograms in the Prometheus text format."""
+        file_path, _ = QFileDialog.getSaveFileName(self, "Export Prometheus Metrics", "latency.prom",
+                                                   "Prometheus text (*.prom *.txt)")
+        if not file_path:
+            return
+        try:
+            with open(file_path, "w") as metrics_file:
+                metrics_file.write(self.latency_recorder.export_prometheus())
+        except OSError as error:
+            QMessageBox.critical(self, "Export Failed", str(error))
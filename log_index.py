@@ -0,0 +1,406 @@
+import codecs
+import os
+import re
+import sqlite3
+import time
+from datetime import datetime
+
+from PyQt6.QtCore import QObject
+from PyQt6.QtCore import QThread
+from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtCore import pyqtSlot
+
+from libraries.bluetooth import constants
+
+iso_timestamp_pattern = re.compile(r"(\d{4}-\d{2}-\d{2})[ T](\d{2}:\d{2}:\d{2}(?:\.\d+)?)")
+syslog_timestamp_pattern = re.compile(r"^([A-Z][a-z]{2})\s+(\d{1,2}) (\d{2}:\d{2}:\d{2})")
+level_pattern = re.compile(r"\b(ERROR|WARNING|WARN|INFO|DEBUG)\b|^(?:\([^)]*\)\s*)?([EWID]): ", re.IGNORECASE)
+address_pattern = re.compile(r"(?<![0-9A-Fa-f:])[0-9A-Fa-f]{2}([:_])[0-9A-Fa-f]{2}(?:\1[0-9A-Fa-f]{2}){4}(?![0-9A-Fa-f:])")
+level_names = {"E": "ERROR", "W": "WARNING", "WARN": "WARNING", "I": "INFO", "D": "DEBUG"}
+
+
+def parse_log_timestamp(line):
+    """Return the timestamp of a log line as seconds since the epoch, or None if it has none.
+
+    Understands ISO-like timestamps (hcidump -t, obexd/ofonod -d with journald output) and
+    syslog timestamps (bluetoothd); syslog lines are assumed to belong to the current year.
+
+    Args:
+        line: Log line.
+    """
+    match = iso_timestamp_pattern.search(line, 0, 64)
+    if match:
+        try:
+            return datetime.fromisoformat(f"{match.group(1)} {match.group(2)[:15]}").timestamp()
+        except ValueError:
+            return None
+    match = syslog_timestamp_pattern.match(line)
+    if match:
+        try:
+            parsed = datetime.strptime(f"{time.localtime().tm_year} {match.group(1)} {match.group(2)} {match.group(3)}",
+                                       "%Y %b %d %H:%M:%S")
+        except ValueError:
+            return None
+        return parsed.timestamp()
+    return None
+
+
+def parse_log_level(line):
+    """Return the normalized level of a log line (ERROR, WARNING, INFO, DEBUG) or None.
+
+    Args:
+        line: Log line.
+    """
+    match = level_pattern.search(line)
+    if not match:
+        return None
+    level = (match.group(1) or match.group(2)).upper()
+    return level_names.get(level, level)
+
+
+def parse_device_addresses(line):
+    """Return the Bluetooth addresses mentioned in a log line, normalized to XX:XX:XX:XX:XX:XX.
+
+    Args:
+        line: Log line.
+    """
+    return {match.group(0).replace("_", ":").upper() for match in address_pattern.finditer(line)}
+
+
+class LogLineParser:
+    """Splits a stream of log chunks into lines with byte offsets and inherited timestamps."""
+
+    def __init__(self):
+        """Initialize an empty parser."""
+        self.partial_line = ""
+        self.partial_offset = None
+        self.last_timestamp = None
+
+    def reset(self):
+        """Forget any buffered partial line, e.g. after the log was rotated."""
+        self.partial_line = ""
+        self.partial_offset = None
+        self.last_timestamp = None
+
+    def feed(self, offset, text):
+        """Parse a chunk of log text.
+
+        Args:
+            offset: Byte offset of the chunk in the log file.
+            text: Decoded chunk.
+
+        Returns:
+            List of (offset, timestamp, level, line, addresses) tuples for every completed line.
+        """
+        if self.partial_offset is None:
+            self.partial_offset = offset
+        lines = (self.partial_line + text).split("\n")
+        self.partial_line = lines.pop()
+        records = []
+        line_offset = self.partial_offset
+        for line in lines:
+            timestamp = parse_log_timestamp(line)
+            if timestamp is None:
+                timestamp = self.last_timestamp
+            else:
+                self.last_timestamp = timestamp
+            records.append((line_offset, timestamp, parse_log_level(line), line, parse_device_addresses(line)))
+            line_offset += len(line.encode("utf-8")) + 1
+        self.partial_offset = line_offset
+        return records
+
+
+class LogIndex:
+    """On-disk SQLite index of log lines keyed by source, generation, byte offset and timestamp.
+
+    A source starts a new generation whenever its file is rotated, truncated or replaced, so the
+    lines of earlier files stay searchable while offsets keep referring to the file they came from.
+    """
+
+    def __init__(self, database_path):
+        """Open or create the index.
+
+        Args:
+            database_path: Path of the SQLite database file.
+        """
+        self.database_path = database_path
+        self.connection = sqlite3.connect(database_path, check_same_thread=False)
+        self.connection.create_function("REGEXP", 2, self.regexp, deterministic=True)
+        self.connection.executescript("PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;")
+        if self.connection.execute("PRAGMA user_version").fetchone()[0] != constants.log_index_schema_version:
+            # The index can always be rebuilt from the logs, so an index of an older layout is dropped.
+            self.connection.executescript("""
+                DROP TABLE IF EXISTS sources;
+                DROP TABLE IF EXISTS lines;
+                DROP TABLE IF EXISTS line_addresses;
+            """)
+        self.connection.executescript(f"""
+            CREATE TABLE IF NOT EXISTS sources (source TEXT PRIMARY KEY, file_path TEXT, indexed_offset INTEGER,
+                                                generation INTEGER);
+            CREATE TABLE IF NOT EXISTS lines (source TEXT, generation INTEGER, offset INTEGER, timestamp REAL,
+                                              level TEXT, text TEXT,
+                                              PRIMARY KEY (source, generation, offset)) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS line_addresses (address TEXT, source TEXT, generation INTEGER, offset INTEGER,
+                                                       PRIMARY KEY (address, source, generation, offset)) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS lines_timestamp ON lines (timestamp);
+            CREATE INDEX IF NOT EXISTS lines_level ON lines (level, timestamp);
+            PRAGMA user_version = {constants.log_index_schema_version};
+        """)
+        self.regex_cache = {}
+        self.generations = {}
+
+    def regexp(self, pattern, text):
+        """SQLite REGEXP implementation with compiled pattern caching."""
+        compiled = self.regex_cache.get(pattern)
+        if compiled is None:
+            compiled = self.regex_cache[pattern] = re.compile(pattern)
+        return text is not None and compiled.search(text) is not None
+
+    def get_indexed_offset(self, source, file_path):
+        """Return the byte offset up to which a source has been indexed.
+
+        Args:
+            source: Name of the log source.
+            file_path: Path of the log file.
+
+        Returns:
+            The offset, or None if the source is not indexed yet or was indexed from another file.
+        """
+        row = self.connection.execute("SELECT file_path, indexed_offset FROM sources WHERE source = ?",
+                                      (source,)).fetchone()
+        if not row or row[0] != file_path:
+            return None
+        return row[1]
+
+    def get_generation(self, source):
+        """Return the generation new lines of a source are stored under.
+
+        Args:
+            source: Name of the log source.
+        """
+        generation = self.generations.get(source)
+        if generation is None:
+            row = self.connection.execute("SELECT generation FROM sources WHERE source = ?", (source,)).fetchone()
+            generation = self.generations[source] = row[0] if row else 0
+        return generation
+
+    def add_records(self, source, file_path, records, indexed_offset):
+        """Store parsed lines of a source.
+
+        Args:
+            source: Name of the log source.
+            file_path: Path of the log file.
+            records: Tuples produced by LogLineParser.feed.
+            indexed_offset: Byte offset up to which the source is now indexed.
+        """
+        generation = self.get_generation(source)
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO lines VALUES (?, ?, ?, ?, ?, ?)",
+                [(source, generation, offset, timestamp, level, text)
+                 for offset, timestamp, level, text, _ in records])
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO line_addresses VALUES (?, ?, ?, ?)",
+                [(address, source, generation, offset)
+                 for offset, _, _, _, addresses in records for address in addresses])
+            self.connection.execute("INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?)",
+                                    (source, file_path, indexed_offset, generation))
+
+    def reset_source(self, source):
+        """Start a new generation for a source whose file was rotated, truncated or replaced.
+
+        The lines indexed so far are kept and stay searchable.
+
+        Args:
+            source: Name of the log source.
+        """
+        row = self.connection.execute("SELECT generation FROM sources WHERE source = ?", (source,)).fetchone()
+        generation = self.generations[source] = row[0] + 1 if row else 0
+        with self.connection:
+            self.connection.execute("INSERT OR REPLACE INTO sources VALUES (?, NULL, 0, ?)", (source, generation))
+
+    def search(self, pattern=None, sources=None, level=None, address=None, start_time=None, end_time=None,
+               limit=constants.log_search_result_limit):
+        """Return indexed lines matching all given filters, ordered by time.
+
+        Args:
+            pattern: Regular expression the line text must match.
+            sources: Iterable of source names to search, or None for all.
+            level: Normalized level (ERROR, WARNING, INFO, DEBUG) the line must have.
+            address: Bluetooth address the line must mention.
+            start_time: Earliest timestamp in seconds since the epoch.
+            end_time: Latest timestamp in seconds since the epoch.
+            limit: Maximum number of results.
+
+        Returns:
+            List of (source, offset, timestamp, level, text) tuples.
+        """
+        query = "SELECT lines.source, lines.offset, lines.timestamp, lines.level, lines.text FROM lines"
+        conditions = []
+        parameters = []
+        if address:
+            query += (" JOIN line_addresses ON line_addresses.source = lines.source"
+                      " AND line_addresses.generation = lines.generation AND line_addresses.offset = lines.offset")
+            conditions.append("line_addresses.address = ?")
+            parameters.append(address.replace("_", ":").upper())
+        if sources:
+            sources = list(sources)
+            conditions.append(f"lines.source IN ({', '.join('?' * len(sources))})")
+            parameters.extend(sources)
+        if level:
+            conditions.append("lines.level = ?")
+            parameters.append(level)
+        if start_time is not None:
+            conditions.append("lines.timestamp >= ?")
+            parameters.append(start_time)
+        if end_time is not None:
+            conditions.append("lines.timestamp <= ?")
+            parameters.append(end_time)
+        if pattern:
+            re.compile(pattern)
+            conditions.append("lines.text REGEXP ?")
+            parameters.append(pattern)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY lines.timestamp, lines.source, lines.generation, lines.offset LIMIT ?"
+        parameters.append(limit)
+        return self.connection.execute(query, parameters).fetchall()
+
+    def find_offset_at(self, source, timestamp):
+        """Return the offset of the first line of a source's current file at or after a timestamp, or None.
+
+        Args:
+            source: Name of the log source.
+            timestamp: Time in seconds since the epoch.
+        """
+        row = self.connection.execute(
+            "SELECT MIN(offset) FROM lines WHERE source = ? AND timestamp >= ?"
+            " AND generation = (SELECT generation FROM sources WHERE source = ?)",
+            (source, timestamp, source)).fetchone()
+        return row[0] if row else None
+
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
+
+
+class LogIndexer(QObject):
+    """Builds the log index incrementally from log tailer output on a background thread."""
+
+    add_source_requested = pyqtSignal(str, str, int)
+    source_indexed = pyqtSignal(str, int)
+
+    def __init__(self, log, database_path, chunk_size=constants.log_tailer_chunk_size):
+        """Initialize the indexer.
+
+        Args:
+            log: Logger instance used for logging.
+            database_path: Path of the SQLite index database.
+            chunk_size: Maximum number of bytes read at once while back-filling a source.
+        """
+        super().__init__()
+        self.log = log
+        self.database_path = database_path
+        self.chunk_size = chunk_size
+        self.index = LogIndex(database_path)
+        self.parsers = {}
+        self.source_paths = {}
+        self.indexer_thread = QThread()
+        self.moveToThread(self.indexer_thread)
+        self.add_source_requested.connect(self.add_source)
+        self.indexer_thread.start()
+
+    def track_source(self, name, file_path, tail_position):
+        """Index a source up to the position where the tailer takes over.
+
+        Args:
+            name: Name of the log source.
+            file_path: Path of the log file.
+            tail_position: Byte offset from which the log tailer reports new data.
+        """
+        self.add_source_requested.emit(name, file_path, tail_position)
+
+    @pyqtSlot(str, str, int)
+    def add_source(self, name, file_path, tail_position):
+        """Back-fill the index of a source from its last indexed offset to tail_position.
+
+        Args:
+            name: Name of the log source.
+            file_path: Path of the log file.
+            tail_position: Byte offset from which the log tailer reports new data.
+        """
+        self.source_paths[name] = file_path
+        parser = self.parsers[name] = LogLineParser()
+        position = self.index.get_indexed_offset(name, file_path)
+        if position is None or position > tail_position:
+            self.index.reset_source(name)
+            position = 0
+        # Incremental, so a character split across two chunks is not replaced and the offsets stay exact.
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        try:
+            with open(file_path, "rb") as log_file:
+                log_file.seek(position)
+                while position < tail_position:
+                    chunk = log_file.read(min(self.chunk_size, tail_position - position))
+                    if not chunk:
+                        break
+                    self.store_chunk(name, parser, position, decoder.decode(chunk))
+                    position += len(chunk)
+        except OSError as error:
+            self.log.warning("Could not index %s: %s", file_path, error)
+        self.source_indexed.emit(name, position)
+
+    def store_chunk(self, name, parser, offset, text):
+        """Parse a chunk and write its completed lines to the index.
+
+        Args:
+            name: Name of the log source.
+            parser: LogLineParser of the source.
+            offset: Byte offset of the chunk.
+            text: Decoded chunk.
+        """
+        records = parser.feed(offset, text)
+        if records:
+            self.index.add_records(name, self.source_paths[name], records, parser.partial_offset)
+
+    @pyqtSlot(str, int, str)
+    def index_chunk(self, name, offset, text):
+        """Index new data reported by the log tailer.
+
+        Args:
+            name: Name of the log source.
+            offset: Byte offset of the chunk.
+            text: Decoded chunk.
+        """
+        parser = self.parsers.get(name)
+        if parser:
+            self.store_chunk(name, parser, offset, text)
+
+    @pyqtSlot(str)
+    def reset_source(self, name):
+        """Start a new index generation for a rotated or truncated source.
+
+        Args:
+            name: Name of the log source.
+        """
+        self.index.reset_source(name)
+        if name in self.parsers:
+            self.parsers[name].reset()
+
+    def stop(self):
+        """Stop the indexer thread and close the index."""
+        if self.index is None:
+            return
+        self.indexer_thread.quit()
+        self.indexer_thread.wait()
+        self.index.close()
+        self.index = None
+
+
+def open_log_index(log_path):
+    """Open a read connection to the log index stored in the given log directory.
+
+    Args:
+        log_path: Directory holding the application logs.
+    """
+    return LogIndex(os.path.join(log_path, constants.log_index_file_name))
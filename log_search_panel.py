@@ -0,0 +1,152 @@
+import re
+import sqlite3
+import time
+from datetime import datetime
+
+from PyQt6.QtCore import QObject
+from PyQt6.QtCore import QRunnable
+from PyQt6.QtCore import QThreadPool
+from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtWidgets import QComboBox
+from PyQt6.QtWidgets import QHBoxLayout
+from PyQt6.QtWidgets import QLabel
+from PyQt6.QtWidgets import QLineEdit
+from PyQt6.QtWidgets import QPlainTextEdit
+from PyQt6.QtWidgets import QPushButton
+from PyQt6.QtWidgets import QVBoxLayout
+from PyQt6.QtWidgets import QWidget
+
+import style_sheet as styles
+
+
+class LogSearchSignals(QObject):
+    """Signals used by a LogSearchTask to report back to the GUI thread."""
+
+    finished = pyqtSignal(object, float)
+    failed = pyqtSignal(str)
+
+
+class LogSearchTask(QRunnable):
+    """Runs one LogIndex query on a worker thread; a regex scan of a large index takes seconds."""
+
+    def __init__(self, log_index, query, signals):
+        """Initialize the task.
+
+        Args:
+            log_index: LogIndex used to answer the query.
+            query: Keyword arguments of LogIndex.search.
+            signals: LogSearchSignals instance owned by the GUI thread.
+        """
+        super().__init__()
+        self.log_index = log_index
+        self.query = query
+        self.signals = signals
+
+    def run(self):
+        start = time.monotonic()
+        try:
+            results = self.log_index.search(**self.query)
+        except re.error as error:
+            self.signals.failed.emit(f"Invalid regex: {error}")
+            return
+        except sqlite3.Error as error:
+            self.signals.failed.emit(f"Search failed: {error}")
+            return
+        self.signals.finished.emit(results, (time.monotonic() - start) * 1000)
+
+
+class LogSearchPanel(QWidget):
+    """Search and filter bar over the log index, with a results view."""
+
+    levels = ["Any level", "ERROR", "WARNING", "INFO", "DEBUG"]
+
+    def __init__(self, log_index, source_names, parent=None):
+        """Initialize the panel.
+
+        Args:
+            log_index: LogIndex used to answer queries.
+            source_names: Names of the indexed log sources.
+            parent: Optional parent widget.
+        """
+        super().__init__(parent)
+        self.log_index = log_index
+        self.search_running = False
+        self.pending_query = None
+        self.search_signals = LogSearchSignals()
+        self.search_signals.finished.connect(self.show_results)
+        self.search_signals.failed.connect(self.show_error)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(4, 4, 4, 4)
+        self.pattern_input = QLineEdit()
+        self.pattern_input.setPlaceholderText("Regex, e.g. Authentication.*Failed")
+        self.pattern_input.returnPressed.connect(self.run_search)
+        layout.addWidget(self.pattern_input)
+        filters_layout = QHBoxLayout()
+        self.source_combobox = QComboBox()
+        self.source_combobox.addItems(["All logs"] + list(source_names))
+        filters_layout.addWidget(self.source_combobox)
+        self.level_combobox = QComboBox()
+        self.level_combobox.addItems(self.levels)
+        filters_layout.addWidget(self.level_combobox)
+        layout.addLayout(filters_layout)
+        address_layout = QHBoxLayout()
+        self.address_input = QLineEdit()
+        self.address_input.setPlaceholderText("BD_ADDR")
+        self.address_input.returnPressed.connect(self.run_search)
+        address_layout.addWidget(self.address_input)
+        search_button = QPushButton("Search")
+        search_button.setStyleSheet(styles.color_style_sheet)
+        search_button.clicked.connect(self.run_search)
+        address_layout.addWidget(search_button)
+        layout.addLayout(address_layout)
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+        self.results_view = QPlainTextEdit()
+        self.results_view.setReadOnly(True)
+        self.results_view.setStyleSheet(styles.transparent_textedit_style)
+        layout.addWidget(self.results_view)
+
+    def run_search(self):
+        """Query the index with the current filters in the background.
+
+        The connection serves one query at a time; a search requested while another runs is started
+        when that one finishes, and only the latest such request is kept.
+        """
+        source = self.source_combobox.currentText()
+        level = self.level_combobox.currentText()
+        query = {"pattern": self.pattern_input.text().strip() or None,
+                 "sources": None if source == "All logs" else [source],
+                 "level": None if level == self.levels[0] else level,
+                 "address": self.address_input.text().strip() or None}
+        if self.search_running:
+            self.pending_query = query
+            return
+        self.search_running = True
+        self.status_label.setText("Searching...")
+        QThreadPool.globalInstance().start(LogSearchTask(self.log_index, query, self.search_signals))
+
+    def finish_search(self):
+        """Start the search requested while the last one ran, if any."""
+        self.search_running = False
+        if self.pending_query is not None:
+            query, self.pending_query = self.pending_query, None
+            self.search_running = True
+            QThreadPool.globalInstance().start(LogSearchTask(self.log_index, query, self.search_signals))
+
+    def show_results(self, results, elapsed_ms):
+        """Show the lines found by a finished search.
+
+        Args:
+            results: Tuples returned by LogIndex.search.
+            elapsed_ms: Duration of the query in milliseconds.
+        """
+        self.status_label.setText(f"{len(results)} matches in {elapsed_ms:.1f} ms")
+        self.results_view.setPlainText("\n".join(
+            f"{datetime.fromtimestamp(timestamp).strftime('%H:%M:%S.%f')[:-3] if timestamp else '--:--:--'} "
+            f"[{result_source}] {text}"
+            for result_source, _, timestamp, _, text in results))
+        self.finish_search()
+
+    def show_error(self, message):
+        self.status_label.setText(message)
+        self.finish_search()
@@ -0,0 +1,235 @@
+import codecs
+import os
+
+from PyQt6.QtCore import QCoreApplication
+from PyQt6.QtCore import QFileSystemWatcher
+from PyQt6.QtCore import QObject
+from PyQt6.QtCore import QThread
+from PyQt6.QtCore import QTimer
+from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtCore import pyqtSlot
+
+from libraries.bluetooth import constants
+
+
+class LogSource:
+    """Read state of one tailed log file."""
+
+    def __init__(self, name, file_path, position=0):
+        """Initialize the source.
+
+        Args:
+            name: Unique name of the source (e.g. 'bluetoothd').
+            file_path: Path of the log file.
+            position: Byte offset from which to start reading.
+        """
+        self.name = name
+        self.file_path = file_path
+        self.position = position
+        self.file_id = None
+        self.decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+
+class LogTailWorker(QObject):
+    """Reads new data from log sources; lives on the tailer's background thread."""
+
+    data_read = pyqtSignal(str, int, str)
+    source_reset = pyqtSignal(str)
+
+    def __init__(self, chunk_size, max_chunks_per_poll):
+        """Initialize the worker.
+
+        Args:
+            chunk_size: Maximum number of bytes read at once.
+            max_chunks_per_poll: Number of chunks read before yielding back to the event loop.
+        """
+        super().__init__()
+        self.chunk_size = chunk_size
+        self.max_chunks_per_poll = max_chunks_per_poll
+        self.sources = {}
+
+    @pyqtSlot(str, str, int)
+    def add_source(self, name, file_path, position):
+        """Start tailing a file.
+
+        Args:
+            name: Unique name of the source.
+            file_path: Path of the log file.
+            position: Byte offset from which to start reading.
+        """
+        source = LogSource(name, file_path, position)
+        source.file_id = self.get_file_id(file_path)
+        self.sources[name] = source
+        self.poll_source(name)
+
+    @pyqtSlot(str)
+    def remove_source(self, name):
+        """Stop tailing a file.
+
+        Args:
+            name: Name of the source.
+        """
+        self.sources.pop(name, None)
+
+    @staticmethod
+    def get_file_id(file_path):
+        """Return (device, inode, size) of a file, or None if it does not exist.
+
+        Args:
+            file_path: Path of the file.
+        """
+        try:
+            file_stat = os.stat(file_path)
+        except OSError:
+            return None
+        return file_stat.st_dev, file_stat.st_ino, file_stat.st_size
+
+    @pyqtSlot()
+    def poll_all(self):
+        """Read pending data from every source."""
+        for name in list(self.sources):
+            self.poll_source(name)
+
+    @pyqtSlot(str)
+    def poll_source(self, name):
+        """Read pending data from one source, restarting from the top after rotation or truncation.
+
+        Args:
+            name: Name of the source.
+        """
+        source = self.sources.get(name)
+        if not source:
+            return
+        file_id = self.get_file_id(source.file_path)
+        if file_id is None:
+            return
+        rotated = source.file_id is not None and file_id[:2] != source.file_id[:2]
+        truncated = file_id[2] < source.position
+        source.file_id = file_id
+        if rotated or truncated:
+            source.position = 0
+            source.decoder.reset()
+            self.source_reset.emit(name)
+        if file_id[2] == source.position:
+            return
+        with open(source.file_path, "rb") as log_file:
+            log_file.seek(source.position)
+            for _ in range(self.max_chunks_per_poll):
+                chunk = log_file.read(self.chunk_size)
+                if not chunk:
+                    return
+                offset = source.position
+                source.position += len(chunk)
+                self.data_read.emit(name, offset, source.decoder.decode(chunk))
+        QTimer.singleShot(0, lambda: self.poll_source(name))
+
+
+class LogTailer(QObject):
+    """Tails any number of log files and emits their new content.
+
+    Files are watched with QFileSystemWatcher and additionally polled on a timer, which also
+    catches files that were rotated or recreated. Reads happen in bounded chunks on a background
+    thread unless use_thread is False.
+    """
+
+    data_read = pyqtSignal(str, int, str)
+    source_reset = pyqtSignal(str)
+    add_source_requested = pyqtSignal(str, str, int)
+    remove_source_requested = pyqtSignal(str)
+    poll_requested = pyqtSignal(str)
+    poll_all_requested = pyqtSignal()
+
+    def __init__(self, log, use_thread=True, chunk_size=constants.log_tailer_chunk_size,
+                 max_chunks_per_poll=constants.log_tailer_max_chunks_per_poll,
+                 poll_interval=constants.log_tailer_poll_interval_ms):
+        """Initialize the tailer.
+
+        Args:
+            log: Logger instance used for logging.
+            use_thread: If True, file reads run on a dedicated thread.
+            chunk_size: Maximum number of bytes read at once.
+            max_chunks_per_poll: Number of chunks read before yielding to other sources.
+            poll_interval: Interval in milliseconds of the fallback poll.
+        """
+        super().__init__()
+        self.log = log
+        self.source_paths = {}
+        self.worker = LogTailWorker(chunk_size, max_chunks_per_poll)
+        self.worker_thread = None
+        if use_thread:
+            self.worker_thread = QThread()
+            self.worker.moveToThread(self.worker_thread)
+            self.worker_thread.start()
+            application = QCoreApplication.instance()
+            if application:
+                application.aboutToQuit.connect(self.stop)
+        self.add_source_requested.connect(self.worker.add_source)
+        self.remove_source_requested.connect(self.worker.remove_source)
+        self.poll_requested.connect(self.worker.poll_source)
+        self.poll_all_requested.connect(self.worker.poll_all)
+        self.worker.data_read.connect(self.data_read)
+        self.worker.source_reset.connect(self.handle_source_reset)
+        self.file_watcher = QFileSystemWatcher(self)
+        self.file_watcher.fileChanged.connect(self.handle_file_changed)
+        self.poll_timer = QTimer(self)
+        self.poll_timer.timeout.connect(self.poll_all)
+        self.poll_timer.start(poll_interval)
+
+    def add_source(self, name, file_path, position=0):
+        """Start tailing a log file.
+
+        Args:
+            name: Unique name of the source.
+            file_path: Path of the log file.
+            position: Byte offset from which to start reading.
+        """
+        self.source_paths[name] = file_path
+        if os.path.exists(file_path):
+            self.file_watcher.addPath(file_path)
+        self.add_source_requested.emit(name, file_path, position)
+
+    def remove_source(self, name):
+        """Stop tailing a log file.
+
+        Args:
+            name: Name of the source.
+        """
+        file_path = self.source_paths.pop(name, None)
+        if file_path and file_path not in self.source_paths.values():
+            self.file_watcher.removePath(file_path)
+        self.remove_source_requested.emit(name)
+
+    def handle_file_changed(self, file_path):
+        """Requests a read of every source backed by the changed file.
+
+        Args:
+            file_path: Path reported by QFileSystemWatcher.
+        """
+        for name, source_path in self.source_paths.items():
+            if source_path == file_path:
+                self.poll_requested.emit(name)
+
+    def poll_all(self):
+        """Re-arm watches lost to rotation and request a read of every source."""
+        watched_files = set(self.file_watcher.files())
+        for file_path in set(self.source_paths.values()) - watched_files:
+            if os.path.exists(file_path):
+                self.file_watcher.addPath(file_path)
+        self.poll_all_requested.emit()
+
+    def handle_source_reset(self, name):
+        """Logs and forwards a rotation or truncation of a source.
+
+        Args:
+            name: Name of the source.
+        """
+        self.log.info("Log %s was rotated or truncated, reading from the start", name)
+        self.source_reset.emit(name)
+
+    def stop(self):
+        """Stop polling and shut down the reader thread."""
+        self.poll_timer.stop()
+        if self.worker_thread:
+            self.worker_thread.quit()
+            self.worker_thread.wait()
+            self.worker_thread = None
@@ -0,0 +1,190 @@
+import bisect
+import heapq
+import itertools
+import os
+import time
+from collections import deque
+from datetime import datetime
+
+from PyQt6.QtCore import QDateTime
+from PyQt6.QtWidgets import QDateTimeEdit
+from PyQt6.QtWidgets import QHBoxLayout
+from PyQt6.QtWidgets import QPlainTextEdit
+from PyQt6.QtWidgets import QPushButton
+from PyQt6.QtWidgets import QSpinBox
+from PyQt6.QtWidgets import QVBoxLayout
+from PyQt6.QtWidgets import QWidget
+
+import style_sheet as styles
+from libraries.bluetooth import constants
+from log_index import parse_log_timestamp
+
+
+class ActionEventLog:
+    """Bounded, time-ordered record of the UI-level actions performed by the application."""
+
+    source_name = "ui"
+
+    def __init__(self, max_events=constants.timeline_max_action_events):
+        """Initialize the event log.
+
+        Args:
+            max_events: Maximum number of events kept; the oldest are dropped first.
+        """
+        self.events = deque(maxlen=max_events)
+
+    def record(self, text, timestamp=None):
+        """Record an event.
+
+        Args:
+            text: Description of the event.
+            timestamp: Time of the event in seconds since the epoch; defaults to now.
+        """
+        self.events.append((time.time() if timestamp is None else timestamp, self.source_name, text))
+
+    def iter_events(self, start_time=None):
+        """Yield (timestamp, source, text) events at or after start_time.
+
+        Args:
+            start_time: Earliest timestamp in seconds since the epoch, or None for all events.
+        """
+        events = list(self.events)
+        first = 0 if start_time is None else bisect.bisect_left(events, (start_time,))
+        return iter(events[first:])
+
+
+def iter_log_lines(source, file_path, start_offset=0, start_time=None):
+    """Yield (timestamp, source, line) for each line of a log file, reading it lazily.
+
+    Lines without a timestamp inherit the one of the previous line. Lines before the first
+    timestamp take the first timestamp that follows within constants.timeline_untimed_lookahead_lines
+    lines, or else the modification time of the file, so a source without parseable timestamps
+    is placed at its last write instead of at 1970.
+
+    Args:
+        source: Name of the log source.
+        file_path: Path of the log file.
+        start_offset: Byte offset of a line start from which to read.
+        start_time: Lines older than this timestamp are skipped.
+    """
+    try:
+        log_file = open(file_path, "rb")
+    except OSError:
+        return
+    with log_file:
+        modified_time = os.fstat(log_file.fileno()).st_mtime
+        log_file.seek(start_offset)
+        last_timestamp = None
+        untimed_lines = []
+        for raw_line in log_file:
+            line = raw_line.decode("utf-8", errors="replace").rstrip("\r\n")
+            timestamp = parse_log_timestamp(line)
+            if timestamp is None:
+                if last_timestamp is None:
+                    untimed_lines.append(line)
+                    if len(untimed_lines) < constants.timeline_untimed_lookahead_lines:
+                        continue
+                    last_timestamp = modified_time
+                else:
+                    timestamp = last_timestamp
+            else:
+                last_timestamp = timestamp
+            if untimed_lines:
+                if start_time is None or last_timestamp >= start_time:
+                    for untimed_line in untimed_lines:
+                        yield last_timestamp, source, untimed_line
+                untimed_lines = []
+                if timestamp is None:
+                    continue
+            if start_time is not None and timestamp < start_time:
+                continue
+            yield timestamp, source, line
+        if untimed_lines and (start_time is None or modified_time >= start_time):
+            for untimed_line in untimed_lines:
+                yield modified_time, source, untimed_line
+
+
+def merge_log_sources(source_paths, action_event_log=None, log_index=None, start_time=None):
+    """Merge several log files into one stream ordered by timestamp.
+
+    This is a streaming k-way merge: only one pending line per source is held in memory. When a
+    log index is given it is used to seek each file close to start_time instead of scanning it
+    from the beginning.
+
+    Args:
+        source_paths: Mapping of source name to log file path.
+        action_event_log: Optional ActionEventLog merged in as an extra source.
+        log_index: Optional LogIndex used to find start offsets.
+        start_time: Earliest timestamp in seconds since the epoch, or None for everything.
+
+    Returns:
+        Iterator of (timestamp, source, line) tuples.
+    """
+    streams = []
+    for source, file_path in source_paths.items():
+        start_offset = 0
+        if log_index is not None and start_time is not None:
+            start_offset = log_index.find_offset_at(source, start_time) or 0
+        streams.append(iter_log_lines(source, file_path, start_offset, start_time))
+    if action_event_log is not None:
+        streams.append(action_event_log.iter_events(start_time))
+    return heapq.merge(*streams, key=lambda entry: entry[0])
+
+
+class LogTimelinePanel(QWidget):
+    """Merged, time-aligned view of all log sources and the application's own actions."""
+
+    def __init__(self, source_paths, action_event_log, log_index=None, parent=None):
+        """Initialize the panel.
+
+        Args:
+            source_paths: Mapping of source name to log file path.
+            action_event_log: ActionEventLog with the UI-level actions.
+            log_index: Optional LogIndex used for jump-to-time.
+            parent: Optional parent widget.
+        """
+        super().__init__(parent)
+        self.source_paths = source_paths
+        self.action_event_log = action_event_log
+        self.log_index = log_index
+        self.timeline = iter(())
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(4, 4, 4, 4)
+        navigation_layout = QHBoxLayout()
+        self.time_input = QDateTimeEdit(QDateTime.currentDateTime().addSecs(-300))
+        self.time_input.setDisplayFormat("yyyy-MM-dd HH:mm:ss")
+        navigation_layout.addWidget(self.time_input)
+        self.page_size_input = QSpinBox()
+        self.page_size_input.setRange(50, 5000)
+        self.page_size_input.setValue(constants.timeline_page_lines)
+        navigation_layout.addWidget(self.page_size_input)
+        layout.addLayout(navigation_layout)
+        buttons_layout = QHBoxLayout()
+        jump_button = QPushButton("Jump")
+        jump_button.setStyleSheet(styles.color_style_sheet)
+        jump_button.clicked.connect(self.jump_to_time)
+        buttons_layout.addWidget(jump_button)
+        next_button = QPushButton("Next")
+        next_button.setStyleSheet(styles.color_style_sheet)
+        next_button.clicked.connect(self.show_next_page)
+        buttons_layout.addWidget(next_button)
+        layout.addLayout(buttons_layout)
+        self.timeline_view = QPlainTextEdit()
+        self.timeline_view.setReadOnly(True)
+        self.timeline_view.setStyleSheet(styles.transparent_textedit_style)
+        layout.addWidget(self.timeline_view)
+
+    def jump_to_time(self):
+        """Restart the merged timeline at the selected time and show its first page."""
+        start_time = self.time_input.dateTime().toSecsSinceEpoch()
+        self.timeline = merge_log_sources(self.source_paths, self.action_event_log, self.log_index, start_time)
+        self.timeline_view.clear()
+        self.show_next_page()
+
+    def show_next_page(self):
+        """Append the next page of merged lines."""
+        page = itertools.islice(self.timeline, self.page_size_input.value())
+        self.timeline_view.appendPlainText("\n".join(
+            f"{datetime.fromtimestamp(timestamp).strftime('%H:%M:%S.%f')[:-3] if timestamp else '--:--:--'} "
+            f"[{source}] {line}"
+            for timestamp, source, line in page))
@@ -0,0 +1,132 @@
+import os
+from collections import deque
+
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QPlainTextEdit
+
+from libraries.bluetooth import constants
+
+
+def read_last_lines(file_path, line_count, block_size=65536, end_position=None):
+    """Read the last lines of a file by seeking backwards from its end.
+
+    Args:
+        file_path: Path of the file to read.
+        line_count: Maximum number of lines to return.
+        block_size: Number of bytes read per backwards step.
+        end_position: Byte offset to read backwards from instead of the end of the file.
+
+    Returns:
+        Tuple of (list of lines without line endings, byte offset the lines end at).
+    """
+    with open(file_path, "rb") as file:
+        file_size = file.seek(0, os.SEEK_END)
+        end_position = file_size if end_position is None else min(end_position, file_size)
+        position = end_position
+        data = b""
+        while position > 0 and data.count(b"\n") <= line_count:
+            read_size = min(block_size, position)
+            position -= read_size
+            file.seek(position)
+            data = file.read(read_size) + data
+    lines = data.decode("utf-8", errors="replace").splitlines()
+    return lines[-line_count:] if line_count else [], end_position
+
+
+class LogLineBuffer:
+    """Keeps the last lines of a tailed log until the LogViewer showing them is created."""
+
+    def __init__(self, tail_position, max_lines=constants.log_viewer_initial_lines):
+        """Initialize the buffer.
+
+        Args:
+            tail_position: Byte offset from which the log tailer reports new data.
+            max_lines: Maximum number of lines kept.
+        """
+        self.tail_position = tail_position
+        self.lines = deque(maxlen=max_lines)
+        self.partial_line = ""
+
+    def append_text(self, text):
+        """Buffer raw log text; an unterminated last line is held back until completed.
+
+        Args:
+            text: Text read from the log file.
+        """
+        lines = (self.partial_line + text).split("\n")
+        self.partial_line = lines.pop()
+        self.lines.extend(lines)
+
+    def reset(self):
+        """Drop the buffered lines after the log was rotated or truncated."""
+        self.tail_position = 0
+        self.lines.clear()
+        self.partial_line = ""
+
+
+class LogViewer(QPlainTextEdit):
+    """Read-only log view holding at most max_lines lines.
+
+    Appended text is buffered and flushed to the widget on a fixed interval, so bursts of log
+    output cause one repaint per interval instead of one per write. Once the line limit is
+    reached the oldest lines are dropped.
+    """
+
+    def __init__(self, max_lines=constants.log_viewer_max_lines,
+                 refresh_interval=constants.log_viewer_refresh_interval_ms, parent=None):
+        """Initialize the viewer.
+
+        Args:
+            max_lines: Maximum number of lines kept in the view.
+            refresh_interval: Interval in milliseconds between flushes of buffered text.
+            parent: Optional parent widget.
+        """
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setMaximumBlockCount(max_lines)
+        self.pending_lines = deque(maxlen=max_lines)
+        self.partial_line = ""
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setInterval(refresh_interval)
+        self.flush_timer.timeout.connect(self.flush_pending_lines)
+        self.flush_timer.start()
+
+    def set_max_lines(self, max_lines):
+        """Change the maximum number of lines kept in the view.
+
+        Args:
+            max_lines: New line limit.
+        """
+        self.setMaximumBlockCount(max_lines)
+        self.pending_lines = deque(self.pending_lines, maxlen=max_lines)
+
+    def append_lines(self, lines):
+        """Queue complete lines for display.
+
+        Args:
+            lines: Iterable of lines without line endings.
+        """
+        self.pending_lines.extend(lines)
+
+    def append_text(self, text):
+        """Queue raw log text for display; an unterminated last line is held back until completed.
+
+        Args:
+            text: Text read from the log file.
+        """
+        if not text:
+            return
+        lines = (self.partial_line + text).split("\n")
+        self.partial_line = lines.pop()
+        self.pending_lines.extend(lines)
+
+    def flush_pending_lines(self):
+        """Append all buffered lines to the widget in a single operation."""
+        if not self.pending_lines:
+            return
+        scroll_bar = self.verticalScrollBar()
+        at_bottom = scroll_bar.value() == scroll_bar.maximum()
+        self.appendPlainText("\n".join(self.pending_lines))
+        self.pending_lines.clear()
+        if at_bottom:
+            scroll_bar.setValue(scroll_bar.maximum())
@@ -0,0 +1,514 @@
+"""AVRCP media-control stress engine.
+
+Sends a scripted sequence of org.bluez.MediaControl1 commands to one device at a bounded rate
+and measures, for every command, the D-Bus reply time and the time until the remote player
+acted on it, observed as the matching org.bluez.MediaPlayer1 Status or Track change::
+
+    python media_control_engine.py 00:11:22:33:44:55 --script "play,pause,next*2" --repetitions 1000 \\
+        --rate 5 --report avrcp.json
+
+The same engine runs from the A2DP tab of the host UI, where it also serves the single command
+buttons.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+import dbus
+from dbus.mainloop.glib import DBusGMainLoop
+from PyQt6.QtCore import QObject
+from PyQt6.QtCore import QTimer
+from PyQt6.QtCore import pyqtSignal
+
+from action_metrics import summarize
+from device_state_cache import to_python
+from libraries.bluetooth import constants
+
+DBusGMainLoop(set_as_default=True)
+
+command_methods = {
+    "play": "Play",
+    "pause": "Pause",
+    "stop": "Stop",
+    "next": "Next",
+    "previous": "Previous",
+    "fast_forward": "FastForward",
+    "rewind": "Rewind",
+    "volume_up": "VolumeUp",
+    "volume_down": "VolumeDown",
+}
+expected_statuses = {
+    "play": "playing",
+    "pause": "paused",
+    "stop": "stopped",
+    "fast_forward": "forward-seek",
+    "rewind": "reverse-seek",
+}
+track_commands = {"next", "previous"}
+
+# Outcomes of a command.
+OBSERVED = "observed"
+REPLIED = "replied"
+UNCHANGED = "unchanged"
+NO_EFFECT = "no effect"
+TIMEOUT = "timeout"
+ERROR = "error"
+
+
+def parse_script(text):
+    """Return the commands of a script such as 'play,pause,next' or 'play, next*3, pause'.
+
+    Args:
+        text: Comma separated command names, each optionally followed by *count.
+
+    Raises:
+        ValueError: If a command is unknown or a count is not a positive number.
+    """
+    commands = []
+    for item in text.split(","):
+        name, _, count = item.strip().lower().partition("*")
+        name = name.strip().replace("-", "_")
+        if not name:
+            continue
+        if name not in command_methods:
+            raise ValueError(f"Unknown media command '{name}', expected one of {', '.join(command_methods)}")
+        count = int(count) if count.strip() else 1
+        if count < 1:
+            raise ValueError(f"Count of '{name}' must be at least 1")
+        commands.extend([name] * count)
+    return commands
+
+
+class MediaCommandSample:
+    """One sent media command and what was observed for it."""
+
+    def __init__(self, index, command, expected):
+        """Initialize the sample.
+
+        Args:
+            index: Position of the command in the run.
+            command: Command name (e.g. 'play').
+            expected: ('Status', value), ('Track', track at send time) or None if no change can be observed.
+        """
+        self.index = index
+        self.command = command
+        self.expected = expected
+        self.sent_at = time.monotonic()
+        self.reply_ms = None
+        self.effect_ms = None
+        self.outcome = None
+        self.error = None
+
+    def describe(self):
+        """Return a one line description such as 'play: Status changed after 85 ms (reply 12 ms)'."""
+        if self.outcome == OBSERVED:
+            return (f"{self.command}: {self.expected[0]} changed after {self.effect_ms:.0f} ms "
+                    f"(reply {self.reply_ms:.0f} ms)")
+        if self.reply_ms is not None and self.outcome != ERROR:
+            return f"{self.command}: {self.outcome}, reply after {self.reply_ms:.0f} ms"
+        return f"{self.command}: {self.outcome} ({self.error})"
+
+    def to_dict(self):
+        return {"index": self.index, "command": self.command, "outcome": self.outcome, "reply_ms": self.reply_ms,
+                "effect_ms": self.effect_ms, "error": self.error}
+
+
+class MediaControlEngine(QObject):
+    """Runs a command script against org.bluez.MediaControl1 of one device, one command at a time.
+
+    The player of the device is taken from the MediaControl1 Player property and followed when
+    it changes. A command is done when its reply and its effect (Status becoming the expected
+    value for play, pause, stop and seeking, a new Track for next and previous) were both seen,
+    when it failed, or after the timeout. Commands whose effect cannot be observed (volume, a
+    status the player already has, no player) are done with their reply. The rate is an upper
+    bound: the next command is sent once the previous one is done and 1 / rate seconds passed
+    since it was sent.
+    """
+
+    progress = pyqtSignal(int, int)
+    command_finished = pyqtSignal(object)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, log, device_address, commands, repetitions=1, rate_hz=constants.media_control_default_rate_hz,
+                 interface="hci0", bus=None, latency_recorder=None, timeout_ms=constants.media_control_timeout_ms):
+        """Initialize the engine.
+
+        Args:
+            log: Logger instance used for logging.
+            device_address: Bluetooth address of the device receiving the commands.
+            commands: Command names of one pass of the script.
+            repetitions: Number of passes of the script.
+            rate_hz: Maximum number of commands sent per second; 0 sends as fast as the player answers.
+            interface: Bluetooth adapter interface (e.g., hci0) the device is connected to.
+            bus: D-Bus connection to BlueZ; defaults to the system bus.
+            latency_recorder: Optional LatencyRecorder receiving the reply and effect latencies.
+            timeout_ms: Time a command may take before it counts as timed out.
+        """
+        super().__init__()
+        self.log = log
+        self.device_address = device_address
+        self.commands = list(commands)
+        self.repetitions = repetitions
+        self.rate_hz = rate_hz
+        self.interface = interface
+        self.bus = bus or dbus.SystemBus()
+        self.latency_recorder = latency_recorder
+        self.timeout_ms = timeout_ms
+        self.device_path = f"{constants.bluez_path}/{interface}/dev_{device_address.replace(':', '_')}"
+        self.player_path = None
+        self.player_status = None
+        self.player_track = None
+        self.signal_matches = []
+        self.pending_commands = []
+        self.current_sample = None
+        self.samples = []
+        self.started_at = None
+        self.running = False
+        self.send_timer = QTimer(self)
+        self.send_timer.setSingleShot(True)
+        self.send_timer.timeout.connect(self.send_next_command)
+        self.timeout_timer = QTimer(self)
+        self.timeout_timer.setSingleShot(True)
+        self.timeout_timer.timeout.connect(self.handle_command_timeout)
+
+    def start(self):
+        """Subscribe to the player signals, look up the player, then send the first command."""
+        self.running = True
+        self.samples = []
+        self.pending_commands = self.commands * self.repetitions
+        self.started_at = time.time()
+        self.signal_matches = [
+            self.bus.add_signal_receiver(self.handle_control_properties_changed,
+                                         dbus_interface=constants.properties_interface,
+                                         signal_name="PropertiesChanged", arg0=constants.media_control_interface,
+                                         bus_name=constants.bluez_service, path=self.device_path),
+            self.bus.add_signal_receiver(self.handle_player_properties_changed,
+                                         dbus_interface=constants.properties_interface,
+                                         signal_name="PropertiesChanged", arg0=constants.media_player_interface,
+                                         bus_name=constants.bluez_service, path_keyword="path"),
+        ]
+        self.log.info("Media control script to %s: %s x %d at %s commands/s", self.device_address,
+                      ",".join(self.commands), self.repetitions, self.rate_hz or "max")
+        self.get_properties(self.device_path).GetAll(
+            constants.media_control_interface, reply_handler=self.handle_control_properties,
+            error_handler=self.handle_control_error)
+
+    def stop(self):
+        """Abandon the remaining commands; the results so far stay available."""
+        if not self.running:
+            return
+        self.running = False
+        self.pending_commands = []
+        self.send_timer.stop()
+        self.timeout_timer.stop()
+        self.current_sample = None
+        self.remove_signal_matches()
+
+    def is_running(self):
+        return self.running
+
+    def remove_signal_matches(self):
+        for match in self.signal_matches:
+            match.remove()
+        self.signal_matches = []
+
+    def get_properties(self, path):
+        """Return an org.freedesktop.DBus.Properties proxy of a BlueZ object without introspection."""
+        return dbus.Interface(self.bus.get_object(constants.bluez_service, path, introspect=False),
+                              constants.properties_interface)
+
+    def handle_control_properties(self, properties):
+        """Takes the player from the MediaControl1 properties and starts sending.
+
+        Args:
+            properties: MediaControl1 properties of the device.
+        """
+        if not self.running:
+            return
+        if not properties.get("Connected", False):
+            self.log.warning("Media control of %s is not connected", self.device_address)
+        player_path = properties.get("Player")
+        if player_path:
+            self.set_player(str(player_path), start=True)
+        else:
+            self.log.warning("%s exposes no media player; only the command replies are measured", self.device_address)
+            self.send_next_command()
+
+    def handle_control_error(self, error):
+        self.log.error("Cannot reach the media control of %s: %s", self.device_address, error)
+        self.stop()
+        self.failed.emit(str(error))
+
+    def set_player(self, player_path, start=False):
+        """Follow a new player object and load its Status and Track.
+
+        Args:
+            player_path: D-Bus object path of the MediaPlayer1 object.
+            start: If True, send the first command once the player state is known.
+        """
+        self.player_path = player_path
+        self.log.debug("Following media player %s", player_path)
+
+        def handle_player_properties(properties):
+            if player_path == self.player_path:
+                self.player_status = str(properties.get("Status", "")) or None
+                self.player_track = to_python(properties.get("Track", {}))
+            if start and self.running:
+                self.send_next_command()
+
+        def handle_player_error(error):
+            self.log.warning("Cannot read the media player %s: %s", player_path, error)
+            if start and self.running:
+                self.send_next_command()
+
+        self.get_properties(player_path).GetAll(
+            constants.media_player_interface, reply_handler=handle_player_properties,
+            error_handler=handle_player_error)
+
+    def handle_control_properties_changed(self, interface, changed, invalidated):
+        """Follows the player of the device when it is replaced, e.g. after an AVRCP reconnect."""
+        if "Connected" in changed and not changed["Connected"]:
+            self.log.warning("Media control of %s disconnected", self.device_address)
+        if "Player" in changed and str(changed["Player"]) != self.player_path:
+            self.set_player(str(changed["Player"]))
+
+    def get_expected_effect(self, command):
+        """Return the property change that shows the command was acted on, or None if none can be observed.
+
+        Args:
+            command: Command name (e.g. 'play').
+        """
+        if self.player_path is None:
+            return None
+        if command in expected_statuses:
+            # A player that already has the status sends no change notification for it.
+            if self.player_status == expected_statuses[command]:
+                return None
+            return "Status", expected_statuses[command]
+        if command in track_commands:
+            return "Track", self.player_track
+        return None
+
+    def send_next_command(self):
+        """Send the next command of the script, or finish the run when none is left."""
+        if not self.running:
+            return
+        if not self.pending_commands:
+            self.running = False
+            self.remove_signal_matches()
+            report = self.get_report()
+            self.log_report(report)
+            self.finished.emit(report)
+            return
+        command = self.pending_commands.pop(0)
+        sample = MediaCommandSample(len(self.samples), command, self.get_expected_effect(command))
+        self.current_sample = sample
+        self.timeout_timer.start(self.timeout_ms)
+        control = dbus.Interface(self.bus.get_object(constants.bluez_service, self.device_path, introspect=False),
+                                 constants.media_control_interface)
+        getattr(control, command_methods[command])(
+            reply_handler=lambda: self.handle_command_reply(sample),
+            error_handler=lambda error: self.handle_command_error(sample, error))
+
+    def handle_command_reply(self, sample):
+        if sample is not self.current_sample:
+            return
+        sample.reply_ms = (time.monotonic() - sample.sent_at) * 1000
+        self.record(sample.command, "reply", sample.reply_ms, True)
+        if sample.expected is None:
+            self.finish_command(sample, UNCHANGED if sample.command in expected_statuses and self.player_path
+                                else REPLIED)
+        elif sample.effect_ms is not None:
+            self.finish_command(sample, OBSERVED)
+
+    def handle_command_error(self, sample, error):
+        if sample is not self.current_sample:
+            return
+        sample.reply_ms = (time.monotonic() - sample.sent_at) * 1000
+        sample.error = error.get_dbus_message() or str(error)
+        self.record(sample.command, "reply", sample.reply_ms, False)
+        self.finish_command(sample, ERROR)
+
+    def handle_player_properties_changed(self, interface, changed, invalidated, path=None):
+        """Tracks the player state and completes the running command when its effect shows up.
+
+        Args:
+            interface: Interface whose properties changed (MediaPlayer1).
+            changed: Changed properties.
+            invalidated: Names of invalidated properties.
+            path: Object path of the player.
+        """
+        if path != self.player_path:
+            return
+        if "Status" in changed:
+            self.player_status = str(changed["Status"])
+        if "Track" in changed:
+            self.player_track = to_python(changed["Track"])
+        sample = self.current_sample
+        if sample is None or sample.expected is None or sample.effect_ms is not None:
+            return
+        name, value = sample.expected
+        if name not in changed:
+            return
+        if (name == "Status" and self.player_status != value) or (name == "Track" and self.player_track == value):
+            return
+        sample.effect_ms = (time.monotonic() - sample.sent_at) * 1000
+        self.record(sample.command, "effect", sample.effect_ms, True)
+        if sample.reply_ms is not None:
+            self.finish_command(sample, OBSERVED)
+
+    def handle_command_timeout(self):
+        sample = self.current_sample
+        if sample is None:
+            return
+        if sample.reply_ms is None:
+            sample.error = f"No reply within {self.timeout_ms} ms"
+            self.record(sample.command, "reply", self.timeout_ms, False)
+            self.finish_command(sample, TIMEOUT)
+        else:
+            self.record(sample.command, "effect", self.timeout_ms, False)
+            self.finish_command(sample, NO_EFFECT)
+
+    def record(self, command, phase, duration_ms, success):
+        if self.latency_recorder:
+            self.latency_recorder.record(f"avrcp_{command}", phase, duration_ms / 1000, success)
+
+    def finish_command(self, sample, outcome):
+        """Store a finished command and schedule the next one.
+
+        Args:
+            sample: MediaCommandSample of the finished command.
+            outcome: One of the outcome strings of this module.
+        """
+        sample.outcome = outcome
+        self.current_sample = None
+        self.timeout_timer.stop()
+        self.samples.append(sample)
+        if outcome in (TIMEOUT, NO_EFFECT, ERROR):
+            self.log.debug("Media command %s #%d to %s: %s %s", sample.command, sample.index, self.device_address,
+                           outcome, sample.error or "")
+        self.command_finished.emit(sample)
+        self.progress.emit(len(self.samples), len(self.samples) + len(self.pending_commands))
+        interval_ms = 1000 / self.rate_hz if self.rate_hz else 0
+        elapsed_ms = (time.monotonic() - sample.sent_at) * 1000
+        self.send_timer.start(max(0, round(interval_ms - elapsed_ms)))
+
+    def get_report(self):
+        """Return the results of the commands sent so far as a JSON-serializable dict."""
+        results = []
+        for command in dict.fromkeys(self.commands):
+            samples = [sample for sample in self.samples if sample.command == command]
+            outcomes = {outcome: sum(1 for sample in samples if sample.outcome == outcome)
+                        for outcome in (OBSERVED, REPLIED, UNCHANGED, NO_EFFECT, TIMEOUT, ERROR)}
+            results.append({
+                "command": command,
+                "sent": len(samples),
+                "outcomes": outcomes,
+                "reply_ms": summarize([sample.reply_ms for sample in samples
+                                       if sample.outcome not in (TIMEOUT, ERROR)]),
+                "effect_ms": summarize([sample.effect_ms for sample in samples if sample.outcome == OBSERVED]),
+            })
+        return {
+            "report_version": constants.media_control_report_version,
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started_at)),
+            "device_address": self.device_address,
+            "interface": self.interface,
+            "script": self.commands,
+            "repetitions": self.repetitions,
+            "rate_hz": self.rate_hz,
+            "timeout_ms": self.timeout_ms,
+            "player_path": self.player_path,
+            "results": results,
+            "samples": [sample.to_dict() for sample in self.samples],
+        }
+
+    def log_report(self, report):
+        """Log one summary line per command.
+
+        Args:
+            report: Report returned by get_report.
+        """
+        for line in self.get_summary(report).splitlines():
+            self.log.info("Media control %s", line)
+
+    def get_summary(self, report=None):
+        """Return one line per command with the effect latency percentiles and the failed commands.
+
+        Args:
+            report: Report returned by get_report; defaults to the current results.
+        """
+        lines = []
+        for result in (report or self.get_report())["results"]:
+            if not result["sent"]:
+                continue
+            effect, reply, outcomes = result["effect_ms"], result["reply_ms"], result["outcomes"]
+            if effect["p50"] is not None:
+                latency = f"effect p50/p95/p99 {effect['p50']:.0f}/{effect['p95']:.0f}/{effect['p99']:.0f} ms"
+            elif reply["p50"] is not None:
+                latency = f"reply p50/p95/p99 {reply['p50']:.0f}/{reply['p95']:.0f}/{reply['p99']:.0f} ms"
+            else:
+                latency = "no reply"
+            lines.append(f"{result['command']}: {result['sent']} sent, {latency}, "
+                         f"{outcomes[NO_EFFECT]} without effect, {outcomes[TIMEOUT]} timed out, "
+                         f"{outcomes[ERROR]} failed")
+        return "\n".join(lines)
+
+
+def save_report(report, file_path):
+    """Write a report as indented JSON.
+
+    Args:
+        report: Report returned by MediaControlEngine.get_report.
+        file_path: Path of the JSON file.
+    """
+    with open(file_path, "w") as report_file:
+        json.dump(report, report_file, indent=2)
+
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Stress AVRCP media control of one device and measure latencies.")
+    parser.add_argument("device_address", help="Bluetooth address of the device receiving the commands")
+    parser.add_argument("--script", default=constants.media_control_default_script,
+                        help="Comma separated commands, each optionally followed by *count, e.g. play,next*3,pause")
+    parser.add_argument("--repetitions", type=int, default=constants.media_control_default_repetitions,
+                        help="Passes of the script")
+    parser.add_argument("--rate", type=float, default=constants.media_control_default_rate_hz,
+                        help="Maximum commands per second, 0 for no limit")
+    parser.add_argument("--timeout-ms", type=int, default=constants.media_control_timeout_ms,
+                        help="Time a command may take before it counts as timed out")
+    parser.add_argument("--interface", default="hci0", help="Adapter the device is connected to")
+    parser.add_argument("--report", default="media_control.json", help="File receiving the JSON report")
+    parser.add_argument("--bus-address", help="D-Bus address to use instead of the system bus, e.g. of mock_bluez.py")
+    args = parser.parse_args(argv)
+    if args.bus_address:
+        os.environ["DBUS_SYSTEM_BUS_ADDRESS"] = args.bus_address
+    logging.basicConfig(stream=sys.stderr, level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    log = logging.getLogger("media_control_engine")
+    try:
+        commands = parse_script(args.script)
+    except ValueError as error:
+        parser.error(str(error))
+    from PyQt6.QtCore import QCoreApplication
+    application = QCoreApplication(sys.argv[:1])
+    engine = MediaControlEngine(log, args.device_address, commands, args.repetitions, args.rate,
+                                interface=args.interface, timeout_ms=args.timeout_ms)
+    outcome = {}
+    engine.finished.connect(lambda report: (outcome.update(report=report), application.quit()))
+    engine.failed.connect(lambda error: application.quit())
+    engine.start()
+    application.exec()
+    report = outcome.get("report")
+    if report is None:
+        return 1
+    save_report(report, args.report)
+    log.info("Report written to %s", args.report)
+    return 0 if all(result["outcomes"][TIMEOUT] + result["outcomes"][ERROR] == 0 for result in report["results"]) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,995 @@
+"""Mock BlueZ and obexd D-Bus service for load testing without hardware.
+
+Usage:
+    python mock_bluez.py scenario.yaml [--address unix:path=/tmp/bus]
+
+Without --address a private dbus-daemon is started. The bus address is printed on the first
+line of stdout; point BluetoothDeviceManager, TestApplication or headless_runner.py at it by
+exporting it before they open their first bus connection::
+
+    python mock_bluez.py scenario.yaml > /tmp/mock_bus &
+    export DBUS_SYSTEM_BUS_ADDRESS=$(head -1 /tmp/mock_bus) DBUS_SESSION_BUS_ADDRESS=$(head -1 /tmp/mock_bus)
+    python headless_runner.py job.yaml
+
+The scenario file (JSON or YAML) looks like::
+
+    adapters: [hci0]
+    devices: 2000
+    paired_ratio: 0.05
+    latencies: {Pair: [0.5, 2.0], Connect: 0.3, SendFile: 0.05, Play: 0.02, PlayerEvent: [0.05, 0.2]}
+    failure_rates: {Pair: 0.02, Connect: 0.05}
+    discovery: {batch: 50, interval_ms: 100, rssi_interval_ms: 1000}
+    obex: {throughput_kbps: 800}
+    pairing_storm: {request_type: confirm, count: 1000, interval_ms: 10}
+    incoming_pushes: {count: 500, size: 65536, interval_ms: 20}
+
+Latencies are seconds, either fixed or a [min, max] range; PlayerEvent is the time from a
+MediaControl1 reply until the media player reports the new Status or Track. Every value can be
+changed at run time through the org.bluez.mock.Control1 interface at /org/bluez/mock.
+
+The pairing storm starts once a pairing agent registers, the incoming pushes once an
+org.bluez.obex.Agent1 registers: each push is offered to that agent with AuthorizePush and, when
+accepted, written to the returned path at the obex throughput.
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+from collections import Counter
+
+import dbus
+import dbus.bus
+import dbus.service
+from dbus.mainloop.glib import DBusGMainLoop
+from gi.repository import GLib
+
+from libraries.bluetooth import constants
+
+DBusGMainLoop(set_as_default=True)
+
+
+class Failed(dbus.DBusException):
+    _dbus_error_name = "org.bluez.Error.Failed"
+
+
+class DoesNotExist(dbus.DBusException):
+    _dbus_error_name = "org.bluez.Error.DoesNotExist"
+
+
+class AlreadyExists(dbus.DBusException):
+    _dbus_error_name = "org.bluez.Error.AlreadyExists"
+
+
+class AuthenticationRejected(dbus.DBusException):
+    _dbus_error_name = "org.bluez.Error.AuthenticationRejected"
+
+
+class AuthenticationCanceled(dbus.DBusException):
+    _dbus_error_name = "org.bluez.Error.AuthenticationCanceled"
+
+
+def load_scenario_file(file_path):
+    """Load a scenario from a JSON or YAML file.
+
+    Args:
+        file_path: Path of the scenario file; .yaml/.yml files need PyYAML.
+    """
+    with open(file_path) as scenario_file:
+        if file_path.endswith((".yaml", ".yml")):
+            import yaml
+            return yaml.safe_load(scenario_file)
+        return json.load(scenario_file)
+
+
+def start_private_bus():
+    """Start a private dbus-daemon that allows any client to own any name.
+
+    Returns:
+        (process, address) of the running daemon.
+    """
+    process = subprocess.Popen(["dbus-daemon", "--session", "--nofork", "--print-address=1"],
+                               stdout=subprocess.PIPE, text=True)
+    address = process.stdout.readline().strip()
+    if not address:
+        process.kill()
+        raise RuntimeError("dbus-daemon did not report an address")
+    return process, address
+
+
+def point_clients_at(address):
+    """Make dbus.SystemBus() and dbus.SessionBus() of this process connect to a bus address.
+
+    Must be called before the first bus connection of the process is opened.
+
+    Args:
+        address: D-Bus address of the mock bus.
+    """
+    os.environ["DBUS_SYSTEM_BUS_ADDRESS"] = address
+    os.environ["DBUS_SESSION_BUS_ADDRESS"] = address
+
+
+def spawn_mock_bluez(scenario_file):
+    """Run the mock service in a child process on its own private bus.
+
+    Args:
+        scenario_file: Scenario file passed to the child.
+
+    Returns:
+        (process, address); terminate the process to stop both the mock and its bus.
+    """
+    process = subprocess.Popen([sys.executable, os.path.abspath(__file__), scenario_file],
+                               stdout=subprocess.PIPE, text=True)
+    address = process.stdout.readline().strip()
+    if not address:
+        process.kill()
+        raise RuntimeError("mock_bluez did not report a bus address")
+    return process, address
+
+
+def make_device_address(adapter_index, device_index):
+    """Return the address of a simulated device."""
+    return f"10:{adapter_index:02X}:" + ":".join(f"{(device_index >> shift) & 0xFF:02X}" for shift in (24, 16, 8, 0))
+
+
+class MockObject(dbus.service.Object):
+    """Exported object with org.freedesktop.DBus.Properties support."""
+
+    writable_properties = set()
+
+    def __init__(self, service, path):
+        """Export the object.
+
+        Args:
+            service: Owning MockBluezService.
+            path: Object path.
+        """
+        super().__init__(service.bus, path)
+        self.service = service
+        self.path = path
+        self.properties = {}
+
+    def get_interfaces(self):
+        """Return the interfaces and properties of the object in GetManagedObjects form."""
+        return dbus.Dictionary({interface: dbus.Dictionary(properties, signature="sv")
+                                for interface, properties in self.properties.items()}, signature="sa{sv}")
+
+    def set_properties(self, interface, changed):
+        """Update properties and emit PropertiesChanged.
+
+        Args:
+            interface: Interface owning the properties.
+            changed: Mapping of property names to new D-Bus typed values.
+        """
+        self.properties[interface].update(changed)
+        self.PropertiesChanged(interface, dbus.Dictionary(changed, signature="sv"), dbus.Array([], signature="s"))
+
+    @dbus.service.method(constants.properties_interface, in_signature="ss", out_signature="v")
+    def Get(self, interface, name):
+        try:
+            return self.properties[interface][name]
+        except KeyError:
+            raise DoesNotExist(f"No property {interface}.{name}")
+
+    @dbus.service.method(constants.properties_interface, in_signature="s", out_signature="a{sv}")
+    def GetAll(self, interface):
+        return dbus.Dictionary(self.properties.get(interface, {}), signature="sv")
+
+    @dbus.service.method(constants.properties_interface, in_signature="ssv", out_signature="")
+    def Set(self, interface, name, value):
+        if name not in self.writable_properties or name not in self.properties.get(interface, {}):
+            raise Failed(f"Property {interface}.{name} is not writable")
+        self.set_properties(interface, {name: value})
+
+    @dbus.service.signal(constants.properties_interface, signature="sa{sv}as")
+    def PropertiesChanged(self, interface, changed, invalidated):
+        pass
+
+
+class MockMediaPlayer(MockObject):
+    """Simulated org.bluez.MediaPlayer1 of a connected device, acting on its MediaControl1 commands."""
+
+    command_statuses = {"Play": "playing", "Pause": "paused", "Stop": "stopped", "FastForward": "forward-seek",
+                        "Rewind": "reverse-seek"}
+
+    def __init__(self, service, device):
+        super().__init__(service, f"{device.path}/player0")
+        self.track_number = 1
+        self.properties[constants.media_player_interface] = {
+            "Name": dbus.String("Mock Player"), "Type": dbus.String("Audio"), "Status": dbus.String("stopped"),
+            "Position": dbus.UInt32(0), "Device": dbus.ObjectPath(device.path), "Track": self.get_track(),
+        }
+
+    def get_track(self):
+        return dbus.Dictionary({"Title": dbus.String(f"Track {self.track_number}"),
+                                "TrackNumber": dbus.UInt32(self.track_number), "Duration": dbus.UInt32(180000)},
+                               signature="sv")
+
+    def apply_command(self, command):
+        """Report the effect of a MediaControl1 command after the PlayerEvent latency."""
+
+        def update():
+            if command in self.command_statuses:
+                self.set_properties(constants.media_player_interface,
+                                    {"Status": dbus.String(self.command_statuses[command])})
+            elif command in ("Next", "Previous"):
+                self.track_number = self.track_number + 1 if command == "Next" else max(1, self.track_number - 1)
+                self.set_properties(constants.media_player_interface, {"Track": self.get_track(),
+                                                                       "Position": dbus.UInt32(0)})
+            return False
+
+        latency = self.service.get_latency("PlayerEvent")
+        if latency > 0:
+            GLib.timeout_add(int(latency * 1000), update)
+        else:
+            update()
+
+
+class MockDevice(MockObject):
+    """Simulated org.bluez.Device1 with org.bluez.MediaControl1 and, while connected, a MediaPlayer1."""
+
+    writable_properties = {"Alias", "Trusted", "Blocked"}
+
+    def __init__(self, service, adapter, address, paired=False):
+        """Export the device.
+
+        Args:
+            service: Owning MockBluezService.
+            adapter: MockAdapter the device belongs to.
+            address: Bluetooth address of the device.
+            paired: True if the device starts out paired.
+        """
+        super().__init__(service, f"{adapter.path}/dev_{address.replace(':', '_')}")
+        self.adapter = adapter
+        self.address = address
+        name = f"Mock-{address[-5:].replace(':', '')}"
+        self.properties[constants.device_interface] = {
+            "Address": dbus.String(address), "AddressType": dbus.String("public"), "Name": dbus.String(name),
+            "Alias": dbus.String(name), "Class": dbus.UInt32(0x240404), "Paired": dbus.Boolean(paired),
+            "Bonded": dbus.Boolean(paired), "Trusted": dbus.Boolean(False), "Blocked": dbus.Boolean(False),
+            "Connected": dbus.Boolean(False), "ServicesResolved": dbus.Boolean(False),
+            "LegacyPairing": dbus.Boolean(False), "RSSI": dbus.Int16(-40 - random.randrange(50)),
+            "Adapter": dbus.ObjectPath(adapter.path),
+            "UUIDs": dbus.Array(["0000110a-0000-1000-8000-00805f9b34fb", "0000110b-0000-1000-8000-00805f9b34fb",
+                                 "0000110e-0000-1000-8000-00805f9b34fb", "00001105-0000-1000-8000-00805f9b34fb"],
+                                signature="s"),
+        }
+        self.properties[constants.media_control_interface] = {"Connected": dbus.Boolean(False)}
+        self.player = None
+
+    def is_paired(self):
+        return bool(self.properties[constants.device_interface]["Paired"])
+
+    def is_connected(self):
+        return bool(self.properties[constants.device_interface]["Connected"])
+
+    def set_paired(self, paired):
+        self.set_properties(constants.device_interface, {"Paired": dbus.Boolean(paired), "Bonded": dbus.Boolean(paired)})
+
+    def set_connected(self, connected):
+        self.set_properties(constants.device_interface, {"Connected": dbus.Boolean(connected),
+                                                         "ServicesResolved": dbus.Boolean(connected)})
+        if connected and self.player is None:
+            self.player = MockMediaPlayer(self.service, self)
+            self.service.object_manager.InterfacesAdded(dbus.ObjectPath(self.player.path), self.player.get_interfaces())
+            self.set_properties(constants.media_control_interface, {"Connected": dbus.Boolean(True),
+                                                                    "Player": dbus.ObjectPath(self.player.path)})
+            return
+        if not connected:
+            self.remove_player()
+        self.set_properties(constants.media_control_interface, {"Connected": dbus.Boolean(connected)})
+
+    def remove_player(self):
+        """Unexport the media player, as BlueZ does when AVRCP disconnects."""
+        if self.player is None:
+            return
+        self.player.remove_from_connection()
+        self.service.object_manager.InterfacesRemoved(
+            dbus.ObjectPath(self.player.path), dbus.Array([constants.media_player_interface], signature="s"))
+        self.properties[constants.media_control_interface].pop("Player", None)
+        self.player = None
+
+    @dbus.service.method(constants.device_interface, in_signature="", out_signature="",
+                         async_callbacks=("reply", "error"))
+    def Pair(self, reply, error):
+        if self.is_paired():
+            error(AlreadyExists("Already Exists"))
+            return
+        self.service.authenticate(
+            self, lambda: self.service.respond("Pair", reply, error, lambda: self.set_paired(True)), error)
+
+    @dbus.service.method(constants.device_interface, in_signature="", out_signature="")
+    def CancelPairing(self):
+        self.service.call_counts["CancelPairing"] += 1
+
+    @dbus.service.method(constants.device_interface, in_signature="", out_signature="",
+                         async_callbacks=("reply", "error"))
+    def Connect(self, reply, error):
+        self.service.respond("Connect", reply, error, lambda: self.set_connected(True))
+
+    @dbus.service.method(constants.device_interface, in_signature="", out_signature="",
+                         async_callbacks=("reply", "error"))
+    def Disconnect(self, reply, error):
+        self.service.respond("Disconnect", reply, error, lambda: self.set_connected(False))
+
+    @dbus.service.method(constants.device_interface, in_signature="s", out_signature="",
+                         async_callbacks=("reply", "error"))
+    def ConnectProfile(self, uuid, reply, error):
+        self.service.respond("ConnectProfile", reply, error, lambda: self.set_connected(True))
+
+    @dbus.service.method(constants.device_interface, in_signature="s", out_signature="",
+                         async_callbacks=("reply", "error"))
+    def DisconnectProfile(self, uuid, reply, error):
+        self.service.respond("DisconnectProfile", reply, error)
+
+    def media_command(self, command, reply, error):
+        """Answer a MediaControl1 command, failing when the device is not connected."""
+        if not self.is_connected():
+            error(Failed("Not connected"))
+            return
+        self.service.respond(command, reply, error, lambda: self.player.apply_command(command) if self.player else None)
+
+    @dbus.service.method(constants.media_control_interface, in_signature="", out_signature="",
+                         async_callbacks=("reply", "error"))
+    def Play(self, reply, error):
+        self.media_command("Play", reply, error)
+
+    @dbus.service.method(constants.media_control_interface, in_signature="", out_signature="",
+                         async_callbacks=("reply", "error"))
+    def Pause(self, reply, error):
+        self.media_command("Pause", reply, error)
+
+    @dbus.service.method(constants.media_control_interface, in_signature="", out_signature="",
+                         async_callbacks=("reply", "error"))
+    def Stop(self, reply, error):
+        self.media_command("Stop", reply, error)
+
+    @dbus.service.method(constants.media_control_interface, in_signature="", out_signature="",
+                         async_callbacks=("reply", "error"))
+    def Next(self, reply, error):
+        self.media_command("Next", reply, error)
+
+    @dbus.service.method(constants.media_control_interface, in_signature="", out_signature="",
+                         async_callbacks=("reply", "error"))
+    def Previous(self, reply, error):
+        self.media_command("Previous", reply, error)
+
+    @dbus.service.method(constants.media_control_interface, in_signature="", out_signature="",
+                         async_callbacks=("reply", "error"))
+    def VolumeUp(self, reply, error):
+        self.media_command("VolumeUp", reply, error)
+
+    @dbus.service.method(constants.media_control_interface, in_signature="", out_signature="",
+                         async_callbacks=("reply", "error"))
+    def VolumeDown(self, reply, error):
+        self.media_command("VolumeDown", reply, error)
+
+    @dbus.service.method(constants.media_control_interface, in_signature="", out_signature="",
+                         async_callbacks=("reply", "error"))
+    def FastForward(self, reply, error):
+        self.media_command("FastForward", reply, error)
+
+    @dbus.service.method(constants.media_control_interface, in_signature="", out_signature="",
+                         async_callbacks=("reply", "error"))
+    def Rewind(self, reply, error):
+        self.media_command("Rewind", reply, error)
+
+
+class MockAdapter(MockObject):
+    """Simulated org.bluez.Adapter1 whose discovery reveals a generated device population."""
+
+    writable_properties = {"Alias", "Powered", "Discoverable", "DiscoverableTimeout", "Pairable", "PairableTimeout"}
+
+    def __init__(self, service, index, name, device_count, paired_ratio):
+        """Export the adapter and its initially paired devices.
+
+        Args:
+            service: Owning MockBluezService.
+            index: Index of the adapter, used to derive addresses.
+            name: Interface name (e.g. 'hci0').
+            device_count: Size of the simulated device population.
+            paired_ratio: Fraction of the population that starts out paired.
+        """
+        super().__init__(service, f"{constants.bluez_path}/{name}")
+        self.name = name
+        address = f"00:00:00:00:{index >> 8:02X}:{index & 0xFF:02X}"
+        self.properties[constants.adapter_interface] = {
+            "Address": dbus.String(address), "AddressType": dbus.String("public"), "Name": dbus.String(f"mock-{name}"),
+            "Alias": dbus.String(f"mock-{name}"), "Class": dbus.UInt32(0x6c010c), "Powered": dbus.Boolean(True),
+            "Discoverable": dbus.Boolean(False), "DiscoverableTimeout": dbus.UInt32(180),
+            "Pairable": dbus.Boolean(True), "PairableTimeout": dbus.UInt32(0), "Discovering": dbus.Boolean(False),
+            "UUIDs": dbus.Array([], signature="s"), "Modalias": dbus.String("usb:v1D6Bp0246d0540"),
+        }
+        self.population = [make_device_address(index, device_index) for device_index in range(device_count)]
+        self.devices = {}
+        self.discovery_position = 0
+        self.discovery_sources = []
+        paired_every = max(1, round(1 / paired_ratio)) if paired_ratio else 0
+        for device_index, device_address in enumerate(self.population):
+            if paired_every and device_index % paired_every == 0:
+                self.add_device(device_address, paired=True)
+
+    def add_device(self, device_address, paired=False):
+        """Export a device of the population and announce it with InterfacesAdded."""
+        device = self.devices.get(device_address)
+        if device is None:
+            device = self.devices[device_address] = MockDevice(self.service, self, device_address, paired)
+            self.service.object_manager.InterfacesAdded(dbus.ObjectPath(device.path), device.get_interfaces())
+        return device
+
+    def reveal_next_device(self):
+        """Export the next device of the population, wrapping around once all were seen."""
+        device = self.add_device(self.population[self.discovery_position])
+        self.discovery_position = (self.discovery_position + 1) % len(self.population)
+        return device
+
+    def discover_batch(self):
+        """Reveal the next batch of the population."""
+        for _ in range(min(self.service.discovery.get("batch", 50), len(self.population))):
+            self.reveal_next_device()
+        return True
+
+    def update_rssi(self):
+        """Report a new RSSI for every unconnected device, as BlueZ does while discovering."""
+        for device in list(self.devices.values()):
+            if not device.is_connected():
+                device.set_properties(constants.device_interface, {"RSSI": dbus.Int16(-30 - random.randrange(60))})
+        return True
+
+    def stop_discovery_sources(self):
+        for source_id in self.discovery_sources:
+            GLib.source_remove(source_id)
+        self.discovery_sources = []
+
+    @dbus.service.method(constants.adapter_interface, in_signature="", out_signature="",
+                         async_callbacks=("reply", "error"))
+    def StartDiscovery(self, reply, error):
+        def start():
+            if not self.discovery_sources:
+                self.discovery_sources = [
+                    GLib.timeout_add(self.service.discovery.get("interval_ms", 100), self.discover_batch),
+                    GLib.timeout_add(self.service.discovery.get("rssi_interval_ms", 1000), self.update_rssi),
+                ]
+            self.set_properties(constants.adapter_interface, {"Discovering": dbus.Boolean(True)})
+
+        self.service.respond("StartDiscovery", reply, error, start)
+
+    @dbus.service.method(constants.adapter_interface, in_signature="", out_signature="",
+                         async_callbacks=("reply", "error"))
+    def StopDiscovery(self, reply, error):
+        def stop():
+            self.stop_discovery_sources()
+            self.set_properties(constants.adapter_interface, {"Discovering": dbus.Boolean(False)})
+
+        self.service.respond("StopDiscovery", reply, error, stop)
+
+    @dbus.service.method(constants.adapter_interface, in_signature="a{sv}", out_signature="")
+    def SetDiscoveryFilter(self, properties):
+        self.service.call_counts["SetDiscoveryFilter"] += 1
+
+    @dbus.service.method(constants.adapter_interface, in_signature="o", out_signature="",
+                         async_callbacks=("reply", "error"))
+    def RemoveDevice(self, device_path, reply, error):
+        device_address = str(device_path).split("dev_")[-1].replace("_", ":")
+        device = self.devices.get(device_address)
+        if device is None:
+            error(DoesNotExist("Does Not Exist"))
+            return
+
+        def remove():
+            del self.devices[device_address]
+            device.remove_player()
+            device.remove_from_connection()
+            self.service.object_manager.InterfacesRemoved(
+                dbus.ObjectPath(device.path), dbus.Array(list(device.properties.keys()), signature="s"))
+
+        self.service.respond("RemoveDevice", reply, error, remove)
+
+
+class MockObjectManager(dbus.service.Object):
+    """org.freedesktop.DBus.ObjectManager at the root of the mock service."""
+
+    def __init__(self, service, path="/"):
+        super().__init__(service.bus, path)
+        self.service = service
+
+    @dbus.service.method(constants.object_manager_interface, in_signature="", out_signature="a{oa{sa{sv}}}")
+    def GetManagedObjects(self):
+        managed_objects = {dbus.ObjectPath(constants.bluez_path): {constants.agent_interface: {}}}
+        for adapter in self.service.adapters.values():
+            managed_objects[dbus.ObjectPath(adapter.path)] = adapter.get_interfaces()
+            for device in adapter.devices.values():
+                managed_objects[dbus.ObjectPath(device.path)] = device.get_interfaces()
+                if device.player is not None:
+                    managed_objects[dbus.ObjectPath(device.player.path)] = device.player.get_interfaces()
+        return managed_objects
+
+    @dbus.service.signal(constants.object_manager_interface, signature="oa{sa{sv}}")
+    def InterfacesAdded(self, path, interfaces):
+        pass
+
+    @dbus.service.signal(constants.object_manager_interface, signature="oas")
+    def InterfacesRemoved(self, path, interfaces):
+        pass
+
+
+class MockAgentManager(dbus.service.Object):
+    """org.bluez.AgentManager1 remembering the registered agents of each client."""
+
+    def __init__(self, service):
+        super().__init__(service.bus, constants.bluez_path)
+        self.service = service
+        self.agents = {}
+        self.default_agent = None
+
+    @dbus.service.method(constants.agent_interface, in_signature="os", out_signature="", sender_keyword="sender")
+    def RegisterAgent(self, agent_path, capability, sender=None):
+        if (sender, str(agent_path)) in self.agents:
+            raise AlreadyExists("Already Exists")
+        self.agents[(sender, str(agent_path))] = str(capability) or "KeyboardDisplay"
+        self.service.call_counts["RegisterAgent"] += 1
+        if self.default_agent is None:
+            self.default_agent = (sender, str(agent_path))
+        self.service.start_pairing_storm()
+
+    @dbus.service.method(constants.agent_interface, in_signature="o", out_signature="", sender_keyword="sender")
+    def UnregisterAgent(self, agent_path, sender=None):
+        if self.agents.pop((sender, str(agent_path)), None) is None:
+            raise DoesNotExist("Does Not Exist")
+        if self.default_agent == (sender, str(agent_path)):
+            self.default_agent = next(iter(self.agents), None)
+
+    @dbus.service.method(constants.agent_interface, in_signature="o", out_signature="", sender_keyword="sender")
+    def RequestDefaultAgent(self, agent_path, sender=None):
+        if (sender, str(agent_path)) not in self.agents:
+            raise DoesNotExist("Does Not Exist")
+        self.default_agent = (sender, str(agent_path))
+
+
+class MockTransfer(MockObject):
+    """Simulated org.bluez.obex.Transfer1 progressing at the configured throughput."""
+
+    def __init__(self, service, session, index, file_path, size=None):
+        """Export the transfer.
+
+        Args:
+            service: Owning MockBluezService.
+            session: MockObexSession the transfer belongs to.
+            index: Number of the transfer within the session.
+            file_path: File sent, or name of the object pushed to this host.
+            size: Size of a pushed object; defaults to the size of file_path.
+        """
+        super().__init__(service, f"{session.path}/transfer{index}")
+        if size is None:
+            size = os.path.getsize(file_path) if os.path.exists(file_path) else 0
+        self.properties[constants.obex_object_transfer] = {
+            "Status": dbus.String("queued"), "Session": dbus.ObjectPath(session.path),
+            "Name": dbus.String(os.path.basename(file_path)), "Type": dbus.String(""),
+            "Size": dbus.UInt64(size), "Transferred": dbus.UInt64(0), "Filename": dbus.String(file_path),
+        }
+        self.source_id = None
+        self.output_file = None
+        self.on_finished = None
+
+    def start(self, will_fail, output_path=None, on_finished=None):
+        """Start reporting progress; a failing transfer stops with status 'error' halfway.
+
+        Args:
+            will_fail: True if the transfer ends with an error.
+            output_path: File the received bytes are written to, for a push to this host.
+            on_finished: Called once the transfer completed, failed or was cancelled.
+        """
+        tick_ms = 100
+        bytes_per_tick = max(1, int(self.service.obex.get("throughput_kbps", 800) * 1024 / 8 * tick_ms / 1000))
+        size = int(self.properties[constants.obex_object_transfer]["Size"])
+        self.on_finished = on_finished
+        if output_path:
+            self.output_file = open(output_path, "wb")
+            self.properties[constants.obex_object_transfer]["Filename"] = dbus.String(output_path)
+        self.set_properties(constants.obex_object_transfer, {"Status": dbus.String("active")})
+
+        def advance():
+            previous = int(self.properties[constants.obex_object_transfer]["Transferred"])
+            transferred = min(size, previous + bytes_per_tick)
+            if will_fail and transferred >= size // 2:
+                self.finish("error")
+                return False
+            if self.output_file:
+                self.output_file.write(bytes(transferred - previous))
+            if transferred >= size:
+                self.properties[constants.obex_object_transfer]["Transferred"] = dbus.UInt64(size)
+                self.finish("complete")
+                return False
+            self.set_properties(constants.obex_object_transfer, {"Transferred": dbus.UInt64(transferred)})
+            return True
+
+        self.source_id = GLib.timeout_add(tick_ms, advance)
+
+    def finish(self, status):
+        """Close the output file and report the final status.
+
+        Args:
+            status: 'complete' or 'error'.
+        """
+        self.source_id = None
+        if self.output_file:
+            self.output_file.close()
+            self.output_file = None
+        changed = {"Status": dbus.String(status)}
+        if status == "complete":
+            changed["Transferred"] = self.properties[constants.obex_object_transfer]["Transferred"]
+        self.set_properties(constants.obex_object_transfer, changed)
+        if self.on_finished:
+            self.on_finished()
+
+    @dbus.service.method(constants.obex_object_transfer, in_signature="", out_signature="")
+    def Cancel(self):
+        if str(self.properties[constants.obex_object_transfer]["Status"]) in ("complete", "error"):
+            raise Failed("Transfer already ended")
+        if self.source_id:
+            GLib.source_remove(self.source_id)
+        self.finish("error")
+
+
+class MockObexSession(MockObject):
+    """Simulated obex session; client sessions implement org.bluez.obex.ObjectPush1."""
+
+    def __init__(self, service, index, destination, target, role="client"):
+        super().__init__(service, f"{constants.obex_path}/{role}/session{index}")
+        self.properties[constants.obex_session_interface] = {
+            "Destination": dbus.String(destination), "Target": dbus.String(target),
+            "Source": dbus.String("00:00:00:00:00:00"), "Channel": dbus.Byte(12),
+        }
+        self.transfer_count = 0
+        self.transfers = []
+
+    def remove(self):
+        for transfer in self.transfers:
+            if transfer.source_id:
+                GLib.source_remove(transfer.source_id)
+            if transfer.output_file:
+                transfer.output_file.close()
+            transfer.remove_from_connection()
+        self.remove_from_connection()
+
+    @dbus.service.method(constants.obex_object_push, in_signature="s", out_signature="oa{sv}",
+                         async_callbacks=("reply", "error"))
+    def SendFile(self, source_file, reply, error):
+        if not os.path.exists(source_file):
+            error(Failed(f"{source_file} does not exist"))
+            return
+        self.transfer_count += 1
+        transfer = MockTransfer(self.service, self, self.transfer_count, str(source_file))
+        self.transfers.append(transfer)
+        will_fail = random.random() < self.service.failure_rates.get("Transfer", 0)
+
+        def send():
+            transfer.start(will_fail)
+            return dbus.ObjectPath(transfer.path), transfer.GetAll(constants.obex_object_transfer)
+
+        self.service.respond("SendFile", reply, error, send)
+
+
+class MockObexClient(dbus.service.Object):
+    """Simulated org.bluez.obex.Client1."""
+
+    def __init__(self, service):
+        super().__init__(service.bus, constants.obex_path)
+        self.service = service
+        self.session_count = 0
+        self.sessions = {}
+
+    @dbus.service.method(constants.obex_client, in_signature="sa{sv}", out_signature="o",
+                         async_callbacks=("reply", "error"))
+    def CreateSession(self, destination, args, reply, error):
+        def create():
+            self.session_count += 1
+            session = MockObexSession(self.service, self.session_count, str(destination),
+                                      str(args.get("Target", "opp")))
+            self.sessions[session.path] = session
+            return dbus.ObjectPath(session.path)
+
+        self.service.respond("CreateSession", reply, error, create)
+
+    @dbus.service.method(constants.obex_client, in_signature="o", out_signature="")
+    def RemoveSession(self, session_path):
+        session = self.sessions.pop(str(session_path), None)
+        if session is None:
+            raise DoesNotExist("Does Not Exist")
+        session.remove()
+
+
+class MockObexAgentManager(MockObexClient):
+    """org.bluez.obex.AgentManager1 next to Client1 at /org/bluez/obex, as obexd exports both there.
+
+    Objects pushed to this host are offered to the registered agent with AuthorizePush; an
+    accepted push is written to the path the agent returned, in a server session that is removed
+    once the transfer ended, like obexd does.
+    """
+
+    def __init__(self, service):
+        super().__init__(service)
+        self.agent = None
+        self.server_session_count = 0
+
+    @dbus.service.method(constants.obex_agent_manager, in_signature="o", out_signature="", sender_keyword="sender")
+    def RegisterAgent(self, agent_path, sender=None):
+        if self.agent is not None:
+            raise AlreadyExists("Already Exists")
+        self.agent = (sender, str(agent_path))
+        self.service.call_counts["RegisterObexAgent"] += 1
+        self.service.start_incoming_pushes()
+
+    @dbus.service.method(constants.obex_agent_manager, in_signature="o", out_signature="", sender_keyword="sender")
+    def UnregisterAgent(self, agent_path, sender=None):
+        if self.agent != (sender, str(agent_path)):
+            raise DoesNotExist("Does Not Exist")
+        self.agent = None
+
+    def push(self, sender_address, size):
+        """Offer an object from a device to the registered agent and receive it if accepted.
+
+        Args:
+            sender_address: Bluetooth address of the pushing device.
+            size: Size of the object in bytes.
+        """
+        if self.agent is None:
+            return
+        self.server_session_count += 1
+        session = MockObexSession(self.service, self.server_session_count, sender_address, "opp", role="server")
+        transfer = MockTransfer(self.service, session, 1, f"push{self.server_session_count}.bin", size=size)
+        session.transfers.append(transfer)
+        will_fail = random.random() < self.service.failure_rates.get("Push", 0)
+        self.service.agent_counts["push"] += 1
+
+        def remove_session():
+            session.remove()
+            return False
+
+        def on_authorized(output_path):
+            self.service.call_counts["PushAccepted"] += 1
+            transfer.start(will_fail, str(output_path), on_finished=lambda: GLib.timeout_add(
+                constants.mock_obex_transfer_linger_ms, remove_session))
+
+        def on_rejected(agent_error):
+            self.service.call_counts["PushRejected"] += 1
+            session.remove()
+
+        sender, agent_path = self.agent
+        agent = self.service.bus.get_object(sender, agent_path, introspect=False)
+        agent.AuthorizePush(dbus.ObjectPath(transfer.path), dbus_interface=constants.obex_agent,
+                            reply_handler=on_authorized, error_handler=on_rejected, timeout=60)
+
+
+class MockControl(dbus.service.Object):
+    """org.bluez.mock.Control1: changes the scenario of a running mock and reads its counters."""
+
+    def __init__(self, service):
+        super().__init__(service.bus, constants.mock_control_path)
+        self.service = service
+
+    @dbus.service.method(constants.mock_control_interface, in_signature="sdd", out_signature="")
+    def SetLatency(self, method, minimum, maximum):
+        self.service.latencies[str(method)] = [float(minimum), float(maximum)]
+
+    @dbus.service.method(constants.mock_control_interface, in_signature="sd", out_signature="")
+    def SetFailureRate(self, method, rate):
+        self.service.failure_rates[str(method)] = float(rate)
+
+    @dbus.service.method(constants.mock_control_interface, in_signature="su", out_signature="u")
+    def AddDevices(self, adapter_name, count):
+        adapter = self.service.adapters[str(adapter_name)]
+        for _ in range(min(count, len(adapter.population))):
+            adapter.reveal_next_device()
+        return len(adapter.devices)
+
+    @dbus.service.method(constants.mock_control_interface, in_signature="suu", out_signature="")
+    def TriggerPairingRequests(self, request_type, count, interval_ms):
+        self.service.start_pairing_storm({"request_type": str(request_type), "count": int(count),
+                                          "interval_ms": int(interval_ms)})
+
+    @dbus.service.method(constants.mock_control_interface, in_signature="uuu", out_signature="")
+    def TriggerIncomingPushes(self, count, size, interval_ms):
+        self.service.start_incoming_pushes({"count": int(count), "size": int(size), "interval_ms": int(interval_ms)})
+
+    @dbus.service.method(constants.mock_control_interface, in_signature="", out_signature="a{su}")
+    def GetStats(self):
+        return dbus.Dictionary({**{f"calls.{name}": count for name, count in self.service.call_counts.items()},
+                                **{f"failures.{name}": count for name, count in self.service.failure_counts.items()},
+                                **{f"agent.{name}": count for name, count in self.service.agent_counts.items()}},
+                               signature="su")
+
+
+class MockBluezService:
+    """Owns org.bluez and org.bluez.obex on a bus and exports the simulated objects."""
+
+    agent_calls = {
+        "pin": ("RequestPinCode", lambda device, passkey: (device,)),
+        "passkey": ("RequestPasskey", lambda device, passkey: (device,)),
+        "confirm": ("RequestConfirmation", lambda device, passkey: (device, dbus.UInt32(passkey))),
+        "authorization": ("RequestAuthorization", lambda device, passkey: (device,)),
+        "authorize": ("AuthorizeService",
+                      lambda device, passkey: (device, dbus.String("0000110d-0000-1000-8000-00805f9b34fb"))),
+        "display_pin": ("DisplayPinCode", lambda device, passkey: (device, dbus.String(f"{passkey % 10000:04d}"))),
+        "display_passkey": ("DisplayPasskey", lambda device, passkey: (device, dbus.UInt32(passkey), dbus.UInt16(0))),
+    }
+    capability_requests = {"DisplayYesNo": "confirm", "KeyboardDisplay": "confirm", "KeyboardOnly": "passkey",
+                           "DisplayOnly": "display_passkey"}
+
+    def __init__(self, bus, scenario):
+        """Export the mock objects.
+
+        Args:
+            bus: Bus connection the service is exported on.
+            scenario: Scenario dict as described in the module docstring.
+        """
+        self.bus = bus
+        self.latencies = dict(scenario.get("latencies", {}))
+        self.failure_rates = dict(scenario.get("failure_rates", {}))
+        self.discovery = dict(scenario.get("discovery", {}))
+        self.obex = dict(scenario.get("obex", {}))
+        self.pairing_storm = scenario.get("pairing_storm")
+        self.incoming_pushes = scenario.get("incoming_pushes")
+        self.call_counts = Counter()
+        self.failure_counts = Counter()
+        self.agent_counts = Counter()
+        self.bus_names = [dbus.service.BusName(constants.bluez_service, bus),
+                          dbus.service.BusName(constants.obex_service, bus)]
+        self.object_manager = MockObjectManager(self)
+        self.agent_manager = MockAgentManager(self)
+        self.adapters = {}
+        for index, name in enumerate(scenario.get("adapters", ["hci0"])):
+            self.adapters[name] = MockAdapter(self, index, name, scenario.get("devices", 100),
+                                              scenario.get("paired_ratio", 0.0))
+        self.obex_agent_manager = MockObexAgentManager(self)
+        self.control = MockControl(self)
+
+    def get_latency(self, method):
+        """Return a latency in seconds for a method call from the scenario."""
+        latency = self.latencies.get(method, 0)
+        if isinstance(latency, (list, tuple)):
+            return random.uniform(latency[0], latency[1])
+        return float(latency)
+
+    def respond(self, method, reply, error, action=None):
+        """Answer an asynchronous method call after its latency, failing at its failure rate.
+
+        Args:
+            method: Name of the method, the key of the latency and failure rate tables.
+            reply: D-Bus reply callback.
+            error: D-Bus error callback.
+            action: Optional callable applying the effect of the call; a non-None result is the reply value.
+        """
+        self.call_counts[method] += 1
+
+        def finish():
+            if random.random() < self.failure_rates.get(method, 0):
+                self.failure_counts[method] += 1
+                error(Failed(f"Simulated {method} failure"))
+                return False
+            result = action() if action else None
+            if result is None:
+                reply()
+            elif isinstance(result, tuple):
+                reply(*result)
+            else:
+                reply(result)
+            return False
+
+        latency = self.get_latency(method)
+        if latency > 0:
+            GLib.timeout_add(int(latency * 1000), finish)
+        else:
+            finish()
+
+    def call_agent(self, device, request_type, on_success, on_error):
+        """Send an Agent1 request for a device to the default agent.
+
+        Args:
+            device: MockDevice the request is about.
+            request_type: Key of agent_calls (matches pairing_request_handlers).
+            on_success: Called once the agent replied.
+            on_error: Called with the agent's DBusException.
+        """
+        sender, agent_path = self.agent_manager.default_agent
+        method_name, make_args = self.agent_calls[request_type]
+        self.agent_counts[request_type] += 1
+        agent = self.bus.get_object(sender, agent_path, introspect=False)
+        getattr(agent, method_name)(*make_args(dbus.ObjectPath(device.path), random.randrange(1000000)),
+                                    dbus_interface=constants.agent, reply_handler=lambda *result: on_success(),
+                                    error_handler=on_error, timeout=60)
+
+    def authenticate(self, device, on_success, error):
+        """Run the agent step of a Pair call according to the default agent's capability."""
+        if self.agent_manager.default_agent is None:
+            on_success()
+            return
+        capability = self.agent_manager.agents[self.agent_manager.default_agent]
+        request_type = self.capability_requests.get(capability)
+        if request_type is None:
+            on_success()
+            return
+
+        def on_error(agent_error):
+            if agent_error.get_dbus_name() == "org.bluez.Error.Canceled":
+                error(AuthenticationCanceled("Authentication Canceled"))
+            else:
+                error(AuthenticationRejected("Authentication Rejected"))
+
+        self.call_agent(device, request_type, on_success, on_error)
+
+    def start_pairing_storm(self, pairing_storm=None):
+        """Send device-initiated agent requests for unpaired devices at a fixed interval.
+
+        Args:
+            pairing_storm: Dict with request_type, count and interval_ms; defaults to the scenario's.
+        """
+        pairing_storm = pairing_storm or self.pairing_storm
+        if not pairing_storm or self.agent_manager.default_agent is None:
+            return
+        self.pairing_storm = None
+        adapter = next(iter(self.adapters.values()))
+        remaining = [pairing_storm.get("count", 100)]
+        request_type = pairing_storm.get("request_type", "confirm")
+
+        def send_next():
+            if remaining[0] <= 0 or self.agent_manager.default_agent is None:
+                return False
+            remaining[0] -= 1
+            device = adapter.reveal_next_device()
+            self.call_agent(device, request_type, lambda: None if device.is_paired() else device.set_paired(True),
+                            lambda agent_error: None)
+            return True
+
+        GLib.timeout_add(pairing_storm.get("interval_ms", 10), send_next)
+
+    def start_incoming_pushes(self, incoming_pushes=None):
+        """Push objects from the devices of the first adapter to the obex agent at a fixed interval.
+
+        Args:
+            incoming_pushes: Dict with count, size and interval_ms; defaults to the scenario's.
+        """
+        incoming_pushes = incoming_pushes or self.incoming_pushes
+        if not incoming_pushes or self.obex_agent_manager.agent is None:
+            return
+        self.incoming_pushes = None
+        adapter = next(iter(self.adapters.values()))
+        remaining = [incoming_pushes.get("count", 100)]
+        size = incoming_pushes.get("size", 64 * 1024)
+
+        def send_next():
+            if remaining[0] <= 0 or self.obex_agent_manager.agent is None:
+                return False
+            remaining[0] -= 1
+            self.obex_agent_manager.push(adapter.reveal_next_device().address, size)
+            return True
+
+        GLib.timeout_add(incoming_pushes.get("interval_ms", 50), send_next)
+
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Run a mock BlueZ/obexd D-Bus service.")
+    parser.add_argument("scenario_file", help="JSON or YAML scenario description")
+    parser.add_argument("--address", help="Existing bus to export on (default: start a private dbus-daemon)")
+    args = parser.parse_args(argv)
+    bus_process = None
+    address = args.address
+    if not address:
+        bus_process, address = start_private_bus()
+    try:
+        bus = dbus.bus.BusConnection(address)
+        MockBluezService(bus, load_scenario_file(args.scenario_file))
+        print(address, flush=True)
+        GLib.MainLoop().run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if bus_process:
+            bus_process.terminate()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
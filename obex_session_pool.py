@@ -0,0 +1,182 @@
+import threading
+import time
+
+import dbus
+from PyQt6.QtCore import QObject
+from PyQt6.QtCore import QTimer
+
+from libraries.bluetooth import constants
+
+
+class ObexSession:
+    """One obexd client session and its use in the pool."""
+
+    def __init__(self, key, session_path):
+        """Initialize the session.
+
+        Args:
+            key: (adapter address, device address, target) tuple the session was created for.
+            session_path: D-Bus object path of the session.
+        """
+        self.key = key
+        self.session_path = session_path
+        self.in_use = True
+        self.transfers = 0
+        self.released_at = None
+
+
+class ObexSessionPool(QObject):
+    """Idle OBEX client sessions kept open for reuse, keyed by (adapter, device, target).
+
+    Creating a session costs an RFCOMM/L2CAP connect plus an OBEX CONNECT, which dominates when
+    many small files go to the same device. acquire() hands out an idle session of the key when
+    there is one and creates a session otherwise; a session serves one transfer at a time.
+    Sessions idle for longer than the idle timeout are removed. acquire() may run on worker
+    threads; the other methods are called from the GUI thread.
+    """
+
+    def __init__(self, log, bus, latency_recorder=None, idle_timeout_ms=constants.obex_session_idle_timeout_ms):
+        """Initialize the pool.
+
+        Args:
+            log: Logger instance used for logging.
+            bus: D-Bus session bus connection to obexd.
+            latency_recorder: Optional LatencyRecorder receiving the session setup times.
+            idle_timeout_ms: Time an unused session stays open.
+        """
+        super().__init__()
+        self.log = log
+        self.bus = bus
+        self.latency_recorder = latency_recorder
+        self.idle_timeout = idle_timeout_ms / 1000
+        self.lock = threading.Lock()
+        self.sessions = {}
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.discarded = 0
+        self.expiry_timer = QTimer(self)
+        self.expiry_timer.timeout.connect(self.expire_idle_sessions)
+        self.expiry_timer.start(max(1000, idle_timeout_ms // 4))
+
+    def acquire(self, adapter_address, device_address, target):
+        """Return an idle session of the key, or a new one; the caller must release or discard it.
+
+        Args:
+            adapter_address: Address of the local adapter, or None for the obexd default.
+            device_address: Bluetooth address of the remote device.
+            target: OBEX target (e.g., 'opp').
+
+        Returns:
+            Tuple of the session object path and True if an existing session was reused.
+
+        Raises:
+            dbus.exceptions.DBusException: If a new session cannot be created.
+        """
+        key = (adapter_address, device_address, target)
+        with self.lock:
+            for session in self.sessions.values():
+                if session.key == key and not session.in_use:
+                    session.in_use = True
+                    self.hits += 1
+                    return session.session_path, True
+            self.misses += 1
+        options = {"Target": target}
+        if adapter_address:
+            options["Source"] = adapter_address
+        client = dbus.Interface(self.bus.get_object(constants.obex_service, constants.obex_path),
+                                constants.obex_client)
+        started_at = time.monotonic()
+        try:
+            session_path = str(client.CreateSession(device_address, options))
+        except dbus.exceptions.DBusException:
+            if self.latency_recorder:
+                self.latency_recorder.record("obex_session", "create", time.monotonic() - started_at, False)
+            raise
+        if self.latency_recorder:
+            self.latency_recorder.record("obex_session", "create", time.monotonic() - started_at, True)
+        with self.lock:
+            self.sessions[session_path] = ObexSession(key, session_path)
+        self.log.debug("Created OBEX session %s to %s", session_path, device_address)
+        return session_path, False
+
+    def release(self, session_path):
+        """Return a session after a finished transfer so it can be reused.
+
+        Args:
+            session_path: D-Bus object path of the session.
+        """
+        with self.lock:
+            session = self.sessions.get(session_path)
+            if session is None:
+                return
+            session.in_use = False
+            session.transfers += 1
+            session.released_at = time.monotonic()
+
+    def discard(self, session_path):
+        """Remove a session that failed or may be broken instead of returning it to the pool.
+
+        Args:
+            session_path: D-Bus object path of the session.
+        """
+        with self.lock:
+            if self.sessions.pop(session_path, None) is None:
+                return
+            self.discarded += 1
+        self.remove_session(session_path)
+
+    def expire_idle_sessions(self, idle_timeout=None):
+        """Remove the sessions that have been idle for longer than the idle timeout.
+
+        Args:
+            idle_timeout: Idle time in seconds overriding the pool's timeout; 0 closes every idle session.
+        """
+        idle_timeout = self.idle_timeout if idle_timeout is None else idle_timeout
+        now = time.monotonic()
+        with self.lock:
+            expired_paths = [session_path for session_path, session in self.sessions.items()
+                             if not session.in_use and now - session.released_at >= idle_timeout]
+            for session_path in expired_paths:
+                del self.sessions[session_path]
+            self.expired += len(expired_paths)
+        for session_path in expired_paths:
+            self.log.debug("Closing idle OBEX session %s", session_path)
+            self.remove_session(session_path)
+
+    def remove_session(self, session_path):
+        """Ask obexd to close a session without waiting for the reply.
+
+        Args:
+            session_path: D-Bus object path of the session.
+        """
+        client = dbus.Interface(self.bus.get_object(constants.obex_service, constants.obex_path, introspect=False),
+                                constants.obex_client)
+        client.RemoveSession(dbus.ObjectPath(session_path), reply_handler=lambda: None,
+                             error_handler=lambda error: self.log.debug("RemoveSession %s failed: %s",
+                                                                        session_path, error))
+
+    def close(self):
+        """Close every session and stop expiring sessions."""
+        self.expiry_timer.stop()
+        with self.lock:
+            session_paths = list(self.sessions)
+            self.sessions.clear()
+        for session_path in session_paths:
+            self.remove_session(session_path)
+
+    def get_metrics(self):
+        """Return a dict with the open, idle and busy session counts, hits, misses, hit ratio and closed sessions."""
+        with self.lock:
+            busy = sum(1 for session in self.sessions.values() if session.in_use)
+            lookups = self.hits + self.misses
+            return {
+                "open": len(self.sessions),
+                "busy": busy,
+                "idle": len(self.sessions) - busy,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "expired": self.expired,
+                "discarded": self.discarded,
+            }
@@ -0,0 +1,102 @@
+import json
+import os
+
+from pairing_policy import ACCEPT
+from pairing_policy import REJECT
+
+
+class OppAcceptRules:
+    """Rule-based automatic answers to incoming OPP pushes.
+
+    Rules are a dict (usually loaded from a JSON or YAML file)::
+
+        {
+            "allow_senders": ["00:11:22:33:44:55", "00:1A:7D"],
+            "reject_unlisted": true,
+            "max_size_bytes": 104857600,
+            "extensions": [".jpg", ".vcf", ".txt"],
+            "mime_types": ["image/*", "text/x-vcard"],
+            "auto_accept": true
+        }
+
+    allow_senders holds addresses or OUI prefixes; without it every sender is eligible. A push
+    from an unlisted sender is rejected if reject_unlisted is set and left to the user otherwise.
+    Pushes over max_size_bytes, or matching neither the extensions nor the mime_types list when
+    one is given, are rejected. The remaining pushes are accepted if auto_accept is set and left
+    to the user otherwise.
+    """
+
+    def __init__(self, rules=None):
+        """Initialize the rules.
+
+        Args:
+            rules: Rules as described in the class docstring.
+        """
+        rules = rules or {}
+        allow_senders = rules.get("allow_senders")
+        self.has_allowlist = allow_senders is not None
+        self.allowed_senders = {sender.upper() for sender in allow_senders or []}
+        self.reject_unlisted = rules.get("reject_unlisted", False)
+        self.max_size_bytes = rules.get("max_size_bytes")
+        self.extensions = {extension.lower() for extension in rules.get("extensions", [])}
+        self.mime_types = [mime_type.lower() for mime_type in rules.get("mime_types", [])]
+        self.auto_accept = rules.get("auto_accept", False)
+
+    @classmethod
+    def from_file(cls, file_path):
+        """Load rules from a JSON or YAML file.
+
+        Args:
+            file_path: Path of the rules file; .yaml/.yml files need PyYAML.
+        """
+        with open(file_path) as rules_file:
+            if file_path.endswith((".yaml", ".yml")):
+                import yaml
+                return cls(yaml.safe_load(rules_file))
+            return cls(json.load(rules_file))
+
+    def is_allowed_sender(self, sender_address):
+        """Return True if the sender matches the allowlist, or if there is no allowlist.
+
+        Args:
+            sender_address: Bluetooth address of the pushing device.
+        """
+        if not self.has_allowlist:
+            return True
+        sender_address = sender_address.upper()
+        return sender_address in self.allowed_senders or sender_address[:8] in self.allowed_senders
+
+    def is_allowed_type(self, file_name, mime_type):
+        """Return True if the file matches the extension or MIME type filter, or if there is none.
+
+        Args:
+            file_name: Name of the pushed object.
+            mime_type: MIME type announced by the sender, or guessed from the name.
+        """
+        if not self.extensions and not self.mime_types:
+            return True
+        if os.path.splitext(file_name)[1].lower() in self.extensions:
+            return True
+        mime_type = (mime_type or "").lower()
+        return any(mime_type == allowed or (allowed.endswith("/*") and mime_type.startswith(allowed[:-1]))
+                   for allowed in self.mime_types)
+
+    def decide(self, sender_address, file_name, size, mime_type):
+        """Decide how to answer an incoming push.
+
+        Args:
+            sender_address: Bluetooth address of the pushing device.
+            file_name: Name of the pushed object.
+            size: Announced size in bytes, 0 if unknown.
+            mime_type: MIME type announced by the sender, or guessed from the name.
+
+        Returns:
+            (ACCEPT, None) or (REJECT, reason) if a rule applies, None to ask the user.
+        """
+        if not self.is_allowed_sender(sender_address):
+            return (REJECT, "sender not in allowlist") if self.reject_unlisted else None
+        if self.max_size_bytes is not None and size > self.max_size_bytes:
+            return REJECT, f"{size} bytes exceeds the {self.max_size_bytes} bytes limit"
+        if not self.is_allowed_type(file_name, mime_type):
+            return REJECT, f"type {mime_type or os.path.splitext(file_name)[1] or 'unknown'} not allowed"
+        return (ACCEPT, None) if self.auto_accept else None
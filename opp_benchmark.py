@@ -0,0 +1,403 @@
+"""OPP throughput benchmark.
+
+Pushes synthetic payloads of several sizes to one device a number of times and writes a JSON
+report with the throughput distribution, the session setup latency against the transfer time and
+the failure rate of every size. Reports of different BlueZ/kernel builds can be compared::
+
+    python opp_benchmark.py 00:11:22:33:44:55 --sizes 1KB,64KB,1MB,100MB --repetitions 20 \\
+        --label bluez-5.65 --report bluez-5.65.json
+    python opp_benchmark.py 00:11:22:33:44:55 --label bluez-5.66 --report bluez-5.66.json \\
+        --compare bluez-5.65.json
+
+The same benchmark runs from the OPP tab of the host UI.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+
+from PyQt6.QtCore import QObject
+from PyQt6.QtCore import QRunnable
+from PyQt6.QtCore import QThreadPool
+from PyQt6.QtCore import pyqtSignal
+
+from action_metrics import summarize
+from libraries.bluetooth import constants
+from opp_transfer_queue import COMPLETE
+from opp_transfer_queue import OppTransferQueue
+from opp_transfer_queue import finished_states
+
+size_units = {"B": 1, "KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3}
+
+
+def parse_size(text):
+    """Return a payload size such as '64KB' or '1MB' in bytes.
+
+    Args:
+        text: Number of bytes, optionally followed by B, KB, MB or GB.
+
+    Raises:
+        ValueError: If the text is not a size or the size is outside 1 byte to opp_benchmark_max_size_bytes.
+    """
+    text = text.strip().upper()
+    unit = next((unit for unit in ("GB", "MB", "KB", "B") if text.endswith(unit)), "B")
+    number = text[:-len(unit)] if text.endswith(unit) else text
+    size = int(float(number) * size_units[unit])
+    if not 0 < size <= constants.opp_benchmark_max_size_bytes:
+        raise ValueError(f"Payload size {text} must be between 1 B and {constants.opp_benchmark_max_size_bytes} B")
+    return size
+
+
+def parse_sizes(text):
+    """Return the payload sizes of a comma separated list such as '1KB,1MB' in bytes."""
+    return [parse_size(size) for size in text.split(",") if size.strip()]
+
+
+def format_size(size):
+    """Return a size in bytes as the largest whole unit, e.g. 1048576 as '1MB'."""
+    for unit in ("GB", "MB", "KB"):
+        if size % size_units[unit] == 0:
+            return f"{size // size_units[unit]}{unit}"
+    return f"{size}B"
+
+
+def get_environment(label=None):
+    """Return the build details stored in a report so reports can be told apart.
+
+    Args:
+        label: Free text naming the build under test (e.g. 'bluez-5.66 kernel-6.6').
+    """
+    bluetoothd_version = None
+    if shutil.which("bluetoothd"):
+        try:
+            bluetoothd_version = subprocess.run(["bluetoothd", "--version"], capture_output=True, text=True,
+                                                timeout=5).stdout.strip() or None
+        except (OSError, subprocess.SubprocessError):
+            pass
+    return {"label": label, "host": platform.node(), "kernel": platform.release(),
+            "bluetoothd": bluetoothd_version, "python": platform.python_version()}
+
+
+def compare_reports(baseline, current):
+    """Return the change of the median throughput, setup latency and failure rate per payload size.
+
+    Args:
+        baseline: Report of the reference build.
+        current: Report of the build under test.
+
+    Returns:
+        List of dicts, one per size present in both reports.
+    """
+    baseline_results = {result["size_bytes"]: result for result in baseline["results"]}
+    comparison = []
+    for result in current["results"]:
+        reference = baseline_results.get(result["size_bytes"])
+        if reference is None:
+            continue
+        row = {"size_bytes": result["size_bytes"]}
+        for key, metric in (("throughput_kbps", "p50"), ("setup_ms", "p50"), ("transfer_ms", "p50")):
+            before, after = reference[key][metric], result[key][metric]
+            row[key] = {"baseline": before, "current": after,
+                        "change": (after - before) / before if before and after is not None else None}
+        row["failure_rate"] = {"baseline": reference["failure_rate"], "current": result["failure_rate"]}
+        comparison.append(row)
+    return comparison
+
+
+class PayloadSignals(QObject):
+    """Signals used by a PayloadTask to report back to the GUI thread."""
+
+    created = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+
+class PayloadTask(QRunnable):
+    """Writes one file of random bytes per payload size, reusing files of the right size."""
+
+    def __init__(self, directory, sizes, signals):
+        """Initialize the task.
+
+        Args:
+            directory: Directory receiving the payload files.
+            sizes: Payload sizes in bytes.
+            signals: PayloadSignals instance owned by the GUI thread.
+        """
+        super().__init__()
+        self.directory = directory
+        self.sizes = sizes
+        self.signals = signals
+
+    def run(self):
+        payload_paths = {}
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            for size in self.sizes:
+                # Random content, so links or stacks that compress cannot inflate the throughput.
+                payload_path = os.path.join(self.directory, f"opp_benchmark_{format_size(size)}.bin")
+                if not os.path.exists(payload_path) or os.path.getsize(payload_path) != size:
+                    with open(payload_path, "wb") as payload_file:
+                        remaining = size
+                        while remaining:
+                            chunk_size = min(remaining, 1024 * 1024)
+                            payload_file.write(os.urandom(chunk_size))
+                            remaining -= chunk_size
+                payload_paths[size] = payload_path
+        except OSError as error:
+            self.signals.failed.emit(str(error))
+            return
+        self.signals.created.emit(payload_paths)
+
+
+class OppBenchmark(QObject):
+    """Pushes each payload size to a device a number of times, one transfer at a time.
+
+    Every run is a single attempt on a private OppTransferQueue, so failures are counted rather
+    than retried. Setup is the time from starting the run until obexd returned the transfer
+    (session creation plus SendFile); transfer time runs from there until the transfer completed.
+    Unless reuse_sessions is set, every run opens a new OBEX session.
+    """
+
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, log, device_address, sizes, repetitions, payload_directory, adapter_address=None,
+                 reuse_sessions=False, label=None):
+        """Initialize the benchmark.
+
+        Args:
+            log: Logger instance used for logging.
+            device_address: Bluetooth address of the receiving device.
+            sizes: Payload sizes in bytes.
+            repetitions: Number of pushes per size.
+            payload_directory: Directory holding the generated payloads; a relative path is resolved
+                here, because obexd opens the files relative to its own working directory.
+            adapter_address: Address of the local adapter to send from, or None for the obexd default.
+            reuse_sessions: If True, consecutive runs share one OBEX session.
+            label: Free text naming the build under test, stored in the report.
+        """
+        super().__init__()
+        self.log = log
+        self.device_address = device_address
+        self.sizes = list(sizes)
+        self.repetitions = repetitions
+        self.payload_directory = os.path.abspath(payload_directory)
+        self.adapter_address = adapter_address
+        self.reuse_sessions = reuse_sessions
+        self.label = label
+        self.transfer_queue = OppTransferQueue(log, max_parallel=1, max_per_device=1, max_retries=0)
+        self.transfer_queue.job_updated.connect(self.handle_job_updated)
+        self.payload_paths = {}
+        self.pending_runs = []
+        self.current_job = None
+        self.current_run = None
+        self.samples = []
+        self.started_at = None
+        self.running = False
+        self.payload_signals = PayloadSignals()
+        self.payload_signals.created.connect(self.handle_payloads_created)
+        self.payload_signals.failed.connect(self.handle_payloads_failed)
+
+    def start(self):
+        """Generate the payloads in the background, then start the first run."""
+        self.running = True
+        self.samples = []
+        self.pending_runs = [(size, run) for size in self.sizes for run in range(self.repetitions)]
+        self.started_at = time.time()
+        self.transfer_queue.start()
+        self.log.info("OPP benchmark to %s: %s x %d", self.device_address,
+                      ", ".join(format_size(size) for size in self.sizes), self.repetitions)
+        QThreadPool.globalInstance().start(PayloadTask(self.payload_directory, self.sizes, self.payload_signals))
+
+    def stop(self):
+        """Abandon the remaining runs and cancel the running transfer."""
+        if not self.running:
+            return
+        self.running = False
+        self.pending_runs = []
+        if self.current_job is not None:
+            self.transfer_queue.cancel(self.current_job.job_id)
+        self.transfer_queue.stop()
+
+    def is_running(self):
+        return self.running
+
+    def handle_payloads_created(self, payload_paths):
+        self.payload_paths = payload_paths
+        self.start_next_run()
+
+    def handle_payloads_failed(self, error):
+        self.running = False
+        self.transfer_queue.stop()
+        self.log.error("Cannot create OPP benchmark payloads: %s", error)
+        self.failed.emit(error)
+
+    def start_next_run(self):
+        """Queue the next run, or finish the benchmark when none is left."""
+        if not self.running:
+            return
+        if not self.pending_runs:
+            self.running = False
+            self.transfer_queue.stop()
+            report = self.get_report()
+            self.log_report(report)
+            self.finished.emit(report)
+            return
+        if not self.reuse_sessions:
+            self.transfer_queue.session_pool.expire_idle_sessions(0)
+        self.current_run = self.pending_runs.pop(0)
+        size, _ = self.current_run
+        self.current_job, = self.transfer_queue.add_transfers([self.device_address], [self.payload_paths[size]],
+                                                              adapter_address=self.adapter_address)
+
+    def handle_job_updated(self, job):
+        """Records a finished run and starts the next one.
+
+        Args:
+            job: OppTransferJob whose state changed.
+        """
+        if job is not self.current_job or job.state not in finished_states:
+            return
+        size, run = self.current_run
+        success = job.state == COMPLETE
+        sample = {"size_bytes": size, "run": run, "success": success, "error": job.error,
+                  "session_reused": job.session_reused, "setup_ms": None, "transfer_ms": None,
+                  "throughput_kbps": None, "effective_throughput_kbps": None}
+        if job.active_at is not None:
+            sample["setup_ms"] = (job.active_at - job.started_at) * 1000
+        if success and job.active_at is not None:
+            transfer_seconds = job.finished_at - job.active_at
+            sample["transfer_ms"] = transfer_seconds * 1000
+            sample["throughput_kbps"] = size / 1024 / transfer_seconds if transfer_seconds > 0 else None
+            sample["effective_throughput_kbps"] = size / 1024 / (job.finished_at - job.started_at)
+        self.samples.append(sample)
+        self.current_job = None
+        self.transfer_queue.clear_finished()
+        self.progress.emit(len(self.samples), len(self.sizes) * self.repetitions)
+        self.start_next_run()
+
+    def get_report(self):
+        """Return the report of the runs recorded so far as a JSON-serializable dict."""
+        results = []
+        for size in self.sizes:
+            samples = [sample for sample in self.samples if sample["size_bytes"] == size]
+            successful = [sample for sample in samples if sample["success"]]
+            failures = len(samples) - len(successful)
+            results.append({
+                "size_bytes": size,
+                "size": format_size(size),
+                "runs": len(samples),
+                "failures": failures,
+                "failure_rate": failures / len(samples) if samples else None,
+                "throughput_kbps": summarize([sample["throughput_kbps"] for sample in successful
+                                              if sample["throughput_kbps"] is not None]),
+                "effective_throughput_kbps": summarize([sample["effective_throughput_kbps"]
+                                                        for sample in successful]),
+                "setup_ms": summarize([sample["setup_ms"] for sample in samples if sample["setup_ms"] is not None]),
+                "transfer_ms": summarize([sample["transfer_ms"] for sample in successful]),
+            })
+        return {
+            "report_version": constants.opp_benchmark_report_version,
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started_at)),
+            "device_address": self.device_address,
+            "adapter_address": self.adapter_address,
+            "repetitions": self.repetitions,
+            "reuse_sessions": self.reuse_sessions,
+            "environment": get_environment(self.label),
+            "results": results,
+            "samples": self.samples,
+        }
+
+    def log_report(self, report):
+        """Log one summary line per payload size.
+
+        Args:
+            report: Report returned by get_report.
+        """
+        for result in report["results"]:
+            throughput, setup = result["throughput_kbps"], result["setup_ms"]
+            if throughput["p50"] is None:
+                self.log.info("OPP benchmark %s: %d runs, all failed", result["size"], result["runs"])
+                continue
+            self.log.info("OPP benchmark %s: %.1f KB/s median (p95 %.1f, min %.1f), setup %.0f ms median, "
+                          "%d/%d failed", result["size"], throughput["p50"], throughput["p95"], throughput["min"],
+                          setup["p50"], result["failures"], result["runs"])
+
+    def get_summary(self):
+        """Return one line per payload size with the median throughput, setup latency and failures."""
+        lines = []
+        for result in self.get_report()["results"]:
+            if not result["runs"]:
+                continue
+            throughput, setup = result["throughput_kbps"]["p50"], result["setup_ms"]["p50"]
+            lines.append(f"{result['size']}: {f'{throughput:.1f} KB/s' if throughput is not None else 'n/a'}, "
+                         f"setup {f'{setup:.0f} ms' if setup is not None else 'n/a'}, "
+                         f"{result['failures']}/{result['runs']} failed")
+        return "\n".join(lines)
+
+
+def save_report(report, file_path):
+    """Write a report as indented JSON.
+
+    Args:
+        report: Report returned by OppBenchmark.get_report.
+        file_path: Path of the JSON file.
+    """
+    with open(file_path, "w") as report_file:
+        json.dump(report, report_file, indent=2)
+
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Measure OPP push throughput to one device.")
+    parser.add_argument("device_address", help="Bluetooth address of the receiving device")
+    parser.add_argument("--sizes", default=constants.opp_benchmark_default_sizes,
+                        help="Comma separated payload sizes, e.g. 1KB,1MB,100MB")
+    parser.add_argument("--repetitions", type=int, default=constants.opp_benchmark_default_repetitions,
+                        help="Pushes per payload size")
+    parser.add_argument("--adapter-address", help="Address of the local adapter to send from")
+    parser.add_argument("--reuse-sessions", action="store_true", help="Share one OBEX session between runs")
+    parser.add_argument("--payload-dir", default=constants.opp_benchmark_payload_directory_name,
+                        help="Directory receiving the generated payloads")
+    parser.add_argument("--label", help="Name of the build under test, stored in the report")
+    parser.add_argument("--report", default="opp_benchmark.json", help="File receiving the JSON report")
+    parser.add_argument("--compare", help="Report of a previous build to compare against")
+    parser.add_argument("--bus-address", help="D-Bus address of obexd instead of the session bus")
+    args = parser.parse_args(argv)
+    if args.bus_address:
+        os.environ["DBUS_SESSION_BUS_ADDRESS"] = args.bus_address
+    logging.basicConfig(stream=sys.stderr, level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    log = logging.getLogger("opp_benchmark")
+    from PyQt6.QtCore import QCoreApplication
+    application = QCoreApplication(sys.argv[:1])
+    benchmark = OppBenchmark(log, args.device_address, parse_sizes(args.sizes), args.repetitions, args.payload_dir,
+                             adapter_address=args.adapter_address, reuse_sessions=args.reuse_sessions,
+                             label=args.label)
+    outcome = {}
+    benchmark.finished.connect(lambda report: (outcome.update(report=report), application.quit()))
+    benchmark.failed.connect(lambda error: application.quit())
+    benchmark.start()
+    application.exec()
+    report = outcome.get("report")
+    if report is None:
+        return 1
+    save_report(report, args.report)
+    log.info("Report written to %s", args.report)
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            for row in compare_reports(json.load(baseline_file), report):
+                changes = ", ".join(f"{key} {row[key]['change']:+.1%}" for key in ("throughput_kbps", "setup_ms",
+                                                                                   "transfer_ms")
+                                    if row[key]["change"] is not None)
+                log.info("%s vs baseline: %s, failure rate %s -> %s", format_size(row["size_bytes"]), changes or "n/a",
+                         row["failure_rate"]["baseline"], row["failure_rate"]["current"])
+    return 0 if all(result["failures"] == 0 for result in report["results"]) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
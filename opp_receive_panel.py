@@ -0,0 +1,135 @@
+import os
+
+import dbus
+from PyQt6.QtWidgets import QHBoxLayout
+from PyQt6.QtWidgets import QHeaderView
+from PyQt6.QtWidgets import QLabel
+from PyQt6.QtWidgets import QMessageBox
+from PyQt6.QtWidgets import QPushButton
+from PyQt6.QtWidgets import QTableWidget
+from PyQt6.QtWidgets import QTableWidgetItem
+from PyQt6.QtWidgets import QVBoxLayout
+from PyQt6.QtWidgets import QWidget
+
+import style_sheet as styles
+
+
+def create_table(columns):
+    """Return a read-only table with the given column titles."""
+    table = QTableWidget(0, len(columns))
+    table.setHorizontalHeaderLabels(columns)
+    table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+    table.horizontalHeader().setStretchLastSection(True)
+    table.verticalHeader().setVisible(False)
+    table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+    return table
+
+
+def set_row_texts(table, row, values):
+    """Write the texts of a table row, touching only the cells that changed."""
+    for column, text in enumerate(values):
+        item = table.item(row, column)
+        if item is None:
+            table.setItem(row, column, QTableWidgetItem(text))
+        elif item.text() != text:
+            item.setText(text)
+
+
+class IncomingTransfersPanel(QWidget):
+    """Incoming OPP transfers of an OppReceiveService and the throughput of each sender."""
+
+    transfer_columns = ["Sender", "File", "Size", "Status", "Progress", "Throughput", "SHA-256 / Error"]
+    sender_columns = ["Sender", "Files", "Bytes", "Throughput", "Active", "Failed", "Rejected"]
+
+    def __init__(self, receive_service, parent=None):
+        """Initialize the panel.
+
+        Args:
+            receive_service: OppReceiveService whose transfers are shown.
+            parent: Optional parent widget.
+        """
+        super().__init__(parent)
+        self.receive_service = receive_service
+        self.transfer_rows = {}
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(4, 4, 4, 4)
+        controls_layout = QHBoxLayout()
+        self.service_button = QPushButton()
+        self.service_button.setStyleSheet(styles.color_style_sheet)
+        self.service_button.clicked.connect(self.toggle_service)
+        controls_layout.addWidget(self.service_button)
+        clear_button = QPushButton("Clear Finished")
+        clear_button.setStyleSheet(styles.color_style_sheet)
+        clear_button.clicked.connect(self.clear_finished)
+        controls_layout.addWidget(clear_button)
+        controls_layout.addWidget(QLabel(f"Spool: {receive_service.spool_directory}"), 1)
+        layout.addLayout(controls_layout)
+        self.transfers_table = create_table(self.transfer_columns)
+        layout.addWidget(self.transfers_table, 3)
+        self.senders_table = create_table(self.sender_columns)
+        layout.addWidget(self.senders_table, 1)
+        for transfer in receive_service.transfers.values():
+            self.add_transfer(transfer)
+        receive_service.transfer_added.connect(self.add_transfer)
+        receive_service.transfer_updated.connect(self.update_transfer)
+        receive_service.running_changed.connect(self.update_service_button)
+        self.update_service_button()
+        self.update_senders()
+
+    def toggle_service(self):
+        """Start or stop the receive service."""
+        if self.receive_service.is_running():
+            self.receive_service.stop()
+        else:
+            try:
+                self.receive_service.start()
+            except dbus.exceptions.DBusException as error:
+                QMessageBox.critical(self, "OPP", f"Cannot start the OPP receive service:\n{error}")
+
+    def update_service_button(self):
+        self.service_button.setText("Stop Receiving" if self.receive_service.is_running() else "Start Receiving")
+
+    def add_transfer(self, transfer):
+        """Append a row for a new incoming transfer.
+
+        Args:
+            transfer: IncomingTransfer announced by the service.
+        """
+        row = self.transfers_table.rowCount()
+        self.transfers_table.insertRow(row)
+        self.transfer_rows[transfer.transfer_id] = row
+        self.update_transfer(transfer)
+
+    def update_transfer(self, transfer):
+        """Redraw the row of a transfer and the sender totals.
+
+        Args:
+            transfer: IncomingTransfer whose state changed.
+        """
+        row = self.transfer_rows.get(transfer.transfer_id)
+        if row is None:
+            return
+        set_row_texts(self.transfers_table, row, [
+            transfer.sender_address, os.path.basename(transfer.file_path or transfer.file_name),
+            f"{transfer.size // 1024} KB", transfer.state, f"{transfer.progress:.0%}",
+            f"{transfer.throughput / 1024:.1f} KB/s" if transfer.started_at is not None else "",
+            transfer.checksum or transfer.error or ""])
+        self.update_senders()
+
+    def update_senders(self):
+        """Redraw the per-sender totals."""
+        sender_stats = sorted(self.receive_service.get_sender_stats().items())
+        self.senders_table.setRowCount(len(sender_stats))
+        for row, (sender_address, stats) in enumerate(sender_stats):
+            set_row_texts(self.senders_table, row, [
+                sender_address, str(stats["files"]), str(stats["bytes"]), f"{stats['throughput'] / 1024:.1f} KB/s",
+                str(stats["active"]), str(stats["failed"]), str(stats["rejected"])])
+
+    def clear_finished(self):
+        """Drop finished transfers from the service and rebuild the tables."""
+        self.receive_service.clear_finished()
+        self.transfers_table.setRowCount(0)
+        self.transfer_rows = {}
+        for transfer in self.receive_service.transfers.values():
+            self.add_transfer(transfer)
+        self.update_senders()
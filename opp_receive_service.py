@@ -0,0 +1,540 @@
+import hashlib
+import itertools
+import mimetypes
+import os
+import time
+
+import dbus
+import dbus.service
+from dbus.mainloop.glib import DBusGMainLoop
+from PyQt6.QtCore import QObject
+from PyQt6.QtCore import QRunnable
+from PyQt6.QtCore import QThreadPool
+from PyQt6.QtCore import QTimer
+from PyQt6.QtCore import pyqtSignal
+
+from libraries.bluetooth import constants
+from opp_accept_rules import OppAcceptRules
+from pairing_agent import Canceled
+from pairing_agent import Rejected
+from pairing_policy import ACCEPT
+
+DBusGMainLoop(set_as_default=True)
+
+PENDING = "pending"
+RECEIVING = "receiving"
+VERIFYING = "verifying"
+RECEIVED = "received"
+REJECTED = "rejected"
+FAILED = "failed"
+
+finished_states = {RECEIVED, REJECTED, FAILED}
+
+
+def reserve_unique_path(directory, file_name):
+    """Create an empty file in a directory for a file name without overwriting an existing file.
+
+    The file is created with O_EXCL, so concurrent callers never get the same path.
+
+    Args:
+        directory: Target directory.
+        file_name: Preferred file name.
+
+    Returns:
+        Path of the created file.
+    """
+    base_name, extension = os.path.splitext(file_name)
+    path = os.path.join(directory, file_name)
+    for index in itertools.count(1):
+        try:
+            os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644))
+        except FileExistsError:
+            path = os.path.join(directory, f"{base_name} ({index}){extension}")
+            continue
+        return path
+
+
+def get_safe_file_name(file_name):
+    """Return the base name of a pushed object name, so a sender cannot write outside the spool.
+
+    Args:
+        file_name: Name announced by the sender.
+    """
+    file_name = os.path.basename(file_name.replace("\\", "/")).strip()
+    return file_name if file_name not in ("", ".", "..") else "unnamed"
+
+
+class IncomingTransfer:
+    """One object pushed to this host, from authorization to the verified file in the spool."""
+
+    transfer_ids = itertools.count(1)
+
+    def __init__(self, transfer_path, sender_address, file_name, size, mime_type):
+        """Initialize a pending transfer.
+
+        Args:
+            transfer_path: D-Bus object path of the obexd transfer.
+            sender_address: Bluetooth address of the pushing device.
+            file_name: Name of the pushed object.
+            size: Announced size in bytes, 0 if unknown.
+            mime_type: MIME type announced by the sender, or guessed from the name.
+        """
+        self.transfer_id = next(self.transfer_ids)
+        self.transfer_path = transfer_path
+        self.sender_address = sender_address
+        self.file_name = file_name
+        self.size = size
+        self.mime_type = mime_type
+        self.state = PENDING
+        self.transferred = 0
+        self.partial_path = None
+        self.file_path = None
+        self.checksum = None
+        self.error = None
+        self.requested_at = time.monotonic()
+        self.last_update_at = self.requested_at
+        self.started_at = None
+        self.finished_at = None
+        self.reply = None
+        self.reply_error = None
+        self.prompt = None
+
+    @property
+    def progress(self):
+        """Fraction of the object received, between 0 and 1."""
+        return min(1.0, self.transferred / self.size) if self.size else 0.0
+
+    @property
+    def throughput(self):
+        """Average receive rate in bytes per second."""
+        if self.started_at is None:
+            return 0.0
+        elapsed = (self.finished_at or time.monotonic()) - self.started_at
+        return self.transferred / elapsed if elapsed > 0 else 0.0
+
+
+class ObexAgent(dbus.service.Object):
+    """org.bluez.obex.Agent1 implementation that defers every AuthorizePush reply to a handler."""
+
+    def __init__(self, bus, authorize_handler, cancel_handler, path=constants.obex_agent_path):
+        """Export the agent.
+
+        Args:
+            bus: D-Bus session bus connection to obexd.
+            authorize_handler: Callable receiving (transfer path, reply, error) of each push.
+            cancel_handler: Callable invoked when obexd cancels the pending authorization.
+            path: Object path of the agent.
+        """
+        super().__init__(bus, path)
+        self.bus = bus
+        self.path = path
+        self.authorize_handler = authorize_handler
+        self.cancel_handler = cancel_handler
+
+    @dbus.service.method(constants.obex_agent, in_signature="", out_signature="")
+    def Release(self):
+        """Called by obexd when the agent is unregistered."""
+
+    @dbus.service.method(constants.obex_agent, in_signature="o", out_signature="s",
+                         async_callbacks=("reply", "error"))
+    def AuthorizePush(self, transfer, reply, error):
+        self.authorize_handler(str(transfer), reply, error)
+
+    @dbus.service.method(constants.obex_agent, in_signature="", out_signature="")
+    def Cancel(self):
+        self.cancel_handler()
+
+
+class SpoolVerifySignals(QObject):
+    """Signals used by a SpoolVerifyTask to report back to the GUI thread."""
+
+    verified = pyqtSignal(int, str, str)
+    failed = pyqtSignal(int, str)
+
+
+class SpoolVerifyTask(QRunnable):
+    """Checks the size of a received file, hashes it and moves it from the partial to the sender directory."""
+
+    def __init__(self, transfer, spool_directory, signals):
+        """Initialize the task.
+
+        Args:
+            transfer: Completed IncomingTransfer.
+            spool_directory: Root of the spool; files go to a sub-directory per sender.
+            signals: SpoolVerifySignals instance owned by the GUI thread.
+        """
+        super().__init__()
+        self.transfer_id = transfer.transfer_id
+        self.partial_path = transfer.partial_path
+        self.expected_size = transfer.size
+        self.target_directory = os.path.join(spool_directory, transfer.sender_address.replace(":", "_"))
+        self.file_name = os.path.basename(transfer.partial_path).split("_", 1)[1]
+        self.signals = signals
+
+    def run(self):
+        try:
+            received_size = os.path.getsize(self.partial_path)
+            if self.expected_size and received_size != self.expected_size:
+                raise ValueError(f"received {received_size} of {self.expected_size} bytes")
+            digest = hashlib.sha256()
+            with open(self.partial_path, "rb") as received_file:
+                for chunk in iter(lambda: received_file.read(constants.opp_receive_hash_chunk_size), b""):
+                    digest.update(chunk)
+            checksum = digest.hexdigest()
+            os.makedirs(self.target_directory, exist_ok=True)
+            file_path = reserve_unique_path(self.target_directory, self.file_name)
+            try:
+                os.replace(self.partial_path, file_path)
+            except OSError:
+                os.remove(file_path)
+                raise
+            with open(f"{file_path}.sha256", "w") as checksum_file:
+                checksum_file.write(f"{checksum}  {os.path.basename(file_path)}\n")
+        except (OSError, ValueError) as error:
+            self.signals.failed.emit(self.transfer_id, str(error))
+            return
+        self.signals.verified.emit(self.transfer_id, file_path, checksum)
+
+
+class OppReceiveService(QObject):
+    """Background OPP receiver built on an org.bluez.obex.Agent1.
+
+    Every push is answered asynchronously, so any number of senders can push at once. Pushes are
+    accepted or rejected by the OppAcceptRules; the others are announced through
+    authorization_requested and answered with accept() or reject(). Receiving transfers that have
+    not reported progress for a while are polled, so a missed Status change cannot leave them
+    running forever. Accepted objects are written
+    by obexd into the partial directory of the spool, then checked against the announced size,
+    hashed with SHA-256 and moved to a directory per sender next to a sha256sum-compatible file.
+    obexd only writes inside its root folder (its -r option), which must contain the spool.
+    """
+
+    running_changed = pyqtSignal(bool)
+    authorization_requested = pyqtSignal(object)
+    transfer_added = pyqtSignal(object)
+    transfer_updated = pyqtSignal(object)
+
+    def __init__(self, log, spool_directory, accept_rules=None, latency_recorder=None, bus=None):
+        """Initialize the service.
+
+        Args:
+            log: Logger instance used for logging.
+            spool_directory: Directory receiving the files.
+            accept_rules: OppAcceptRules answering pushes without prompting.
+            latency_recorder: Optional LatencyRecorder receiving the duration of every received transfer.
+            bus: D-Bus connection to obexd; defaults to the session bus.
+        """
+        super().__init__()
+        self.log = log
+        self.spool_directory = spool_directory
+        self.partial_directory = os.path.join(spool_directory, constants.opp_spool_partial_directory)
+        self.accept_rules = accept_rules or OppAcceptRules()
+        self.latency_recorder = latency_recorder
+        self.bus = bus or dbus.SessionBus()
+        self.agent = None
+        self.signal_match = None
+        self.transfers = {}
+        self.transfer_paths = {}
+        self.thread_pool = QThreadPool()
+        self.verify_signals = SpoolVerifySignals()
+        self.verify_signals.verified.connect(self.handle_verified)
+        self.verify_signals.failed.connect(self.handle_verify_failed)
+        self.poll_timer = QTimer(self)
+        self.poll_timer.timeout.connect(self.poll_receiving_transfers)
+
+    def is_running(self):
+        return self.agent is not None
+
+    def start(self):
+        """Register the agent with obexd and follow the progress of incoming transfers.
+
+        Raises:
+            dbus.exceptions.DBusException: If obexd is not reachable or another agent is registered.
+        """
+        os.makedirs(self.partial_directory, exist_ok=True)
+        self.agent = ObexAgent(self.bus, self.handle_authorize_push, self.handle_agent_cancel)
+        agent_manager = dbus.Interface(self.bus.get_object(constants.obex_service, constants.obex_path),
+                                       constants.obex_agent_manager)
+        try:
+            agent_manager.RegisterAgent(constants.obex_agent_path)
+        except dbus.exceptions.DBusException:
+            self.agent.remove_from_connection()
+            self.agent = None
+            raise
+        self.signal_match = self.bus.add_signal_receiver(
+            self.handle_properties_changed, dbus_interface=constants.properties_interface,
+            signal_name="PropertiesChanged", arg0=constants.obex_object_transfer, path_keyword="path")
+        self.poll_timer.start(constants.opp_transfer_poll_interval_ms)
+        self.log.info("OPP receive service started, spooling to %s", self.spool_directory)
+        self.running_changed.emit(True)
+
+    def stop(self):
+        """Unregister the agent, reject pending pushes, abort running ones and wait for running verifications."""
+        if self.agent is None:
+            return
+        self.poll_timer.stop()
+        for transfer in list(self.transfers.values()):
+            if transfer.state == PENDING:
+                self.reject(transfer.transfer_id, "receive service stopped")
+            elif transfer.state == RECEIVING:
+                self.get_obex_interface(transfer.transfer_path, constants.obex_object_transfer).Cancel(
+                    reply_handler=lambda: None,
+                    error_handler=lambda error, path=transfer.transfer_path: self.log.debug(
+                        "Failed to cancel %s: %s", path, error))
+                self.finish_transfer(transfer, FAILED, "receive service stopped")
+        if self.signal_match:
+            self.signal_match.remove()
+            self.signal_match = None
+        agent_manager = dbus.Interface(self.bus.get_object(constants.obex_service, constants.obex_path),
+                                       constants.obex_agent_manager)
+        try:
+            agent_manager.UnregisterAgent(constants.obex_agent_path)
+        except dbus.exceptions.DBusException as error:
+            self.log.warning("Failed to unregister the OBEX agent: %s", error)
+        finally:
+            self.agent.remove_from_connection()
+            self.agent = None
+        self.thread_pool.waitForDone()
+        self.log.info("OPP receive service stopped")
+        self.running_changed.emit(False)
+
+    def get_obex_interface(self, path, interface):
+        """Return a proxy of an obexd object that does not introspect, so async calls never block.
+
+        Args:
+            path: D-Bus object path.
+            interface: D-Bus interface name.
+        """
+        return dbus.Interface(self.bus.get_object(constants.obex_service, path, introspect=False), interface)
+
+    def handle_authorize_push(self, transfer_path, reply, error):
+        """Reads the transfer and session properties of a push without blocking, then decides on it.
+
+        Args:
+            transfer_path: D-Bus object path of the obexd transfer.
+            reply: Callback sending the file name to obexd.
+            error: Callback sending a D-Bus error to obexd.
+        """
+        def on_session_properties(transfer_properties, session_properties):
+            file_name = str(transfer_properties.get("Name", ""))
+            mime_type = str(transfer_properties.get("Type", "")) or mimetypes.guess_type(file_name)[0] or ""
+            transfer = IncomingTransfer(transfer_path, str(session_properties.get("Destination", "")).upper(),
+                                        file_name, int(transfer_properties.get("Size", 0)), mime_type)
+            transfer.reply = reply
+            transfer.reply_error = error
+            self.transfers[transfer.transfer_id] = transfer
+            self.transfer_paths[transfer_path] = transfer
+            self.transfer_added.emit(transfer)
+            self.apply_accept_rules(transfer)
+
+        def on_transfer_properties(transfer_properties):
+            session = self.get_obex_interface(str(transfer_properties.get("Session", "/")),
+                                              constants.properties_interface)
+            session.GetAll(constants.obex_session_interface,
+                           reply_handler=lambda session_properties: on_session_properties(transfer_properties,
+                                                                                          session_properties),
+                           error_handler=lambda _: on_session_properties(transfer_properties, {}))
+
+        def on_error(dbus_error):
+            self.log.error("Cannot read incoming transfer %s: %s", transfer_path, dbus_error)
+            error(Rejected("Transfer properties unavailable"))
+
+        transfer = self.get_obex_interface(transfer_path, constants.properties_interface)
+        transfer.GetAll(constants.obex_object_transfer, reply_handler=on_transfer_properties, error_handler=on_error)
+
+    def apply_accept_rules(self, transfer):
+        """Answers a push from the accept rules, or asks for a decision if no rule applies.
+
+        Args:
+            transfer: Pending IncomingTransfer.
+        """
+        decision = self.accept_rules.decide(transfer.sender_address, transfer.file_name, transfer.size,
+                                            transfer.mime_type)
+        if decision is None:
+            self.authorization_requested.emit(transfer)
+            return
+        response, reason = decision
+        if response == ACCEPT:
+            self.accept(transfer.transfer_id)
+        else:
+            self.reject(transfer.transfer_id, reason)
+
+    def accept(self, transfer_id):
+        """Accept a pending push; obexd starts writing it into the partial directory.
+
+        Args:
+            transfer_id: Identifier of the IncomingTransfer.
+        """
+        transfer = self.transfers.get(transfer_id)
+        if transfer is None or transfer.state != PENDING:
+            return
+        transfer.partial_path = os.path.join(self.partial_directory,
+                                             f"{transfer.transfer_id}_{get_safe_file_name(transfer.file_name)}")
+        transfer.state = RECEIVING
+        transfer.started_at = transfer.last_update_at = time.monotonic()
+        transfer.reply(transfer.partial_path)
+        self.log.info("Receiving %s (%d bytes) from %s", transfer.file_name, transfer.size, transfer.sender_address)
+        self.transfer_updated.emit(transfer)
+
+    def reject(self, transfer_id, reason):
+        """Reject a pending push.
+
+        Args:
+            transfer_id: Identifier of the IncomingTransfer.
+            reason: Description of why the push was rejected.
+        """
+        transfer = self.transfers.get(transfer_id)
+        if transfer is None or transfer.state != PENDING:
+            return
+        transfer.reply_error(Rejected(reason))
+        self.log.info("Rejected %s from %s: %s", transfer.file_name, transfer.sender_address, reason)
+        self.finish_transfer(transfer, REJECTED, reason)
+
+    def handle_agent_cancel(self):
+        """Abandons the pushes still waiting for a decision after obexd cancelled the authorization."""
+        for transfer in list(self.transfers.values()):
+            if transfer.state == PENDING:
+                transfer.reply_error(Canceled("Canceled"))
+                self.finish_transfer(transfer, FAILED, "cancelled by the sender")
+
+    def handle_properties_changed(self, interface, changed, invalidated, path=None):
+        """Updates an incoming transfer from Transfer1 property changes.
+
+        Args:
+            interface: Name of the interface whose properties changed.
+            changed: Mapping of changed property names to new values.
+            invalidated: Names of properties whose values were invalidated.
+            path: D-Bus object path of the transfer.
+        """
+        transfer = self.transfer_paths.get(str(path))
+        if transfer is not None:
+            self.update_transfer(transfer, changed)
+
+    def update_transfer(self, transfer, transfer_properties):
+        """Applies Transfer1 properties from a signal or a poll to a receiving transfer.
+
+        Args:
+            transfer: IncomingTransfer of the transfer.
+            transfer_properties: Mapping of Transfer1 property names to values.
+        """
+        if transfer.state != RECEIVING:
+            return
+        transfer.last_update_at = time.monotonic()
+        if "Transferred" in transfer_properties:
+            transfer.transferred = int(transfer_properties["Transferred"])
+        status = str(transfer_properties.get("Status", ""))
+        if status == "complete":
+            transfer.finished_at = time.monotonic()
+            transfer.transferred = max(transfer.transferred, transfer.size)
+            transfer.state = VERIFYING
+            self.thread_pool.start(SpoolVerifyTask(transfer, self.spool_directory, self.verify_signals))
+        elif status == "error":
+            self.finish_transfer(transfer, FAILED, "obexd reported a transfer error")
+            return
+        self.transfer_updated.emit(transfer)
+
+    def poll_receiving_transfers(self):
+        """Re-read the properties of receiving transfers that have not reported progress recently."""
+        now = time.monotonic()
+        for transfer in list(self.transfer_paths.values()):
+            if (transfer.state != RECEIVING
+                    or now - transfer.last_update_at < constants.opp_transfer_poll_interval_ms / 1000):
+                continue
+            properties = self.get_obex_interface(transfer.transfer_path, constants.properties_interface)
+            properties.GetAll(
+                constants.obex_object_transfer,
+                reply_handler=lambda transfer_properties, transfer=transfer:
+                    self.update_transfer(transfer, transfer_properties),
+                error_handler=lambda error, transfer=transfer: self.handle_transfer_vanished(transfer, error))
+
+    def handle_transfer_vanished(self, transfer, error):
+        """Finishes a receiving transfer whose object is gone; obexd removes transfers once they end.
+
+        The transfer counts as complete if the partial file has the announced size, verification
+        then checks it like any other received file.
+
+        Args:
+            transfer: IncomingTransfer of the transfer.
+            error: DBusException raised by GetAll.
+        """
+        if transfer.state != RECEIVING:
+            return
+        try:
+            received_size = os.path.getsize(transfer.partial_path)
+        except OSError:
+            received_size = 0
+        if transfer.size and received_size >= transfer.size:
+            self.update_transfer(transfer, {"Transferred": received_size, "Status": "complete"})
+        else:
+            self.finish_transfer(transfer, FAILED,
+                                 f"Transfer ended without completing: {error.get_dbus_message()}")
+
+    def handle_verified(self, transfer_id, file_path, checksum):
+        transfer = self.transfers.get(transfer_id)
+        if transfer is None:
+            return
+        transfer.file_path = file_path
+        transfer.checksum = checksum
+        self.log.info("Received %s from %s: %d bytes at %.1f KB/s, sha256 %s", file_path, transfer.sender_address,
+                      transfer.transferred, transfer.throughput / 1024, checksum)
+        self.finish_transfer(transfer, RECEIVED, None)
+
+    def handle_verify_failed(self, transfer_id, error):
+        transfer = self.transfers.get(transfer_id)
+        if transfer is not None:
+            self.finish_transfer(transfer, FAILED, f"Verification failed: {error}")
+
+    def finish_transfer(self, transfer, state, error):
+        """Move a transfer to a final state; the partial file of a failed transfer is deleted.
+
+        Args:
+            transfer: IncomingTransfer to finish.
+            state: RECEIVED, REJECTED or FAILED.
+            error: Description of the failure or rejection, if any.
+        """
+        transfer.state = state
+        transfer.error = error
+        transfer.finished_at = transfer.finished_at or time.monotonic()
+        transfer.reply = transfer.reply_error = None
+        if transfer.prompt is not None:
+            transfer.prompt.close()
+        self.transfer_paths.pop(transfer.transfer_path, None)
+        if state == FAILED:
+            self.log.error("Receiving %s from %s failed: %s", transfer.file_name, transfer.sender_address, error)
+            if transfer.partial_path:
+                try:
+                    os.remove(transfer.partial_path)
+                except FileNotFoundError:
+                    pass
+                except OSError as remove_error:
+                    self.log.warning("Failed to delete %s: %s", transfer.partial_path, remove_error)
+        if self.latency_recorder and transfer.started_at is not None:
+            self.latency_recorder.record("opp_receive", "total", transfer.finished_at - transfer.started_at,
+                                         state == RECEIVED)
+        self.transfer_updated.emit(transfer)
+
+    def clear_finished(self):
+        """Forget all received, rejected and failed transfers."""
+        for transfer_id in [transfer_id for transfer_id, transfer in self.transfers.items()
+                            if transfer.state in finished_states]:
+            del self.transfers[transfer_id]
+
+    def get_sender_stats(self):
+        """Return a mapping of sender addresses to their file, byte, failure and throughput totals."""
+        sender_stats = {}
+        for transfer in self.transfers.values():
+            stats = sender_stats.setdefault(transfer.sender_address, {
+                "files": 0, "bytes": 0, "failed": 0, "rejected": 0, "active": 0, "seconds": 0.0})
+            if transfer.state == RECEIVED:
+                stats["files"] += 1
+                stats["bytes"] += transfer.transferred
+                stats["seconds"] += transfer.finished_at - transfer.started_at
+            elif transfer.state == FAILED:
+                stats["failed"] += 1
+            elif transfer.state == REJECTED:
+                stats["rejected"] += 1
+            elif transfer.state in (RECEIVING, VERIFYING):
+                stats["active"] += 1
+        for stats in sender_stats.values():
+            stats["throughput"] = stats["bytes"] / stats["seconds"] if stats["seconds"] > 0 else 0.0
+        return sender_stats
@@ -0,0 +1,452 @@
+import itertools
+import os
+import time
+from collections import OrderedDict
+
+import dbus
+from dbus.mainloop.glib import DBusGMainLoop
+from PyQt6.QtCore import QObject
+from PyQt6.QtCore import QRunnable
+from PyQt6.QtCore import QThreadPool
+from PyQt6.QtCore import QTimer
+from PyQt6.QtCore import pyqtSignal
+
+from libraries.bluetooth import constants
+from obex_session_pool import ObexSessionPool
+
+DBusGMainLoop(set_as_default=True)
+
+QUEUED = "queued"
+STARTING = "starting"
+ACTIVE = "active"
+RETRY_WAIT = "retry wait"
+COMPLETE = "complete"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+finished_states = {COMPLETE, FAILED, CANCELLED}
+
+
+class OppTransferJob:
+    """One file to push to one device, with its progress and retry state."""
+
+    job_ids = itertools.count(1)
+
+    def __init__(self, device_address, file_path, adapter_address=None):
+        """Initialize a queued job.
+
+        Args:
+            device_address: Bluetooth address of the receiving device.
+            file_path: Path of the file to send.
+            adapter_address: Address of the local adapter to send from, or None for the obexd default.
+        """
+        self.job_id = next(self.job_ids)
+        self.device_address = device_address
+        self.adapter_address = adapter_address
+        self.file_path = file_path
+        self.state = QUEUED
+        self.attempts = 0
+        self.size = os.path.getsize(file_path) if os.path.exists(file_path) else 0
+        self.transferred = 0
+        self.session_path = None
+        self.session_reused = False
+        self.transfer_path = None
+        self.started_at = None
+        self.active_at = None
+        self.finished_at = None
+        self.last_update_at = None
+        self.error = None
+        self.cancel_requested = False
+
+    @property
+    def progress(self):
+        """Fraction of the file transferred, between 0 and 1."""
+        return min(1.0, self.transferred / self.size) if self.size else 0.0
+
+    @property
+    def throughput(self):
+        """Average transfer rate of the current attempt in bytes per second."""
+        if self.started_at is None:
+            return 0.0
+        elapsed = (self.finished_at or time.monotonic()) - self.started_at
+        return self.transferred / elapsed if elapsed > 0 else 0.0
+
+
+class OppTransferSignals(QObject):
+    """Signals used by an OppSendTask to report back to the GUI thread."""
+
+    started = pyqtSignal(int, str, bool, str, object)
+    failed = pyqtSignal(int, str)
+
+
+class OppSendTask(QRunnable):
+    """Starts pushing a file over a pooled OPP session; progress is tracked by the queue."""
+
+    def __init__(self, session_pool, job, signals):
+        """Initialize the task.
+
+        Args:
+            session_pool: ObexSessionPool providing the OPP session.
+            job: OppTransferJob to start.
+            signals: OppTransferSignals instance owned by the GUI thread.
+        """
+        super().__init__()
+        self.session_pool = session_pool
+        self.job_id = job.job_id
+        self.adapter_address = job.adapter_address
+        self.device_address = job.device_address
+        self.file_path = job.file_path
+        self.signals = signals
+
+    def run(self):
+        while True:
+            session_path, reused = None, False
+            try:
+                session_path, reused = self.session_pool.acquire(self.adapter_address, self.device_address,
+                                                                 constants.opp_target)
+                object_push = dbus.Interface(self.session_pool.bus.get_object(constants.obex_service, session_path),
+                                             constants.obex_object_push)
+                transfer_path, transfer_properties = object_push.SendFile(self.file_path)
+            except dbus.exceptions.DBusException as error:
+                if session_path:
+                    self.session_pool.discard(session_path)
+                if reused:
+                    # The idle session went stale, e.g. the device dropped the link; use a new one.
+                    continue
+                self.signals.failed.emit(self.job_id, error.get_dbus_message() or str(error))
+                return
+            self.signals.started.emit(self.job_id, session_path, reused, str(transfer_path),
+                                      dict(transfer_properties))
+            return
+
+
+class OppTransferQueue(QObject):
+    """Queue of OPP file pushes to any number of devices.
+
+    Transfers are started on a thread pool, at most max_per_device at a time per device and
+    max_parallel overall. Progress comes from org.bluez.obex.Transfer1 PropertiesChanged signals,
+    with a periodic GetAll as a fallback for missed signals and transfers that vanished. A failed
+    transfer is sent again from the start, as OPP cannot resume, up to max_retries times. Sessions
+    come from an ObexSessionPool, so consecutive files to a device share one OBEX connection.
+    """
+
+    job_added = pyqtSignal(object)
+    job_updated = pyqtSignal(object)
+
+    def __init__(self, log, latency_recorder=None, bus=None, max_parallel=constants.opp_max_parallel_transfers,
+                 max_per_device=constants.opp_max_transfers_per_device, max_retries=constants.opp_max_retries):
+        """Initialize the queue.
+
+        Args:
+            log: Logger instance used for logging.
+            latency_recorder: Optional LatencyRecorder receiving the duration of every attempt.
+            bus: D-Bus connection to obexd; defaults to the session bus.
+            max_parallel: Maximum number of transfers running at once.
+            max_per_device: Maximum number of transfers running at once to the same device.
+            max_retries: Number of times a failed transfer is retried.
+        """
+        super().__init__()
+        self.log = log
+        self.latency_recorder = latency_recorder
+        self.bus = bus or dbus.SessionBus()
+        self.max_parallel = max_parallel
+        self.max_per_device = max_per_device
+        self.max_retries = max_retries
+        self.session_pool = ObexSessionPool(log, self.bus, latency_recorder=latency_recorder)
+        self.jobs = {}
+        self.transfer_jobs = {}
+        self.unclaimed_updates = OrderedDict()
+        self.thread_pool = QThreadPool()
+        self.thread_pool.setMaxThreadCount(max_parallel)
+        self.signals = OppTransferSignals()
+        self.signals.started.connect(self.handle_transfer_started)
+        self.signals.failed.connect(self.handle_start_failed)
+        self.signal_match = None
+        self.poll_timer = QTimer(self)
+        self.poll_timer.timeout.connect(self.poll_active_transfers)
+
+    def start(self):
+        """Subscribe to Transfer1 property changes."""
+        self.signal_match = self.bus.add_signal_receiver(
+            self.handle_properties_changed, dbus_interface=constants.properties_interface,
+            signal_name="PropertiesChanged", arg0=constants.obex_object_transfer, path_keyword="path")
+        self.poll_timer.start(constants.opp_transfer_poll_interval_ms)
+
+    def stop(self):
+        """Cancel running transfers, remove the signal subscription, wait for starting tasks and close the sessions."""
+        self.poll_timer.stop()
+        for job in self.jobs.values():
+            if job.state not in finished_states:
+                self.cancel(job.job_id)
+        if self.signal_match:
+            self.signal_match.remove()
+            self.signal_match = None
+        self.unclaimed_updates.clear()
+        self.thread_pool.waitForDone()
+        self.session_pool.close()
+
+    def add_transfers(self, device_addresses, file_paths, adapter_address=None):
+        """Queue every file for every device.
+
+        Args:
+            device_addresses: Bluetooth addresses of the receiving devices.
+            file_paths: Paths of the files to send.
+            adapter_address: Address of the local adapter to send from, or None for the obexd default.
+
+        Returns:
+            List of the created OppTransferJob objects.
+        """
+        jobs = []
+        for device_address in device_addresses:
+            for file_path in file_paths:
+                job = OppTransferJob(device_address, file_path, adapter_address)
+                self.jobs[job.job_id] = job
+                jobs.append(job)
+                self.job_added.emit(job)
+        self.log.info("Queued %d OPP transfer(s) to %d device(s)", len(jobs), len(device_addresses))
+        self.schedule()
+        return jobs
+
+    def cancel(self, job_id):
+        """Cancel a job; a running transfer is aborted through Transfer1.Cancel.
+
+        Args:
+            job_id: Identifier of the job.
+        """
+        job = self.jobs.get(job_id)
+        if job is None or job.state in finished_states:
+            return
+        job.cancel_requested = True
+        if job.state == ACTIVE and job.transfer_path:
+            transfer = self.get_obex_interface(job.transfer_path, constants.obex_object_transfer)
+            transfer.Cancel(reply_handler=lambda: None,
+                            error_handler=lambda error: self.finish_job(job, CANCELLED, str(error)))
+        elif job.state != STARTING:
+            self.finish_job(job, CANCELLED, None)
+
+    def clear_finished(self):
+        """Forget all completed, failed and cancelled jobs."""
+        for job_id in [job_id for job_id, job in self.jobs.items() if job.state in finished_states]:
+            del self.jobs[job_id]
+
+    def get_obex_interface(self, path, interface):
+        """Return a proxy of an obexd object that does not introspect, so async calls never block.
+
+        Args:
+            path: D-Bus object path.
+            interface: D-Bus interface name.
+        """
+        return dbus.Interface(self.bus.get_object(constants.obex_service, path, introspect=False), interface)
+
+    def get_running_count(self, device_address=None):
+        """Return the number of starting or active transfers, optionally only those to one device.
+
+        Args:
+            device_address: Bluetooth address of a device, or None for all devices.
+        """
+        return sum(1 for job in self.jobs.values() if job.state in (STARTING, ACTIVE)
+                   and (device_address is None or job.device_address == device_address))
+
+    def schedule(self):
+        """Start queued jobs in order while the concurrency limits allow."""
+        running = self.get_running_count()
+        running_per_device = {}
+        for job in self.jobs.values():
+            if job.state in (STARTING, ACTIVE):
+                running_per_device[job.device_address] = running_per_device.get(job.device_address, 0) + 1
+        for job in list(self.jobs.values()):
+            if running >= self.max_parallel:
+                return
+            if job.state != QUEUED or running_per_device.get(job.device_address, 0) >= self.max_per_device:
+                continue
+            job.state = STARTING
+            job.attempts += 1
+            job.transferred = 0
+            job.error = None
+            job.started_at = time.monotonic()
+            job.active_at = None
+            job.finished_at = None
+            running += 1
+            running_per_device[job.device_address] = running_per_device.get(job.device_address, 0) + 1
+            self.job_updated.emit(job)
+            self.thread_pool.start(OppSendTask(self.session_pool, job, self.signals))
+
+    def handle_transfer_started(self, job_id, session_path, session_reused, transfer_path, transfer_properties):
+        job = self.jobs.get(job_id)
+        if job is None:
+            self.session_pool.discard(session_path)
+            return
+        job.session_path = session_path
+        job.session_reused = session_reused
+        job.transfer_path = transfer_path
+        job.size = int(transfer_properties.get("Size", job.size)) or job.size
+        job.state = ACTIVE
+        job.active_at = job.last_update_at = time.monotonic()
+        self.transfer_jobs[transfer_path] = job
+        self.log.info("OPP transfer of %s to %s started (attempt %d, %s session)", job.file_path,
+                      job.device_address, job.attempts, "reused" if session_reused else "new")
+        unclaimed_properties = self.unclaimed_updates.pop(transfer_path, None)
+        if unclaimed_properties:
+            # A short push may have progressed, or even ended, before the SendFile reply got here.
+            self.update_job(job, unclaimed_properties)
+            if job.state != ACTIVE:
+                return
+        else:
+            self.job_updated.emit(job)
+        if job.cancel_requested:
+            self.cancel(job_id)
+
+    def handle_start_failed(self, job_id, error):
+        job = self.jobs.get(job_id)
+        if job is not None:
+            self.handle_attempt_failed(job, error)
+
+    def handle_properties_changed(self, interface, changed, invalidated, path=None):
+        """Updates the job of a transfer from Transfer1 property changes.
+
+        Args:
+            interface: Name of the interface whose properties changed.
+            changed: Mapping of changed property names to new values.
+            invalidated: Names of properties whose values were invalidated.
+            path: D-Bus object path of the transfer.
+        """
+        job = self.transfer_jobs.get(str(path))
+        if job is not None:
+            self.update_job(job, changed)
+        elif str(path).startswith(f"{constants.obex_path}/client/"):
+            # Possibly a transfer whose SendFile reply has not been handled yet; keep its changes until then.
+            self.unclaimed_updates.setdefault(str(path), {}).update(changed)
+            self.unclaimed_updates.move_to_end(str(path))
+            while len(self.unclaimed_updates) > constants.opp_unclaimed_transfer_updates:
+                self.unclaimed_updates.popitem(last=False)
+
+    def update_job(self, job, transfer_properties):
+        """Apply Transfer1 properties to a job and finish it once the status is final.
+
+        Args:
+            job: OppTransferJob of the transfer.
+            transfer_properties: Mapping of Transfer1 property names to values.
+        """
+        job.last_update_at = time.monotonic()
+        if "Transferred" in transfer_properties:
+            job.transferred = int(transfer_properties["Transferred"])
+        status = str(transfer_properties.get("Status", ""))
+        if status == "complete":
+            job.transferred = job.size or job.transferred
+            self.finish_job(job, COMPLETE, None)
+        elif status == "error":
+            if job.cancel_requested:
+                self.finish_job(job, CANCELLED, None)
+            else:
+                self.handle_attempt_failed(job, "obexd reported a transfer error")
+        else:
+            self.job_updated.emit(job)
+
+    def poll_active_transfers(self):
+        """Re-read the properties of active transfers that have not reported progress recently."""
+        now = time.monotonic()
+        for job in list(self.transfer_jobs.values()):
+            if job.state != ACTIVE or now - job.last_update_at < constants.opp_transfer_poll_interval_ms / 1000:
+                continue
+            transfer_path = job.transfer_path
+            properties = self.get_obex_interface(transfer_path, constants.properties_interface)
+            properties.GetAll(
+                constants.obex_object_transfer,
+                reply_handler=lambda transfer_properties, job=job, transfer_path=transfer_path:
+                    self.update_job(job, transfer_properties) if job.transfer_path == transfer_path else None,
+                error_handler=lambda error, job=job, transfer_path=transfer_path:
+                    self.handle_transfer_vanished(job, error) if job.transfer_path == transfer_path else None)
+
+    def handle_transfer_vanished(self, job, error):
+        """Finishes a job whose transfer object is gone; obexd removes transfers once they end.
+
+        Args:
+            job: OppTransferJob of the transfer.
+            error: DBusException raised by GetAll.
+        """
+        if job.state != ACTIVE:
+            return
+        if job.size and job.transferred >= job.size:
+            self.finish_job(job, COMPLETE, None)
+        elif job.cancel_requested:
+            self.finish_job(job, CANCELLED, None)
+        else:
+            self.handle_attempt_failed(job, f"Transfer ended without completing: {error.get_dbus_message()}")
+
+    def handle_attempt_failed(self, job, error):
+        """Retries a failed attempt after a delay, or fails the job once the retries are used up.
+
+        Args:
+            job: OppTransferJob whose attempt failed.
+            error: Description of the failure.
+        """
+        self.record_attempt(job, False)
+        self.release_transfer(job)
+        if job.cancel_requested:
+            self.finish_job(job, CANCELLED, error)
+            return
+        if job.attempts > self.max_retries:
+            self.finish_job(job, FAILED, error)
+            return
+        self.log.warning("OPP transfer of %s to %s failed (attempt %d): %s; retrying", job.file_path,
+                         job.device_address, job.attempts, error)
+        job.state = RETRY_WAIT
+        job.error = error
+        self.job_updated.emit(job)
+        QTimer.singleShot(constants.opp_retry_delay_ms, lambda: self.requeue(job))
+        self.schedule()
+
+    def requeue(self, job):
+        if job.state != RETRY_WAIT:
+            return
+        job.state = QUEUED
+        self.job_updated.emit(job)
+        self.schedule()
+
+    def finish_job(self, job, state, error):
+        """Move a job to a final state and start the next queued jobs.
+
+        Args:
+            job: OppTransferJob to finish.
+            state: COMPLETE, FAILED or CANCELLED.
+            error: Description of the failure, if any.
+        """
+        if job.state in finished_states:
+            return
+        if state == COMPLETE:
+            self.record_attempt(job, True)
+        job.state = state
+        job.error = error
+        job.finished_at = time.monotonic()
+        self.release_transfer(job, reuse_session=state == COMPLETE)
+        if state == COMPLETE:
+            self.log.info("OPP transfer of %s to %s complete: %d bytes at %.1f KB/s", job.file_path,
+                          job.device_address, job.transferred, job.throughput / 1024)
+        elif state == FAILED:
+            self.log.error("OPP transfer of %s to %s failed after %d attempts: %s", job.file_path,
+                           job.device_address, job.attempts, error)
+        self.job_updated.emit(job)
+        self.schedule()
+
+    def record_attempt(self, job, success):
+        if self.latency_recorder and job.started_at is not None:
+            self.latency_recorder.record("opp_send", "total", (job.finished_at or time.monotonic()) - job.started_at,
+                                         success)
+
+    def release_transfer(self, job, reuse_session=False):
+        """Forget the transfer of a job and hand its OBEX session back to the pool.
+
+        Args:
+            job: OppTransferJob whose attempt ended.
+            reuse_session: True to keep the session for the next transfer; sessions of failed or
+                cancelled transfers are closed.
+        """
+        if job.transfer_path:
+            self.transfer_jobs.pop(job.transfer_path, None)
+            job.transfer_path = None
+        if job.session_path:
+            if reuse_session:
+                self.session_pool.release(job.session_path)
+            else:
+                self.session_pool.discard(job.session_path)
+            job.session_path = None
@@ -0,0 +1,113 @@
+import os
+
+from PyQt6.QtWidgets import QHBoxLayout
+from PyQt6.QtWidgets import QHeaderView
+from PyQt6.QtWidgets import QLabel
+from PyQt6.QtWidgets import QPushButton
+from PyQt6.QtWidgets import QTableWidget
+from PyQt6.QtWidgets import QTableWidgetItem
+from PyQt6.QtWidgets import QVBoxLayout
+from PyQt6.QtWidgets import QWidget
+
+import style_sheet as styles
+
+
+class OppTransfersPanel(QWidget):
+    """Table of the jobs of an OppTransferQueue with live progress, throughput and OBEX session reuse."""
+
+    columns = ["File", "Device", "Status", "Progress", "Throughput", "Attempts", "Error"]
+
+    def __init__(self, transfer_queue, parent=None):
+        """Initialize the panel.
+
+        Args:
+            transfer_queue: OppTransferQueue whose jobs are shown.
+            parent: Optional parent widget.
+        """
+        super().__init__(parent)
+        self.transfer_queue = transfer_queue
+        self.job_rows = {}
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(4, 4, 4, 4)
+        self.transfers_table = QTableWidget(0, len(self.columns))
+        self.transfers_table.setHorizontalHeaderLabels(self.columns)
+        self.transfers_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.transfers_table.horizontalHeader().setStretchLastSection(True)
+        self.transfers_table.verticalHeader().setVisible(False)
+        self.transfers_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.transfers_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        layout.addWidget(self.transfers_table)
+        self.session_stats_label = QLabel()
+        layout.addWidget(self.session_stats_label)
+        buttons_layout = QHBoxLayout()
+        cancel_button = QPushButton("Cancel Selected")
+        cancel_button.setStyleSheet(styles.color_style_sheet)
+        cancel_button.clicked.connect(self.cancel_selected)
+        buttons_layout.addWidget(cancel_button)
+        clear_button = QPushButton("Clear Finished")
+        clear_button.setStyleSheet(styles.color_style_sheet)
+        clear_button.clicked.connect(self.clear_finished)
+        buttons_layout.addWidget(clear_button)
+        layout.addLayout(buttons_layout)
+        for job in transfer_queue.jobs.values():
+            self.add_job(job)
+        self.update_session_stats()
+        transfer_queue.job_added.connect(self.add_job)
+        transfer_queue.job_updated.connect(self.update_job)
+
+    def add_job(self, job):
+        """Append a row for a new job.
+
+        Args:
+            job: OppTransferJob that was queued.
+        """
+        row = self.transfers_table.rowCount()
+        self.transfers_table.insertRow(row)
+        self.job_rows[job.job_id] = row
+        for column in range(len(self.columns)):
+            self.transfers_table.setItem(row, column, QTableWidgetItem())
+        self.update_job(job)
+
+    def update_job(self, job):
+        """Redraw the row of a job.
+
+        Args:
+            job: OppTransferJob whose state changed.
+        """
+        row = self.job_rows.get(job.job_id)
+        if row is None:
+            return
+        values = [os.path.basename(job.file_path), job.device_address, job.state,
+                  f"{job.progress:.0%} ({job.transferred // 1024} / {job.size // 1024} KB)",
+                  f"{job.throughput / 1024:.1f} KB/s" if job.started_at is not None else "",
+                  str(job.attempts), job.error or ""]
+        for column, text in enumerate(values):
+            item = self.transfers_table.item(row, column)
+            if item.text() != text:
+                item.setText(text)
+        self.update_session_stats()
+
+    def update_session_stats(self):
+        """Show the OBEX session pool metrics below the table."""
+        metrics = self.transfer_queue.session_pool.get_metrics()
+        self.session_stats_label.setText(
+            f"OBEX sessions: {metrics['open']} open ({metrics['busy']} busy) | Reused: {metrics['hits']} | "
+            f"Created: {metrics['misses']} | Hit ratio: {metrics['hit_ratio']:.0%} | "
+            f"Expired: {metrics['expired']} | Discarded: {metrics['discarded']}")
+
+    def cancel_selected(self):
+        """Cancel the jobs of the selected rows."""
+        selected_rows = {index.row() for index in self.transfers_table.selectionModel().selectedRows()}
+        for job_id, row in list(self.job_rows.items()):
+            if row in selected_rows:
+                self.transfer_queue.cancel(job_id)
+
+    def clear_finished(self):
+        """Drop finished jobs from the queue and rebuild the table."""
+        self.transfer_queue.clear_finished()
+        for job_id, row in sorted(self.job_rows.items(), key=lambda entry: entry[1], reverse=True):
+            if job_id not in self.transfer_queue.jobs:
+                self.transfers_table.removeRow(row)
+        remaining_jobs = [job_id for job_id, _ in sorted(self.job_rows.items(), key=lambda entry: entry[1])
+                          if job_id in self.transfer_queue.jobs]
+        self.job_rows = {job_id: row for row, job_id in enumerate(remaining_jobs)}
@@ -0,0 +1,249 @@
+import time
+
+import dbus
+import dbus.service
+from dbus.mainloop.glib import DBusGMainLoop
+from PyQt6.QtCore import QObject
+from PyQt6.QtCore import pyqtSignal
+
+from libraries.bluetooth import constants
+
+DBusGMainLoop(set_as_default=True)
+
+
+class Rejected(dbus.DBusException):
+    """Error returned to BlueZ when the user or a policy rejects a request."""
+
+    _dbus_error_name = "org.bluez.Error.Rejected"
+
+
+class Canceled(dbus.DBusException):
+    """Error returned to BlueZ when a request is abandoned."""
+
+    _dbus_error_name = "org.bluez.Error.Canceled"
+
+
+class PairingRequest:
+    """One outstanding agent call whose D-Bus reply is sent once it is resolved."""
+
+    def __init__(self, request_type, device_path, reply, error, uuid=None, passkey=None):
+        """Initialize the request.
+
+        Args:
+            request_type: Key of the request in pairing_request_handlers (e.g. 'pin').
+            device_path: D-Bus object path of the device, empty for Cancel.
+            reply: Callback sending the D-Bus method return.
+            error: Callback sending a D-Bus error.
+            uuid: Service UUID to authorize, or PIN code to display.
+            passkey: Passkey to confirm or display.
+        """
+        self.request_type = request_type
+        self.device_path = device_path
+        self.device_address = device_path.split("dev_")[-1].replace("_", ":") if device_path else ""
+        self.uuid = uuid
+        self.passkey = passkey
+        self.reply = reply
+        self.error = error
+        self.completed = False
+        self.outcome = None
+        self.prompt = None
+        self.on_complete = None
+        self.received_at = time.monotonic()
+        self.answered_at = None
+        self.replied_at = None
+
+    def complete(self, outcome, send_reply):
+        """Send the D-Bus reply once, time-stamping the answer and the reply.
+
+        Args:
+            outcome: 'accepted', 'rejected' or 'canceled'.
+            send_reply: Callable sending the D-Bus reply.
+
+        Returns:
+            False if the request had already been completed.
+        """
+        if self.completed:
+            return False
+        self.completed = True
+        self.outcome = outcome
+        self.answered_at = time.monotonic()
+        send_reply()
+        self.replied_at = time.monotonic()
+        if self.on_complete:
+            self.on_complete(self)
+        return True
+
+    def accept(self, value=None):
+        """Send the method return, with a value for PIN and passkey requests.
+
+        Args:
+            value: PIN string, passkey integer or None.
+        """
+        if value is None:
+            self.complete("accepted", self.reply)
+        elif self.request_type == "passkey":
+            self.complete("accepted", lambda: self.reply(dbus.UInt32(value)))
+        else:
+            self.complete("accepted", lambda: self.reply(dbus.String(value)))
+
+    def reject(self):
+        """Reply with org.bluez.Error.Rejected."""
+        self.complete("rejected", lambda: self.error(Rejected("Rejected by user")))
+
+    def cancel(self):
+        """Reply with org.bluez.Error.Canceled and close any prompt shown for the request."""
+        if self.complete("canceled", lambda: self.error(Canceled("Canceled"))) and self.prompt is not None:
+            self.prompt.close()
+
+
+class PairingRequestQueue(QObject):
+    """Pending pairing requests grouped per device object, i.e. per (adapter, device) pair.
+
+    Requests of different devices are independent; a new request for a device replaces the one
+    still pending for it, and a BlueZ Cancel abandons everything pending.
+    """
+
+    request_added = pyqtSignal(object)
+
+    def __init__(self, log, latency_recorder=None):
+        """Initialize an empty queue.
+
+        Args:
+            log: Logger instance used for logging.
+            latency_recorder: Optional LatencyRecorder receiving the agent request phases.
+        """
+        super().__init__()
+        self.log = log
+        self.latency_recorder = latency_recorder
+        self.pending_requests = {}
+
+    def add_request(self, pairing_request):
+        """Queue a request from the agent and announce it.
+
+        Args:
+            pairing_request: PairingRequest received by the agent.
+        """
+        if pairing_request.request_type == "cancel":
+            for pending_request in list(self.pending_requests.values()):
+                pending_request.cancel()
+        else:
+            previous_request = self.pending_requests.get(pairing_request.device_path)
+            if previous_request:
+                self.log.info("Replacing pending %s request for %s", previous_request.request_type,
+                              previous_request.device_address)
+                previous_request.cancel()
+            pairing_request.on_complete = self.remove_request
+            self.pending_requests[pairing_request.device_path] = pairing_request
+        self.request_added.emit(pairing_request)
+
+    def remove_request(self, pairing_request):
+        """Forget a resolved request and record how long each phase took.
+
+        Args:
+            pairing_request: The resolved PairingRequest.
+        """
+        if self.pending_requests.get(pairing_request.device_path) is pairing_request:
+            del self.pending_requests[pairing_request.device_path]
+        if self.latency_recorder:
+            operation = f"agent_{pairing_request.request_type}"
+            success = pairing_request.outcome == "accepted"
+            self.latency_recorder.record(operation, "user_response",
+                                         pairing_request.answered_at - pairing_request.received_at, success)
+            self.latency_recorder.record(operation, "reply", pairing_request.replied_at - pairing_request.answered_at,
+                                         success)
+            self.latency_recorder.record(operation, "total", pairing_request.replied_at - pairing_request.received_at,
+                                         success)
+
+
+class PairingAgent(dbus.service.Object):
+    """org.bluez.Agent1 implementation that defers every reply until the request is resolved.
+
+    Each call is wrapped in a PairingRequest and handed to request_handler; the D-Bus main loop
+    is never blocked, so several devices can pair at the same time.
+    """
+
+    def __init__(self, bus, request_handler, path=constants.agent_path):
+        """Export the agent.
+
+        Args:
+            bus: D-Bus connection to BlueZ.
+            request_handler: Callable receiving each PairingRequest.
+            path: Object path of the agent.
+        """
+        super().__init__(bus, path)
+        self.bus = bus
+        self.path = path
+        self.request_handler = request_handler
+
+    def submit(self, request_type, device, reply, error, uuid=None, passkey=None):
+        """Wrap an agent call into a PairingRequest and hand it over."""
+        self.request_handler(PairingRequest(request_type, str(device), reply, error, uuid=uuid, passkey=passkey))
+
+    @dbus.service.method(constants.agent, in_signature="", out_signature="")
+    def Release(self):
+        """Called by BlueZ when the agent is unregistered."""
+
+    @dbus.service.method(constants.agent, in_signature="o", out_signature="s", async_callbacks=("reply", "error"))
+    def RequestPinCode(self, device, reply, error):
+        self.submit("pin", device, reply, error)
+
+    @dbus.service.method(constants.agent, in_signature="os", out_signature="", async_callbacks=("reply", "error"))
+    def DisplayPinCode(self, device, pincode, reply, error):
+        self.submit("display_pin", device, reply, error, uuid=str(pincode))
+
+    @dbus.service.method(constants.agent, in_signature="o", out_signature="u", async_callbacks=("reply", "error"))
+    def RequestPasskey(self, device, reply, error):
+        self.submit("passkey", device, reply, error)
+
+    @dbus.service.method(constants.agent, in_signature="ouq", out_signature="", async_callbacks=("reply", "error"))
+    def DisplayPasskey(self, device, passkey, entered, reply, error):
+        self.submit("display_passkey", device, reply, error, passkey=int(passkey))
+
+    @dbus.service.method(constants.agent, in_signature="ou", out_signature="", async_callbacks=("reply", "error"))
+    def RequestConfirmation(self, device, passkey, reply, error):
+        self.submit("confirm", device, reply, error, passkey=int(passkey))
+
+    @dbus.service.method(constants.agent, in_signature="o", out_signature="", async_callbacks=("reply", "error"))
+    def RequestAuthorization(self, device, reply, error):
+        self.submit("confirm", device, reply, error)
+
+    @dbus.service.method(constants.agent, in_signature="os", out_signature="", async_callbacks=("reply", "error"))
+    def AuthorizeService(self, device, uuid, reply, error):
+        self.submit("authorize", device, reply, error, uuid=str(uuid))
+
+    @dbus.service.method(constants.agent, in_signature="", out_signature="")
+    def Cancel(self):
+        self.submit("cancel", "", lambda *args: None, lambda *args: None)
+
+
+def register_pairing_agent(bus, capability, request_handler):
+    """Export a PairingAgent and register it as the default BlueZ agent.
+
+    Args:
+        bus: D-Bus connection to BlueZ.
+        capability: IO capability (e.g. 'DisplayYesNo').
+        request_handler: Callable receiving each PairingRequest.
+
+    Returns:
+        The registered PairingAgent.
+    """
+    agent = PairingAgent(bus, request_handler)
+    agent_manager = dbus.Interface(bus.get_object(constants.bluez_service, constants.bluez_path),
+                                   constants.agent_interface)
+    agent_manager.RegisterAgent(constants.agent_path, capability)
+    agent_manager.RequestDefaultAgent(constants.agent_path)
+    return agent
+
+
+def unregister_pairing_agent(agent):
+    """Unregister a PairingAgent from BlueZ and remove it from the bus.
+
+    Args:
+        agent: PairingAgent returned by register_pairing_agent.
+    """
+    agent_manager = dbus.Interface(agent.bus.get_object(constants.bluez_service, constants.bluez_path),
+                                   constants.agent_interface)
+    try:
+        agent_manager.UnregisterAgent(agent.path)
+    finally:
+        agent.remove_from_connection()
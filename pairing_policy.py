@@ -0,0 +1,111 @@
+import json
+import re
+
+ACCEPT = "accept"
+REJECT = "reject"
+
+
+class PairingPolicy:
+    """Rule-based automatic answers to pairing agent requests.
+
+    Rules are a dict (usually loaded from a JSON or YAML file)::
+
+        {
+            "allow": {"addresses": ["00:11:22:33:44:55"], "ouis": ["00:1A:7D"], "name_patterns": ["^DUT-"]},
+            "reject_unlisted": false,
+            "pins": {"00:11:22:33:44:55": "0000", "*": "1234"},
+            "passkeys": {"*": 123456},
+            "auto_confirm": true,
+            "authorize_uuids": ["0000110b-0000-1000-8000-00805f9b34fb"]
+        }
+
+    Without an "allow" section every device is eligible. A request that no rule answers is left
+    to the interactive handlers.
+    """
+
+    def __init__(self, rules=None):
+        """Initialize the policy.
+
+        Args:
+            rules: Policy rules as described in the class docstring.
+        """
+        rules = rules or {}
+        allow = rules.get("allow")
+        self.has_allowlist = allow is not None
+        allow = allow or {}
+        self.allowed_addresses = {address.upper() for address in allow.get("addresses", [])}
+        self.allowed_ouis = {oui.upper() for oui in allow.get("ouis", [])}
+        self.allowed_name_patterns = [re.compile(pattern) for pattern in allow.get("name_patterns", [])]
+        self.reject_unlisted = rules.get("reject_unlisted", False)
+        self.pins = {address.upper(): str(pin) for address, pin in rules.get("pins", {}).items()}
+        self.passkeys = {address.upper(): int(passkey) for address, passkey in rules.get("passkeys", {}).items()}
+        self.auto_confirm = rules.get("auto_confirm", False)
+        self.authorize_uuids = {uuid.lower() for uuid in rules.get("authorize_uuids", [])}
+
+    @classmethod
+    def from_file(cls, file_path):
+        """Load a policy from a JSON or YAML file.
+
+        Args:
+            file_path: Path of the policy file; .yaml/.yml files need PyYAML.
+        """
+        with open(file_path) as policy_file:
+            if file_path.endswith((".yaml", ".yml")):
+                import yaml
+                return cls(yaml.safe_load(policy_file))
+            return cls(json.load(policy_file))
+
+    def is_enabled(self):
+        """Return True if the policy can answer any request at all."""
+        return bool(self.has_allowlist or self.pins or self.passkeys or self.auto_confirm or self.authorize_uuids)
+
+    def is_allowed(self, device_address, device_name=None):
+        """Return True if the device matches the allowlist, or if there is no allowlist.
+
+        Args:
+            device_address: Bluetooth address of the device.
+            device_name: Name or alias of the device, if known.
+        """
+        if not self.has_allowlist:
+            return True
+        device_address = device_address.upper()
+        if device_address in self.allowed_addresses or device_address[:8] in self.allowed_ouis:
+            return True
+        return bool(device_name) and any(pattern.search(device_name) for pattern in self.allowed_name_patterns)
+
+    def lookup(self, table, device_address):
+        """Return the per-device value of a table, falling back to its '*' entry."""
+        return table.get(device_address.upper(), table.get("*"))
+
+    def decide(self, pairing_request, device_name=None):
+        """Decide how to answer a pairing request.
+
+        Args:
+            pairing_request: PairingRequest received by the agent.
+            device_name: Name or alias of the device, if known.
+
+        Returns:
+            (ACCEPT, value) or (REJECT, None) if a rule applies, None to ask the user.
+        """
+        request_type = pairing_request.request_type
+        device_address = pairing_request.device_address
+        if request_type == "cancel":
+            return None
+        if not self.is_allowed(device_address, device_name):
+            return (REJECT, None) if self.reject_unlisted else None
+        if request_type == "pin":
+            pin = self.lookup(self.pins, device_address)
+            return (ACCEPT, pin) if pin is not None else None
+        if request_type == "passkey":
+            passkey = self.lookup(self.passkeys, device_address)
+            return (ACCEPT, passkey) if passkey is not None else None
+        if request_type == "confirm":
+            return (ACCEPT, None) if self.auto_confirm else None
+        if request_type == "authorize":
+            uuid = (pairing_request.uuid or "").lower()
+            if "*" in self.authorize_uuids or (uuid and uuid in self.authorize_uuids):
+                return ACCEPT, None
+            return None
+        if request_type in ("display_pin", "display_passkey"):
+            return (ACCEPT, None) if self.has_allowlist else None
+        return None
@@ -0,0 +1,115 @@
+from collections import OrderedDict
+
+from PyQt6.QtWidgets import QVBoxLayout
+from PyQt6.QtWidgets import QWidget
+
+from libraries.bluetooth import constants
+
+
+class ProfilePanel(QWidget):
+    """Tab page holding the controls of one profile for one device.
+
+    The content is built the first time the page is shown and replaced in place only when the
+    device's state changes, so switching back to the page does not rebuild it.
+    """
+
+    def __init__(self, device_address, profile):
+        """Initialize an empty panel.
+
+        Args:
+            device_address: Bluetooth address of the remote device.
+            profile: Profile name shown by the panel (e.g., 'A2DP').
+        """
+        super().__init__()
+        self.device_address = device_address
+        self.profile = profile
+        self.connected = None
+        self.content = None
+        self.attributes = {}
+        self.setMaximumWidth(600)
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(layout)
+
+    def is_stale(self, connected):
+        """Return True if the content was never built or was built for another connection state.
+
+        Args:
+            connected: Current connection state of the device.
+        """
+        return self.content is None or self.connected != connected
+
+    def set_content(self, content, connected, attributes):
+        """Replace the content of the panel.
+
+        Args:
+            content: Widget with the profile controls.
+            connected: Connection state the content was built for.
+            attributes: Mapping of TestApplication attribute names to the values the content set.
+        """
+        if self.content is not None:
+            self.layout().removeWidget(self.content)
+            self.content.setParent(None)
+            self.content.deleteLater()
+        self.content = content
+        self.connected = connected
+        self.attributes = attributes
+        self.layout().addWidget(content)
+
+    def invalidate(self):
+        """Mark the content as outdated so it is rebuilt the next time the panel is shown."""
+        self.connected = None
+
+
+class ProfilePanelCache:
+    """Least recently used ProfilePanel instances keyed by (device address, profile)."""
+
+    def __init__(self, max_size=constants.profile_panel_cache_size):
+        """Initialize the cache.
+
+        Args:
+            max_size: Number of panels kept before the least recently used one is deleted.
+        """
+        self.max_size = max_size
+        self.panels = OrderedDict()
+
+    def get(self, device_address, profile):
+        """Return the panel of a device profile, creating it if needed, and mark it as most recently used.
+
+        Args:
+            device_address: Bluetooth address of the remote device.
+            profile: Profile name shown by the panel (e.g., 'A2DP').
+        """
+        key = (device_address, profile)
+        panel = self.panels.get(key)
+        if panel is not None:
+            self.panels.move_to_end(key)
+            return panel
+        panel = self.panels[key] = ProfilePanel(device_address, profile)
+        while len(self.panels) > self.max_size:
+            _, evicted_panel = self.panels.popitem(last=False)
+            evicted_panel.deleteLater()
+        return panel
+
+    def get_device_panels(self, device_address):
+        """Return the cached panels of a device.
+
+        Args:
+            device_address: Bluetooth address of the remote device.
+        """
+        return [panel for (address, _), panel in self.panels.items() if address == device_address]
+
+    def remove_device(self, device_address):
+        """Delete the cached panels of a device.
+
+        Args:
+            device_address: Bluetooth address of the remote device.
+        """
+        for panel in self.get_device_panels(device_address):
+            del self.panels[(device_address, panel.profile)]
+            panel.deleteLater()
+
+    def invalidate_all(self):
+        """Mark every cached panel as outdated, e.g. after switching to another adapter."""
+        for panel in self.panels.values():
+            panel.invalidate()
@@ -0,0 +1,101 @@
+"""Cold start trace of the host UI.
+
+Run on a test PC to check the startup budget; exits with status 1 when the budget is exceeded::
+
+    python startup_trace.py --interface hci0 --log-dir /var/log/bluetooth --budget-ms 2000
+"""
+import argparse
+import importlib
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+from libraries.bluetooth import constants
+
+
+class StartupTrace:
+    """Durations of the import and construction phases of a host UI start."""
+
+    def __init__(self, budget_ms=constants.startup_budget_ms):
+        """Start the trace.
+
+        Args:
+            budget_ms: Startup time in milliseconds above which a warning is logged.
+        """
+        self.budget_ms = budget_ms
+        self.started = time.perf_counter()
+        self.phases = []
+        self.total_ms = None
+
+    @contextmanager
+    def phase(self, name):
+        """Context manager recording the duration of one startup phase.
+
+        Args:
+            name: Name of the phase shown in the trace.
+        """
+        phase_started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, (time.perf_counter() - phase_started) * 1000))
+
+    def import_module(self, module_name):
+        """Import a module and record the import time as a phase.
+
+        Args:
+            module_name: Name of the module to import.
+        """
+        with self.phase(f"import {module_name}"):
+            return importlib.import_module(module_name)
+
+    def finish(self, log):
+        """Record the total startup time and log every phase.
+
+        Args:
+            log: Logger instance used for logging.
+
+        Returns:
+            Total startup time in milliseconds.
+        """
+        if self.total_ms is None:
+            self.total_ms = (time.perf_counter() - self.started) * 1000
+        for name, duration_ms in self.phases:
+            log.info("Startup phase %s: %.1f ms", name, duration_ms)
+        if self.total_ms > self.budget_ms:
+            log.warning("Startup took %.1f ms, over the budget of %.1f ms", self.total_ms, self.budget_ms)
+        else:
+            log.info("Startup took %.1f ms (budget %.1f ms)", self.total_ms, self.budget_ms)
+        return self.total_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the cold start of the Bluetooth test host UI.")
+    parser.add_argument("--interface", default="hci0", help="Bluetooth adapter interface")
+    parser.add_argument("--log-dir", default=os.getcwd(), help="Directory holding <source>.log files")
+    parser.add_argument("--budget-ms", type=float, default=constants.startup_budget_ms,
+                        help="Startup budget in milliseconds")
+    args = parser.parse_args()
+    trace = StartupTrace(args.budget_ms)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    log = logging.LoggerAdapter(logging.getLogger("startup_trace"), {})
+    log.log_path = args.log_dir
+    qt_widgets = trace.import_module("PyQt6.QtWidgets")
+    host_ui = trace.import_module("host_ui")
+    with trace.phase("QApplication"):
+        application = qt_widgets.QApplication(sys.argv)
+    log_files = {f"{source}_log_file_path": os.path.join(args.log_dir, f"{source}.log")
+                 for source in ("bluetoothd", "pulseaudio", "obexd", "ofonod")}
+    window = host_ui.TestApplication(interface=args.interface, back_callback=application.quit, log=log,
+                                     hcidump_log_name=os.path.join(args.log_dir, "hcidump.log"),
+                                     startup_trace=trace, **log_files)
+    window.show()
+    host_ui.QTimer.singleShot(0, application.quit)
+    application.exec()
+    sys.exit(0 if trace.total_ms <= args.budget_ms else 1)
+
+
+if __name__ == "__main__":
+    main()